@@ -0,0 +1,181 @@
+"""
+Runtime coopératif asyncio commun
+Héberge une ou plusieurs applications (sélecteur d'effets, horloge BCD,
+minuteur) dans un même processus
+
+Chaque application expose une méthode tasks() qui retourne ses coroutines
+(rendu, entrées, réseau, temps). Les tâches communiquent par Queue et
+asyncio.Event et dorment jusqu'à leur prochaine échéance : le CPU reste
+inactif entre deux échéances.
+
+Exemple:
+    runtime = Runtime()
+    runtime.add_app(EffectSelectorApp(matrix, button))
+    runtime.add_app(MinuteurApp())
+    runtime.run()
+
+Sur CircuitPython, copier asyncio/ et adafruit_ticks.mpy dans lib/
+"""
+
+import time
+import asyncio
+
+
+# ============================================================================
+# FILE DE MESSAGES
+# ============================================================================
+
+class Queue:
+    """
+    File de messages minimale entre tâches.
+
+    asyncio.Queue n'existe pas sous CircuitPython : cette version repose
+    uniquement sur asyncio.Event et fonctionne aussi sous CPython.
+    """
+
+    def __init__(self, maxsize=0):
+        """
+        Args:
+            maxsize: Taille maximale (0 = illimitée). Si la file est pleine,
+                le message le plus ancien est abandonné.
+        """
+        self.maxsize = maxsize
+        self._items = []
+        self._event = asyncio.Event()
+
+    def empty(self):
+        """True si aucun message n'est en attente."""
+        return not self._items
+
+    def put_nowait(self, item):
+        """Ajoute un message sans attendre."""
+        if self.maxsize and len(self._items) >= self.maxsize:
+            self._items.pop(0)
+        self._items.append(item)
+        self._event.set()
+
+    def get_nowait(self):
+        """Retourne le prochain message, ou None si la file est vide."""
+        if self._items:
+            return self._items.pop(0)
+        return None
+
+    async def get(self):
+        """Attend et retourne le prochain message."""
+        while not self._items:
+            self._event.clear()
+            await self._event.wait()
+        return self._items.pop(0)
+
+    async def get_until(self, deadline):
+        """
+        Attend un message jusqu'à une échéance.
+
+        Args:
+            deadline: Échéance absolue (time.monotonic())
+
+        Returns:
+            Le message, ou None si l'échéance est atteinte
+        """
+        while not self._items:
+            delay = deadline - time.monotonic()
+            if delay <= 0:
+                return None
+            self._event.clear()
+            try:
+                await asyncio.wait_for(self._event.wait(), delay)
+            except asyncio.TimeoutError:
+                return None
+        return self._items.pop(0)
+
+
+# ============================================================================
+# ÉCHÉANCES
+# ============================================================================
+
+async def sleep_until(deadline):
+    """
+    Dort jusqu'à une échéance absolue (time.monotonic()).
+    Cède tout de même la main si l'échéance est déjà passée.
+    """
+    delay = deadline - time.monotonic()
+    await asyncio.sleep(delay if delay > 0 else 0)
+
+
+def next_deadline(deadline, period):
+    """
+    Calcule l'échéance suivante d'une tâche périodique, sans dérive.
+    En cas de retard, les échéances manquées sont sautées.
+
+    Args:
+        deadline: Échéance précédente
+        period: Période en secondes
+
+    Returns:
+        Nouvelle échéance absolue
+    """
+    deadline += period
+    now = time.monotonic()
+    if deadline < now:
+        deadline = now + period - (now - deadline) % period
+    return deadline
+
+
+async def periodic(period, callback):
+    """
+    Appelle callback() toutes les period secondes, sans dérive.
+
+    Args:
+        period: Période en secondes
+        callback: Fonction sans argument
+    """
+    deadline = time.monotonic()
+    while True:
+        callback()
+        deadline = next_deadline(deadline, period)
+        await sleep_until(deadline)
+
+
+# ============================================================================
+# RUNTIME
+# ============================================================================
+
+class Runtime:
+    """
+    Héberge plusieurs applications dans une seule boucle asyncio.
+
+    Une application est un objet avec:
+        tasks(): liste de coroutines à lancer
+        stop(): (facultatif) appelé à l'arrêt du runtime
+    """
+
+    def __init__(self):
+        self.apps = []
+
+    def add_app(self, app):
+        """Ajoute une application au runtime."""
+        self.apps.append(app)
+
+    async def main(self):
+        """Lance toutes les tâches de toutes les applications."""
+        tasks = []
+        for app in self.apps:
+            for coroutine in app.tasks():
+                tasks.append(asyncio.create_task(coroutine))
+        await asyncio.gather(*tasks)
+
+    def stop(self):
+        """Arrête proprement toutes les applications."""
+        for app in self.apps:
+            stop = getattr(app, "stop", None)
+            if stop:
+                stop()
+
+    def run(self):
+        """Exécute le runtime jusqu'à Ctrl+C."""
+        try:
+            asyncio.run(self.main())
+        except KeyboardInterrupt:
+            print("\n\nArret du runtime...")
+        finally:
+            self.stop()
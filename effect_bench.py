@@ -0,0 +1,795 @@
+"""
+Benchmark des effets et des moteurs de rendu
+Mesure chaque effet de effects/, chaque exemple de exemples.py et
+les rendus de l'horloge BCD et du minuteur sur N frames
+
+Pour chaque rendu:
+    - temps de rendu moyen et p99 (ms)
+    - appels à show() par frame
+    - pixels écrits par frame
+    - octets alloués par frame
+
+UTILISATION:
+Sur l'ordinateur (modules simulés, voir simulateur/) :
+    python effect_bench.py --frames 200 --json resultats.json
+    python effect_bench.py --reference resultats.json --seuil 0.2
+    python effect_bench.py --suite effets --suite horloge --repetitions 5
+    python effect_bench.py --suite tailles     # temps par frame de 64 à 1024 LEDs
+    python effect_bench.py --suite palette     # RGB / framebuffer indexé
+
+Sur le Pico :
+1. Copier ce fichier en code.py avec neopixel_matrix_optimized.py,
+   fixed_trig.py, le dossier effects/ et exemples.py (facultatif: display.py et config.py de
+   l'horloge, minuteur/code.py renommé minuteur.py)
+2. Lancer depuis l'ordinateur, la carte redémarre et renvoie le JSON:
+    python effect_bench.py --serie /dev/ttyACM0 --json pico.json
+
+Sur la carte, les octets alloués sont mesurés par gc.mem_alloc() avec le
+GC désactivé pendant la frame. Sur l'ordinateur, tracemalloc donne le pic
+d'allocation de la frame. Les deux mesures ne sont pas comparables entre
+elles, seulement d'une exécution à l'autre sur la même plateforme.
+"""
+
+import sys
+import time
+import random
+import gc
+
+try:
+    import json
+except ImportError:
+    json = None
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+FRAMES = 200              # Frames mesurées par rendu (temps)
+FRAMES_MEMOIRE = 50       # Frames mesurées par rendu (allocations)
+FRAMES_CHAUFFE = 5        # Frames ignorées au démarrage de chaque rendu
+SEUIL_REGRESSION = 0.2    # +20% sur la moyenne ou le p99 = régression
+TOLERANCE_MS = 0.05       # Hausse absolue tolérée (bruit de mesure sur l'ordinateur)
+TOLERANCE_OCTETS = 64     # Allocation supplémentaire tolérée (octets/frame)
+REPETITIONS = 3           # Exécutions sur l'ordinateur (meilleure mesure retenue)
+MARQUEUR_JSON = "BENCH-JSON "
+SUITES = ("effets", "exemples", "horloge", "minuteur")
+# Suite "tailles" (à demander explicitement): effets de 64 à 1024 LEDs
+SCALING_LAYOUTS = ("8x8", "2x1", "2x2", "2x1_16x16", "2x2_16x16")
+# Suite "palette" (à demander explicitement): RGB / framebuffer indexé
+PALETTE_LAYOUTS = ("8x8", "2x2")
+WIRE_US_PER_PIXEL = 30    # Transmission WS2812 (800 kHz, 24 bits)
+WIRE_RESET_US = 80
+
+IS_CIRCUITPYTHON = sys.implementation.name == "circuitpython"
+
+
+class BenchmarkDone(Exception):
+    """Interrompt un exemple une fois le nombre de frames atteint."""
+
+
+# ============================================================================
+# COMPTAGE DES ÉCRITURES
+# ============================================================================
+
+class CountingPixels:
+    """
+    Enveloppe un objet NeoPixel et compte les pixels écrits et les show().
+    Les autres attributs (brightness, n...) sont délégués.
+    """
+
+    def __init__(self, pixels):
+        self.pixels = pixels
+        self.shows = 0
+        self.writes = 0
+
+    def __len__(self):
+        return len(self.pixels)
+
+    def __getattr__(self, name):
+        return getattr(self.pixels, name)
+
+    def __getitem__(self, index):
+        return self.pixels[index]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            self.writes += len(range(*index.indices(len(self.pixels))))
+        else:
+            self.writes += 1
+        self.pixels[index] = value
+
+    def fill(self, color):
+        self.writes += len(self.pixels)
+        self.pixels.fill(color)
+
+    def show(self):
+        self.shows += 1
+        self.pixels.show()
+
+
+# ============================================================================
+# MESURE DES ALLOCATIONS
+# ============================================================================
+
+if hasattr(gc, "mem_alloc"):
+    tracemalloc = None
+
+    def alloc_begin():
+        """Commence la mesure d'allocation d'une frame."""
+        gc.collect()
+        gc.disable()
+        return gc.mem_alloc()
+
+    def alloc_end(start):
+        """Retourne les octets alloués depuis alloc_begin()."""
+        allocated = gc.mem_alloc() - start
+        gc.enable()
+        return allocated
+else:
+    import tracemalloc
+
+    def alloc_begin():
+        """Commence la mesure d'allocation d'une frame."""
+        tracemalloc.reset_peak()
+        return tracemalloc.get_traced_memory()[0]
+
+    def alloc_end(start):
+        """Retourne le pic d'allocation depuis alloc_begin()."""
+        return max(0, tracemalloc.get_traced_memory()[1] - start)
+
+
+# ============================================================================
+# STATISTIQUES
+# ============================================================================
+
+class FrameMeter:
+    """
+    Mesure les frames d'un rendu.
+
+    Passe temps: durée, show() et pixels écrits par frame (GC actif, les
+    pauses du GC apparaissent dans le p99).
+    Passe mémoire: octets alloués par frame.
+    """
+
+    def __init__(self, pixels):
+        self.pixels = pixels
+        self.times = []
+        self.allocations = []
+        self.shows = 0
+        self.writes = 0
+        self.memory = False
+        self._start = 0
+        self._alloc = 0
+        self._shows = 0
+        self._writes = 0
+
+    def begin(self):
+        """Début d'une frame."""
+        if self.memory:
+            self._alloc = alloc_begin()
+        else:
+            self._shows = self.pixels.shows
+            self._writes = self.pixels.writes
+        self._start = time.monotonic_ns()
+
+    def end(self, keep=True):
+        """Fin d'une frame (keep=False: frame de chauffe ignorée)."""
+        elapsed = time.monotonic_ns() - self._start
+        if self.memory:
+            allocated = alloc_end(self._alloc)
+            if keep:
+                self.allocations.append(allocated)
+        elif keep:
+            self.times.append(elapsed)
+            self.shows += self.pixels.shows - self._shows
+            self.writes += self.pixels.writes - self._writes
+
+    def result(self):
+        """Retourne le dictionnaire de résultats du rendu."""
+        times = sorted(self.times)
+        n = len(times)
+        if not n:
+            return None
+        allocations = self.allocations or [0]
+        return {
+            "frames": n,
+            "moyenne_ms": sum(times) / n / 1e6,
+            "p99_ms": times[min(n - 1, int(n * 0.99))] / 1e6,
+            "max_ms": times[-1] / 1e6,
+            "shows_par_frame": self.shows / n,
+            "pixels_par_frame": self.writes / n,
+            "octets_par_frame": sum(allocations) / len(allocations),
+        }
+
+
+def measure(pixels, frame, frames, memory_frames):
+    """
+    Mesure un rendu pull: frame() dessine une frame à chaque appel.
+
+    Returns:
+        Dictionnaire de résultats
+    """
+    meter = FrameMeter(pixels)
+    for i in range(FRAMES_CHAUFFE + frames):
+        meter.begin()
+        frame()
+        meter.end(keep=i >= FRAMES_CHAUFFE)
+
+    meter.memory = True
+    if tracemalloc:
+        tracemalloc.start()
+    try:
+        for i in range(memory_frames):
+            meter.begin()
+            frame()
+            meter.end()
+    finally:
+        if tracemalloc:
+            tracemalloc.stop()
+    return meter.result()
+
+
+# ============================================================================
+# SUITES DE RENDUS
+# ============================================================================
+
+def effect_renderers(matrix):
+    """Rendus des classes d'effets de effects/ (tous importés)."""
+    from effects import EffectRegistry
+    renderers = []
+    for effect_class in EffectRegistry(lazy=False).classes():
+        def make(effect_class=effect_class):
+            return effect_class(matrix).update
+        renderers.append((effect_class.__name__, make))
+    return renderers
+
+
+def palette_renderers(matrix):
+    """
+    Arc-en-ciel et feu de effects/ en RGB puis sur le framebuffer
+    indexé (attribut INDEXED de l'instance).
+    """
+    from effects.effect2_rainbow import Effect2_Rainbow
+    from effects.effect5_fire import Effect5_Fire
+    renderers = []
+    for effect_class in (Effect2_Rainbow, Effect5_Fire):
+        for indexed in (False, True):
+            def make(effect_class=effect_class, indexed=indexed):
+                default = effect_class.INDEXED
+                effect_class.INDEXED = indexed
+                matrix._indexed = None  # Framebuffer compté dans l'état de l'effet
+                try:
+                    effect = effect_class(matrix)
+                finally:
+                    effect_class.INDEXED = default
+                effect.INDEXED = indexed
+                return effect.update
+            mode = "indexe" if indexed else "rgb"
+            renderers.append((f"{effect_class.__name__}[{mode}]", make))
+    return renderers
+
+
+def retained(make):
+    """
+    Construit un rendu et mesure la mémoire qu'il conserve.
+
+    Returns:
+        Tuple (frame, octets)
+    """
+    if tracemalloc:
+        gc.collect()  # Vide aussi les listes libres de CPython (tuples réutilisés non tracés)
+        tracemalloc.start()
+        try:
+            frame = make()
+            size = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+    else:
+        gc.collect()
+        start = gc.mem_alloc()
+        frame = make()
+        gc.collect()
+        size = gc.mem_alloc() - start
+    return frame, size
+
+
+class _BenchTime:
+    """
+    Remplace le module time de exemples.py: chaque sleep() marque la fin
+    d'une frame (sans attendre).
+    """
+
+    def __init__(self, meter, frames):
+        self.meter = meter
+        self.frames = frames
+        self.count = 0
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+    def sleep(self, delay):
+        self.meter.end(keep=self.count >= FRAMES_CHAUFFE)
+        self.count += 1
+        if self.count >= self.frames + FRAMES_CHAUFFE:
+            raise BenchmarkDone()
+        self.meter.begin()
+
+
+def measure_example(matrix, function, frames, memory_frames):
+    """
+    Mesure une fonction de exemples.py (boucle infinie avec time.sleep).
+
+    Returns:
+        Dictionnaire de résultats
+    """
+    import exemples
+
+    def shared_matrix(pin, width=8, height=8, brightness=0.3, layout=None):
+        matrix.pixels.brightness = brightness
+        return matrix
+
+    meter = FrameMeter(matrix.pixels)
+    original_time = exemples.time
+    original_matrix = exemples.NeoPixelMatrix
+    exemples.NeoPixelMatrix = shared_matrix
+    exemples.print = lambda *args, **kwargs: None  # Messages de démarrage
+    try:
+        for memory, count in ((False, frames), (True, memory_frames)):
+            meter.memory = memory
+            exemples.time = _BenchTime(meter, count)
+            if memory and tracemalloc:
+                tracemalloc.start()
+            meter.begin()
+            try:
+                function()
+            except BenchmarkDone:
+                pass
+            finally:
+                if memory and tracemalloc:
+                    tracemalloc.stop()
+                elif memory:
+                    gc.enable()
+    finally:
+        exemples.time = original_time
+        exemples.NeoPixelMatrix = original_matrix
+        del exemples.print
+    return meter.result()
+
+
+def example_functions():
+    """Fonctions d'exemple de exemples.py (hors menu)."""
+    import exemples
+    names = sorted(name for name in dir(exemples) if name.startswith("exemple_"))
+    return [(name, getattr(exemples, name)) for name in names]
+
+
+class _ClockHardware:
+    """Matériel minimal pour DisplayManager (seulement .pixels)."""
+
+    def __init__(self, pixels):
+        self.pixels = pixels
+
+
+def clock_renderers(pixels):
+    """Rendus de l'horloge BCD (horloge_binaire/display.py)."""
+    from display import DisplayManager
+    from config import Config
+
+    def bcd():
+        display = DisplayManager(_ClockHardware(pixels))
+        state = [12 * 3600 + 34 * 60]
+
+        def frame():
+            t = state[0]
+            display.current_buffer = display.generer_buffer_bcd(
+                (t // 3600) % 12, (t // 60) % 60, t % 60, False, t, t % 2)
+            display._appliquer_buffer()
+            state[0] = t + 1
+        return frame
+
+    def crossfade():
+        display = DisplayManager(_ClockHardware(pixels))
+        display.non_bloquant = True
+        state = [12 * 3600 + 34 * 60]
+
+        def frame():
+            if not display.en_transition:
+                t = state[0]
+                display.demarrer_transition(display.generer_buffer_bcd(
+                    (t // 3600) % 12, (t // 60) % 60, t % 60, False, t), Config.FADE_SECONDE)
+                state[0] = t + 1
+            display.avancer_transition()
+        return frame
+
+    return [("horloge_bcd", bcd), ("horloge_fondu", crossfade)]
+
+
+def load_minuteur():
+    """
+    Importe le minuteur comme module (minuteur.py sur la carte,
+    minuteur/code.py dans le dépôt).
+    """
+    try:
+        import minuteur
+        return minuteur
+    except ImportError:
+        pass
+    import importlib.util
+    import os
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        "projets", "matrice neopixel 8x8", "minuteur", "code.py")
+    spec = importlib.util.spec_from_file_location("minuteur", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    sys.modules["minuteur"] = module
+    return module
+
+
+def minuteur_renderers(minuteur):
+    """Rendus du minuteur (affichage BCD, fondu, explosion)."""
+    minuteur.config["SYSTEM_DEBUG"] = False
+
+    def bcd():
+        state = [3599]
+
+        def frame():
+            minuteur.afficher_bcd(state[0], minuteur.COULEUR_NORMALE_BASE)
+            state[0] = state[0] - 1 if state[0] > 0 else 3599
+        return frame
+
+    def crossfade():
+        state = [3599]
+        minuteur.mode_non_bloquant = True
+
+        def frame():
+            if minuteur.transition is None:
+                source = minuteur.generer_affichage_bcd(state[0], minuteur.COULEUR_NORMALE_BASE)
+                state[0] = state[0] - 1 if state[0] > 0 else 3599
+                destination = minuteur.generer_affichage_bcd(state[0], minuteur.COULEUR_NORMALE_BASE)
+                minuteur.demarrer_transition(source, destination, minuteur.DUREE_FADE_SECONDE)
+            minuteur.avancer_transition()
+        return frame
+
+    def explosion():
+        state = [minuteur.etapes_explosion()]
+
+        def frame():
+            try:
+                next(state[0])
+            except StopIteration:
+                state[0] = minuteur.etapes_explosion()
+        return frame
+
+    return [("minuteur_bcd", bcd), ("minuteur_fondu", crossfade),
+            ("minuteur_explosion", explosion)]
+
+
+# ============================================================================
+# EXÉCUTION
+# ============================================================================
+
+def print_result(name, result):
+    """Affiche une ligne de résultats."""
+    print(f"{name:28s} {result['moyenne_ms']:8.3f} ms  p99 {result['p99_ms']:8.3f} ms  "
+          f"{result['shows_par_frame']:.2f} show  {result['pixels_par_frame']:6.1f} px  "
+          f"{result['octets_par_frame']:8.0f} o")
+
+
+def print_results(results):
+    """Affiche le tableau des résultats."""
+    print(f"Plateforme: {results['plateforme']}, {results['frames']} frames par rendu")
+    print("=" * 40)
+    for name, result in results["resultats"].items():
+        if result:
+            print_result(name, result)
+
+
+def print_scaling(results):
+    """
+    Affiche le temps de rendu par frame de chaque effet selon le nombre de
+    LEDs (suite "tailles"), et la limite imposée par la transmission.
+    """
+    from neopixel_matrix_optimized import tile_map
+    sizes = [(layout, tile_map(layout)) for layout in SCALING_LAYOUTS]
+    print("=" * 40)
+    print("Temps de rendu par frame (ms) selon le nombre de LEDs")
+    print(f"{'effet':20s}" + "".join(f"{m.width * m.height:>9d}" for _, m in sizes))
+    names = []
+    for key in results["resultats"]:
+        name, _, layout = key.partition("@")
+        if layout and name not in names:
+            names.append(name)
+    for name in names:
+        if "[" in name:
+            continue  # Suite "palette"
+        row = ""
+        for layout, _ in sizes:
+            result = results["resultats"].get(f"{name}@{layout}")
+            row += f"{result['moyenne_ms']:9.2f}" if result else f"{'-':>9s}"
+        print(f"{name:20s}{row}")
+    wires = [(m.width * m.height * WIRE_US_PER_PIXEL + WIRE_RESET_US) / 1000 for _, m in sizes]
+    print(f"{'transmission (ms)':20s}" + "".join(f"{w:9.2f}" for w in wires))
+    print(f"{'FPS max (fil)':20s}" + "".join(f"{1000 / w:9.0f}" for w in wires))
+
+
+def print_palette(results):
+    """
+    Compare les rendus RGB et indexés (suite "palette") : temps par frame,
+    pixels écrits et mémoire conservée par l'effet.
+    """
+    from neopixel_matrix_optimized import tile_map
+    print("=" * 40)
+    print("RGB / framebuffer indexé (temps par frame, mémoire de l'effet)")
+    print(f"{'effet':24s}{'RGB ms':>9s}{'index ms':>10s}{'gain':>7s}"
+          f"{'RGB o':>9s}{'index o':>9s}{'gain':>7s}")
+    for key, rgb in results["resultats"].items():
+        name, _, layout = key.partition("@")
+        if not name.endswith("[rgb]") or not rgb:
+            continue
+        indexed = results["resultats"].get(key.replace("[rgb]", "[indexe]"))
+        if not indexed:
+            continue
+        size = tile_map(layout)
+        label = f"{name[:-5]} {size.width * size.height}"
+        time_gain = 1 - indexed["moyenne_ms"] / rgb["moyenne_ms"]
+        ram_gain = 1 - indexed["octets_etat"] / max(1, rgb["octets_etat"])
+        print(f"{label:24s}{rgb['moyenne_ms']:9.3f}{indexed['moyenne_ms']:10.3f}"
+              f"{time_gain * 100:6.0f}%{rgb['octets_etat']:9d}{indexed['octets_etat']:9d}"
+              f"{ram_gain * 100:6.0f}%")
+
+
+def run(frames=FRAMES, memory_frames=FRAMES_MEMOIRE, suites=SUITES, verbose=True):
+    """
+    Exécute les suites de benchmark.
+
+    Args:
+        frames: Frames mesurées par rendu (temps)
+        memory_frames: Frames mesurées par rendu (allocations)
+        suites: Suites à exécuter ("effets", "exemples", "horloge",
+            "minuteur", "tailles", "palette")
+        verbose: Affiche chaque résultat au fil de l'eau
+
+    Returns:
+        Dictionnaire {plateforme, frames, resultats: {nom: mesures}}
+    """
+    import board
+    from neopixel_matrix_optimized import NeoPixelMatrix
+
+    results = {}
+
+    def record(name, result):
+        results[name] = result
+        if verbose and result:
+            print_result(name, result)
+
+    matrix = NeoPixelMatrix(board.GP0, brightness=0.3)
+    pixels = CountingPixels(matrix.pixels)
+    matrix.pixels = pixels
+
+    try:
+        if "effets" in suites:
+            for name, make in effect_renderers(matrix):
+                random.seed(1)
+                record(name, measure(pixels, make(), frames, memory_frames))
+
+        if "exemples" in suites:
+            for name, function in example_functions():
+                random.seed(1)
+                record(name, measure_example(matrix, function, frames, memory_frames))
+
+        if "horloge" in suites:
+            try:
+                for name, make in clock_renderers(pixels):
+                    record(name, measure(pixels, make(), frames, memory_frames))
+            except ImportError as e:
+                print(f"Horloge ignorée: {e}")
+    finally:
+        # Le minuteur crée sa propre bande sur la même broche
+        pixels.pixels.deinit()
+
+    if "tailles" in suites:
+        # Mêmes effets sur des panneaux chaînés (temps seulement)
+        for layout in SCALING_LAYOUTS:
+            scaled = NeoPixelMatrix(board.GP0, brightness=0.3, layout=layout)
+            scaled_pixels = CountingPixels(scaled.pixels)
+            scaled.pixels = scaled_pixels
+            try:
+                for name, make in effect_renderers(scaled):
+                    random.seed(1)
+                    record(f"{name}@{layout}", measure(scaled_pixels, make(), frames, 0))
+            finally:
+                scaled_pixels.pixels.deinit()
+
+    if "palette" in suites:
+        for layout in PALETTE_LAYOUTS:
+            palette_matrix = NeoPixelMatrix(board.GP0, brightness=0.3, layout=layout)
+            palette_pixels = CountingPixels(palette_matrix.pixels)
+            palette_matrix.pixels = palette_pixels
+            try:
+                for name, make in palette_renderers(palette_matrix):
+                    random.seed(1)
+                    frame, size = retained(make)
+                    result = measure(palette_pixels, frame, frames, memory_frames)
+                    result["octets_etat"] = size
+                    record(f"{name}@{layout}", result)
+            finally:
+                palette_pixels.pixels.deinit()
+
+    if "minuteur" in suites:
+        try:
+            minuteur = load_minuteur()
+        except (ImportError, OSError) as e:
+            print(f"Minuteur ignoré: {e}")
+        else:
+            strip = minuteur.pixels
+            if isinstance(strip, CountingPixels):
+                strip = strip.pixels  # Module déjà mesuré (répétition)
+            minuteur_pixels = CountingPixels(strip)
+            minuteur.pixels = minuteur_pixels
+            for name, make in minuteur_renderers(minuteur):
+                random.seed(1)
+                record(name, measure(minuteur_pixels, make(), frames, memory_frames))
+
+    return {
+        "plateforme": sys.implementation.name,
+        "frames": frames,
+        "resultats": results,
+    }
+
+
+def best_of(runs):
+    """
+    Fusionne plusieurs exécutions en gardant la meilleure valeur de chaque
+    mesure (réduit le bruit de l'ordonnanceur sur l'ordinateur).
+    """
+    merged = runs[0]
+    for other in runs[1:]:
+        for name, result in other["resultats"].items():
+            best = merged["resultats"].get(name)
+            if not best or not result:
+                continue
+            for key, value in result.items():
+                best[key] = min(best[key], value)
+    return merged
+
+
+# ============================================================================
+# RÉGRESSIONS
+# ============================================================================
+
+def compare(results, reference, threshold=SEUIL_REGRESSION):
+    """
+    Compare des résultats à une référence.
+
+    Args:
+        results: Résultats de run()
+        reference: Résultats de référence (même plateforme)
+        threshold: Hausse relative tolérée du temps moyen et du p99
+
+    Returns:
+        Liste de messages de régression (vide si aucune)
+    """
+    regressions = []
+    if reference.get("plateforme") != results.get("plateforme"):
+        print(f"Attention: référence {reference.get('plateforme')}, "
+              f"mesures {results.get('plateforme')}")
+    for name, result in results["resultats"].items():
+        base = reference["resultats"].get(name)
+        if not result or not base:
+            continue
+        for key in ("moyenne_ms", "p99_ms"):
+            if result[key] > base[key] * (1 + threshold) + TOLERANCE_MS:
+                regressions.append(f"{name}: {key} {base[key]:.3f} -> {result[key]:.3f}")
+        for key in ("shows_par_frame", "pixels_par_frame"):
+            if result[key] > base[key] * (1 + threshold):
+                regressions.append(f"{name}: {key} {base[key]:.2f} -> {result[key]:.2f}")
+        if result["octets_par_frame"] > base["octets_par_frame"] * (1 + threshold) + TOLERANCE_OCTETS:
+            regressions.append(f"{name}: octets_par_frame {base['octets_par_frame']:.0f} "
+                               f"-> {result['octets_par_frame']:.0f}")
+    return regressions
+
+
+# ============================================================================
+# LIAISON SÉRIE (ORDINATEUR <-> PICO)
+# ============================================================================
+
+def read_serial(port, timeout=600):
+    """
+    Redémarre la carte (Ctrl+D) et lit les résultats envoyés sur la
+    console série.
+
+    Args:
+        port: Port série (/dev/ttyACM0, COM3...)
+        timeout: Délai maximal en secondes
+
+    Returns:
+        Résultats décodés
+    """
+    import serial  # pyserial
+    with serial.Serial(port, 115200, timeout=1) as link:
+        link.write(b"\x03\x04")
+        end = time.monotonic() + timeout
+        while time.monotonic() < end:
+            line = link.readline().decode("utf-8", "replace").strip()
+            if line.startswith(MARQUEUR_JSON):
+                return json.loads(line[len(MARQUEUR_JSON):])
+            if line:
+                print(f"  pico> {line}")
+    raise TimeoutError("Pas de résultats reçus du Pico")
+
+
+def main(argv):
+    """Point d'entrée sur l'ordinateur."""
+    frames = FRAMES
+    memory_frames = FRAMES_MEMOIRE
+    threshold = SEUIL_REGRESSION
+    output = None
+    reference_path = None
+    port = None
+    repetitions = REPETITIONS
+    suites = []
+    args = iter(argv)
+    for arg in args:
+        if arg == "--frames":
+            frames = int(next(args))
+        elif arg == "--frames-memoire":
+            memory_frames = int(next(args))
+        elif arg == "--json":
+            output = next(args)
+        elif arg == "--reference":
+            reference_path = next(args)
+        elif arg == "--seuil":
+            threshold = float(next(args))
+        elif arg == "--serie":
+            port = next(args)
+        elif arg == "--repetitions":
+            repetitions = int(next(args))
+        elif arg == "--suite":
+            suites.append(next(args))
+        else:
+            print(__doc__)
+            return 2
+
+    if port:
+        results = read_serial(port)
+    else:
+        import simulateur
+        from simulateur.enregistreur import EnregistreurFrames
+        simulateur.installer(enregistreur=EnregistreurFrames(
+            garder_frames=False, modeler_transmission=False))
+        import os
+        sys.path.insert(0, os.path.join(simulateur.DOSSIER_PROJET, "projets",
+                                        "matrice neopixel 8x8", "horloge_binaire"))
+        results = best_of([run(frames, memory_frames, suites or SUITES, verbose=False)
+                           for _ in range(repetitions)])
+        print_results(results)
+        if "tailles" in suites:
+            print_scaling(results)
+        if "palette" in suites:
+            print_palette(results)
+
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Résultats: {output}")
+
+    if reference_path:
+        with open(reference_path) as f:
+            reference = json.load(f)
+        regressions = compare(results, reference, threshold)
+        print("=" * 40)
+        if regressions:
+            print(f"{len(regressions)} régression(s) (seuil {threshold * 100:.0f}%):")
+            for message in regressions:
+                print(f"  {message}")
+            return 1
+        print(f"Aucune régression (seuil {threshold * 100:.0f}%)")
+    return 0
+
+
+if __name__ == "__main__":
+    if IS_CIRCUITPYTHON:
+        print(MARQUEUR_JSON + json.dumps(run()))
+    else:
+        sys.exit(main(sys.argv[1:]))
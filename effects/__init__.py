@@ -0,0 +1,163 @@
+"""
+Registre des effets : découverte dans le dossier effects/ et chargement
+à la demande
+
+Chaque module effectN_nom.py (ou .mpy) expose sa classe sous le nom
+EFFECT ; N donne l'ordre d'affichage. En mode paresseux, seul le module
+de l'effet affiché est importé : le précédent est retiré de sys.modules
+et la mémoire rendue par gc.collect() avant de charger le suivant.
+
+UTILISATION:
+    from effects import EffectRegistry
+
+    registry = EffectRegistry()
+    EffectClass = registry.load(0)     # Importe effect1_gradient
+    effect = EffectClass(matrix)
+    ...
+    effect = None
+    registry.release()                 # Module libéré, gc.collect()
+
+Ajouter un effet : copier un module existant sous effects/effect10_nom.py
+et y changer la classe et EFFECT.
+"""
+
+import gc
+import os
+import sys
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+PACKAGE = "effects"
+PREFIX = "effect"
+EXTENSIONS = (".py", ".mpy")
+
+
+def _order(name):
+    """Clé de tri : numéro après le préfixe (effect10 après effect9)."""
+    digits = ""
+    for char in name[len(PREFIX):]:
+        if not char.isdigit():
+            break
+        digits += char
+    return (int(digits) if digits else 1 << 16, name)
+
+
+def discover(folder=None):
+    """
+    Liste les modules d'effets du dossier.
+
+    Args:
+        folder: Dossier à parcourir (défaut: celui de ce paquet)
+
+    Returns:
+        Noms de modules triés par numéro
+    """
+    if folder is None:
+        folder = __file__.rsplit("/", 1)[0] if "/" in __file__ else "."
+    names = []
+    for filename in os.listdir(folder):
+        for extension in EXTENSIONS:
+            if filename.startswith(PREFIX) and filename.endswith(extension):
+                name = filename[:-len(extension)]
+                if name not in names:
+                    names.append(name)
+    names.sort(key=_order)
+    return names
+
+
+# ============================================================================
+# REGISTRE
+# ============================================================================
+
+class EffectRegistry:
+    """
+    Effets disponibles, importés à la demande.
+
+    Attributes:
+        names (list): Modules d'effets dans l'ordre d'affichage
+        lazy (bool): Un seul module importé à la fois (deux pendant un fondu)
+        loaded (list): Modules actuellement importés (mode paresseux)
+    """
+
+    def __init__(self, lazy=True, folder=None):
+        """
+        Args:
+            lazy: False = tous les effets importés tout de suite
+            folder: Dossier des effets (défaut: ce paquet)
+        """
+        self.names = discover(folder)
+        if not self.names:
+            raise OSError("Aucun effet dans le dossier effects/")
+        self.lazy = lazy
+        self.loaded = []
+        self._classes = {}
+        if not lazy:
+            for name in self.names:
+                self._classes[name] = self._import(name)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _import(self, name):
+        """Importe effects.<name> et retourne sa classe EFFECT."""
+        module = __import__(f"{PACKAGE}.{name}", None, None, ["EFFECT"])
+        return module.EFFECT
+
+    def load(self, index, keep=False):
+        """
+        Retourne la classe de l'effet index, en l'important au besoin.
+        En mode paresseux, les modules précédents sont libérés d'abord.
+
+        Args:
+            index: Position dans names
+            keep: Garder les modules déjà importés (deux effets rendus
+                ensemble pendant un fondu, voir playlist.py)
+
+        Returns:
+            Sous-classe d'Effect
+        """
+        name = self.names[index]
+        if not self.lazy:
+            return self._classes[name]
+        if name not in self.loaded:
+            if not keep:
+                self.release()
+            self.loaded.append(name)
+        return self._import(name)
+
+    def release(self, index=None):
+        """
+        Oublie les modules importés (mode paresseux) et rend leur mémoire.
+        Les instances des effets doivent avoir été abandonnées avant.
+
+        Args:
+            index: Seulement le module de cet effet (défaut: tous)
+        """
+        if not self.lazy or not self.loaded:
+            return
+        names = list(self.loaded) if index is None else [self.names[index]]
+        package = sys.modules.get(PACKAGE)
+        for name in names:
+            if name not in self.loaded:
+                continue
+            sys.modules.pop(f"{PACKAGE}.{name}", None)
+            if package is not None and hasattr(package, name):
+                delattr(package, name)
+            self.loaded.remove(name)
+        gc.collect()
+
+    def classes(self):
+        """
+        Importe et retourne toutes les classes (benchmark, compilation).
+        Ne libère rien : réservé à l'ordinateur ou aux mesures.
+        """
+        classes = []
+        for name in self.names:
+            effect_class = self._classes.get(name)
+            if effect_class is None:
+                effect_class = self._import(name)
+            classes.append(effect_class)
+        return classes
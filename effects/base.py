@@ -0,0 +1,69 @@
+"""
+Classe de base des effets du sélecteur (main_final.py)
+Chaque module effects/effectN_nom.py définit une sous-classe et l'expose
+sous le nom EFFECT (voir effects/__init__.py)
+"""
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+INDEXED_EFFECTS = True  # Arc-en-ciel et feu sur le framebuffer indexé (rotation de palette)
+
+
+# ============================================================================
+# EFFET DE BASE
+# ============================================================================
+
+class Effect:
+    """
+    Classe de base pour les effets.
+    
+    update(dt, t) reçoit le temps écoulé depuis la frame précédente et le
+    temps d'animation depuis le lancement de l'effet (secondes) : la
+    vitesse ne dépend ni de la fréquence d'images ni des frames sautées.
+    Les effets simulés (feu, pluie, étoiles) avancent par pas fixes de
+    STEP secondes (ticks()).
+    """
+    
+    STEP = 0.05  # Pas de simulation (secondes), cadence d'origine de 20 FPS
+    MAX_STEPS = 4  # Rattrapage maximal par frame (au-delà, le temps est sauté)
+    
+    def __init__(self, matrix):
+        self.matrix = matrix
+        self.running = True
+        self.frame_count = 0
+        self.time = 0.0
+        self.step_count = 0  # Pas de simulation effectués
+    
+    def stop(self):
+        """Arrête l'effet."""
+        self.running = False
+    
+    def update(self, dt=STEP, t=None):
+        """
+        Méthode à appeler à chaque frame.
+        
+        Args:
+            dt: Temps écoulé depuis la frame précédente (secondes)
+            t: Temps d'animation absolu (défaut: somme des dt)
+        """
+        self.frame_count += 1
+        self.time = self.time + dt if t is None else t
+    
+    def ticks(self):
+        """
+        Nombre de pas de simulation dus depuis le dernier appel.
+        
+        Returns:
+            0 à MAX_STEPS (0: rien n'a changé, la frame peut être sautée)
+        """
+        # Tolérance: une somme de dt de 0.05 peut tomber juste en dessous
+        due = int(self.time / self.STEP + 1e-6)
+        steps = due - self.step_count
+        if steps > self.MAX_STEPS:
+            # Surcharge: on abandonne le retard au lieu de ralentir
+            steps = self.MAX_STEPS
+        self.step_count = due
+        return steps if steps > 0 else 0
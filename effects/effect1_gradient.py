@@ -0,0 +1,23 @@
+"""
+Effet 1 : Dégradé animé
+"""
+
+from effects.base import Effect
+
+
+class Effect1_Gradient(Effect):
+    """Effet 1 : Dégradé animé"""
+    
+    SPEED = 40  # Pas d'échelle par seconde
+    
+    def __init__(self, matrix):
+        super().__init__(matrix)
+        self.scale = 0
+    
+    def update(self, dt=Effect.STEP, t=None):
+        super().update(dt, t)
+        self.scale = int(self.time * self.SPEED) % 256
+        self.matrix.draw_gradient(x_scale=self.scale, y_scale=self.scale, z_value=100)
+
+
+EFFECT = Effect1_Gradient
@@ -0,0 +1,58 @@
+"""
+Effet 2 : Arc-en-ciel rotatif (palette indexée)
+"""
+
+from neopixel_matrix_optimized import hsv_to_rgb
+from effects.base import Effect, INDEXED_EFFECTS
+
+
+class Effect2_Rainbow(Effect):
+    """
+    Effet 2 : Arc-en-ciel rotatif
+    
+    Mode indexé: les pixels gardent leur teinte de départ, chaque frame
+    ne fait que tourner la palette.
+    """
+    
+    SPEED = 20  # Pas de teinte par seconde
+    INDEXED = INDEXED_EFFECTS
+    
+    def __init__(self, matrix):
+        super().__init__(matrix)
+        self.offset = 0
+        # Un tour de teinte sur la diagonale, quelle que soit la taille
+        self.span = max(1, matrix.width + matrix.height - 2)
+        if self.INDEXED:
+            self.framebuffer = matrix.indexed()
+            for hue in range(256):
+                self.framebuffer.set_color(hue, hsv_to_rgb(hue / 255, 1.0, 1.0))
+            self.framebuffer.draw_pattern(self.rainbow_index)
+            self.rotation = -1  # Force le premier affichage
+        else:
+            # Teintes précalculées et motif lié une seule fois (pas de
+            # fermeture ni de conversion HSV à chaque frame)
+            self.palette = [hsv_to_rgb(hue / 255, 1.0, 1.0) for hue in range(256)]
+            self.pattern = self.rainbow_rotated
+    
+    def rainbow_index(self, x, y):
+        return (x + y) * 255 // self.span
+    
+    def rainbow_rotated(self, x, y):
+        return self.palette[((x + y + self.offset) * 255 // self.span) % 256]
+    
+    def update(self, dt=Effect.STEP, t=None):
+        super().update(dt, t)
+        self.offset = int(self.time * self.SPEED) % 256
+        if not self.INDEXED:
+            self.matrix.draw_pattern(self.pattern)
+            return
+        rotation = self.offset * 255 // self.span % 256
+        if rotation == self.rotation:
+            return  # Palette inchangée: rien à transmettre
+        # L'entrée i doit recevoir la teinte i + rotation
+        self.framebuffer.rotate(max(self.rotation, 0) - rotation)
+        self.rotation = rotation
+        self.framebuffer.show()
+
+
+EFFECT = Effect2_Rainbow
@@ -0,0 +1,39 @@
+"""
+Effet 3 : Vague (sinus en virgule fixe par colonne)
+"""
+
+from fixed_trig import isin, radians, ONE
+from effects.base import Effect
+
+
+class Effect3_Wave(Effect):
+    """
+    Effet 3 : Vague
+    
+    L'onde ne dépend que de la colonne : un sinus en virgule fixe par
+    colonne et par frame, couleurs en entiers 0xRRGGBB.
+    """
+    
+    SPEED = 6.0  # Colonnes par seconde
+    COLUMN_ANGLE = radians(0.5)  # Phase entre deux colonnes
+    
+    def __init__(self, matrix):
+        super().__init__(matrix)
+        self.t = 0
+        self.columns = [0] * matrix.width
+        self.pattern = self.wave_color  # Lié une seule fois
+    
+    def wave_color(self, x, y):
+        return self.columns[x]
+    
+    def update(self, dt=Effect.STEP, t=None):
+        super().update(dt, t)
+        self.t = self.time * self.SPEED
+        phase = int(self.t * self.COLUMN_ANGLE)
+        for x in range(self.matrix.width):
+            intensity = (isin(x * self.COLUMN_ANGLE + phase) + ONE) * 255 >> 16
+            self.columns[x] = (intensity << 8) | (255 - intensity)
+        self.matrix.draw_pattern(self.pattern)
+
+
+EFFECT = Effect3_Wave
@@ -0,0 +1,49 @@
+"""
+Effet 4 : Spirale (angle et distance précalculés)
+"""
+
+from neopixel_matrix_optimized import hsv_to_rgb
+from fixed_trig import iatan2, isqrt, radians, TURN
+from effects.base import Effect
+
+
+class Effect4_Spiral(Effect):
+    """
+    Effet 4 : Spirale
+    
+    Angle et distance au centre ne changent pas : calculés une fois par
+    pixel (iatan2, isqrt), chaque frame ne fait qu'ajouter la rotation.
+    """
+    
+    SPEED = 2.0  # Radians par seconde
+    DISTANCE_SCALE = 32  # Distances en 1/32 de pixel
+    
+    def __init__(self, matrix):
+        super().__init__(matrix)
+        self.offset = 0
+        self.phase = 0
+        self.palette = [hsv_to_rgb(hue / 255, 1.0, 1.0) for hue in range(256)]
+        # Coordonnées doublées: le centre tombe entre deux LEDs sans float
+        radian = radians(1.0)
+        self.base = []
+        for y in range(matrix.height):
+            dy = 2 * y - (matrix.height - 1)
+            for x in range(matrix.width):
+                dx = 2 * x - (matrix.width - 1)
+                distance = isqrt((dx * dx + dy * dy) * self.DISTANCE_SCALE * self.DISTANCE_SCALE)
+                distance = distance * radian // (2 * self.DISTANCE_SCALE)
+                self.base.append((iatan2(dy, dx) + distance) & (TURN - 1))
+        self.pattern = self.spiral_color  # Lié une seule fois
+    
+    def spiral_color(self, x, y):
+        angle = self.base[y * self.matrix.width + x] + self.phase
+        return self.palette[(angle & (TURN - 1)) >> 8]
+    
+    def update(self, dt=Effect.STEP, t=None):
+        super().update(dt, t)
+        self.offset = self.time * self.SPEED
+        self.phase = radians(self.offset)
+        self.matrix.draw_pattern(self.pattern)
+
+
+EFFECT = Effect4_Spiral
@@ -0,0 +1,87 @@
+"""
+Effet 5 : Feu (température = index de palette)
+"""
+
+import random
+from effects.base import Effect, INDEXED_EFFECTS
+
+
+class Effect5_Fire(Effect):
+    """
+    Effet 5 : Feu
+    
+    Mode indexé: la température (0-255) sert directement d'index de palette.
+    """
+    
+    INDEXED = INDEXED_EFFECTS
+    
+    def __init__(self, matrix):
+        super().__init__(matrix)
+        self.heat = [[0] * matrix.width for _ in range(matrix.height)]
+        if self.INDEXED:
+            self.framebuffer = matrix.indexed()
+            self.framebuffer.set_palette(self.heat_color(t) for t in range(256))
+        else:
+            self.palette = [self.heat_color(t) for t in range(256)]
+    
+    @staticmethod
+    def heat_color(t):
+        """Couleur d'une température (0-255)."""
+        if t < 85:
+            return (t * 3, 0, 0)
+        if t < 170:
+            return (255, (t - 85) * 3, 0)
+        return (255, 255, (t - 170) * 3)
+    
+    def step(self):
+        """Un pas de simulation (STEP secondes)."""
+        width = self.matrix.width
+        height = self.matrix.height
+        
+        # Refroidissement
+        for y in range(height):
+            for x in range(width):
+                cooldown = random.randint(0, 10)
+                self.heat[y][x] = max(0, self.heat[y][x] - cooldown)
+        
+        # Propagation vers le haut
+        for y in range(height - 1, 0, -1):
+            for x in range(width):
+                self.heat[y][x] = (self.heat[y-1][x] + 
+                                 self.heat[y-1][(x-1) % width] + 
+                                 self.heat[y-1][(x+1) % width]) // 3
+        
+        # Source de chaleur en bas
+        for x in range(width):
+            self.heat[0][x] = random.randint(200, 255)
+    
+    def update(self, dt=Effect.STEP, t=None):
+        super().update(dt, t)
+        steps = self.ticks()
+        if not steps:
+            return
+        for _ in range(steps):
+            self.step()
+        
+        if self.INDEXED:
+            # Une écriture d'octet par pixel, couleurs développées par show()
+            indexes = self.framebuffer.indexes
+            i = 0
+            for row in self.heat:
+                for heat in row:
+                    indexes[i] = heat
+                    i += 1
+            self.framebuffer.show()
+            return
+        
+        # Affichage (couleurs précalculées)
+        palette = self.palette
+        for y in range(self.matrix.height):
+            row = self.heat[y]
+            for x in range(self.matrix.width):
+                self.matrix.set_pixel(x, y, palette[row[x]])
+        
+        self.matrix.show()
+
+
+EFFECT = Effect5_Fire
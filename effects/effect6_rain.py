@@ -0,0 +1,77 @@
+"""
+Effet 6 : Pluie
+"""
+
+import random
+from effects.base import Effect
+
+
+class Effect6_Rain(Effect):
+    """Effet 6 : Pluie"""
+    
+    DROP_LIFETIME = 13  # Pas au plus (intensité 255, -20 par pas)
+    BACKGROUND = (0, 0, 20)
+    TRAIL = 0  # Traînées: trame précédente atténuée à TRAIL/256 (0: fond uni)
+    
+    def __init__(self, matrix):
+        super().__init__(matrix)
+        # Densité constante: une tentative de goutte par bande de 8 colonnes
+        self.lanes = max(1, matrix.width // 8)
+        self.max_drops = self.lanes * min(matrix.height, self.DROP_LIFETIME)
+        # Gouttes dans des tableaux préalloués (intensité 0 = emplacement libre)
+        self.drop_x = [0] * self.max_drops
+        self.drop_y = [0] * self.max_drops
+        self.drop_intensity = [0] * self.max_drops
+        self.blues = [(0, 0, i) for i in range(256)]
+    
+    def step(self):
+        """Un pas de simulation: les gouttes tombent, de nouvelles apparaissent."""
+        height = self.matrix.height
+        for i in range(self.max_drops):
+            intensity = self.drop_intensity[i]
+            if not intensity:
+                continue
+            if self.drop_y[i] + 1 < height and intensity > 20:
+                self.drop_y[i] += 1
+                self.drop_intensity[i] = intensity - 20
+            else:
+                self.drop_intensity[i] = 0
+        
+        # Nouvelles gouttes (probabilité 77/256 = 0.3 par bande)
+        for _ in range(self.lanes):
+            if random.getrandbits(8) >= 77:
+                continue
+            for i in range(self.max_drops):
+                if not self.drop_intensity[i]:
+                    self.drop_x[i] = random.randint(0, self.matrix.width - 1)
+                    self.drop_y[i] = 0
+                    self.drop_intensity[i] = 255
+                    break
+    
+    def update(self, dt=Effect.STEP, t=None):
+        super().update(dt, t)
+        steps = self.ticks()
+        if not steps:
+            return
+        for _ in range(steps):
+            self.step()
+        
+        matrix = self.matrix
+        if self.TRAIL:
+            # Les gouttes laissent une traînée sur la trame affichée
+            matrix.begin_frame(copy_previous=True)
+            matrix.fade(self.TRAIL)
+        else:
+            # Fond bleu foncé
+            matrix.begin_frame()
+            matrix.fill(self.BACKGROUND)
+        
+        for i in range(self.max_drops):
+            intensity = self.drop_intensity[i]
+            if intensity:
+                matrix.set_pixel(self.drop_x[i], self.drop_y[i], self.blues[intensity])
+        
+        matrix.end_frame()
+
+
+EFFECT = Effect6_Rain
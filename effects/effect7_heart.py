@@ -0,0 +1,59 @@
+"""
+Effet 7 : Cœur battant
+"""
+
+from fixed_trig import isin, radians, ONE
+from effects.base import Effect
+
+
+class Effect7_Heart(Effect):
+    """Effet 7 : Cœur battant"""
+    
+    SPEED = 4.0  # Radians par seconde (~0.64 battement par seconde)
+    
+    # Forme dessinée sur une grille 8x8
+    HEART = (
+        (1, 1), (2, 1), (4, 1), (5, 1),
+        (0, 2), (1, 2), (2, 2), (4, 2), (5, 2), (6, 2),
+        (0, 3), (1, 3), (2, 3), (3, 3), (4, 3), (5, 3), (6, 3),
+        (1, 4), (2, 4), (3, 4), (4, 4), (5, 4),
+        (2, 5), (3, 5), (4, 5),
+        (3, 6),
+    )
+    
+    def __init__(self, matrix):
+        super().__init__(matrix)
+        self.t = 0
+        self.reds = [(i, 0, 0) for i in range(256)]
+        # Agrandi d'un facteur entier et centré (16x16: cœur 2x plus grand)
+        scale = max(1, min(matrix.width, matrix.height) // 8)
+        left = (matrix.width - 8 * scale) // 2
+        top = (matrix.height - 8 * scale) // 2
+        self.heart_pixels = [
+            (left + x * scale + dx, top + y * scale + dy)
+            for x, y in self.HEART
+            for dy in range(scale)
+            for dx in range(scale)
+            if 0 <= left + x * scale + dx < matrix.width
+            and 0 <= top + y * scale + dy < matrix.height
+        ]
+    
+    def update(self, dt=Effect.STEP, t=None):
+        super().update(dt, t)
+        self.t = self.time * self.SPEED
+        
+        color = self.reds[(isin(radians(self.t)) + ONE) * 255 >> 16]
+        
+        matrix = self.matrix
+        matrix.begin_frame()
+        if self.frame_count == 1:
+            # Une fois : ensuite seule la couleur du cœur change, le frame
+            # buffer garde le fond noir de la trame précédente
+            matrix.fill((0, 0, 0))
+        for x, y in self.heart_pixels:
+            matrix.set_pixel(x, y, color)
+        
+        matrix.end_frame()
+
+
+EFFECT = Effect7_Heart
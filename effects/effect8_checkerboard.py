@@ -0,0 +1,36 @@
+"""
+Effet 8 : Damier clignotant
+"""
+
+from effects.base import Effect
+
+
+class Effect8_Checkerboard(Effect):
+    """Effet 8 : Damier clignotant"""
+    
+    BLINK_RATE = 20  # Inversions par seconde
+    COLOR_PERIOD = 1.0  # Secondes par paire de couleurs
+    
+    def __init__(self, matrix):
+        super().__init__(matrix)
+        self.colors = [
+            ((255, 0, 0), (0, 0, 255)),
+            ((0, 255, 0), (255, 255, 0)),
+        ]
+        self.offset = 0
+        self.color_index = 0
+        self.pattern = self.animated_checker  # Lié une seule fois
+    
+    def animated_checker(self, x, y):
+        if (x + y + self.offset) % 2 == 0:
+            return self.colors[self.color_index][0]
+        return self.colors[self.color_index][1]
+    
+    def update(self, dt=Effect.STEP, t=None):
+        super().update(dt, t)
+        self.offset = int(self.time * self.BLINK_RATE) % 2
+        self.color_index = int(self.time / self.COLOR_PERIOD) % len(self.colors)
+        self.matrix.draw_pattern(self.pattern)
+
+
+EFFECT = Effect8_Checkerboard
@@ -0,0 +1,76 @@
+"""
+Effet 9 : Étoiles scintillantes
+"""
+
+import random
+from effects.base import Effect
+
+
+class Effect9_Stars(Effect):
+    """Effet 9 : Étoiles scintillantes"""
+    
+    MAX_STARS = 32  # Par bloc de 64 LEDs: une étoile vit 26 pas
+    BLACK = (0, 0, 0)
+    
+    def __init__(self, matrix):
+        super().__init__(matrix)
+        # Densité constante: une tentative d'étoile par bloc de 64 LEDs
+        self.blocks = max(1, matrix.num_pixels // 64)
+        self.max_stars = self.MAX_STARS * self.blocks
+        # Étoiles dans des tableaux préalloués (direction 0 = emplacement libre)
+        self.star_x = [0] * self.max_stars
+        self.star_y = [0] * self.max_stars
+        self.star_brightness = [0] * self.max_stars
+        self.star_direction = [0] * self.max_stars
+        self.grays = [(v, v, v) for v in range(256)]
+    
+    def step(self):
+        """Un pas de simulation: apparitions et scintillement."""
+        # Ajouter de nouvelles étoiles (probabilité 51/256 = 0.2 par bloc)
+        for _ in range(self.blocks):
+            if random.getrandbits(8) >= 51:
+                continue
+            for i in range(self.max_stars):
+                if not self.star_direction[i]:
+                    self.star_x[i] = random.randint(0, self.matrix.width - 1)
+                    self.star_y[i] = random.randint(0, self.matrix.height - 1)
+                    self.star_brightness[i] = 0
+                    self.star_direction[i] = 1
+                    break
+        
+        # Scintillement
+        for i in range(self.max_stars):
+            direction = self.star_direction[i]
+            if not direction:
+                continue
+            brightness = self.star_brightness[i] + direction * 20
+            if brightness >= 255:
+                brightness = 255
+                self.star_direction[i] = -1
+            elif brightness <= 0:
+                brightness = 0
+                self.star_direction[i] = 0
+            self.star_brightness[i] = brightness
+    
+    def update(self, dt=Effect.STEP, t=None):
+        super().update(dt, t)
+        steps = self.ticks()
+        if not steps:
+            return
+        for _ in range(steps):
+            self.step()
+        
+        # Fond noir
+        matrix = self.matrix
+        matrix.begin_frame()
+        matrix.fill(self.BLACK)
+        
+        for i in range(self.max_stars):
+            if self.star_direction[i]:
+                matrix.set_pixel(self.star_x[i], self.star_y[i],
+                                 self.grays[self.star_brightness[i]])
+        
+        matrix.end_frame()
+
+
+EFFECT = Effect9_Stars
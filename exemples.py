@@ -1,12 +1,15 @@
 """
 Exemples d'utilisation du contrôleur NeoPixel Matrix
 Différents motifs et animations pour votre matrice LED 8x8
+(ou panneaux chaînés, voir LAYOUT)
 """
 
 import board
 import time
 from neopixel_matrix_optimized import NeoPixelMatrix, rainbow_pattern, checkerboard_pattern, hsv_to_rgb
 
+LAYOUT = "8x8"  # Disposition des panneaux ("2x1", "2x2", "16x16", "32x8"...)
+
 
 # ============================================================================
 # EXEMPLE 1 : DÉGRADÉ ANIMÉ
@@ -15,7 +18,7 @@ from neopixel_matrix_optimized import NeoPixelMatrix, rainbow_pattern, checkerbo
 def exemple_degrade_anime():
     """Animation d'un dégradé qui change progressivement."""
     print("Démarrage : Dégradé animé")
-    matrix = NeoPixelMatrix(board.GP0, brightness=0.3)
+    matrix = NeoPixelMatrix(board.GP0, brightness=0.3, layout=LAYOUT)
     
     try:
         scale = 0
@@ -35,10 +38,12 @@ def exemple_degrade_anime():
 def exemple_arc_en_ciel():
     """Affiche un arc-en-ciel qui tourne."""
     print("Démarrage : Arc-en-ciel rotatif")
-    matrix = NeoPixelMatrix(board.GP0, brightness=0.2)
+    matrix = NeoPixelMatrix(board.GP0, brightness=0.2, layout=LAYOUT)
+    
+    span = max(1, matrix.width + matrix.height - 2)  # Diagonale complète
     
     def rainbow_rotated(x, y, offset):
-        hue = ((x + y + offset) * 255 // 14) % 256
+        hue = ((x + y + offset) * 255 // span) % 256
         return hsv_to_rgb(hue / 255, 1.0, 1.0)
     
     try:
@@ -59,7 +64,7 @@ def exemple_arc_en_ciel():
 def exemple_damier_clignotant():
     """Damier qui alterne entre deux couleurs."""
     print("Démarrage : Damier clignotant")
-    matrix = NeoPixelMatrix(board.GP0, brightness=0.3)
+    matrix = NeoPixelMatrix(board.GP0, brightness=0.3, layout=LAYOUT)
     
     colors = [
         ((255, 0, 0), (0, 0, 255)),    # Rouge/Bleu
@@ -100,21 +105,23 @@ def exemple_damier_clignotant():
 def exemple_vague():
     """Effet de vague qui traverse la matrice."""
     print("Démarrage : Vague")
-    matrix = NeoPixelMatrix(board.GP0, brightness=0.3)
+    matrix = NeoPixelMatrix(board.GP0, brightness=0.3, layout=LAYOUT)
     
-    import math
+    from fixed_trig import isin, radians, ONE
     
-    def wave_pattern(x, y, t):
-        # Calcul de l'intensité basée sur une onde sinusoïdale
-        wave = math.sin((x + t) * 0.5) * 0.5 + 0.5
-        intensity = int(wave * 255)
+    column_angle = radians(0.5)  # Phase entre deux colonnes
+    
+    def wave_pattern(x, y, phase):
+        # Onde sinusoïdale en virgule fixe (Q15): entiers seulement
+        intensity = (isin(x * column_angle + phase) + ONE) * 255 >> 16
         return (0, intensity, 255 - intensity)
     
     try:
-        t = 0
+        phase = 0
+        step = radians(0.15)
         while True:
-            matrix.draw_pattern(lambda x, y: wave_pattern(x, y, t))
-            t += 0.3
+            matrix.draw_pattern(lambda x, y: wave_pattern(x, y, phase))
+            phase += step
             time.sleep(0.05)
     except KeyboardInterrupt:
         matrix.clear()
@@ -128,30 +135,33 @@ def exemple_vague():
 def exemple_spirale():
     """Spirale colorée qui tourne."""
     print("Démarrage : Spirale")
-    matrix = NeoPixelMatrix(board.GP0, brightness=0.3)
+    matrix = NeoPixelMatrix(board.GP0, brightness=0.3, layout=LAYOUT)
     
-    import math
+    from fixed_trig import iatan2, isqrt, radians, TURN
     
-    def spiral_pattern(x, y, offset):
-        # Centrer la spirale
-        cx, cy = 3.5, 3.5
-        dx, dy = x - cx, y - cy
+    radian = radians(1.0)
+    
+    def spiral_pattern(x, y, phase):
+        # Centrer la spirale (coordonnées doublées: le centre tombe entre
+        # deux LEDs sans float)
+        dx = 2 * x - (matrix.width - 1)
+        dy = 2 * y - (matrix.height - 1)
         
-        # Calculer l'angle et la distance
-        angle = math.atan2(dy, dx)
-        distance = math.sqrt(dx*dx + dy*dy)
+        # Angle en unités binaires, distance en 1/32 de pixel
+        angle = iatan2(dy, dx)
+        distance = isqrt((dx * dx + dy * dy) << 8)
         
-        # Créer l'effet de spirale
-        hue = (angle + distance + offset) % (2 * math.pi)
-        hue_normalized = hue / (2 * math.pi)
+        # Créer l'effet de spirale (un radian par pixel, modulo un tour)
+        hue = (angle + distance * radian // 32 + phase) & (TURN - 1)
         
-        return hsv_to_rgb(hue_normalized, 1.0, 1.0)
+        return hsv_to_rgb(hue / TURN, 1.0, 1.0)
     
     try:
-        offset = 0
+        phase = 0
+        step = radians(0.1)
         while True:
-            matrix.draw_pattern(lambda x, y: spiral_pattern(x, y, offset))
-            offset += 0.1
+            matrix.draw_pattern(lambda x, y: spiral_pattern(x, y, phase))
+            phase += step
             time.sleep(0.03)
     except KeyboardInterrupt:
         matrix.clear()
@@ -165,7 +175,7 @@ def exemple_spirale():
 def exemple_feu():
     """Simulation d'un feu avec des couleurs chaudes."""
     print("Démarrage : Effet feu")
-    matrix = NeoPixelMatrix(board.GP0, brightness=0.3)
+    matrix = NeoPixelMatrix(board.GP0, brightness=0.3, layout=LAYOUT)
     
     import random
     
@@ -221,7 +231,7 @@ def exemple_feu():
 def exemple_pluie():
     """Effet de gouttes de pluie qui tombent."""
     print("Démarrage : Pluie")
-    matrix = NeoPixelMatrix(board.GP0, brightness=0.3)
+    matrix = NeoPixelMatrix(board.GP0, brightness=0.3, layout=LAYOUT)
     
     import random
     
@@ -232,7 +242,7 @@ def exemple_pluie():
         while True:
             # Ajouter de nouvelles gouttes aléatoirement
             if random.random() < 0.3:
-                drops.append([random.randint(0, 7), 0, 255])
+                drops.append([random.randint(0, matrix.width - 1), 0, 255])
             
             # Effacer la matrice
             matrix.fill((0, 0, 20))  # Fond bleu foncé
@@ -270,26 +280,28 @@ def exemple_pluie():
 def exemple_coeur_battant():
     """Cœur qui bat en changeant d'intensité."""
     print("Démarrage : Cœur battant")
-    matrix = NeoPixelMatrix(board.GP0, brightness=0.3)
+    matrix = NeoPixelMatrix(board.GP0, brightness=0.3, layout=LAYOUT)
     
-    import math
+    from fixed_trig import isin, radians, ONE
     
-    # Forme du cœur (coordonnées)
-    heart_pixels = [
+    # Forme du cœur (coordonnées sur 8x8, centrée sur la matrice)
+    left = (matrix.width - 8) // 2
+    top = (matrix.height - 8) // 2
+    heart_pixels = [(x + left, y + top) for x, y in [
         (1, 1), (2, 1), (4, 1), (5, 1),
         (0, 2), (1, 2), (2, 2), (4, 2), (5, 2), (6, 2),
         (0, 3), (1, 3), (2, 3), (3, 3), (4, 3), (5, 3), (6, 3),
         (1, 4), (2, 4), (3, 4), (4, 4), (5, 4),
         (2, 5), (3, 5), (4, 5),
         (3, 6),
-    ]
+    ]]
     
     try:
         t = 0
+        step = radians(0.2)
         while True:
-            # Calculer l'intensité du battement
-            intensity = (math.sin(t) * 0.5 + 0.5) * 255
-            intensity = int(intensity)
+            # Calculer l'intensité du battement (sinus en virgule fixe)
+            intensity = (isin(t) + ONE) * 255 >> 16
             
             # Effacer et redessiner
             matrix.fill((0, 0, 0))
@@ -297,7 +309,7 @@ def exemple_coeur_battant():
                 matrix.set_pixel(x, y, (intensity, 0, 0))
             
             matrix.show()
-            t += 0.2
+            t += step
             time.sleep(0.05)
             
     except KeyboardInterrupt:
@@ -0,0 +1,221 @@
+"""
+Trigonométrie en virgule fixe pour les calculs par pixel
+Sinus et cosinus par table (symétrie d'un quart de période), atan2 par
+table et racine carrée entière : uniquement des petits entiers, aucun
+float alloué par pixel sur le Pico
+
+Conventions:
+    - angles en unités binaires : TURN = 65536 pour un tour complet
+      (QUARTER = 16384 pour 90°), tout entier est accepté (modulo un tour)
+    - sinus et cosinus en Q15 : ONE = 32768 représente 1.0
+
+Tables (créées à l'import, ~4 Ko) :
+    - SIN_TABLE : 1025 valeurs de 16 bits pour 0 à 90° (1024 pas + 90°)
+    - ATAN_TABLE : 1025 valeurs de atan(i / 1024) pour 0 à 45°
+
+UTILISATION:
+    from fixed_trig import isin, icos, iatan2, isqrt, radians, ONE, TURN
+
+    s = isin(radians(0.5) * x + phase)        # Q15, de -ONE à ONE
+    intensity = (s + ONE) * 255 >> 16         # 0 à 255
+    angle = iatan2(2 * y - 7, 2 * x - 7)      # 0 à TURN - 1
+    distance = isqrt(dx * dx + dy * dy)
+
+    # Erreur maximale et comparaison de vitesse avec math
+    python fixed_trig.py                      # sur l'ordinateur
+    (copier en code.py sur le Pico)
+"""
+
+import math
+import time
+from array import array
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+TURN = 1 << 16            # Unités d'angle par tour
+HALF = TURN >> 1
+QUARTER = TURN >> 2
+EIGHTH = TURN >> 3
+ONE = 1 << 15             # 1.0 en Q15
+SIN_BITS = 10             # 1024 pas par quart de période
+SIN_SHIFT = 14 - SIN_BITS  # Bits d'angle sous la résolution de la table
+ATAN_BITS = 10            # 1024 pas de tangente entre 0 et 45°
+BENCH_CALLS = 2000        # Appels chronométrés par fonction
+
+
+# ============================================================================
+# TABLES
+# ============================================================================
+
+def _sin_table():
+    """sin(0..90°) en Q15, 1 << SIN_BITS pas plus le point à 90°."""
+    steps = 1 << SIN_BITS
+    table = array("H", range(steps + 1))
+    for i in range(steps + 1):
+        table[i] = int(math.sin(i * math.pi / (2 * steps)) * ONE + 0.5)
+    return table
+
+
+def _atan_table():
+    """atan(i / 2**ATAN_BITS) en unités d'angle, de 0 à 45°."""
+    steps = 1 << ATAN_BITS
+    table = array("H", range(steps + 1))
+    for i in range(steps + 1):
+        table[i] = int(math.atan(i / steps) * TURN / (2 * math.pi) + 0.5)
+    return table
+
+
+SIN_TABLE = _sin_table()
+ATAN_TABLE = _atan_table()
+
+
+# ============================================================================
+# FONCTIONS
+# ============================================================================
+
+def radians(value):
+    """Convertit des radians en unités d'angle (entier, hors boucle de rendu)."""
+    return int(value * TURN / (2 * math.pi))
+
+
+def isin(angle):
+    """
+    Sinus d'un angle en unités binaires.
+
+    Args:
+        angle: Entier (TURN = un tour)
+
+    Returns:
+        Entier Q15 de -ONE à ONE
+    """
+    index = (angle & (TURN - 1)) >> SIN_SHIFT
+    quadrant = index >> SIN_BITS
+    index &= (1 << SIN_BITS) - 1
+    if quadrant == 0:
+        return SIN_TABLE[index]
+    if quadrant == 1:
+        return SIN_TABLE[(1 << SIN_BITS) - index]
+    if quadrant == 2:
+        return -SIN_TABLE[index]
+    return -SIN_TABLE[(1 << SIN_BITS) - index]
+
+
+def icos(angle):
+    """Cosinus d'un angle en unités binaires (Q15, voir isin())."""
+    return isin(angle + QUARTER)
+
+
+def iatan2(y, x):
+    """
+    Angle du point (x, y), comme math.atan2 mais en unités binaires.
+    Une division entière et une lecture de table (réduction à 0-45°).
+
+    Args:
+        y, x: Entiers (n'importe quelle échelle, seul le rapport compte)
+
+    Returns:
+        Entier de 0 à TURN - 1 (0 pour l'origine)
+    """
+    ax = -x if x < 0 else x
+    ay = -y if y < 0 else y
+    if ax >= ay:
+        if not ax:
+            return 0
+        angle = ATAN_TABLE[((ay << ATAN_BITS) + (ax >> 1)) // ax]
+    else:
+        angle = QUARTER - ATAN_TABLE[((ax << ATAN_BITS) + (ay >> 1)) // ay]
+    if x < 0:
+        angle = HALF - angle
+    if y < 0:
+        angle = -angle
+    return angle & (TURN - 1)
+
+
+def isqrt(n):
+    """
+    Racine carrée entière (arrondie à l'inférieur), bit par bit.
+
+    Args:
+        n: Entier positif ou nul
+
+    Returns:
+        Plus grand entier r tel que r * r <= n
+    """
+    if n < 0:
+        raise ValueError("isqrt d'un nombre négatif")
+    bit = 1
+    while bit <= n >> 2:
+        bit <<= 2
+    root = 0
+    while bit:
+        if n >= root + bit:
+            n -= root + bit
+            root = (root >> 1) + bit
+        else:
+            root >>= 1
+        bit >>= 2
+    return root
+
+
+# ============================================================================
+# PRÉCISION ET VITESSE
+# ============================================================================
+
+def accuracy_report():
+    """Affiche l'erreur maximale de chaque fonction par rapport à math."""
+    step = 2 * math.pi / TURN
+    sin_error = 0.0
+    for angle in range(0, TURN, 7):
+        error = abs(isin(angle) / ONE - math.sin(angle * step))
+        if error > sin_error:
+            sin_error = error
+    atan_error = 0
+    for y in range(-64, 65):
+        for x in range(-64, 65):
+            if x or y:
+                exact = math.atan2(y, x) / step % TURN
+                error = abs((iatan2(y, x) - exact + HALF) % TURN - HALF)
+                if error > atan_error:
+                    atan_error = error
+    for n in range(20000):
+        root = isqrt(n)
+        if root * root > n or (root + 1) * (root + 1) <= n:
+            raise AssertionError(f"isqrt({n}) = {root}")
+    print("Erreur maximale")
+    print(f"  isin/icos : {sin_error:.5f} ({sin_error * 255:.2f} niveau de LED sur 255)")
+    print(f"  iatan2    : {atan_error:.1f} unités ({atan_error * 360 / TURN:.3f}°)")
+    print("  isqrt     : exacte (arrondi inférieur, 0 à 20000)")
+
+
+def _time_ns(function, values):
+    """Durée moyenne d'un appel de function sur values (ns)."""
+    start = time.monotonic_ns()
+    for value in values:
+        function(value)
+    return (time.monotonic_ns() - start) / len(values)
+
+
+def speed_report(calls=BENCH_CALLS):
+    """Affiche la durée d'un appel, virgule fixe contre math."""
+    angles = [i * 31 for i in range(calls)]
+    radian_values = [a * 2 * math.pi / TURN for a in angles]
+    points = [((i % 15) - 7, (i // 15 % 15) - 7) for i in range(calls)]
+    squares = [x * x + y * y for x, y in points]
+    rows = (
+        ("sin", _time_ns(isin, angles), _time_ns(math.sin, radian_values)),
+        ("atan2", _time_ns(lambda p: iatan2(p[1], p[0]), points),
+         _time_ns(lambda p: math.atan2(p[1], p[0]), points)),
+        ("sqrt", _time_ns(isqrt, squares), _time_ns(math.sqrt, squares)),
+    )
+    print(f"Durée par appel (µs), {calls} appels")
+    print(f"{'fonction':10s}{'fixe':>9s}{'math':>9s}")
+    for name, fixed, reference in rows:
+        print(f"{name:10s}{fixed / 1000:9.2f}{reference / 1000:9.2f}")
+
+
+if __name__ == "__main__":
+    accuracy_report()
+    speed_report()
@@ -2,24 +2,56 @@
 Programme principal avec sélection d'effets par bouton
 Appuyez sur le bouton GP1 pour changer d'effet
 VERSION CORRIGÉE - Bouton fonctionnel
+Les effets sont dans effects/ et chargés à la demande (effects/__init__.py)
+PLAYLIST: enchaînement automatique avec fondus (playlist.py), le bouton
+passe à l'élément suivant
 """
 
+import time
+BOOT_NS = time.monotonic_ns()  # Début du chargement de main_final
+
 import board
 import digitalio
-import time
+import gc
 from neopixel_matrix_optimized import NeoPixelMatrix, rainbow_pattern, hsv_to_rgb
-import random
-import math
+from effects import EffectRegistry
+
+try:
+    import asyncio
+    from async_runtime import Queue, Runtime, next_deadline
+    HAS_ASYNCIO = True
+except ImportError:
+    HAS_ASYNCIO = False
+
+try:
+    from profiler import Profiler
+    HAS_PROFILER = True
+except ImportError:
+    HAS_PROFILER = False
 
 
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
 
-LED_PIN = board.GP0
+LED_PIN = board.GP0  # Plusieurs sorties: (board.GP2, board.GP3, ...) (strip_output.py)
+LAYOUT = "8x8"  # Panneaux chaînés: "2x1", "4x1", "2x2", "16x16", "32x8"... (LAYOUTS)
+ASYNC_SHOW = False  # True: show() rend la main pendant la transmission (strip_output.py)
 BUTTON_PIN = board.GP1
 BRIGHTNESS = 0.3
 EFFECT_DISPLAY_TIME = 1.5  # Temps d'affichage du numéro d'effet (secondes)
+FRAME_RATE = 20  # Images par seconde (les effets gardent leur vitesse à toute cadence)
+LAZY_EFFECTS = True  # Un seul module d'effet en RAM (False: tous importés au démarrage)
+PLAYLIST = None  # None: bouton seulement, (): tous les effets, ou (("effect5_fire", 30, 2), ...)
+PLAYLIST_MODE = "ordre"  # "ordre", "melange" ou "pondere" (poids: 3e valeur des éléments)
+TRANSITION = "crossfade"  # "crossfade", "balayage" ou "coupe"
+TRANSITION_TIME = 1.5  # Durée des transitions de la playlist (secondes)
+USE_ASYNC_RUNTIME = True  # Runtime asyncio (async_runtime.py), False: boucle synchrone
+BUTTON_POLL_INTERVAL = 0.01  # Scrutation du bouton (secondes)
+PROFILING = False  # Mesures update/show/bouton dès le démarrage ("prof on" sinon, profiler.py)
+PROFILING_REPORT = 0  # Rapport de profilage périodique (secondes, 0 = sur commande)
+PROFILING_MEMORY = False  # Allocations par frame (commande "prof mem on")
+PROFILING_STRICT = False  # GC coupé pendant le rendu, allocations signalées
 
 
 # ============================================================================
@@ -177,318 +209,65 @@ DIGITS = {
 }
 
 
-def display_number(matrix, number, color=(0, 255, 255), scroll=True):
+def number_frames(matrix, number, color=(0, 255, 255), scroll=True):
     """
-    Affiche un numéro sur la matrice avec effet de défilement.
+    Dessine les frames d'affichage d'un numéro, une par itération.
     
     Args:
         matrix: Instance de NeoPixelMatrix
         number: Numéro à afficher (0-9)
         color: Couleur RGB du chiffre
         scroll: Si True, fait défiler le chiffre de droite à gauche
+    
+    Yields:
+        Délai (secondes) avant la frame suivante
     """
     if number not in DIGITS:
         return
     
     digit = DIGITS[number]
+    width = matrix.width
+    # Chiffre 8x8 centré verticalement sur les matrices plus hautes
+    top = (matrix.height - 8) // 2
+    rows = [y for y in range(8) if 0 <= y + top < matrix.height]
     
     if scroll:
         # Défilement de droite à gauche
-        for offset in range(8, -8, -1):
+        for offset in range(width, -8, -1):
             matrix.fill((0, 0, 0))
             
-            for y in range(8):
+            for y in rows:
                 for x in range(8):
                     display_x = x + offset
-                    if 0 <= display_x < 8:
+                    if 0 <= display_x < width:
                         if digit[y][x] == '█':
-                            matrix.set_pixel(display_x, y, color)
+                            matrix.set_pixel(display_x, y + top, color)
             
             matrix.show()
-            time.sleep(0.05)
+            yield 0.05
     else:
-        # Affichage statique
+        # Affichage statique (centré)
+        left = (width - 8) // 2
         matrix.fill((0, 0, 0))
-        for y in range(8):
+        for y in rows:
             for x in range(8):
-                if digit[y][x] == '█':
-                    matrix.set_pixel(x, y, color)
+                if digit[y][x] == '█' and 0 <= x + left < width:
+                    matrix.set_pixel(x + left, y + top, color)
         matrix.show()
 
 
-# ============================================================================
-# EFFETS VISUELS (MODIFIÉS POUR ÊTRE NON-BLOQUANTS)
-# ============================================================================
-
-class Effect:
-    """Classe de base pour les effets."""
-    
-    def __init__(self, matrix):
-        self.matrix = matrix
-        self.running = True
-        self.frame_count = 0
-    
-    def stop(self):
-        """Arrête l'effet."""
-        self.running = False
-    
-    def update(self):
-        """Méthode à appeler à chaque frame."""
-        self.frame_count += 1
-
-
-class Effect1_Gradient(Effect):
-    """Effet 1 : Dégradé animé"""
-    
-    def __init__(self, matrix):
-        super().__init__(matrix)
-        self.scale = 0
-    
-    def update(self):
-        super().update()
-        self.matrix.draw_gradient(x_scale=self.scale, y_scale=self.scale, z_value=100)
-        self.scale = (self.scale + 2) % 256
-
-
-class Effect2_Rainbow(Effect):
-    """Effet 2 : Arc-en-ciel rotatif"""
-    
-    def __init__(self, matrix):
-        super().__init__(matrix)
-        self.offset = 0
-    
-    def update(self):
-        super().update()
-        
-        def rainbow_rotated(x, y):
-            hue = ((x + y + self.offset) * 255 // 14) % 256
-            return hsv_to_rgb(hue / 255, 1.0, 1.0)
-        
-        self.matrix.draw_pattern(rainbow_rotated)
-        self.offset = (self.offset + 1) % 256
-
-
-class Effect3_Wave(Effect):
-    """Effet 3 : Vague"""
-    
-    def __init__(self, matrix):
-        super().__init__(matrix)
-        self.t = 0
-    
-    def update(self):
-        super().update()
-        
-        def wave_pattern(x, y):
-            wave = math.sin((x + self.t) * 0.5) * 0.5 + 0.5
-            intensity = int(wave * 255)
-            return (0, intensity, 255 - intensity)
-        
-        self.matrix.draw_pattern(wave_pattern)
-        self.t += 0.3
-
-
-class Effect4_Spiral(Effect):
-    """Effet 4 : Spirale"""
-    
-    def __init__(self, matrix):
-        super().__init__(matrix)
-        self.offset = 0
-    
-    def update(self):
-        super().update()
-        
-        def spiral_pattern(x, y):
-            cx, cy = 3.5, 3.5
-            dx, dy = x - cx, y - cy
-            angle = math.atan2(dy, dx)
-            distance = math.sqrt(dx*dx + dy*dy)
-            hue = (angle + distance + self.offset) % (2 * math.pi)
-            hue_normalized = hue / (2 * math.pi)
-            return hsv_to_rgb(hue_normalized, 1.0, 1.0)
-        
-        self.matrix.draw_pattern(spiral_pattern)
-        self.offset += 0.1
-
-
-class Effect5_Fire(Effect):
-    """Effet 5 : Feu"""
-    
-    def __init__(self, matrix):
-        super().__init__(matrix)
-        self.heat = [[0 for _ in range(8)] for _ in range(8)]
-    
-    def update(self):
-        super().update()
-        
-        # Refroidissement
-        for y in range(8):
-            for x in range(8):
-                cooldown = random.randint(0, 10)
-                self.heat[y][x] = max(0, self.heat[y][x] - cooldown)
-        
-        # Propagation vers le haut
-        for y in range(7, 0, -1):
-            for x in range(8):
-                self.heat[y][x] = (self.heat[y-1][x] + 
-                                 self.heat[y-1][(x-1) % 8] + 
-                                 self.heat[y-1][(x+1) % 8]) // 3
-        
-        # Source de chaleur en bas
-        for x in range(8):
-            self.heat[0][x] = random.randint(200, 255)
-        
-        # Affichage
-        for y in range(8):
-            for x in range(8):
-                t = self.heat[y][x]
-                if t < 85:
-                    r, g, b = t * 3, 0, 0
-                elif t < 170:
-                    r, g, b = 255, (t - 85) * 3, 0
-                else:
-                    r, g, b = 255, 255, (t - 170) * 3
-                
-                self.matrix.set_pixel(x, y, (r, g, b))
-        
-        self.matrix.show()
-
-
-class Effect6_Rain(Effect):
-    """Effet 6 : Pluie"""
-    
-    def __init__(self, matrix):
-        super().__init__(matrix)
-        self.drops = []
-    
-    def update(self):
-        super().update()
-        
-        # Nouvelles gouttes
-        if random.random() < 0.3:
-            self.drops.append([random.randint(0, 7), 0, 255])
-        
-        # Fond bleu foncé
-        self.matrix.fill((0, 0, 20))
-        
-        # Mise à jour des gouttes
-        new_drops = []
-        for drop in self.drops:
-            x, y, intensity = drop
-            
-            if 0 <= y < 8:
-                self.matrix.set_pixel(x, y, (0, 0, intensity))
-            
-            drop[1] += 1
-            drop[2] = max(0, drop[2] - 20)
-            
-            if drop[1] < 8 and drop[2] > 0:
-                new_drops.append(drop)
-        
-        self.drops = new_drops
-        self.matrix.show()
-
-
-class Effect7_Heart(Effect):
-    """Effet 7 : Cœur battant"""
-    
-    def __init__(self, matrix):
-        super().__init__(matrix)
-        self.t = 0
-        self.heart_pixels = [
-            (1, 1), (2, 1), (4, 1), (5, 1),
-            (0, 2), (1, 2), (2, 2), (4, 2), (5, 2), (6, 2),
-            (0, 3), (1, 3), (2, 3), (3, 3), (4, 3), (5, 3), (6, 3),
-            (1, 4), (2, 4), (3, 4), (4, 4), (5, 4),
-            (2, 5), (3, 5), (4, 5),
-            (3, 6),
-        ]
-    
-    def update(self):
-        super().update()
-        
-        intensity = int((math.sin(self.t) * 0.5 + 0.5) * 255)
-        
-        self.matrix.fill((0, 0, 0))
-        for x, y in self.heart_pixels:
-            self.matrix.set_pixel(x, y, (intensity, 0, 0))
-        
-        self.matrix.show()
-        self.t += 0.2
-
-
-class Effect8_Checkerboard(Effect):
-    """Effet 8 : Damier clignotant"""
-    
-    def __init__(self, matrix):
-        super().__init__(matrix)
-        self.colors = [
-            ((255, 0, 0), (0, 0, 255)),
-            ((0, 255, 0), (255, 255, 0)),
-        ]
-        self.offset = 0
-        self.color_index = 0
-    
-    def update(self):
-        super().update()
-        
-        def animated_checker(x, y):
-            if (x + y + self.offset) % 2 == 0:
-                return self.colors[self.color_index][0]
-            return self.colors[self.color_index][1]
-        
-        self.matrix.draw_pattern(animated_checker)
-        self.offset = (self.offset + 1) % 2
-        
-        if self.frame_count % 20 == 0:
-            self.color_index = (self.color_index + 1) % len(self.colors)
-
-
-class Effect9_Stars(Effect):
-    """Effet 9 : Étoiles scintillantes"""
-    
-    def __init__(self, matrix):
-        super().__init__(matrix)
-        self.stars = []
+def display_number(matrix, number, color=(0, 255, 255), scroll=True):
+    """
+    Affiche un numéro sur la matrice avec effet de défilement.
     
-    def update(self):
-        super().update()
-        
-        # Ajouter de nouvelles étoiles
-        if random.random() < 0.2:
-            self.stars.append({
-                'x': random.randint(0, 7),
-                'y': random.randint(0, 7),
-                'brightness': 0,
-                'direction': 1
-            })
-        
-        # Fond noir
-        self.matrix.fill((0, 0, 0))
-        
-        # Mise à jour des étoiles
-        new_stars = []
-        for star in self.stars:
-            # Scintillement
-            star['brightness'] += star['direction'] * 20
-            
-            if star['brightness'] >= 255:
-                star['brightness'] = 255
-                star['direction'] = -1
-            elif star['brightness'] <= 0:
-                star['brightness'] = 0
-                continue
-            
-            # Afficher l'étoile
-            self.matrix.set_pixel(
-                star['x'], 
-                star['y'], 
-                (star['brightness'], star['brightness'], star['brightness'])
-            )
-            
-            new_stars.append(star)
-        
-        self.stars = new_stars
-        self.matrix.show()
+    Args:
+        matrix: Instance de NeoPixelMatrix
+        number: Numéro à afficher (0-9)
+        color: Couleur RGB du chiffre
+        scroll: Si True, fait défiler le chiffre de droite à gauche
+    """
+    for delay in number_frames(matrix, number, color, scroll):
+        time.sleep(delay)
 
 
 # ============================================================================
@@ -501,46 +280,127 @@ class EffectManager:
     def __init__(self, matrix, button):
         self.matrix = matrix
         self.button = button
-        self.effects = [
-            Effect1_Gradient,
-            Effect2_Rainbow,
-            Effect3_Wave,
-            Effect4_Spiral,
-            Effect5_Fire,
-            Effect6_Rain,
-            Effect7_Heart,
-            Effect8_Checkerboard,
-            Effect9_Stars
-        ]
+        # Effets de effects/, importés à la sélection (LAZY_EFFECTS)
+        self.effects = EffectRegistry(lazy=LAZY_EFFECTS)
         self.current_effect_index = 0
         self.current_effect = None
         self.last_frame_time = 0
-        self.frame_delay = 0.05  # 20 FPS
-    
-    def next_effect(self):
-        """Passe à l'effet suivant."""
-        # Arrêter l'effet actuel
+        self.frame_delay = 1 / FRAME_RATE
+        self.effect_start_ns = 0  # Origine du temps d'animation
+        self.last_render_ns = 0
+        self.boot_reported = False
+        self.number_ns = 0  # Temps passé à afficher les numéros avant le premier frame
+        
+        # Profilage: update(), show() et allocations par effet, bouton
+        self.profiler = None
+        self.input_histogram = None
+        if HAS_PROFILER:
+            self.profiler = Profiler(enabled=PROFILING, report_interval=PROFILING_REPORT,
+                                     memory=PROFILING_MEMORY, strict=PROFILING_STRICT)
+            self.profiler.instrument_show(matrix)  # Enveloppe posée par "prof on"
+            self.input_histogram = self.profiler.section("input").time
+    
+    def select_next(self):
+        """
+        Arrête l'effet actuel et passe à l'index suivant.
+        
+        Returns:
+            Tuple (numéro de l'effet, couleur du numéro)
+        """
+        # Arrêter l'effet actuel et libérer son module
         if self.current_effect:
             self.current_effect.stop()
+            self.current_effect = None
+        self.effects.release()
+        profiler = self.profiler
+        if profiler is not None and profiler.enabled and hasattr(gc, "mem_free"):
+            # Tas après libération du module (mesures seulement)
+            print(f"Tas libre: {gc.mem_free()} octets")
         
         # Passer à l'effet suivant
         self.current_effect_index = (self.current_effect_index + 1) % len(self.effects)
         
-        # Afficher le numéro de l'effet avec défilement
         effect_number = self.current_effect_index + 1
         print(f"\n=== Effet {effect_number} selectionne ===")
+        if self.profiler:
+            self.profiler.select("number")
         
         # Couleur arc-en-ciel pour le numéro
         hue = (effect_number - 1) / len(self.effects)
         color = hsv_to_rgb(hue, 1.0, 1.0)
+        return effect_number, color
+    
+    def start_effect(self):
+        """Lance l'effet sélectionné (module importé à ce moment)."""
+        EffectClass = self.effects.load(self.current_effect_index)
+        self.current_effect = EffectClass(self.matrix)
+        if self.profiler:
+            self.profiler.select(EffectClass.__name__)
+        self.last_frame_time = time.monotonic()
+        self.effect_start_ns = time.monotonic_ns()
+        self.last_render_ns = self.effect_start_ns - int(self.frame_delay * 1_000_000_000)
+    
+    def next_effect(self):
+        """Passe à l'effet suivant."""
+        effect_number, color = self.select_next()
         
+        # Afficher le numéro de l'effet avec défilement
+        start = time.monotonic_ns()
         display_number(self.matrix, effect_number % 10, color=color, scroll=True)
         time.sleep(EFFECT_DISPLAY_TIME)
+        if not self.boot_reported:
+            self.number_ns += time.monotonic_ns() - start
         
         # Lancer le nouvel effet
-        EffectClass = self.effects[self.current_effect_index]
-        self.current_effect = EffectClass(self.matrix)
-        self.last_frame_time = time.monotonic()
+        self.start_effect()
+    
+    def render_frame(self):
+        """
+        Calcule une frame de l'effet actuel avec le temps réellement
+        écoulé : une frame en retard fait avancer l'animation d'autant,
+        les frames manquées sont simplement sautées.
+        
+        Returns:
+            False si l'effet a planté (il faut passer au suivant)
+        """
+        if self.current_effect:
+            now = time.monotonic_ns()
+            dt = (now - self.last_render_ns) / 1_000_000_000
+            t = (now - self.effect_start_ns) / 1_000_000_000
+            self.last_render_ns = now
+            # Profilage inactif: aucun appel au profileur dans la boucle
+            profiler = self.profiler
+            if profiler is not None and not profiler.active:
+                profiler = None
+            start = profiler.begin_frame() if profiler else 0
+            try:
+                self.current_effect.update(dt, t)
+            except Exception as e:
+                if profiler:
+                    profiler.end_frame(start)
+                print(f"Erreur dans l'effet: {e}")
+                return False
+            if profiler:
+                profiler.end_frame(start)
+            if not self.boot_reported:
+                self.boot_report()
+        return True
+    
+    def boot_report(self):
+        """
+        Affiche, au premier frame d'effet, le temps depuis la mise sous
+        tension (horloge de CircuitPython) et depuis le chargement de
+        main_final, hors affichage du numéro, et le tas libre.
+        """
+        self.boot_reported = True
+        now = time.monotonic_ns()
+        mode = "paresseux" if LAZY_EFFECTS else "tous importés"
+        print(f"Premier frame ({mode}): {(now - self.number_ns) / 1e6:.0f} ms "
+              f"depuis le démarrage, {(now - BOOT_NS - self.number_ns) / 1e6:.0f} ms "
+              f"depuis main_final (hors numéro)")
+        if hasattr(gc, "mem_free"):
+            gc.collect()
+            print(f"Tas libre: {gc.mem_free()} octets")
     
     def update(self):
         """Met à jour l'effet actuel."""
@@ -548,18 +408,86 @@ class EffectManager:
         
         # Vérifier si c'est le temps de mettre à jour l'affichage
         if current_time - self.last_frame_time >= self.frame_delay:
-            if self.current_effect:
-                try:
-                    self.current_effect.update()
-                except Exception as e:
-                    print(f"Erreur dans l'effet: {e}")
-                    self.next_effect()
+            if not self.render_frame():
+                self.next_effect()
             
             self.last_frame_time = current_time
     
     def check_button(self):
         """Vérifie si le bouton a été appuyé."""
-        return self.button.is_pressed()
+        if self.profiler is None or not self.profiler.enabled:
+            return self.button.is_pressed()
+        start = self.profiler.start()
+        pressed = self.button.is_pressed()
+        self.profiler.stop(self.input_histogram, start)
+        return pressed
+    
+    def poll_profiler(self):
+        """Traite les commandes série du profileur (non bloquant)."""
+        if self.profiler:
+            self.profiler.poll()
+
+
+# ============================================================================
+# APPLICATION ASYNCIO
+# ============================================================================
+
+class EffectSelectorApp:
+    """
+    Sélecteur d'effets pour le runtime asyncio (async_runtime.Runtime).
+    
+    Tâche entrées: scrute le bouton et envoie "next" dans la file.
+    Tâche rendu: calcule une frame par échéance et dort entre deux.
+    """
+    
+    def __init__(self, matrix, button):
+        self.matrix = matrix
+        self.manager = EffectManager(matrix, button)
+        self.events = Queue(maxsize=4)
+    
+    def tasks(self):
+        """Retourne les coroutines de l'application."""
+        return [self.input_task(), self.render_task()]
+    
+    def stop(self):
+        """Arrête l'effet et éteint la matrice."""
+        if self.manager.current_effect:
+            self.manager.current_effect.stop()
+        self.matrix.clear()
+    
+    async def input_task(self):
+        """Scrute le bouton."""
+        while True:
+            if self.manager.check_button():
+                print("Bouton appuye!")
+                self.events.put_nowait("next")
+            self.manager.poll_profiler()
+            await asyncio.sleep(BUTTON_POLL_INTERVAL)
+    
+    async def next_effect(self):
+        """Passe à l'effet suivant sans bloquer les autres tâches."""
+        effect_number, color = self.manager.select_next()
+        for delay in number_frames(self.matrix, effect_number % 10, color=color):
+            await asyncio.sleep(delay)
+        await asyncio.sleep(EFFECT_DISPLAY_TIME)
+        # Ignorer les appuis reçus pendant l'affichage du numéro
+        while self.events.get_nowait():
+            pass
+        self.manager.start_effect()
+    
+    async def render_task(self):
+        """Rend l'effet actuel à cadence fixe."""
+        await self.next_effect()
+        deadline = time.monotonic()
+        while True:
+            if not self.manager.render_frame():
+                await self.next_effect()
+                deadline = time.monotonic()
+            
+            deadline = next_deadline(deadline, self.manager.frame_delay)
+            if await self.events.get_until(deadline) == "next":
+                await self.next_effect()
+                deadline = time.monotonic()
 
 
 # ============================================================================
@@ -578,7 +506,8 @@ def main():
     
     # Initialisation
     try:
-        matrix = NeoPixelMatrix(LED_PIN, brightness=BRIGHTNESS)
+        matrix = NeoPixelMatrix(LED_PIN, brightness=BRIGHTNESS, layout=LAYOUT,
+                                background=ASYNC_SHOW)
         print("Matrice NeoPixel initialisee")
     except Exception as e:
         print(f"Erreur initialisation matrice: {e}")
@@ -592,6 +521,10 @@ def main():
         print(f"Erreur initialisation bouton: {e}")
         return
     
+    if PLAYLIST is not None:
+        run_playlist(matrix, button)
+        return
+    
     manager = EffectManager(matrix, button)
     
     # Démarrer avec le premier effet
@@ -612,6 +545,7 @@ def main():
             
             # Mettre à jour l'effet actuel
             manager.update()
+            manager.poll_profiler()
             
             # Debug: afficher l'état du bouton toutes les 100 frames
             debug_counter += 1
@@ -619,16 +553,66 @@ def main():
                 # Afficher l'état du bouton dans la console
                 print(f"Etat bouton: {button.button.value} (1=relache, 0=appuye)", end='\r')
             
-            # Petite pause pour éviter de saturer le CPU
-            time.sleep(0.001)
+            # Dormir jusqu'au prochain frame (le bouton reste scruté)
+            idle(manager.last_frame_time + manager.frame_delay)
     
     except KeyboardInterrupt:
         print("\n\nArret du programme...")
         if manager.current_effect:
             manager.current_effect.stop()
         matrix.clear()
+        if hasattr(matrix.pixels, "overlap"):
+            matrix.pixels.overlap.report()
+        print("LEDs eteintes. Au revoir!")
+
+
+def idle(deadline):
+    """
+    Dort jusqu'à l'échéance (secondes, time.monotonic), par tranches
+    d'au plus BUTTON_POLL_INTERVAL pour scruter le bouton.
+    """
+    delay = deadline - time.monotonic()
+    if delay > 0:
+        time.sleep(min(delay, BUTTON_POLL_INTERVAL))
+
+
+def run_playlist(matrix, button):
+    """Playlist automatique (playlist.py), le bouton passe à l'élément suivant."""
+    from playlist import Playlist, PlaylistPlayer
+    registry = EffectRegistry(lazy=LAZY_EFFECTS)
+    player = PlaylistPlayer(matrix, registry, Playlist(registry, PLAYLIST, PLAYLIST_MODE),
+                            transition=TRANSITION, transition_time=TRANSITION_TIME,
+                            frame_rate=FRAME_RATE)
+    try:
+        while True:
+            if button.is_pressed():
+                print("Bouton appuye!")
+                player.skip()
+            player.update()
+            idle((player.last_frame_ns + player.frame_ns) / 1_000_000_000)
+    except KeyboardInterrupt:
+        print("\n\nArret du programme...")
+        player.stop()
+        player.report()
+        matrix.clear()
         print("LEDs eteintes. Au revoir!")
 
 
+def main_async():
+    """Fonction principale avec le runtime asyncio."""
+    print("Initialisation (runtime asyncio)...")
+    matrix = NeoPixelMatrix(LED_PIN, brightness=BRIGHTNESS, layout=LAYOUT,
+                            background=ASYNC_SHOW)
+    button = Button(BUTTON_PIN)
+    
+    runtime = Runtime()
+    runtime.add_app(EffectSelectorApp(matrix, button))
+    runtime.run()
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # La playlist garde la boucle synchrone (sans attente active, idle())
+    if USE_ASYNC_RUNTIME and HAS_ASYNCIO and PLAYLIST is None:
+        main_async()
+    else:
+        main()
\ No newline at end of file
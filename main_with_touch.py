@@ -7,6 +7,7 @@ import board
 import touchio
 import time
 from neopixel_matrix_optimized import NeoPixelMatrix, rainbow_pattern, hsv_to_rgb
+from touch_filter import TouchFilter
 import random
 import math
 
@@ -19,7 +20,7 @@ LED_PIN = board.GP0
 TOUCH_PIN = board.GP1
 BRIGHTNESS = 0.3
 EFFECT_DISPLAY_TIME = 1.5  # Temps d'affichage du numéro d'effet (secondes)
-TOUCH_THRESHOLD = 500  # Seuil de détection tactile (ajuster si nécessaire)
+TOUCH_SAMPLE_RATE = 100  # Échantillonnage du capteur tactile (Hz)
 
 
 # ============================================================================
@@ -27,78 +28,63 @@ TOUCH_THRESHOLD = 500  # Seuil de détection tactile (ajuster si nécessaire)
 # ============================================================================
 
 class TouchSensor:
-    """Classe pour gérer le capteur tactile capacitif."""
+    """Classe pour gérer le capteur tactile capacitif (filtre adaptatif)."""
     
-    def __init__(self, pin, threshold=500):
+    def __init__(self, pin, sample_rate=TOUCH_SAMPLE_RATE):
         """
         Initialise le capteur tactile.
         
         Args:
             pin: Pin GPIO du capteur tactile
-            threshold: Seuil de détection (ajuster selon votre capteur)
+            sample_rate: Fréquence d'échantillonnage de raw_value (Hz)
         """
         self.touch = touchio.TouchIn(pin)
-        self.touch.threshold = threshold
-        self.last_touch_time = 0
-        self.debounce_time = 0.3  # 300ms anti-rebond
-        self.was_touched = False
+        self.filter = TouchFilter()
+        self.sample_period = 1 / sample_rate
+        self.next_sample_time = time.monotonic()
+        self.pending_touch = False
     
-    def is_touched(self):
+    def update(self):
         """
-        Détecte un toucher avec anti-rebond.
+        Échantillonne raw_value à cadence fixe, à appeler dans la boucle.
         
         Returns:
-            True si le capteur vient d'être touché, False sinon
+            True si un nouveau toucher vient d'être détecté, False sinon
         """
         current_time = time.monotonic()
-        is_currently_touched = self.touch.value
+        if current_time < self.next_sample_time:
+            return False
         
-        # Détection d'un nouveau toucher (front montant)
-        if (is_currently_touched and not self.was_touched and 
-            (current_time - self.last_touch_time) > self.debounce_time):
-            self.last_touch_time = current_time
-            self.was_touched = True
-            return True
+        # Cadence fixe, sans rattrapage en rafale après un retard
+        self.next_sample_time += self.sample_period
+        if self.next_sample_time < current_time:
+            self.next_sample_time = current_time + self.sample_period
         
-        # Mise à jour de l'état
-        if not is_currently_touched:
-            self.was_touched = False
+        if self.filter.update(self.touch.raw_value):
+            self.pending_touch = True
+            return True
+        return False
+    
+    def is_touched(self):
+        """
+        Détecte un toucher (front montant avec hystérésis).
         
+        Returns:
+            True si le capteur vient d'être touché, False sinon
+        """
+        self.update()
+        if self.pending_touch:
+            self.pending_touch = False
+            return True
         return False
     
     def calibrate(self):
         """
-        Calibre le capteur tactile.
-        Affiche la valeur brute pour aider à définir le seuil.
+        Recalibre le capteur sans bloquer.
+        La ligne de base est rétablie sur les prochains échantillons.
         """
-        print("=== Calibration du capteur tactile ===")
-        print("Ne touchez PAS le capteur...")
-        time.sleep(1)
-        
-        # Mesurer la valeur de base
-        base_value = self.touch.raw_value
-        print(f"Valeur de base (sans contact): {base_value}")
-        
-        print("\nMaintenez votre doigt sur le capteur...")
-        time.sleep(2)
-        
-        # Mesurer la valeur avec contact
-        touch_value = self.touch.raw_value
-        print(f"Valeur avec contact: {touch_value}")
-        
-        # Calculer un seuil optimal
-        if touch_value > base_value:
-            optimal_threshold = base_value + (touch_value - base_value) // 2
-        else:
-            optimal_threshold = touch_value + (base_value - touch_value) // 2
-        
-        print(f"\nSeuil recommandé: {optimal_threshold}")
-        print(f"Seuil actuel: {self.touch.threshold}")
-        
-        # Appliquer le seuil optimal
-        self.touch.threshold = optimal_threshold
-        print(f"\nNouveau seuil appliqué: {self.touch.threshold}")
-        print("=" * 40)
+        self.filter.reset()
+        print("Calibration tactile: ligne de base réinitialisée")
 
 
 # ============================================================================
@@ -256,14 +242,38 @@ def display_number(matrix, number, color=(0, 255, 255), scroll=True):
 class Effect:
     """Classe de base pour les effets."""
     
-    def __init__(self, matrix):
+    def __init__(self, matrix, touch_sensor=None):
         self.matrix = matrix
+        self.touch_sensor = touch_sensor
         self.running = True
     
     def stop(self):
         """Arrête l'effet."""
         self.running = False
     
+    def wait(self, duration):
+        """
+        Attend entre deux frames en continuant d'échantillonner le capteur.
+        Un toucher arrête l'effet pour que la boucle principale le traite.
+        
+        Args:
+            duration: Durée d'attente en secondes
+        """
+        if self.touch_sensor is None:
+            time.sleep(duration)
+            return
+        
+        deadline = time.monotonic() + duration
+        while self.running:
+            self.touch_sensor.update()
+            if self.touch_sensor.pending_touch:
+                self.stop()
+                return
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(min(remaining, self.touch_sensor.sample_period))
+    
     def run(self):
         """Méthode à surcharger pour chaque effet."""
         pass
@@ -277,7 +287,7 @@ class Effect1_Gradient(Effect):
         while self.running:
             self.matrix.draw_gradient(x_scale=scale, y_scale=scale, z_value=100)
             scale = (scale + 2) % 256
-            time.sleep(0.03)
+            self.wait(0.03)
 
 
 class Effect2_Rainbow(Effect):
@@ -292,7 +302,7 @@ class Effect2_Rainbow(Effect):
             
             self.matrix.draw_pattern(rainbow_rotated)
             offset = (offset + 1) % 256
-            time.sleep(0.05)
+            self.wait(0.05)
 
 
 class Effect3_Wave(Effect):
@@ -308,7 +318,7 @@ class Effect3_Wave(Effect):
             
             self.matrix.draw_pattern(wave_pattern)
             t += 0.3
-            time.sleep(0.05)
+            self.wait(0.05)
 
 
 class Effect4_Spiral(Effect):
@@ -328,7 +338,7 @@ class Effect4_Spiral(Effect):
             
             self.matrix.draw_pattern(spiral_pattern)
             offset += 0.1
-            time.sleep(0.03)
+            self.wait(0.03)
 
 
 class Effect5_Fire(Effect):
@@ -369,7 +379,7 @@ class Effect5_Fire(Effect):
                     self.matrix.set_pixel(x, y, (r, g, b))
             
             self.matrix.show()
-            time.sleep(0.05)
+            self.wait(0.05)
 
 
 class Effect6_Rain(Effect):
@@ -402,7 +412,7 @@ class Effect6_Rain(Effect):
             
             drops = new_drops
             self.matrix.show()
-            time.sleep(0.1)
+            self.wait(0.1)
 
 
 class Effect7_Heart(Effect):
@@ -428,7 +438,7 @@ class Effect7_Heart(Effect):
             
             self.matrix.show()
             t += 0.2
-            time.sleep(0.05)
+            self.wait(0.05)
 
 
 class Effect8_Checkerboard(Effect):
@@ -456,7 +466,7 @@ class Effect8_Checkerboard(Effect):
             if iterations % 20 == 0:
                 color_index = (color_index + 1) % len(colors)
             
-            time.sleep(0.5)
+            self.wait(0.5)
 
 
 class Effect9_Stars(Effect):
@@ -502,7 +512,7 @@ class Effect9_Stars(Effect):
             
             stars = new_stars
             self.matrix.show()
-            time.sleep(0.05)
+            self.wait(0.05)
 
 
 # ============================================================================
@@ -551,7 +561,7 @@ class EffectManager:
         
         # Lancer le nouvel effet
         EffectClass = self.effects[self.current_effect_index]
-        self.current_effect = EffectClass(self.matrix)
+        self.current_effect = EffectClass(self.matrix, self.touch_sensor)
     
     def run_current_effect(self):
         """Exécute l'effet actuel."""
@@ -578,12 +588,10 @@ def main():
     
     # Initialisation
     matrix = NeoPixelMatrix(LED_PIN, brightness=BRIGHTNESS)
-    touch_sensor = TouchSensor(TOUCH_PIN, threshold=TOUCH_THRESHOLD)
+    touch_sensor = TouchSensor(TOUCH_PIN, sample_rate=TOUCH_SAMPLE_RATE)
     
-    # Calibration optionnelle (décommenter pour calibrer)
-    # print("\nCalibration du capteur tactile...")
-    # touch_sensor.calibrate()
-    # time.sleep(2)
+    # Pas de calibration bloquante : la ligne de base s'établit en
+    # arrière-plan sur les premiers échantillons (ne pas toucher au démarrage)
     
     manager = EffectManager(matrix, touch_sensor)
     
@@ -0,0 +1,377 @@
+"""
+Construction d'un CIRCUITPY précompilé (sur l'ordinateur)
+Compile les modules du projet en .mpy avec mpy-cross : la carte n'a plus
+à compiler leur source à chaque démarrage. Le programme principal reste
+en source (CircuitPython ne lance que code.py).
+
+Pour le minuteur, config.toml est validé (types de CONFIG_DEFAUT,
+clés inconnues, bornes) puis figé en module de constantes plates
+config_minuteur : au démarrage, plus de lecture TOML ni de fusion
+récursive, sauf si config.toml est plus récent que le module figé.
+
+Cibles:
+    - horloge  : horloge_binaire/ (config, hardware, time_utils, display,
+                 button, state_manager, network, energie, alarm_local),
+                 neopixel_matrix_optimized et udp_stream (mode UDP)
+    - minuteur : minuteur/code.py, config.toml et config_minuteur
+    - effets   : main_final.py (en code.py), neopixel_matrix_optimized,
+                 fixed_trig, strip_output et le dossier effects/
+    async_runtime et profiler sont ajoutés à chaque cible.
+
+UTILISATION:
+    python mpy_build.py minuteur                   # dossier build/minuteur/
+    python mpy_build.py horloge --mpy-cross ~/mpy-cross-9.2.1
+    python mpy_build.py effets --sortie /media/$USER/CIRCUITPY
+    python mpy_build.py --mesure                   # démarrage source / précompilé
+
+Options:
+    --mpy-cross F  Compilateur de la version de CircuitPython de la carte
+                   (défaut: mpy-cross du PATH ; absent: modules copiés en source)
+    --sortie D     Dossier de sortie (défaut: build/<cible>)
+    --toml F       Configuration du minuteur (défaut: minuteur/config.toml)
+    --mesure       Compare compilation des sources et chargement précompilé,
+                   lecture TOML et module figé (temps de l'ordinateur)
+
+Copier config.toml avant config_minuteur.mpy (ou construire directement
+sur CIRCUITPY avec --sortie) : le module figé doit être le plus récent.
+"""
+
+import ast
+import marshal
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tomllib  # Python 3.11+
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+PROJET = os.path.dirname(os.path.abspath(__file__))
+MATRICE = os.path.join(PROJET, "projets", "matrice neopixel 8x8")
+HORLOGE = os.path.join(MATRICE, "horloge_binaire")
+MINUTEUR = os.path.join(MATRICE, "minuteur")
+SORTIE = os.path.join(PROJET, "build")
+MODULE_FIGE = "config_minuteur"
+REPETITIONS = 20  # Mesures par module (moyenne)
+
+# Cible: (dossier, programme copié en code.py, modules précompilés)
+CIBLES = {
+    "horloge": (HORLOGE, "code.py", (
+        "config.py", "hardware.py", "time_utils.py", "display.py", "button.py",
+        "state_manager.py", "network.py", "energie.py", "alarm_local.py")),
+    "minuteur": (MINUTEUR, "code.py", ()),
+    "effets": (PROJET, "main_final.py", (
+        "neopixel_matrix_optimized.py", "fixed_trig.py", "strip_output.py",
+        "effects")),
+}
+COMMUNS = ("async_runtime.py", "profiler.py")  # Dossier du projet
+# Modules du dossier du projet propres à une cible
+PARTAGES = {"horloge": ("neopixel_matrix_optimized.py", "udp_stream.py")}
+
+# Contraintes vérifiées à la construction, en plus des types de CONFIG_DEFAUT
+CHOIX = {"BOUTON_TYPE": ("pulldown", "pullup", "none")}
+BORNES = {
+    "MATRICE_PIN": (0, 28), "BOUTON_PIN": (0, 28),
+    "MATRICE_LUMINOSITE": (0.0, 1.0), "ANIMATION_EXTINCTION_FACTEUR": (0.0, 1.0),
+}
+POSITIFS = ("TIMER_", "TRANSITIONS_", "BOUTON_APPUI", "ANIMATION_", "RUNTIME_SCRUTATION",
+            "MINUTEURS_ROTATION")
+
+
+# ============================================================================
+# CONFIGURATION FIGÉE DU MINUTEUR
+# ============================================================================
+
+def minuteur_definitions(path=os.path.join(MINUTEUR, "code.py")):
+    """
+    Exécute CONFIG_DEFAUT et aplatir() du minuteur, sans le reste du
+    programme (matériel) : la configuration figée est exactement celle
+    que la carte calculerait depuis le TOML.
+
+    Returns:
+        Tuple (CONFIG_DEFAUT, aplatir)
+    """
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    names = ("CONFIG_DEFAUT", "aplatir")
+    tree.body = [node for node in tree.body
+                 if getattr(node, "name", None) in names
+                 or (isinstance(node, ast.Assign)
+                     and getattr(node.targets[0], "id", None) in names)]
+    namespace = {}
+    exec(compile(tree, path, "exec"), namespace)
+    return namespace["CONFIG_DEFAUT"], namespace["aplatir"]
+
+
+def check_constraints(config):
+    """
+    Returns:
+        Liste des erreurs (vide si la configuration est valide)
+    """
+    errors = []
+    for name, choices in CHOIX.items():
+        if config[name] not in choices:
+            errors.append(f"{name}: {config[name]!r} (attendu: {', '.join(choices)})")
+    for name, (low, high) in BORNES.items():
+        if not low <= config[name] <= high:
+            errors.append(f"{name}: {config[name]} hors de [{low}, {high}]")
+    for name, value in config.items():
+        if name.startswith("COULEURS_") and not all(0 <= c <= 255 for c in value):
+            errors.append(f"{name}: composantes de 0 à 255 attendues")
+        elif (name.startswith(POSITIFS) and not isinstance(value, bool)
+              and isinstance(value, (int, float)) and value <= 0):
+            errors.append(f"{name}: valeur positive attendue")
+    names = config.get("MINUTEURS_NOMS", ())
+    if names:
+        if not len(names) == len(config["MINUTEURS_DUREES"]) == len(config["MINUTEURS_COULEURS"]):
+            errors.append("MINUTEURS_: noms, durees et couleurs de même longueur attendus")
+        if not all(isinstance(d, (int, float)) and d > 0 for d in config["MINUTEURS_DUREES"]):
+            errors.append("MINUTEURS_DUREES: durées positives attendues")
+        if not all(len(c) == 3 and all(0 <= v <= 255 for v in c)
+                   for c in config["MINUTEURS_COULEURS"]):
+            errors.append("MINUTEURS_COULEURS: [r, g, b] de 0 à 255 attendus")
+    return errors
+
+
+def freeze_config(toml_path):
+    """
+    Lit, fusionne et valide config.toml.
+
+    Returns:
+        Dictionnaire plat des constantes
+
+    Raises:
+        ValueError: Configuration invalide (toutes les erreurs)
+    """
+    defaults, flatten = minuteur_definitions()
+    with open(toml_path, "rb") as f:
+        user = tomllib.load(f)
+    rejected = []
+    config = flatten(defaults, user, "", rejected)
+    errors = rejected + check_constraints(config)
+    if errors:
+        raise ValueError("\n".join(errors))
+    return config
+
+
+def frozen_source(config, toml_name):
+    """Source du module de constantes plates."""
+    lines = ['"""',
+             f"Configuration figée du minuteur, générée par mpy_build.py depuis {toml_name}",
+             "Ne pas modifier : éditer config.toml (relu au démarrage s'il est plus récent)",
+             '"""', ""]
+    lines.extend(f"{name} = {value!r}" for name, value in config.items())
+    return "\n".join(lines) + "\n"
+
+
+# ============================================================================
+# COMPILATION
+# ============================================================================
+
+def find_mpy_cross(path=None):
+    """Chemin de mpy-cross, None s'il est introuvable."""
+    if path:
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"mpy-cross introuvable: {path}")
+        return path
+    return shutil.which("mpy-cross")
+
+
+def module_files(folder, names):
+    """
+    Développe les dossiers (paquets) en fichiers .py.
+
+    Returns:
+        Chemins relatifs à folder
+    """
+    files = []
+    for name in names:
+        path = os.path.join(folder, name)
+        if not os.path.isdir(path):
+            files.append(name)
+            continue
+        for entry in sorted(os.listdir(path)):
+            if entry.endswith(".py"):
+                files.append(os.path.join(name, entry))
+    return files
+
+
+def install_module(source, destination, mpy_cross):
+    """
+    Compile source en destination (.mpy) ou la copie telle quelle.
+    L'autre forme est supprimée : CircuitPython préfère le .py au .mpy.
+
+    Returns:
+        Chemin écrit
+    """
+    base = os.path.splitext(destination)[0]
+    target = base + (".mpy" if mpy_cross else ".py")
+    stale = base + (".py" if mpy_cross else ".mpy")
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    if os.path.exists(stale):
+        os.remove(stale)
+    if mpy_cross:
+        result = subprocess.run([mpy_cross, "-o", target, source],
+                                capture_output=True, text=True)
+        if result.returncode:
+            raise RuntimeError(f"mpy-cross {source}: {result.stderr.strip()}")
+    else:
+        shutil.copyfile(source, target)
+    return target
+
+
+def build(target, output=None, mpy_cross=None, toml_path=None):
+    """
+    Construit le dossier CIRCUITPY d'une cible.
+
+    Returns:
+        Liste de tuples (chemin relatif, octets)
+    """
+    folder, program, modules = CIBLES[target]
+    output = output or os.path.join(SORTIE, target)
+    os.makedirs(output, exist_ok=True)
+    written = []
+
+    # Module figé après config.toml: il doit être le plus récent
+    if target == "minuteur":
+        toml_path = toml_path or os.path.join(MINUTEUR, "config.toml")
+        config = freeze_config(toml_path)
+        shutil.copy2(toml_path, os.path.join(output, "config.toml"))
+        written.append(os.path.join(output, "config.toml"))
+        with tempfile.TemporaryDirectory() as temporary:
+            source = os.path.join(temporary, MODULE_FIGE + ".py")
+            with open(source, "w", encoding="utf-8") as f:
+                f.write(frozen_source(config, os.path.basename(toml_path)))
+            written.append(install_module(source, os.path.join(output, MODULE_FIGE + ".py"),
+                                          mpy_cross))
+
+    sources = [(os.path.join(folder, name), name) for name in module_files(folder, modules)]
+    sources += [(os.path.join(PROJET, name), name)
+                for name in COMMUNS + PARTAGES.get(target, ())]
+    for source, name in sources:
+        written.append(install_module(source, os.path.join(output, name), mpy_cross))
+
+    shutil.copyfile(os.path.join(folder, program), os.path.join(output, "code.py"))
+    written.append(os.path.join(output, "code.py"))
+    return [(os.path.relpath(path, output), os.path.getsize(path)) for path in written]
+
+
+# ============================================================================
+# MESURE DU DÉMARRAGE
+# ============================================================================
+
+def _mean_ms(function, repetitions=REPETITIONS):
+    """Durée moyenne d'un appel (ms)."""
+    start = time.perf_counter_ns()
+    for _ in range(repetitions):
+        function()
+    return (time.perf_counter_ns() - start) / repetitions / 1e6
+
+
+def measure_modules(target):
+    """
+    Compilation des sources (démarrage en .py) contre chargement du
+    bytecode déjà compilé (équivalent du .mpy) pour une cible.
+
+    Returns:
+        Tuple (ms source, ms précompilé, nombre de modules)
+    """
+    folder, program, modules = CIBLES[target]
+    paths = [os.path.join(folder, name) for name in module_files(folder, modules)]
+    paths += [os.path.join(PROJET, name) for name in COMMUNS + PARTAGES.get(target, ())]
+    source_ms = compiled_ms = 0.0
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        data = marshal.dumps(compile(text, path, "exec"))
+        source_ms += _mean_ms(lambda: compile(text, path, "exec"))
+        compiled_ms += _mean_ms(lambda: marshal.loads(data))
+    return source_ms, compiled_ms, len(paths)
+
+
+def measure_config(toml_path=None):
+    """
+    Lecture de config.toml avec fusion contre module figé précompilé.
+
+    Returns:
+        Tuple (ms TOML, ms module figé)
+    """
+    toml_path = toml_path or os.path.join(MINUTEUR, "config.toml")
+    defaults, flatten = minuteur_definitions()
+    with open(toml_path, encoding="utf-8") as f:
+        text = f.read()
+    data = marshal.dumps(compile(frozen_source(freeze_config(toml_path), "config.toml"),
+                                 MODULE_FIGE, "exec"))
+    toml_ms = _mean_ms(lambda: flatten(defaults, tomllib.loads(text)))
+    frozen_ms = _mean_ms(lambda: exec(marshal.loads(data), {}))
+    return toml_ms, frozen_ms
+
+
+def print_measures(toml_path=None):
+    """Affiche le gain au démarrage de chaque cible."""
+    print(f"Démarrage sur l'ordinateur (moyenne de {REPETITIONS})")
+    print(f"{'cible':24s}{'modules':>8s}{'source ms':>11s}{'précompilé ms':>15s}{'gain':>7s}")
+    rows = [(name, *measure_modules(name)) for name in CIBLES]
+    rows = [(name, count, source, compiled) for name, source, compiled, count in rows]
+    toml_ms, frozen_ms = measure_config(toml_path)
+    rows.append(("config minuteur", 1, toml_ms, frozen_ms))
+    for name, count, before, after in rows:
+        print(f"{name:24s}{count:8d}{before:11.2f}{after:15.3f}{1 - after / before:7.0%}")
+    print("Sur la carte: 'Modules et matériel prêts' (horloge) et "
+          "'Configuration chargée' (minuteur) avec DEBUG")
+
+
+def main(argv):
+    """Point d'entrée en ligne de commande."""
+    targets = []
+    output = None
+    mpy_cross = None
+    toml_path = None
+    measure = False
+    args = iter(argv)
+    for arg in args:
+        if arg == "--mpy-cross":
+            mpy_cross = next(args)
+        elif arg == "--sortie":
+            output = next(args)
+        elif arg == "--toml":
+            toml_path = next(args)
+        elif arg == "--mesure":
+            measure = True
+        elif arg.startswith("-") or arg not in CIBLES:
+            print(__doc__)
+            return 2
+        else:
+            targets.append(arg)
+
+    if measure:
+        print_measures(toml_path)
+        if not targets:
+            return 0
+    if not targets or (output and len(targets) > 1):
+        print(__doc__)
+        return 2
+
+    mpy_cross = find_mpy_cross(mpy_cross)
+    if not mpy_cross:
+        print("Avertissement: mpy-cross introuvable, modules copiés en source")
+    for target in targets:
+        try:
+            files = build(target, output, mpy_cross, toml_path)
+        except ValueError as e:
+            print(f"Configuration invalide:\n{e}")
+            return 1
+        print(f"{target} -> {output or os.path.join(SORTIE, target)}: "
+              f"{len(files)} fichiers, {sum(size for _, size in files)} octets")
+        for name, size in files:
+            print(f"  {name:40s}{size:8d}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
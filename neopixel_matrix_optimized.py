@@ -1,11 +1,18 @@
 """
 Module de contrôle pour matrice LED NeoPixel 8x8
 Optimisé pour performances et facilité d'utilisation
+Panneaux chaînés (2x1, 4x1, 2x2 de 8x8) et modules 16x16 / 32x8 par
+table de correspondance précalculée (TileMap)
+Framebuffer indexé 8 bits avec palette de 256 couleurs (IndexedFramebuffer)
+Matrice hors écran (pin=None) : pixels en mémoire (PixelBuffer)
+Double tampon : dessin dans le frame buffer, envoi en bloc par
+end_frame() (begin_frame() / end_frame()) vers l'étage de sortie
 """
 
 import board
 import neopixel
 import time
+from array import array
 
 # ============================================================================
 # CONFIGURATION
@@ -17,6 +24,160 @@ NUM_PIXELS = LED_WIDTH * LED_HEIGHT
 LED_PIN = board.GP0
 BRIGHTNESS = 0.3  # Luminosité (0.0 à 1.0) pour économiser l'énergie
 
+# Dispositions prédéfinies (paramètres de TileMap)
+LAYOUTS = {
+    "8x8": {},                                          # 1 panneau, 64 LEDs
+    "2x1": {"tiles_x": 2},                              # 16x8, 128 LEDs
+    "4x1": {"tiles_x": 4},                              # 32x8, 256 LEDs
+    "2x2": {"tiles_x": 2, "tiles_y": 2},                # 16x16, 256 LEDs
+    "16x16": {"panel_width": 16, "panel_height": 16,    # Module souple 16x16
+              "serpentine": True},
+    "32x8": {"panel_width": 32, "vertical": True,       # Module souple 32x8
+             "serpentine": True},
+    "2x1_16x16": {"panel_width": 16, "panel_height": 16,  # 32x16, 512 LEDs
+                  "tiles_x": 2, "serpentine": True},
+    "2x2_16x16": {"panel_width": 16, "panel_height": 16,  # 32x32, 1024 LEDs
+                  "tiles_x": 2, "tiles_y": 2, "serpentine": True},
+}
+
+
+# ============================================================================
+# DISPOSITION DES PANNEAUX
+# ============================================================================
+
+class TileMap:
+    """
+    Correspondance entre coordonnées logiques et index dans la bande LED
+    pour des panneaux chaînés.
+
+    Les panneaux sont chaînés ligne par ligne (de gauche à droite, de haut
+    en bas). Les tables sont calculées une seule fois : la conversion
+    coûte ensuite une lecture d'array par pixel.
+
+    Attributes:
+        width (int), height (int): Dimensions logiques totales
+        table (array): Index dans la bande de chaque pixel logique (y * width + x)
+        inverse (array): Index logique de chaque LED de la bande
+    """
+
+    def __init__(self, panel_width=8, panel_height=8, tiles_x=1, tiles_y=1,
+                 serpentine=False, vertical=False, tile_serpentine=False):
+        """
+        Args:
+            panel_width, panel_height: Dimensions d'un panneau
+            tiles_x, tiles_y: Nombre de panneaux en largeur et en hauteur
+            serpentine: Lignes (ou colonnes) alternées dans chaque panneau
+            vertical: LEDs câblées par colonnes dans chaque panneau (32x8)
+            tile_serpentine: Les rangées impaires de panneaux sont chaînées
+                de droite à gauche
+        """
+        self.panel_width = panel_width
+        self.panel_height = panel_height
+        self.width = panel_width * tiles_x
+        self.height = panel_height * tiles_y
+        panel_size = panel_width * panel_height
+        count = self.width * self.height
+        self.table = array("H", range(count))
+        self.inverse = array("H", range(count))
+        i = 0
+        for y in range(self.height):
+            tile_row, ly = divmod(y, panel_height)
+            for x in range(self.width):
+                tile_col, lx = divmod(x, panel_width)
+                if tile_serpentine and tile_row % 2:
+                    tile_col = tiles_x - 1 - tile_col
+                if vertical:
+                    position = panel_height - 1 - ly if serpentine and lx % 2 else ly
+                    local = lx * panel_height + position
+                else:
+                    position = panel_width - 1 - lx if serpentine and ly % 2 else lx
+                    local = ly * panel_width + position
+                index = (tile_row * tiles_x + tile_col) * panel_size + local
+                self.table[i] = index
+                self.inverse[index] = i
+                i += 1
+
+
+def tile_map(layout):
+    """
+    Retourne une TileMap à partir d'un nom de LAYOUTS ("2x2", "32x8"...)
+    ou d'une TileMap existante.
+    """
+    if isinstance(layout, TileMap):
+        return layout
+    if layout not in LAYOUTS:
+        raise ValueError(f"Disposition inconnue: {layout} ({', '.join(LAYOUTS)})")
+    return TileMap(**LAYOUTS[layout])
+
+
+# ============================================================================
+# PIXELS EN MÉMOIRE (MATRICE HORS ÉCRAN)
+# ============================================================================
+
+class PixelBuffer:
+    """
+    Remplace neopixel.NeoPixel pour une matrice hors écran : les couleurs
+    restent en octets RGB dans l'ordre de la bande, sans luminosité ni
+    transmission. Un effet y dessine sans le savoir (fondus, playlist.py).
+    
+    Attributes:
+        buf (bytearray): 3 octets par LED, dans l'ordre de la bande
+        shows (int): Nombre d'appels à show() (trames terminées)
+    """
+    
+    def __init__(self, n):
+        """
+        Args:
+            n: Nombre de LEDs
+        """
+        self.n = n
+        self.buf = bytearray(3 * n)
+        self.brightness = 1.0  # Appliquée par la vraie bande à la sortie
+        self.auto_write = False
+        self.shows = 0
+    
+    def __len__(self):
+        return self.n
+    
+    def _set(self, index, color):
+        buf = self.buf
+        o = index * 3
+        if isinstance(color, int):
+            buf[o] = (color >> 16) & 0xFF
+            buf[o + 1] = (color >> 8) & 0xFF
+            buf[o + 2] = color & 0xFF
+        else:
+            buf[o] = color[0]
+            buf[o + 1] = color[1]
+            buf[o + 2] = color[2]
+    
+    def __setitem__(self, index, value):
+        if not isinstance(index, slice):
+            self._set(index, value)
+            return
+        start, stop, step = index.indices(self.n)
+        if len(value) == len(range(start, stop, step)):
+            for i, color in zip(range(start, stop, step), value):
+                self._set(i, color)
+        elif step == 1:
+            # Séquence plate d'octets RGB (IndexedFramebuffer.show())
+            self.buf[start * 3:stop * 3] = value
+        else:
+            raise ValueError("Séquence de couleurs de mauvaise longueur")
+    
+    def __getitem__(self, index):
+        o = index * 3
+        return (self.buf[o], self.buf[o + 1], self.buf[o + 2])
+    
+    def fill(self, color):
+        """Donne la même couleur à toutes les LEDs."""
+        for i in range(self.n):
+            self._set(i, color)
+    
+    def show(self):
+        """Rien à transmettre : compte la trame."""
+        self.shows += 1
+
 
 # ============================================================================
 # CLASSE PRINCIPALE
@@ -30,28 +191,79 @@ class NeoPixelMatrix:
         width (int): Largeur de la matrice
         height (int): Hauteur de la matrice
         pixels (neopixel.NeoPixel): Objet NeoPixel
+        index_table (array): Index dans la bande de chaque pixel logique
+        drawing (bool): Trame commencée par begin_frame(), pas encore envoyée
+    
+    Double tampon : les méthodes de dessin écrivent dans le frame buffer
+    (octets RGB dans l'ordre de la bande, frame_buffer()), le front buffer
+    est l'étage de sortie (tampon de pixels, et avec background=True les
+    deux tampons de transmission échangés en O(1), strip_output.py).
+    Entre begin_frame() et end_frame(), show() n'envoie rien : aucune
+    trame à moitié dessinée n'atteint les LEDs. end_frame() transmet la
+    trame en une copie ; le frame buffer la garde, la trame suivante peut
+    repartir de la trame affichée sans copie. Hors frame, show() transmet
+    directement (mode immédiat des effets existants, le dessin persiste).
+    
+        matrix.begin_frame()                    # Redessin complet
+        matrix.fill(BACKGROUND)
+        matrix.set_pixel(x, y, color)
+        matrix.end_frame()
+    
+        matrix.begin_frame(copy_previous=True)  # Part de la trame affichée
+        matrix.fade(192)                        # Traînées
+        matrix.set_pixel(x, y, color)
+        matrix.end_frame()
+    
+    Le framebuffer indexé (indexed()) développe ses couleurs dans le même
+    frame buffer.
     """
     
-    def __init__(self, pin, width=8, height=8, brightness=0.3):
+    def __init__(self, pin, width=8, height=8, brightness=0.3, layout=None,
+                 parallel=None, background=False):
         """
         Initialise la matrice LED.
         
         Args:
-            pin: Pin GPIO du microcontrôleur
+            pin: Pin GPIO du microcontrôleur, ou séquence de pins (une
+                tranche de la bande par pin, voir strip_output.py), ou
+                None pour une matrice hors écran (PixelBuffer)
             width: Largeur de la matrice (défaut: 8)
             height: Hauteur de la matrice (défaut: 8)
             brightness: Luminosité de 0.0 à 1.0 (défaut: 0.3)
+            layout: Panneaux chaînés, nom de LAYOUTS ou TileMap (remplace
+                width et height)
+            parallel: Plusieurs pins: True = PIO exigé, False = séquentiel,
+                None = le plus rapide disponible
+            background: show() rend la main pendant la transmission (double
+                tampon de sortie, voir strip_output.py)
         """
-        self.width = width
-        self.height = height
-        self.num_pixels = width * height
-        self.pixels = neopixel.NeoPixel(
-            pin, 
-            self.num_pixels, 
-            auto_write=False,
-            brightness=brightness
-        )
-        self._buffer = [(0, 0, 0)] * self.num_pixels  # Buffer pour éviter les recalculs
+        layout = tile_map(layout) if layout is not None else TileMap(width, height)
+        self.layout = layout
+        self.index_table = layout.table
+        self.width = layout.width
+        self.height = layout.height
+        self.num_pixels = self.width * self.height
+        if pin is None:
+            self.pixels = PixelBuffer(self.num_pixels)
+        elif isinstance(pin, (list, tuple)) or background:
+            # Importé seulement pour plusieurs sorties ou show() en arrière-plan (RAM)
+            from strip_output import create_pixels
+            self.pixels = create_pixels(pin, self.num_pixels, brightness, parallel,
+                                        background=background)
+        else:
+            self.pixels = neopixel.NeoPixel(
+                pin, 
+                self.num_pixels, 
+                auto_write=False,
+                brightness=brightness
+            )
+        # Frame buffer: 3 octets par LED dans l'ordre de la bande (le front
+        # buffer est l'étage de sortie, self.pixels)
+        self._frame = bytearray(3 * self.num_pixels)
+        self._frame_view = memoryview(self._frame)
+        self.drawing = False  # Entre begin_frame() et end_frame()
+        self._all = slice(None)  # pixels[:] sans objet slice alloué par frame
+        self._indexed = None
     
     def get_index(self, x, y):
         """
@@ -65,7 +277,7 @@ class NeoPixelMatrix:
             Index du pixel dans la bande LED
         """
         if 0 <= x < self.width and 0 <= y < self.height:
-            return y * self.width + x
+            return self.index_table[y * self.width + x]
         raise ValueError(f"Coordonnées hors limites: ({x}, {y})")
     
     def get_coords(self, index):
@@ -73,46 +285,168 @@ class NeoPixelMatrix:
         Convertit un index de pixel en coordonnées (x, y).
         
         Args:
-            index: Index du pixel (0 à num_pixels-1)
+            index: Index du pixel dans la bande (0 à num_pixels-1)
             
         Returns:
             Tuple (x, y)
         """
-        x = index % self.width
-        y = index // self.width
-        return (x, y)
+        logical = self.layout.inverse[index]
+        return (logical % self.width, logical // self.width)
     
     def set_pixel(self, x, y, color):
         """
-        Définit la couleur d'un pixel spécifique.
+        Définit la couleur d'un pixel spécifique (frame buffer).
+        
+        Args:
+            x: Coordonnée x
+            y: Coordonnée y
+            color: Tuple RGB (r, g, b) avec valeurs 0-255 ou entier 0xRRGGBB
+        """
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise ValueError(f"Coordonnées hors limites: ({x}, {y})")
+        o = self.index_table[y * self.width + x] * 3
+        buffer = self._frame
+        if isinstance(color, int):
+            buffer[o] = (color >> 16) & 0xFF
+            buffer[o + 1] = (color >> 8) & 0xFF
+            buffer[o + 2] = color & 0xFF
+        else:
+            buffer[o] = color[0]
+            buffer[o + 1] = color[1]
+            buffer[o + 2] = color[2]
+    
+    def get_pixel(self, x, y):
+        """
+        Retourne la couleur d'un pixel du frame buffer.
         
         Args:
             x: Coordonnée x
             y: Coordonnée y
-            color: Tuple RGB (r, g, b) avec valeurs 0-255
+            
+        Returns:
+            Tuple RGB (r, g, b)
         """
-        index = self.get_index(x, y)
-        self._buffer[index] = color
-        self.pixels[index] = color
+        o = self.get_index(x, y) * 3
+        buffer = self._frame
+        return (buffer[o], buffer[o + 1], buffer[o + 2])
     
     def fill(self, color):
         """
-        Remplit toute la matrice avec une couleur.
+        Remplit toute la matrice avec une couleur (frame buffer).
         
         Args:
-            color: Tuple RGB (r, g, b)
+            color: Tuple RGB (r, g, b) ou entier 0xRRGGBB
+        """
+        if isinstance(color, int):
+            color = ((color >> 16) & 0xFF, (color >> 8) & 0xFF, color & 0xFF)
+        buffer = self._frame
+        buffer[0] = color[0]
+        buffer[1] = color[1]
+        buffer[2] = color[2]
+        # Copies doublées (memmove): log2(n) copies au lieu d'une boucle par pixel
+        view = self._frame_view
+        size = 3
+        total = len(buffer)
+        while size < total:
+            count = min(size, total - size)
+            view[size:size + count] = view[:count]
+            size += count
+    
+    def fade(self, scale):
+        """
+        Atténue le frame buffer sur place (traînées sur la trame précédente).
+        
+        Args:
+            scale: Facteur sur 256 (0: noir, 256: inchangé)
+        """
+        buffer = self._frame
+        for i in range(len(buffer)):
+            buffer[i] = buffer[i] * scale >> 8
+    
+    def frame_buffer(self):
+        """
+        Retourne le frame buffer : 3 octets RGB par LED, dans l'ordre de la
+        bande (index_table). Après end_frame() ou show(), il contient la
+        trame envoyée (sans la luminosité).
+        
+        Returns:
+            bytearray partagé (écrit en place par les récepteurs et lecteurs)
+        """
+        return self._frame
+    
+    def frame_view(self):
+        """
+        Retourne une memoryview du frame buffer (tranches sans copie,
+        readinto() d'un flux).
+        
+        Returns:
+            memoryview partagée
         """
-        self._buffer = [color] * self.num_pixels
-        self.pixels.fill(color)
+        return self._frame_view
+    
+    def indexed(self):
+        """
+        Retourne le framebuffer indexé de la matrice (alloué au premier appel).
+        
+        Returns:
+            IndexedFramebuffer partagé par les effets qui l'utilisent
+        """
+        if self._indexed is None:
+            self._indexed = IndexedFramebuffer(self)
+        return self._indexed
     
     def clear(self):
         """Éteint tous les LEDs."""
         self.fill((0, 0, 0))
         self.show()
     
+    def begin_frame(self, copy_previous=False):
+        """
+        Commence une trame : show() n'envoie plus rien jusqu'à end_frame().
+        
+        Le frame buffer n'est pas échangé : il contient déjà la trame
+        affichée (sauf dessin hors frame sans show(), ou cancel_frame()).
+        
+        Args:
+            copy_previous: La trame part de la trame affichée (traînées,
+                fade()). Sans copie ; False annonce un redessin complet.
+        """
+        self.drawing = True
+    
+    def end_frame(self, keep=False):
+        """
+        Termine la trame et la transmet (une copie vers l'étage de sortie).
+        
+        Args:
+            keep: Le frame buffer garde la trame envoyée. Toujours le cas :
+                accepté pour les appelants qui enchaînent sur
+                begin_frame(copy_previous=True).
+        """
+        self.drawing = False
+        self._transmit()
+    
+    def cancel_frame(self):
+        """
+        Abandonne la trame commencée sans rien envoyer (paquet invalide).
+        Les LEDs gardent la trame précédente ; le frame buffer garde le
+        dessin partiel, à redessiner entièrement ensuite.
+        """
+        self.drawing = False
+    
     def show(self):
-        """Met à jour l'affichage de la matrice."""
-        self.pixels.show()
+        """
+        Met à jour l'affichage de la matrice. Sans effet entre begin_frame()
+        et end_frame() (la trame est envoyée par end_frame()).
+        """
+        if self.drawing:
+            return
+        self._transmit()
+    
+    def _transmit(self):
+        """Envoie le frame buffer (luminosité appliquée par pixelbuf)."""
+        pixels = self.pixels
+        pixels[self._all] = self._frame  # Séquence plate: un seul appel
+        pixels.show()
     
     def draw_gradient(self, x_scale=32, y_scale=32, z_value=50):
         """
@@ -123,16 +457,19 @@ class NeoPixelMatrix:
             y_scale: Facteur de multiplication pour la composante verte (défaut: 32)
             z_value: Valeur constante pour la composante bleue (défaut: 50)
         """
-        for i in range(self.num_pixels):
-            x, y = self.get_coords(i)
-            # Calcul optimisé de la couleur
-            color = (
-                min(x * x_scale, 255),
-                min(y * y_scale, 255),
-                min(z_value, 255)
-            )
-            self._buffer[i] = color
-            self.pixels[i] = color
+        # Octets écrits directement: pas de tuple alloué par pixel
+        blue = min(z_value, 255)
+        table = self.index_table
+        buffer = self._frame
+        i = 0
+        for y in range(self.height):
+            green = min(y * y_scale, 255)
+            for x in range(self.width):
+                o = table[i] * 3
+                buffer[o] = min(x * x_scale, 255)
+                buffer[o + 1] = green
+                buffer[o + 2] = blue
+                i += 1
         self.show()
     
     def draw_pattern(self, pattern_func):
@@ -141,27 +478,178 @@ class NeoPixelMatrix:
         
         Args:
             pattern_func: Fonction qui prend (x, y) et retourne un tuple RGB
+                ou un entier 0xRRGGBB. Pour un rendu sans allocation, la
+                fonction doit retourner des couleurs précalculées.
             
         Example:
             def checker(x, y):
                 return (255, 255, 255) if (x + y) % 2 == 0 else (0, 0, 0)
             matrix.draw_pattern(checker)
         """
-        for i in range(self.num_pixels):
-            x, y = self.get_coords(i)
-            color = pattern_func(x, y)
-            self._buffer[i] = color
-            self.pixels[i] = color
+        # Boucles imbriquées plutôt que get_coords(): pas de tuple par pixel
+        table = self.index_table
+        buffer = self._frame
+        i = 0
+        for y in range(self.height):
+            for x in range(self.width):
+                color = pattern_func(x, y)
+                o = table[i] * 3
+                if isinstance(color, int):
+                    buffer[o] = (color >> 16) & 0xFF
+                    buffer[o + 1] = (color >> 8) & 0xFF
+                    buffer[o + 2] = color & 0xFF
+                else:
+                    buffer[o] = color[0]
+                    buffer[o + 1] = color[1]
+                    buffer[o + 2] = color[2]
+                i += 1
         self.show()
 
 
+# ============================================================================
+# FRAMEBUFFER INDEXÉ (PALETTE 256 COULEURS)
+# ============================================================================
+
+class IndexedFramebuffer:
+    """
+    Framebuffer 8 bits : un index de palette par pixel et une palette de
+    256 couleurs RGB, développés en octets RGB au moment de show().
+    
+    Les animations par cycle de couleurs (arc-en-ciel qui tourne, feu)
+    ne redessinent aucun pixel : rotate() décale la palette et show()
+    renvoie la trame. Obtenu par NeoPixelMatrix.indexed().
+    
+    Attributes:
+        indexes (bytearray): Index de palette par pixel logique (y * width + x)
+        palette (bytearray): 256 couleurs RGB (768 octets)
+    """
+    
+    def __init__(self, matrix):
+        """
+        Args:
+            matrix: NeoPixelMatrix à piloter
+        """
+        self.matrix = matrix
+        n = matrix.num_pixels
+        self.indexes = bytearray(n)
+        self.palette = bytearray(768)
+        # Position de chaque pixel logique dans le frame buffer de la matrice
+        # (TileMap appliquée une fois)
+        self._offsets = array("H", range(n))
+        table = matrix.index_table
+        for i in range(n):
+            self._offsets[i] = table[i] * 3
+        # Vues et tampon de rotation préalloués (rotate() sans allocation)
+        self._scratch = bytearray(768)
+        self._palette_view = memoryview(self.palette)
+        self._scratch_view = memoryview(self._scratch)
+    
+    def set_color(self, index, color):
+        """
+        Définit une entrée de la palette.
+        
+        Args:
+            index: Entrée (0 à 255)
+            color: Tuple RGB ou entier 0xRRGGBB
+        """
+        if isinstance(color, int):
+            color = ((color >> 16) & 0xFF, (color >> 8) & 0xFF, color & 0xFF)
+        base = index * 3
+        self.palette[base] = color[0]
+        self.palette[base + 1] = color[1]
+        self.palette[base + 2] = color[2]
+    
+    def set_palette(self, colors, start=0):
+        """
+        Remplit la palette à partir de l'entrée start.
+        
+        Args:
+            colors: Couleurs (tuples RGB ou entiers 0xRRGGBB)
+            start: Première entrée
+        """
+        for i, color in enumerate(colors):
+            self.set_color(start + i, color)
+    
+    def set_pixel(self, x, y, index):
+        """
+        Définit l'index de palette d'un pixel.
+        
+        Args:
+            x: Coordonnée x
+            y: Coordonnée y
+            index: Entrée de la palette (0 à 255)
+        """
+        if not (0 <= x < self.matrix.width and 0 <= y < self.matrix.height):
+            raise ValueError(f"Coordonnées hors limites: ({x}, {y})")
+        self.indexes[y * self.matrix.width + x] = index
+    
+    def fill(self, index):
+        """Donne le même index à tous les pixels."""
+        indexes = self.indexes
+        for i in range(len(indexes)):
+            indexes[i] = index
+    
+    def draw_pattern(self, pattern_func):
+        """
+        Remplit le framebuffer avec une fonction (x, y) -> index.
+        N'affiche rien : appeler show().
+        """
+        indexes = self.indexes
+        i = 0
+        for y in range(self.matrix.height):
+            for x in range(self.matrix.width):
+                indexes[i] = pattern_func(x, y)
+                i += 1
+    
+    def rotate(self, steps=1, start=0, count=256):
+        """
+        Fait tourner une plage de la palette : la couleur de l'entrée i
+        passe à l'entrée i + steps (modulo la plage).
+        
+        Args:
+            steps: Décalage en entrées (négatif: sens inverse)
+            start: Première entrée de la plage
+            count: Nombre d'entrées de la plage
+        """
+        steps %= count
+        if not steps:
+            return
+        begin = start * 3
+        size = count * 3
+        shift = steps * 3
+        palette = self._palette_view
+        scratch = self._scratch_view
+        scratch[:size] = palette[begin:begin + size]
+        palette[begin + shift:begin + size] = scratch[:size - shift]
+        palette[begin:begin + shift] = scratch[size - shift:size]
+    
+    def show(self):
+        """
+        Développe les index en couleurs RGB dans le frame buffer de la
+        matrice et transmet la trame.
+        """
+        matrix = self.matrix
+        indexes = self.indexes
+        palette = self.palette
+        rgb = matrix.frame_buffer()
+        offsets = self._offsets
+        for i in range(len(indexes)):
+            p = indexes[i] * 3
+            o = offsets[i]
+            rgb[o] = palette[p]
+            rgb[o + 1] = palette[p + 1]
+            rgb[o + 2] = palette[p + 2]
+        if not matrix.drawing:
+            matrix.end_frame()
+
+
 # ============================================================================
 # FONCTIONS D'EXEMPLE
 # ============================================================================
 
 def rainbow_pattern(x, y):
     """Crée un motif arc-en-ciel."""
-    hue = (x + y) * 255 // 14  # 14 = (8+8-2) pour une matrice 8x8
+    hue = (x + y) * 255 // (LED_WIDTH + LED_HEIGHT - 2)  # Diagonale complète
     return hsv_to_rgb(hue / 255, 1.0, 1.0)
 
 
@@ -0,0 +1,614 @@
+"""
+Format d'animation binaire .npxa et lecteur en flux pour NeoPixelMatrix
+Images clés et images delta (pixels modifiés seulement, en plages RLE),
+lues par petits blocs depuis la flash CIRCUITPY ou une carte SD
+
+FORMAT (petit-boutiste):
+    En-tête (26 octets)
+        4s  magie "NPXA"
+        B   version (1)
+        B   drapeaux (bit 0: couleurs RGB directes, sans palette)
+        H   largeur
+        H   hauteur
+        I   nombre de frames
+        I   durée d'une frame (µs)
+        H   taille de la palette (0 en mode RGB)
+        H   intervalle entre images clés
+        I   taille maximale d'une frame (octets, pour le tampon de lecture)
+    Palette: taille x 3 octets (R, G, B)
+    Frames: type (B: "K" image clé, "D" delta), longueur (H), données
+
+    Données d'une frame: suite de plages
+        H   pixels inchangés à sauter
+        B   n: nombre de pixels (bits 0-6) | 0x80 si répétition
+        n entrées (littéral) ou 1 entrée (répétition)
+    Une entrée est un index de palette (1 octet) ou une couleur RGB
+    (3 octets). Les pixels sont en ordre logique (y * largeur + x).
+
+UTILISATION:
+    # Lecture (Pico)
+    player = AnimationPlayer(matrix, "/anim.npxa")
+    player.play()
+
+    # Écriture (ordinateur ou Pico)
+    save("anim.npxa", frames, width=8, height=8, fps=20)
+
+    # Informations
+    python npxa.py anim.npxa
+"""
+
+import struct
+import time
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+MAGIC = b"NPXA"
+VERSION = 1
+HEADER_FORMAT = "<4sBBHHIIHHI"
+HEADER_SIZE = 26
+FLAG_RGB = 0x01
+
+KEYFRAME = 0x4B  # "K"
+DELTA = 0x44     # "D"
+FRAME_HEADER_SIZE = 3
+
+RUN = 0x80
+MAX_COUNT = 0x7F
+MAX_SKIP = 0xFFFF
+MIN_RUN = 3      # Répétitions plus courtes codées en littéral
+MAX_GAP = 3      # Pixels inchangés absorbés dans une plage (< en-tête de plage)
+
+READAHEAD = 512           # Taille minimale du tampon de lecture (octets)
+KEYFRAME_INTERVAL = 50    # Image clé toutes les N frames par défaut
+
+
+class FormatError(ValueError):
+    """Fichier .npxa invalide."""
+
+
+# ============================================================================
+# EN-TÊTE
+# ============================================================================
+
+class Header:
+    """
+    En-tête d'un fichier .npxa.
+
+    Attributes:
+        width (int), height (int): Dimensions logiques
+        frame_count (int): Nombre de frames
+        frame_us (int): Durée d'une frame en microsecondes
+        palette (list): Couleurs (r, g, b), vide en mode RGB
+        keyframe_interval (int): Intervalle entre images clés
+        max_frame_size (int): Taille maximale des données d'une frame
+    """
+
+    def __init__(self, width, height, frame_count, frame_us, palette=(),
+                 keyframe_interval=KEYFRAME_INTERVAL, max_frame_size=0, rgb=False):
+        self.width = width
+        self.height = height
+        self.frame_count = frame_count
+        self.frame_us = frame_us
+        self.palette = list(palette)
+        self.keyframe_interval = keyframe_interval
+        self.max_frame_size = max_frame_size
+        self.rgb = rgb
+
+    @property
+    def fps(self):
+        """Fréquence d'images."""
+        return 1_000_000 / self.frame_us if self.frame_us else 0
+
+    @property
+    def entry_size(self):
+        """Taille d'une entrée de couleur (octets)."""
+        return 3 if self.rgb else 1
+
+    @property
+    def size(self):
+        """Taille de l'en-tête et de la palette (début de la première frame)."""
+        return HEADER_SIZE + 3 * len(self.palette)
+
+    def pack(self):
+        """Retourne l'en-tête et la palette encodés."""
+        data = bytearray(struct.pack(
+            HEADER_FORMAT, MAGIC, VERSION, FLAG_RGB if self.rgb else 0,
+            self.width, self.height, self.frame_count, self.frame_us,
+            len(self.palette), self.keyframe_interval, self.max_frame_size))
+        for r, g, b in self.palette:
+            data.append(r)
+            data.append(g)
+            data.append(b)
+        return data
+
+    @classmethod
+    def read(cls, f):
+        """Lit l'en-tête et la palette depuis un fichier ouvert en binaire."""
+        raw = f.read(HEADER_SIZE)
+        if len(raw) < HEADER_SIZE:
+            raise FormatError("En-tête tronqué")
+        (magic, version, flags, width, height, frame_count, frame_us,
+         palette_size, keyframe_interval, max_frame_size) = struct.unpack(HEADER_FORMAT, raw)
+        if magic != MAGIC:
+            raise FormatError("Ce n'est pas un fichier .npxa")
+        if version != VERSION:
+            raise FormatError(f"Version {version} non supportée")
+        raw = f.read(3 * palette_size)
+        if len(raw) < 3 * palette_size:
+            raise FormatError("Palette tronquée")
+        palette = [(raw[i], raw[i + 1], raw[i + 2]) for i in range(0, 3 * palette_size, 3)]
+        return cls(width, height, frame_count, frame_us, palette,
+                   keyframe_interval, max_frame_size, rgb=bool(flags & FLAG_RGB))
+
+
+# ============================================================================
+# ENCODAGE
+# ============================================================================
+
+def _pack_color(color):
+    """Convertit un tuple (r, g, b) ou un entier en entier 0xRRGGBB."""
+    if isinstance(color, int):
+        return color & 0xFFFFFF
+    r, g, b = color[0], color[1], color[2]
+    return (int(r) << 16) | (int(g) << 8) | int(b)
+
+
+def _append_ops(out, start, values, skip, entry):
+    """
+    Encode values (couleurs à partir de start) en opérations répétition /
+    littéral. La première opération porte le saut skip.
+    """
+    n = len(values)
+    i = 0
+    literal_start = 0
+    while i < n:
+        # Longueur de la répétition commençant en i
+        j = i + 1
+        while j < n and values[j] == values[i] and j - i < MAX_COUNT:
+            j += 1
+        if j - i >= MIN_RUN:
+            skip = _flush_literal(out, values, literal_start, i, skip, entry)
+            _append_op_header(out, skip, RUN | (j - i))
+            entry(out, values[i])
+            skip = 0
+            i = j
+            literal_start = i
+        else:
+            i += 1
+    _flush_literal(out, values, literal_start, n, skip, entry)
+
+
+def _flush_literal(out, values, start, end, skip, entry):
+    """Écrit values[start:end] en littéraux (par blocs de 127)."""
+    while start < end:
+        count = min(MAX_COUNT, end - start)
+        _append_op_header(out, skip, count)
+        for k in range(start, start + count):
+            entry(out, values[k])
+        skip = 0
+        start += count
+    return skip
+
+
+def _append_op_header(out, skip, n):
+    """Écrit un en-tête de plage (saut sur 16 bits, compteur)."""
+    while skip > MAX_SKIP:
+        # Saut trop long: plage vide intermédiaire
+        out.append(MAX_SKIP & 0xFF)
+        out.append(MAX_SKIP >> 8)
+        out.append(0)
+        skip -= MAX_SKIP
+    out.append(skip & 0xFF)
+    out.append(skip >> 8)
+    out.append(n)
+
+
+class Encoder:
+    """
+    Encode des frames (listes de couleurs en ordre logique) en .npxa.
+
+    Exemple:
+        encoder = Encoder(8, 8, fps=20)
+        for frame in frames:
+            encoder.add_frame(frame)
+        encoder.save("anim.npxa")
+    """
+
+    def __init__(self, width, height, fps=20, keyframe_interval=KEYFRAME_INTERVAL,
+                 max_colors=256, quantize=False):
+        """
+        Args:
+            width, height: Dimensions logiques
+            fps: Fréquence d'images
+            keyframe_interval: Image clé toutes les N frames (boucle, reprise)
+            max_colors: Au-delà, le fichier est écrit en couleurs RGB directes
+            quantize: Au-delà de max_colors, réduire la précision des canaux
+                (bits de poids faible) jusqu'à tenir dans la palette
+        """
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.max_colors = max_colors
+        self.quantize = quantize
+        self.frames = []
+
+    def add_frame(self, colors):
+        """Ajoute une frame (tuples RGB ou entiers 0xRRGGBB)."""
+        if len(colors) != self.width * self.height:
+            raise ValueError(f"Frame de {len(colors)} pixels, "
+                             f"{self.width * self.height} attendus")
+        self.frames.append([_pack_color(c) for c in colors])
+
+    def _palette(self):
+        """Construit la palette (couleurs par fréquence), ou None si trop de couleurs."""
+        counts = {}
+        for frame in self.frames:
+            for color in frame:
+                counts[color] = counts.get(color, 0) + 1
+        if len(counts) > self.max_colors:
+            return None
+        return sorted(counts, key=lambda c: -counts[c])
+
+    def _quantize(self):
+        """
+        Tronque les canaux bit par bit jusqu'à max_colors couleurs.
+
+        Returns:
+            La palette obtenue (les frames sont modifiées)
+        """
+        original = self.frames
+        for bits in range(1, 8):
+            channel = (0xFF << bits) & 0xFF
+            mask = (channel << 16) | (channel << 8) | channel
+            self.frames = [[color & mask for color in frame] for frame in original]
+            palette = self._palette()
+            if palette is not None:
+                return palette
+        self.frames = original
+        return None
+
+    def encode(self):
+        """
+        Returns:
+            Tuple (données du fichier, statistiques)
+        """
+        palette = self._palette()
+        if palette is None and self.quantize:
+            palette = self._quantize()
+        rgb = palette is None
+        if rgb:
+            def entry(out, color):
+                out.append(color >> 16)
+                out.append((color >> 8) & 0xFF)
+                out.append(color & 0xFF)
+        else:
+            index = {color: i for i, color in enumerate(palette)}
+
+            def entry(out, color):
+                out.append(index[color])
+
+        body = bytearray()
+        max_frame_size = 0
+        keyframes = 0
+        previous = None
+        for number, frame in enumerate(self.frames):
+            key = bytearray()
+            _append_ops(key, 0, frame, 0, entry)
+            data = key
+            kind = KEYFRAME
+            if previous is not None and number % self.keyframe_interval:
+                delta = self._delta(previous, frame, entry)
+                if len(delta) < len(key):
+                    data = delta
+                    kind = DELTA
+            if len(data) > 0xFFFF:
+                raise ValueError("Frame trop grande pour le format (64 Ko)")
+            if kind == KEYFRAME:
+                keyframes += 1
+            body.append(kind)
+            body.append(len(data) & 0xFF)
+            body.append(len(data) >> 8)
+            body.extend(data)
+            max_frame_size = max(max_frame_size, len(data))
+            previous = frame
+
+        header = Header(self.width, self.height, len(self.frames),
+                        int(round(1_000_000 / self.fps)),
+                        [] if rgb else [(c >> 16, (c >> 8) & 0xFF, c & 0xFF) for c in palette],
+                        self.keyframe_interval, max_frame_size, rgb)
+        data = header.pack() + body
+        raw_size = len(self.frames) * self.width * self.height * 3
+        stats = {
+            "frames": len(self.frames),
+            "images_cles": keyframes,
+            "couleurs": "RGB" if rgb else len(palette),
+            "octets": len(data),
+            "octets_bruts": raw_size,
+            "compression": raw_size / len(data) if data else 0,
+            "frame_max": max_frame_size,
+        }
+        return bytes(data), stats
+
+    def _delta(self, previous, frame, entry):
+        """Encode les pixels modifiés depuis previous en plages."""
+        out = bytearray()
+        n = len(frame)
+        i = 0
+        last_end = 0
+        while i < n:
+            if frame[i] == previous[i]:
+                i += 1
+                continue
+            # Début d'une plage: étendre tant que les trous restent courts
+            start = i
+            end = i + 1
+            gap = 0
+            j = end
+            while j < n:
+                if frame[j] != previous[j]:
+                    end = j + 1
+                    gap = 0
+                else:
+                    gap += 1
+                    if gap > MAX_GAP:
+                        break
+                j += 1
+            _append_ops(out, start, frame[start:end], start - last_end, entry)
+            last_end = end
+            i = end
+        return out
+
+    def save(self, path):
+        """Écrit le fichier et retourne les statistiques."""
+        data, stats = self.encode()
+        with open(path, "wb") as f:
+            f.write(data)
+        return stats
+
+
+def save(path, frames, width, height, fps=20, keyframe_interval=KEYFRAME_INTERVAL):
+    """
+    Encode une liste de frames dans un fichier .npxa.
+
+    Returns:
+        Statistiques d'encodage (taille, compression...)
+    """
+    encoder = Encoder(width, height, fps, keyframe_interval)
+    for frame in frames:
+        encoder.add_frame(frame)
+    return encoder.save(path)
+
+
+# ============================================================================
+# LECTURE EN FLUX
+# ============================================================================
+
+class AnimationPlayer:
+    """
+    Lit un fichier .npxa frame par frame et décode directement dans le
+    frame buffer de la matrice (transmis par show()).
+
+    La mémoire est constante (tampon de lecture anticipée de taille fixe,
+    palette convertie une fois) et le décodage ne touche que les pixels
+    modifiés: une frame delta vide ne coûte presque rien.
+    """
+
+    def __init__(self, matrix, source, loop=True, readahead=READAHEAD):
+        """
+        Args:
+            matrix: NeoPixelMatrix (double tampon)
+            source: Chemin du fichier ou fichier ouvert en binaire
+            loop: Reprend au début à la fin de l'animation
+            readahead: Taille minimale du tampon de lecture
+        """
+        self.matrix = matrix
+        self.loop = loop
+        self._own_file = isinstance(source, str)
+        self.file = open(source, "rb") if self._own_file else source
+        self.header = Header.read(self.file)
+        header = self.header
+        width = getattr(matrix, "width", header.width)
+        if header.width != width or header.width * header.height > len(matrix.pixels):
+            raise FormatError(f"Animation {header.width}x{header.height} "
+                              f"incompatible avec la matrice")
+        # Ordre logique -> index dans la bande (panneaux chaînés)
+        self.table = getattr(matrix, "index_table", None) or range(len(matrix.pixels))
+        self.start = header.size
+        # Palette en octets RGB: copiés tels quels dans le frame buffer
+        self.palette = bytes(channel for color in header.palette for channel in color)
+        self.entry_size = header.entry_size
+        size = max(readahead, header.max_frame_size + FRAME_HEADER_SIZE)
+        self.buffer = bytearray(size)
+        self.view = memoryview(self.buffer)
+        self.pos = 0
+        self.end = 0
+        self.frame = 0
+
+    def close(self):
+        """Ferme le fichier (si ouvert par le lecteur)."""
+        if self._own_file:
+            self.file.close()
+
+    def rewind(self):
+        """Revient à la première frame (image clé)."""
+        self.file.seek(self.start)
+        self.pos = 0
+        self.end = 0
+        self.frame = 0
+
+    def _fill(self, needed):
+        """
+        Garantit needed octets disponibles dans le tampon.
+        Returns:
+            False si la fin du fichier est atteinte
+        """
+        available = self.end - self.pos
+        if available >= needed:
+            return True
+        # Ramener le reste en tête de tampon, puis lire la suite
+        buffer = self.buffer
+        pos = self.pos
+        for k in range(available):
+            buffer[k] = buffer[pos + k]
+        self.pos = 0
+        self.end = available
+        while self.end < needed:
+            count = self.file.readinto(self.view[self.end:])
+            if not count:
+                return False
+            self.end += count
+        return True
+
+    def next_frame(self):
+        """
+        Décode la frame suivante dans le frame buffer (sans show()).
+
+        Returns:
+            False à la fin de l'animation (sans boucle)
+        """
+        if self.frame >= self.header.frame_count:
+            if not self.loop:
+                return False
+            self.rewind()
+        if not self._fill(FRAME_HEADER_SIZE):
+            raise FormatError("Frame tronquée")
+        buffer = self.buffer
+        pos = self.pos
+        length = buffer[pos + 1] | (buffer[pos + 2] << 8)
+        self.pos = pos + FRAME_HEADER_SIZE
+        if not self._fill(length):
+            raise FormatError("Frame tronquée")
+        self._decode(self.pos, self.pos + length)
+        self.pos += length
+        self.frame += 1
+        return True
+
+    def _decode(self, pos, end):
+        """
+        Applique les plages d'une frame au frame buffer.
+
+        Le frame buffer garde la frame précédente après show(): une frame
+        delta n'écrit que les pixels modifiés.
+        """
+        buffer = self.buffer
+        back = self.matrix.frame_buffer()
+        table = self.table
+        palette = self.palette
+        rgb = self.entry_size == 3
+        i = 0
+        while pos < end:
+            i += buffer[pos] | (buffer[pos + 1] << 8)
+            n = buffer[pos + 2]
+            pos += 3
+            count = n & MAX_COUNT
+            if n & RUN:
+                if rgb:
+                    r, g, b = buffer[pos], buffer[pos + 1], buffer[pos + 2]
+                    pos += 3
+                else:
+                    c = 3 * buffer[pos]
+                    r, g, b = palette[c], palette[c + 1], palette[c + 2]
+                    pos += 1
+                for _ in range(count):
+                    o = 3 * table[i]
+                    back[o] = r
+                    back[o + 1] = g
+                    back[o + 2] = b
+                    i += 1
+            elif rgb:
+                for _ in range(count):
+                    o = 3 * table[i]
+                    back[o] = buffer[pos]
+                    back[o + 1] = buffer[pos + 1]
+                    back[o + 2] = buffer[pos + 2]
+                    pos += 3
+                    i += 1
+            else:
+                for _ in range(count):
+                    c = 3 * buffer[pos]
+                    o = 3 * table[i]
+                    back[o] = palette[c]
+                    back[o + 1] = palette[c + 1]
+                    back[o + 2] = palette[c + 2]
+                    pos += 1
+                    i += 1
+
+    def frames(self):
+        """
+        Affiche les frames une par itération.
+
+        Yields:
+            Délai (secondes) jusqu'à la frame suivante (sans dérive)
+        """
+        period = self.header.frame_us * 1000
+        deadline = time.monotonic_ns()
+        while self.next_frame():
+            self.matrix.show()
+            deadline += period
+            delay = deadline - time.monotonic_ns()
+            if delay < 0:
+                # Retard: repartir de maintenant plutôt que rattraper
+                deadline -= delay
+                delay = 0
+            yield delay / 1e9
+
+    def play(self, duration=None):
+        """
+        Joue l'animation (bloquant).
+
+        Args:
+            duration: Durée maximale en secondes (None = jusqu'à la fin,
+                ou indéfiniment en boucle)
+        """
+        stop = None if duration is None else time.monotonic() + duration
+        for delay in self.frames():
+            if stop is not None and time.monotonic() >= stop:
+                break
+            time.sleep(delay)
+
+
+# ============================================================================
+# INFORMATIONS (SUR L'ORDINATEUR)
+# ============================================================================
+
+def describe(path):
+    """Affiche l'en-tête et la composition d'un fichier .npxa."""
+    import os
+    with open(path, "rb") as f:
+        header = Header.read(f)
+        keyframes = 0
+        deltas = 0
+        empty = 0
+        for _ in range(header.frame_count):
+            raw = f.read(FRAME_HEADER_SIZE)
+            if len(raw) < FRAME_HEADER_SIZE:
+                break
+            length = raw[1] | (raw[2] << 8)
+            if raw[0] == KEYFRAME:
+                keyframes += 1
+            else:
+                deltas += 1
+                if not length:
+                    empty += 1
+            f.seek(length, 1)
+    size = os.path.getsize(path)
+    raw_size = header.frame_count * header.width * header.height * 3
+    print(f"{path}: {header.width}x{header.height}, {header.frame_count} frames "
+          f"à {header.fps:.1f} FPS ({header.frame_count / header.fps if header.fps else 0:.1f} s)")
+    print(f"  Couleurs: {'RGB directes' if header.rgb else f'palette de {len(header.palette)}'}")
+    print(f"  Images clés: {keyframes}, delta: {deltas} (dont {empty} vides)")
+    print(f"  Taille: {size} octets ({raw_size / size if size else 0:.1f}x plus petit que brut), "
+          f"frame max {header.max_frame_size} octets")
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) < 2:
+        print(__doc__)
+    else:
+        for name in sys.argv[1:]:
+            describe(name)
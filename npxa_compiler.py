@@ -0,0 +1,325 @@
+"""
+Compilateur d'animations .npxa (sur l'ordinateur)
+Rend un effet de effects/ ou une fonction de motif à travers une
+NeoPixelMatrix simulée, puis l'encode avec npxa.py
+
+Cibles "fichier:nom":
+    - une sous-classe d'Effect (update(dt, t) appelé une fois par frame
+      avec dt = 1/fps, horloge simulée avancée d'autant)
+    - une fonction de motif f(x, y, t) -> couleur (t en secondes) ou f(x, y)
+
+Seules les définitions du fichier source sont exécutées (imports,
+affectations, fonctions, classes) : les boucles principales des anciens
+programmes comme old_stuff/code.py-fan.py ne sont pas lancées.
+
+Le rendu est réparti sur un pool de processus : plusieurs cibles en
+parallèle, et les fonctions de motif (sans état) découpées en blocs de
+frames. Le résultat ne dépend pas du nombre de processus.
+
+UTILISATION:
+    python npxa_compiler.py effects/effect4_spiral.py:Effect4_Spiral --duree 10 -o spirale.npxa
+    python npxa_compiler.py effects/effect5_fire.py:Effect5_Fire --graine 42 --fps 30
+    python npxa_compiler.py "projets/matrice neopixel 8x8/old_stuff/code.py-fan.py:fan_blade"
+    python npxa_compiler.py effects/effect6_rain.py:Effect6_Rain effects/effect9_stars.py:Effect9_Stars --dossier anims/
+
+Options:
+    --duree S        Durée rendue (défaut: 10 s)
+    --fps N          Fréquence d'images (défaut: 30)
+    --graine N       Graine de random (défaut: 0)
+    --taille LxH     Dimensions de la matrice (défaut: 8x8)
+    --disposition D  Dimensions d'une disposition de panneaux ("2x2", "32x8"...)
+    --cles N         Image clé toutes les N frames
+    --couleurs N     Taille maximale de la palette (au-delà: RGB directes)
+    --quantifier     Réduire la précision des couleurs pour tenir dans la palette
+    --processus N    Processus de rendu (défaut: nombre de cœurs, 1 = sans pool)
+    -o FICHIER       Fichier de sortie (une seule cible)
+    --dossier D      Dossier de sortie (défaut: dossier courant)
+"""
+
+import ast
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import npxa
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+DUREE = 10.0
+FPS = 30
+GRAINE = 0
+LARGEUR = 8
+HAUTEUR = 8
+BLOC_FRAMES = 64  # Frames par tâche pour les fonctions de motif
+
+# Instructions de premier niveau conservées dans le fichier source
+_DEFINITIONS = (ast.Import, ast.ImportFrom, ast.Assign, ast.AnnAssign,
+                ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Try)
+
+
+# ============================================================================
+# CHARGEMENT DES CIBLES
+# ============================================================================
+
+def split_target(target):
+    """
+    Sépare "fichier:nom".
+
+    Returns:
+        Tuple (chemin absolu, nom)
+    """
+    path, sep, name = target.rpartition(":")
+    if not sep or not path or not name:
+        raise ValueError(f"Cible invalide (attendu fichier:nom): {target}")
+    return os.path.abspath(path), name
+
+
+_modules = {}
+
+
+def load_definitions(path):
+    """
+    Exécute les définitions de premier niveau d'un fichier source.
+
+    Returns:
+        Espace de noms du module (dict)
+    """
+    namespace = _modules.get(path)
+    if namespace is not None:
+        return namespace
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    tree.body = [node for node in tree.body if isinstance(node, _DEFINITIONS)]
+    folder = os.path.dirname(path)
+    if folder not in sys.path:
+        sys.path.insert(0, folder)
+    namespace = {"__name__": "npxa_source", "__file__": path}
+    exec(compile(tree, path, "exec"), namespace)
+    _modules[path] = namespace
+    return namespace
+
+
+def load_target(target):
+    """
+    Returns:
+        Tuple (objet, genre) avec genre "effet", "motif_t" ou "motif"
+    """
+    path, name = split_target(target)
+    namespace = load_definitions(path)
+    if name not in namespace:
+        raise ValueError(f"{name} introuvable dans {path}")
+    obj = namespace[name]
+    if isinstance(obj, type):
+        if not hasattr(obj, "update"):
+            raise ValueError(f"{name} n'a pas de méthode update()")
+        return obj, "effet"
+    if not callable(obj):
+        raise ValueError(f"{name} n'est ni un effet ni une fonction de motif")
+    code = getattr(obj, "__code__", None)
+    arguments = code.co_argcount if code is not None else 3
+    return obj, "motif_t" if arguments >= 3 else "motif"
+
+
+# ============================================================================
+# RENDU (PROCESSUS DE TRAVAIL)
+# ============================================================================
+
+def _add_paths():
+    """Rend les modules simulés importables sans toucher à l'horloge."""
+    import simulateur
+    for folder in (simulateur.DOSSIER_PROJET, simulateur.DOSSIER_MODULES):
+        if folder not in sys.path:
+            sys.path.insert(0, folder)
+
+
+def _init_worker():
+    """
+    Installe le simulateur (horloge virtuelle, show() instantané).
+    Uniquement dans les processus de rendu: l'horloge virtuelle
+    perturberait les attentes du pool dans le processus principal.
+    """
+    import simulateur
+    from simulateur.enregistreur import EnregistreurFrames
+    simulateur.installer(virtuel=True, enregistreur=EnregistreurFrames(
+        garder_frames=False, modeler_transmission=False))
+
+
+def _snapshot(matrix):
+    """Couleurs courantes de la matrice en entiers 0xRRGGBB (ordre logique)."""
+    pixels = matrix.pixels
+    table = matrix.index_table
+    frame = []
+    for i in range(matrix.num_pixels):
+        r, g, b = pixels[table[i]][:3]
+        frame.append((r << 16) | (g << 8) | b)
+    return frame
+
+
+def render(target, start, count, fps, width, height, seed):
+    """
+    Rend count frames de la cible à partir de la frame start.
+
+    Returns:
+        Liste de frames (listes d'entiers 0xRRGGBB)
+    """
+    import board
+    from neopixel_matrix_optimized import NeoPixelMatrix
+    from simulateur.etat import etat
+
+    obj, kind = load_target(target)
+    matrix = NeoPixelMatrix(board.GP0, width=width, height=height)
+    frames = []
+    if kind == "effet":
+        # Effet avec état: toujours rendu depuis le début, d'un seul bloc
+        random.seed(seed)
+        effect = obj(matrix)
+        for number in range(start + count):
+            effect.update(1 / fps, number / fps)
+            frames.append(_snapshot(matrix))
+            etat.horloge.avancer(1 / fps)
+        return frames[start:]
+
+    # Fonction de motif: graine par bloc, indépendante du découpage
+    random.seed(seed * 1_000_003 + start)
+    for number in range(start, start + count):
+        if kind == "motif_t":
+            t = number / fps
+            matrix.draw_pattern(lambda x, y: obj(x, y, t))
+        else:
+            matrix.draw_pattern(obj)
+        frames.append(_snapshot(matrix))
+    return frames
+
+
+def _tasks(kind, frame_count):
+    """Découpe une cible en tâches (start, count)."""
+    if kind == "effet":
+        return [(0, frame_count)]
+    return [(start, min(BLOC_FRAMES, frame_count - start))
+            for start in range(0, frame_count, BLOC_FRAMES)]
+
+
+# ============================================================================
+# COMPILATION
+# ============================================================================
+
+def output_path(target, folder):
+    """Nom de sortie par défaut: <nom>.npxa."""
+    return os.path.join(folder, split_target(target)[1] + ".npxa")
+
+
+def compile_targets(targets, outputs, duration=DUREE, fps=FPS, seed=GRAINE,
+                    width=LARGEUR, height=HAUTEUR, keyframe_interval=npxa.KEYFRAME_INTERVAL,
+                    max_colors=256, quantize=False, processes=None):
+    """
+    Rend et encode chaque cible.
+
+    Args:
+        targets: Cibles "fichier:nom"
+        outputs: Fichiers de sortie (même ordre)
+        processes: Nombre de processus (None = cœurs, 1 = sans pool)
+
+    Returns:
+        Liste de statistiques (une par cible)
+    """
+    _add_paths()  # Les cibles importent board et neopixel
+    frame_count = max(1, int(round(duration * fps)))
+    jobs = []
+    for target in targets:
+        _, kind = load_target(target)
+        for start, count in _tasks(kind, frame_count):
+            jobs.append((target, start, count))
+
+    start_time = time.monotonic()
+    if processes == 1:
+        _init_worker()
+        try:
+            chunks = [render(target, start, count, fps, width, height, seed)
+                      for target, start, count in jobs]
+        finally:
+            import simulateur
+            simulateur.desinstaller()
+    else:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker) as pool:
+            futures = [pool.submit(render, target, start, count, fps, width, height, seed)
+                       for target, start, count in jobs]
+            chunks = [future.result() for future in futures]
+    render_time = time.monotonic() - start_time
+
+    results = []
+    for target, output in zip(targets, outputs):
+        encoder = npxa.Encoder(width, height, fps, keyframe_interval, max_colors, quantize)
+        for (job_target, _, _), chunk in zip(jobs, chunks):
+            if job_target == target:
+                encoder.frames.extend(chunk)
+        stats = encoder.save(output)
+        stats["cible"] = target
+        stats["fichier"] = output
+        results.append(stats)
+    for stats in results:
+        stats["rendu_s"] = render_time
+    return results
+
+
+def main(argv):
+    """Point d'entrée en ligne de commande."""
+    options = {}
+    targets = []
+    output = None
+    folder = "."
+    args = iter(argv)
+    for arg in args:
+        if arg == "--duree":
+            options["duration"] = float(next(args))
+        elif arg == "--fps":
+            options["fps"] = float(next(args))
+        elif arg == "--graine":
+            options["seed"] = int(next(args))
+        elif arg == "--taille":
+            width, height = next(args).lower().split("x")
+            options["width"], options["height"] = int(width), int(height)
+        elif arg == "--disposition":
+            # Frames en ordre logique: seules les dimensions comptent
+            _add_paths()
+            from neopixel_matrix_optimized import tile_map
+            layout = tile_map(next(args))
+            options["width"], options["height"] = layout.width, layout.height
+        elif arg == "--cles":
+            options["keyframe_interval"] = int(next(args))
+        elif arg == "--couleurs":
+            options["max_colors"] = int(next(args))
+        elif arg == "--quantifier":
+            options["quantize"] = True
+        elif arg == "--processus":
+            options["processes"] = int(next(args))
+        elif arg == "-o":
+            output = next(args)
+        elif arg == "--dossier":
+            folder = next(args)
+        elif arg.startswith("-"):
+            print(__doc__)
+            return 2
+        else:
+            targets.append(arg)
+
+    if not targets or (output and len(targets) > 1):
+        print(__doc__)
+        return 2
+    outputs = [output] if output else [output_path(t, folder) for t in targets]
+    os.makedirs(folder, exist_ok=True)
+
+    for stats in compile_targets(targets, outputs, **options):
+        print(f"{stats['cible']} -> {stats['fichier']}: {stats['frames']} frames, "
+              f"{stats['images_cles']} images clés, couleurs {stats['couleurs']}, "
+              f"{stats['octets']} octets ({stats['compression']:.1f}x)")
+    print(f"Rendu: {stats['rendu_s']:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
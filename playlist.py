@@ -0,0 +1,467 @@
+"""
+Playlist d'effets avec fondus entre deux effets en cours
+Chaque élément a sa durée et son poids ; ordre fixe, mélange ou tirage
+pondéré. Pendant une transition, l'effet sortant et l'effet entrant sont
+rendus ensemble dans deux matrices hors écran (PixelBuffer), puis mélangés
+en entiers (fondu enchaîné ou balayage) dans le frame buffer de la matrice
+de sortie, transmis par end_frame()
+
+Mémoire: l'effet entrant n'est instancié (et son module importé) qu'au
+début de la transition, le sortant est libéré dès la fin : deux effets
+en RAM seulement pendant le chevauchement.
+
+Cadence: le coût de chaque effet est mesuré pendant qu'il tourne. Si
+sortant + entrant + mélange + envoi dépassent le budget d'une frame, le fondu
+part de la dernière image figée du sortant (un seul effet rendu) et la
+paire est signalée dans report().
+
+UTILISATION:
+    from effects import EffectRegistry
+    from playlist import Playlist, PlaylistPlayer
+
+    registry = EffectRegistry()
+    playlist = Playlist(registry, (("effect2_rainbow", 20), ("effect5_fire", 30, 2)),
+                        mode="pondere")
+    player = PlaylistPlayer(matrix, registry, playlist, transition="crossfade")
+    while True:
+        if button.is_pressed():
+            player.skip()              # Transition immédiate
+        player.update()
+        time.sleep(0.001)
+"""
+
+import gc
+import random
+import time
+from array import array
+
+from neopixel_matrix_optimized import NeoPixelMatrix
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+ORDER = "ordre"          # Éléments dans l'ordre de la liste
+SHUFFLE = "melange"      # Chaque élément une fois par tour, ordre aléatoire
+WEIGHTED = "pondere"     # Tirage selon le poids, jamais deux fois de suite
+CROSSFADE = "crossfade"  # Fondu enchaîné
+WIPE = "balayage"        # Balayage de gauche à droite
+CUT = "coupe"            # Sans transition
+
+DURATION = 30.0          # Durée par défaut d'un élément (secondes)
+WEIGHT = 1               # Poids par défaut (mode pondéré)
+TRANSITION_TIME = 1.5    # Durée d'une transition (secondes)
+FRAME_RATE = 20          # Images par seconde
+OVERLAP_BUDGET = 0.8     # Part de la période de frame disponible pour le rendu
+OVERRUN_FRAMES = 3       # Frames hors budget de suite avant de figer le sortant
+COST_SMOOTHING = 3       # Moyenne glissante des coûts: poids 1/2**N par mesure
+
+
+# ============================================================================
+# PLAYLIST
+# ============================================================================
+
+class Playlist:
+    """
+    Ordre de passage des effets.
+
+    Attributes:
+        items (list): Tuples (index dans le registre, durée, poids)
+        mode (str): ORDER, SHUFFLE ou WEIGHTED
+    """
+
+    def __init__(self, registry, items=None, mode=ORDER):
+        """
+        Args:
+            registry: EffectRegistry (noms des modules d'effets)
+            items: Noms de modules ou tuples (nom, durée[, poids])
+                (défaut: tous les effets, DURATION chacun)
+            mode: ORDER, SHUFFLE ou WEIGHTED
+        """
+        if mode not in (ORDER, SHUFFLE, WEIGHTED):
+            raise ValueError(f"Mode de playlist inconnu: {mode}")
+        if not items:
+            items = registry.names
+        self.items = []
+        for item in items:
+            if isinstance(item, str):
+                item = (item,)
+            name = item[0]
+            if name not in registry.names:
+                raise ValueError(f"Effet inconnu dans la playlist: {name}")
+            duration = item[1] if len(item) > 1 else DURATION
+            weight = item[2] if len(item) > 2 else WEIGHT
+            if duration <= 0 or weight <= 0:
+                raise ValueError(f"Durée et poids positifs attendus: {name}")
+            self.items.append((registry.names.index(name), duration, weight))
+        self.mode = mode
+        self.position = -1
+        self._order = list(range(len(self.items)))
+        self._total_weight = sum(item[2] for item in self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def _shuffle(self):
+        """Nouveau tour mélangé (Fisher-Yates), sans répéter le dernier élément."""
+        last = self._order[-1]
+        order = self._order
+        for i in range(len(order) - 1, 0, -1):
+            j = random.randint(0, i)
+            order[i], order[j] = order[j], order[i]
+        if len(order) > 1 and order[0] == last:
+            order[0], order[-1] = order[-1], order[0]
+
+    def _draw(self):
+        """Tirage pondéré, différent de l'élément actuel."""
+        current = self.position if len(self.items) > 1 else -1
+        total = self._total_weight
+        if current >= 0:
+            total -= self.items[current][2]
+        pick = random.random() * total
+        chosen = current
+        for i, item in enumerate(self.items):
+            if i == current:
+                continue
+            chosen = i
+            pick -= item[2]
+            if pick < 0:
+                break
+        return chosen
+
+    def next(self):
+        """
+        Passe à l'élément suivant.
+
+        Returns:
+            Tuple (index dans le registre, durée)
+        """
+        if self.mode == WEIGHTED:
+            self.position = self._draw()
+            item = self.items[self.position]
+        else:
+            step = (self.position + 1) % len(self.items)
+            if self.mode == SHUFFLE and step == 0:
+                self._shuffle()
+            self.position = step
+            item = self.items[self._order[step]]
+        return item[0], item[1]
+
+
+# ============================================================================
+# EFFET EN COURS
+# ============================================================================
+
+class Track:
+    """
+    Un effet rendu dans sa matrice hors écran, avec son propre temps
+    d'animation.
+    """
+
+    def __init__(self, effect, matrix, index, now):
+        self.effect = effect
+        self.matrix = matrix
+        self.index = index  # Dans le registre
+        self.start_ns = now
+        self.last_ns = now
+        self.shows = -1  # Dernière trame envoyée à la sortie
+
+    @property
+    def name(self):
+        return type(self.effect).__name__
+
+    def render(self, now):
+        """Une frame de l'effet (temps réel écoulé, comme EffectManager)."""
+        dt = (now - self.last_ns) / 1_000_000_000
+        t = (now - self.start_ns) / 1_000_000_000
+        self.last_ns = now
+        self.effect.update(dt, t)
+
+    def changed(self):
+        """L'effet a-t-il terminé une trame depuis le dernier appel ?"""
+        shows = self.matrix.pixels.shows
+        if shows == self.shows:
+            return False
+        self.shows = shows
+        return True
+
+
+# ============================================================================
+# LECTEUR
+# ============================================================================
+
+class PlaylistPlayer:
+    """
+    Enchaîne les effets d'une Playlist avec transitions.
+
+    Attributes:
+        current (Track): Effet affiché (sortant pendant une transition)
+        incoming (Track): Effet entrant (None hors transition)
+        costs (dict): Coût moyen de update() par classe d'effet (ns)
+        expensive (dict): Paires trop coûteuses à superposer -> ms mesurées
+    """
+
+    def __init__(self, matrix, registry, playlist, transition=CROSSFADE,
+                 transition_time=TRANSITION_TIME, frame_rate=FRAME_RATE):
+        """
+        Args:
+            matrix: NeoPixelMatrix de sortie
+            registry: EffectRegistry
+            playlist: Playlist
+            transition: CROSSFADE, WIPE ou CUT
+            transition_time: Durée d'une transition (secondes, 0: CUT)
+            frame_rate: Images par seconde
+        """
+        if transition not in (CROSSFADE, WIPE, CUT):
+            raise ValueError(f"Transition inconnue: {transition}")
+        if transition_time < 0:
+            raise ValueError(f"Durée de transition négative: {transition_time}")
+        if transition_time == 0:
+            transition = CUT
+        self.matrix = matrix
+        self.registry = registry
+        self.playlist = playlist
+        self.transition = transition
+        self.transition_ns = int(transition_time * 1_000_000_000)
+        self.frame_ns = int(1_000_000_000 / frame_rate)
+        self.budget_ns = int(self.frame_ns * OVERLAP_BUDGET)
+        # Deux matrices hors écran, réutilisées d'un effet à l'autre
+        layout = matrix.layout
+        self.buffers = [NeoPixelMatrix(None, layout=layout), NeoPixelMatrix(None, layout=layout)]
+        # Octets de chaque colonne logique (balayage)
+        self._columns = []
+        for x in range(matrix.width):
+            column = array("H", range(matrix.height))
+            for y in range(matrix.height):
+                column[y] = layout.table[y * matrix.width + x] * 3
+            self._columns.append(column)
+        self.current = None
+        self.incoming = None
+        self.item_end_ns = 0
+        self.duration_ns = 0
+        self.transition_start_ns = 0
+        self.frozen = False  # Sortant figé (paire trop coûteuse)
+        self.overruns = 0
+        self.weight = -1  # Dernier poids de mélange affiché
+        self.last_frame_ns = 0
+        self.costs = {}
+        self.blend_ns = 0
+        self.send_ns = 0
+        self.expensive = {}
+        self.transition_frames = 0
+        self.transition_time_ns = 0
+        self.late_frames = 0
+
+    # ---- effets ----------------------------------------------------------
+
+    def _instance(self, index, buffer, now, keep):
+        """Importe et instancie un effet dans une matrice hors écran."""
+        effect_class = self.registry.load(index, keep=keep)
+        # Matrice réutilisée: la trame repart du noir
+        buffer.begin_frame()
+        buffer.fill(0)
+        buffer.end_frame()
+        return Track(effect_class(buffer), buffer, index, now)
+
+    def _release(self, track):
+        """Arrête un effet et libère son module."""
+        track.effect.stop()
+        track.effect = None
+        self.registry.release(track.index)
+
+    def _measure(self, track, now):
+        """Rend une frame de l'effet et met à jour son coût moyen."""
+        start = time.monotonic_ns()
+        track.render(now)
+        elapsed = time.monotonic_ns() - start
+        name = track.name
+        cost = self.costs.get(name)
+        if cost is None:
+            self.costs[name] = elapsed
+        else:
+            self.costs[name] = cost + ((elapsed - cost) >> COST_SMOOTHING)
+        return elapsed
+
+    def start(self):
+        """Lance le premier élément de la playlist."""
+        now = time.monotonic_ns()
+        index, duration = self.playlist.next()
+        self.current = self._instance(index, self.buffers[0], now, keep=False)
+        self.duration_ns = int(duration * 1_000_000_000)
+        self.item_end_ns = now + self.duration_ns
+        print(f"Playlist: {self.current.name}")
+
+    def skip(self):
+        """Passe à l'élément suivant tout de suite (bouton)."""
+        if self.incoming is None:
+            self.item_end_ns = 0
+
+    def _begin_transition(self, now):
+        """Instancie l'effet suivant dans le tampon libre."""
+        index, duration = self.playlist.next()
+        if index == self.current.index:
+            # Un seul élément: on prolonge
+            self.item_end_ns = now + int(duration * 1_000_000_000)
+            return
+        buffer = self.buffers[1] if self.current.matrix is self.buffers[0] else self.buffers[0]
+        self.incoming = self._instance(index, buffer, now, keep=True)
+        self.duration_ns = int(duration * 1_000_000_000)
+        self.transition_start_ns = now
+        self.overruns = 0
+        self.weight = -1
+        print(f"Playlist: {self.current.name} -> {self.incoming.name}")
+        if self.transition == CUT:
+            self._end_transition(now)
+            return
+        # Coût connu des deux effets: figer le sortant d'emblée si la paire déborde
+        estimate = (self.costs.get(self.current.name, 0) + self.costs.get(self.incoming.name, 0)
+                    + self.blend_ns + self.send_ns)
+        self.frozen = estimate > self.budget_ns
+        if self.frozen:
+            self._flag(estimate)
+
+    def _end_transition(self, now):
+        """Libère le sortant, l'entrant devient l'effet affiché."""
+        outgoing = self.current
+        self.current = self.incoming
+        self.incoming = None
+        self.frozen = False
+        self._release(outgoing)
+        self.current.shows = -1  # Forcer l'envoi de sa trame
+        self.item_end_ns = now + self.duration_ns
+
+    def _flag(self, cost_ns):
+        """Retient une paire trop coûteuse et le signale."""
+        pair = f"{self.current.name} + {self.incoming.name}"
+        ms = cost_ns / 1_000_000
+        if pair not in self.expensive:
+            print(f"Chevauchement trop coûteux: {pair} = {ms:.1f} ms "
+                  f"> {self.budget_ns / 1_000_000:.1f} ms, fondu sur image figée")
+        self.expensive[pair] = max(ms, self.expensive.get(pair, 0))
+
+    # ---- mélange ---------------------------------------------------------
+
+    def crossfade(self, weight):
+        """sortie = sortant + (entrant - sortant) * weight / 256, par octet."""
+        out = self.matrix.frame_buffer()
+        a = self.current.matrix.frame_buffer()
+        b = self.incoming.matrix.frame_buffer()
+        inverse = 256 - weight
+        for i in range(len(out)):
+            out[i] = (a[i] * inverse + b[i] * weight) >> 8
+
+    def wipe(self, weight):
+        """Colonnes à gauche du front: entrant, à droite: sortant."""
+        out = self.matrix.frame_buffer()
+        a = self.current.matrix.frame_buffer()
+        b = self.incoming.matrix.frame_buffer()
+        edge = weight * len(self._columns) >> 8
+        for x, column in enumerate(self._columns):
+            source = b if x < edge else a
+            for o in column:
+                out[o] = source[o]
+                out[o + 1] = source[o + 1]
+                out[o + 2] = source[o + 2]
+
+    def _send(self, track=None):
+        """
+        Transmet la trame de sortie par end_frame() et met à jour le coût
+        moyen d'envoi.
+
+        Args:
+            track: Effet seul, copié dans le frame buffer de sortie (None:
+                mélange déjà écrit par crossfade() ou wipe())
+        """
+        start = time.monotonic_ns()
+        matrix = self.matrix
+        if track is not None:
+            matrix.begin_frame()
+            matrix.frame_view()[:] = track.matrix.frame_view()
+        matrix.end_frame()
+        elapsed = time.monotonic_ns() - start
+        self.send_ns += (elapsed - self.send_ns) >> COST_SMOOTHING
+
+    # ---- boucle ----------------------------------------------------------
+
+    def render_frame(self, now=None):
+        """
+        Calcule et affiche une frame : effet seul, ou les deux effets et
+        leur mélange pendant une transition.
+        """
+        if now is None:
+            now = time.monotonic_ns()
+        if self.current is None:
+            self.start()
+        if self.incoming is None and now >= self.item_end_ns:
+            self._begin_transition(now)
+
+        if self.incoming is None:
+            self._measure(self.current, now)
+            if self.current.changed():
+                self._send(self.current)
+            return
+
+        frame_start = time.monotonic_ns()
+        cost = self._measure(self.incoming, now)
+        if not self.frozen:
+            cost += self._measure(self.current, now)
+        changed = self.current.changed() | self.incoming.changed()
+        weight = min(256, (now - self.transition_start_ns) * 256 // self.transition_ns)
+        if changed or weight != self.weight:
+            start = time.monotonic_ns()
+            self.matrix.begin_frame()
+            if self.transition == WIPE:
+                self.wipe(weight)
+            else:
+                self.crossfade(weight)
+            blend = time.monotonic_ns() - start
+            self.blend_ns += (blend - self.blend_ns) >> COST_SMOOTHING
+            self._send()
+            cost += blend + self.send_ns
+            self.weight = weight
+
+        # Cadence tenue ? Sinon on fige le sortant pour la suite du fondu
+        if cost > self.budget_ns and not self.frozen:
+            self.overruns += 1
+            if self.overruns >= OVERRUN_FRAMES:
+                self.frozen = True
+                self._flag(cost)
+        else:
+            self.overruns = 0
+        self.transition_frames += 1
+        self.transition_time_ns += time.monotonic_ns() - frame_start
+        if weight >= 256:
+            self._end_transition(now)
+
+    def update(self):
+        """Rend une frame si sa date est venue (à appeler en boucle)."""
+        now = time.monotonic_ns()
+        if now - self.last_frame_ns < self.frame_ns:
+            return
+        if now - self.last_frame_ns >= 2 * self.frame_ns and self.current is not None:
+            self.late_frames += 1
+        self.last_frame_ns = now
+        self.render_frame(now)
+
+    def stop(self):
+        """Arrête les effets en cours et libère leurs modules."""
+        for track in (self.incoming, self.current):
+            if track is not None and track.effect is not None:
+                self._release(track)
+        self.current = None
+        self.incoming = None
+        gc.collect()
+
+    def report(self):
+        """Affiche les coûts mesurés et les paires trop coûteuses."""
+        print(f"Playlist: budget {self.budget_ns / 1_000_000:.1f} ms par frame "
+              f"({1_000_000_000 / self.frame_ns:.0f} FPS), mélange {self.blend_ns / 1_000_000:.2f} ms, "
+              f"envoi {self.send_ns / 1_000_000:.2f} ms, {self.late_frames} frames en retard")
+        for name in sorted(self.costs):
+            print(f"  {name:24s}{self.costs[name] / 1_000_000:8.2f} ms")
+        if self.transition_frames:
+            print(f"  transitions: {self.transition_frames} frames, "
+                  f"{self.transition_time_ns / self.transition_frames / 1_000_000:.2f} ms en moyenne")
+        for pair, ms in self.expensive.items():
+            print(f"  trop coûteux à superposer: {pair} ({ms:.1f} ms)")
@@ -0,0 +1,436 @@
+"""
+Profilage en continu du rendu (effets, show(), entrées, mémoire)
+Histogrammes glissants de taille fixe et commandes sur la console série
+
+Le coût par mesure est de deux appels à time.monotonic_ns() et d'une
+écriture dans un array préalloué : le profilage peut rester actif en
+production et s'active ou se désactive sans redémarrage. Inactif, il ne
+coûte rien : les enveloppes de show() sont retirées et la boucle teste
+active avant begin_frame() / end_frame().
+
+Commandes série (taper puis Entrée):
+    prof        Affiche p50 / p95 / max par section
+    prof on     Active les mesures
+    prof off    Désactive les mesures
+    prof reset  Vide les histogrammes
+    prof N      Rapport périodique toutes les N secondes (0 = arrêt)
+    prof mem on|off     Allocations par frame (gc.mem_alloc)
+    prof strict on|off  GC coupé pendant le rendu, allocations signalées
+"""
+
+import gc
+import sys
+import time
+from array import array
+
+try:
+    import supervisor
+    HAS_SUPERVISOR = True
+except ImportError:
+    HAS_SUPERVISOR = False
+
+HAS_MEM_INFO = hasattr(gc, "mem_alloc")  # CircuitPython / MicroPython
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+HISTOGRAM_SIZE = 128     # Dernières mesures conservées par section
+COMMAND_PREFIX = "prof"
+MAX_COMMAND_LENGTH = 32
+STRICT_MIN_FREE = 8192   # Mode strict: collecte avant la frame sous ce seuil
+
+
+# ============================================================================
+# HISTOGRAMME GLISSANT
+# ============================================================================
+
+class RollingHistogram:
+    """
+    Conserve les N dernières durées (ns) dans un tampon circulaire.
+
+    Attributes:
+        count (int): Nombre total de mesures depuis la remise à zéro
+    """
+
+    def __init__(self, size=HISTOGRAM_SIZE):
+        """
+        Args:
+            size: Nombre de mesures conservées
+        """
+        # Durées < 4.29 s : 32 bits suffisent, aucune allocation par mesure
+        self.samples = array("L", [0] * size)
+        self.size = size
+        self.index = 0
+        self.count = 0
+
+    def add(self, duration_ns):
+        """Ajoute une durée (ns)."""
+        self.samples[self.index] = duration_ns if duration_ns < 0xFFFFFFFF else 0xFFFFFFFF
+        self.index = (self.index + 1) % self.size
+        self.count += 1
+
+    def reset(self):
+        """Vide l'histogramme."""
+        self.index = 0
+        self.count = 0
+
+    def values(self):
+        """Retourne les durées conservées, triées (alloue une liste)."""
+        return sorted(self.samples[:min(self.count, self.size)])
+
+    def percentiles(self):
+        """
+        Returns:
+            Tuple (p50, p95, max) en ns, ou None si aucune mesure
+        """
+        values = self.values()
+        n = len(values)
+        if not n:
+            return None
+        return (values[n // 2], values[min(n - 1, n * 95 // 100)], values[-1])
+
+
+# ============================================================================
+# PROFILEUR
+# ============================================================================
+
+class Section:
+    """
+    Mesures d'une section (effet, rendu, entrées).
+
+    Attributes:
+        time (RollingHistogram): Durée de la frame (ns)
+        show (RollingHistogram): Durée des show() (ns)
+        alloc (RollingHistogram): Octets alloués par frame
+        violations (int): Frames ayant alloué en mode strict
+    """
+
+    def __init__(self, name, size):
+        self.name = name
+        self.time = RollingHistogram(size)
+        self.show = RollingHistogram(size)
+        self.alloc = RollingHistogram(size)
+        self.violations = 0
+
+    def reset(self):
+        """Vide les mesures de la section."""
+        self.time.reset()
+        self.show.reset()
+        self.alloc.reset()
+        self.violations = 0
+
+
+class Profiler:
+    """
+    Regroupe les mesures par section ("Effect3_Wave", "input"...) et
+    traite les commandes série.
+
+    Mesure mémoire (CircuitPython): gc.mem_alloc() avant et après chaque
+    frame, attribué à la section courante. En mode strict, le GC est
+    désactivé pendant la frame et toute allocation est signalée.
+
+    Exemple:
+        profiler = Profiler()
+        profiler.select("Effect3_Wave")
+        start = profiler.begin_frame()
+        effect.update(dt, t)
+        profiler.end_frame(start)
+    """
+
+    def __init__(self, enabled=True, size=HISTOGRAM_SIZE, report_interval=0,
+                 memory=False, strict=False):
+        """
+        Args:
+            enabled: Mesures de temps actives au démarrage
+            size: Taille des histogrammes
+            report_interval: Rapport périodique en secondes (0 = désactivé)
+            memory: Mesure des allocations par frame
+            strict: GC désactivé pendant le rendu, allocations signalées
+        """
+        self.enabled = enabled
+        self.size = size
+        self.report_interval = report_interval
+        self.memory = memory and HAS_MEM_INFO
+        self.strict = strict and HAS_MEM_INFO
+        self.active = False  # Temps ou mémoire mesurés (begin_frame() utile)
+        self._update_active()
+        self.sections = {}
+        self.current = None
+        self.min_free = None
+        self.lost_samples = 0  # Frames pendant lesquelles le GC a collecté
+        self._alloc_start = -1
+        self._depth = 0  # Frames imbriquées (seule la plus externe mesure la mémoire)
+        self._last_report = time.monotonic()
+        self._command = ""
+        self._shows = []  # Matrices de instrument_show()
+        self._originals = []  # (matrice, nom, méthode) tant que show() est enveloppé
+
+    def _update_active(self):
+        """active: une mesure (temps ou mémoire) est à faire par frame."""
+        self.active = self.enabled or self.memory or self.strict
+
+    def set_enabled(self, enabled):
+        """
+        Active ou coupe les mesures de temps. Coupées, les show()
+        instrumentés retrouvent leur méthode d'origine.
+        """
+        self.enabled = enabled
+        self._update_active()
+        for matrix in self._shows:
+            if enabled:
+                self._wrap_show(matrix)
+            else:
+                self._unwrap_show(matrix)
+
+    def section(self, name):
+        """Retourne la section name (créée au besoin)."""
+        section = self.sections.get(name)
+        if section is None:
+            section = Section(name, self.size)
+            self.sections[name] = section
+        return section
+
+    def select(self, name):
+        """Les frames et show() suivants sont attribués à la section name."""
+        self.current = self.section(name)
+
+    def start(self):
+        """Retourne l'instant de début d'une mesure (0 si désactivé)."""
+        return time.monotonic_ns() if self.enabled else 0
+
+    def stop(self, histogram, start):
+        """Enregistre la durée écoulée depuis start() dans un histogramme."""
+        if start and histogram is not None:
+            histogram.add(time.monotonic_ns() - start)
+
+    def begin_frame(self):
+        """
+        Début d'une frame de la section courante.
+
+        Returns:
+            Instant de début (à passer à end_frame)
+        """
+        start = self.start()
+        self._depth += 1
+        if self._depth == 1 and (self.memory or self.strict):
+            if self.strict:
+                # GC coupé pendant la frame: garder une marge pour ne pas
+                # provoquer de MemoryError si le rendu alloue
+                if gc.mem_free() < STRICT_MIN_FREE:
+                    gc.collect()
+                gc.disable()
+            # Lu en dernier: l'entier de monotonic_ns() n'est pas compté
+            self._alloc_start = gc.mem_alloc()
+        return start
+
+    def end_frame(self, start):
+        """Fin d'une frame: enregistre durée et allocations."""
+        section = self.current
+        self._depth -= 1
+        if self._depth == 0 and self._alloc_start >= 0:
+            allocated = gc.mem_alloc() - self._alloc_start
+            self._alloc_start = -1
+            if self.strict:
+                gc.enable()
+            free = gc.mem_free()
+            if self.min_free is None or free < self.min_free:
+                self.min_free = free
+            if allocated < 0:
+                self.lost_samples += 1
+            elif section is not None:
+                section.alloc.add(allocated)
+                if self.strict and allocated:
+                    section.violations += 1
+                    if section.violations == 1:
+                        print(f"Allocation en mode strict: {section.name} "
+                              f"({allocated} octets)")
+        if section is not None:
+            self.stop(section.time, start)
+
+    def instrument_show(self, matrix):
+        """
+        Chronomètre matrix.show() (et matrix.end_frame() en double tampon)
+        dans la section courante. L'enveloppe n'est posée que pendant que
+        les mesures sont actives (set_enabled(), "prof on").
+
+        Args:
+            matrix: Objet possédant une méthode show() (NeoPixelMatrix)
+        """
+        self._shows.append(matrix)
+        if self.enabled:
+            self._wrap_show(matrix)
+
+    def _wrap_show(self, matrix):
+        """Pose les enveloppes de show() / end_frame() (une seule fois)."""
+        for entry in self._originals:
+            if entry[0] is matrix:
+                return  # Déjà enveloppé
+        for name in ("show", "end_frame"):
+            method = getattr(matrix, name, None)
+            if method is not None:
+                self._originals.append((matrix, name, method))
+                setattr(matrix, name, self._timed_show(method))
+
+    def _unwrap_show(self, matrix):
+        """Rend à la matrice ses méthodes d'origine."""
+        kept = []
+        for entry in self._originals:
+            if entry[0] is matrix:
+                setattr(matrix, entry[1], entry[2])
+            else:
+                kept.append(entry)
+        self._originals = kept
+
+    def _timed_show(self, method):
+        """Enveloppe une méthode d'envoi de trame (voir instrument_show())."""
+        def timed_show(*args):
+            start = self.start()
+            method(*args)
+            if self.current is not None:
+                self.stop(self.current.show, start)
+
+        return timed_show
+
+    def instrument(self, obj, method_name, section_name):
+        """
+        Mesure chaque appel de obj.method_name() comme une frame de la
+        section section_name (temps et allocations).
+
+        Args:
+            obj: Objet à instrumenter (DisplayManager...)
+            method_name: Nom de la méthode
+            section_name: Section de profilage
+        """
+        method = getattr(obj, method_name)
+        section = self.section(section_name)
+
+        def timed(*args, **kwargs):
+            previous = self.current
+            self.current = section
+            start = self.begin_frame()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.end_frame(start)
+                self.current = previous
+
+        setattr(obj, method_name, timed)
+
+    def reset(self):
+        """Vide toutes les mesures."""
+        for section in self.sections.values():
+            section.reset()
+        self.min_free = None
+        self.lost_samples = 0
+
+    def report(self):
+        """Affiche p50 / p95 / max (ms, octets) pour chaque section."""
+        print(f"--- Profil ({'actif' if self.enabled else 'inactif'}) ---")
+        print(f"{'section':28s} {'n':>6s} {'p50':>8s} {'p95':>8s} {'max':>8s}")
+        for name in sorted(self.sections):
+            section = self.sections[name]
+            for label, histogram in ((name, section.time), (name + ".show", section.show)):
+                stats = histogram.percentiles()
+                if stats is None:
+                    continue
+                p50, p95, peak = stats
+                print(f"{label:28s} {histogram.count:6d} {p50 / 1e6:8.3f} "
+                      f"{p95 / 1e6:8.3f} {peak / 1e6:8.3f}")
+
+        if not (self.memory or self.strict):
+            return
+        print(f"--- Mémoire (octets/frame{', strict' if self.strict else ''}) ---")
+        print(f"{'section':28s} {'n':>6s} {'p50':>8s} {'p95':>8s} {'max':>8s} {'strict':>6s}")
+        for name in sorted(self.sections):
+            section = self.sections[name]
+            stats = section.alloc.percentiles()
+            if stats is None:
+                continue
+            p50, p95, peak = stats
+            print(f"{name:28s} {section.alloc.count:6d} {p50:8d} {p95:8d} {peak:8d} "
+                  f"{section.violations:6d}")
+        print(f"mem_free min: {self.min_free} octets, "
+              f"frames avec collecte: {self.lost_samples}")
+
+    def poll(self):
+        """
+        Traite les commandes série en attente et le rapport périodique.
+        À appeler régulièrement depuis la boucle principale (non bloquant).
+        """
+        line = self._read_line()
+        if line is not None:
+            self.execute(line)
+
+        if self.report_interval:
+            now = time.monotonic()
+            if now - self._last_report >= self.report_interval:
+                self._last_report = now
+                self.report()
+
+    def execute(self, line):
+        """
+        Exécute une commande ("prof", "prof on", "prof 10"...).
+
+        Returns:
+            True si la commande a été reconnue
+        """
+        words = line.strip().split()
+        if not words or words[0] != COMMAND_PREFIX:
+            return False
+        argument = words[1] if len(words) > 1 else ""
+        switch = words[2] if len(words) > 2 else "on"
+        if argument == "":
+            self.report()
+        elif argument == "on":
+            self.set_enabled(True)
+            print("Profilage actif")
+        elif argument == "off":
+            self.set_enabled(False)
+            print("Profilage inactif")
+        elif argument == "reset":
+            self.reset()
+            print("Profil remis à zéro")
+        elif argument in ("mem", "strict"):
+            if not HAS_MEM_INFO:
+                print("Mesure mémoire indisponible (gc.mem_alloc absent)")
+                return True
+            setattr(self, "memory" if argument == "mem" else "strict", switch == "on")
+            self._update_active()
+            print(f"Mémoire: {'active' if self.memory else 'inactive'}, "
+                  f"strict: {'actif' if self.strict else 'inactif'}")
+        else:
+            try:
+                self.report_interval = float(argument)
+                self._last_report = time.monotonic()
+                print(f"Rapport toutes les {self.report_interval:g} s")
+            except ValueError:
+                print(f"Commande inconnue: {line.strip()}")
+        return True
+
+    def _read_line(self):
+        """Lit la console série sans bloquer; retourne une ligne complète ou None."""
+        while _serial_available():
+            char = sys.stdin.read(1)
+            if not char:
+                return None  # Fin de l'entrée (console fermée)
+            if char in ("\n", "\r"):
+                line = self._command
+                self._command = ""
+                if line:
+                    return line
+            elif len(self._command) < MAX_COMMAND_LENGTH:
+                self._command += char
+        return None
+
+
+def _serial_available():
+    """True si un caractère attend sur la console série."""
+    if HAS_SUPERVISOR:
+        return supervisor.runtime.serial_bytes_available
+    try:
+        import select
+        return bool(select.select([sys.stdin], [], [], 0)[0])
+    except (ImportError, OSError, ValueError):
+        return False
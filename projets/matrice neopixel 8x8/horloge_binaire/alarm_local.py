@@ -0,0 +1,92 @@
+"""
+Remplaçant local du module alarm de CircuitPython
+Permet de tester le planificateur d'énergie sans carte (ou sur une
+version de CircuitPython sans alarm) : le sommeil devient un time.sleep
+interrompu par les broches simulées
+"""
+
+import time as _time
+
+TRANCHE_SOMMEIL = 0.005  # Scrutation des broches simulées pendant le sommeil
+
+# Lecteurs des broches simulées: {pin: fonction retournant l'état}
+_lecteurs_broches = {}
+
+wake_alarm = None
+
+
+def simuler_broche(pin, lecteur):
+    """
+    Associe une broche à une fonction de lecture pour les PinAlarm
+
+    Args:
+        pin: Broche (board.GPx)
+        lecteur: Fonction sans argument retournant True/False
+    """
+    _lecteurs_broches[pin] = lecteur
+
+
+class TimeAlarm:
+    """Alarme à une échéance time.monotonic()"""
+
+    def __init__(self, *, monotonic_time=None, epoch_time=None):
+        if monotonic_time is None:
+            monotonic_time = _time.monotonic() + (epoch_time - _time.time())
+        self.monotonic_time = monotonic_time
+
+
+class PinAlarm:
+    """Alarme sur le niveau d'une broche"""
+
+    def __init__(self, pin, value, edge=False, pull=False):
+        self.pin = pin
+        self.value = value
+        self.edge = edge
+        self.pull = pull
+
+    def declenchee(self):
+        """True si la broche simulée est au niveau attendu"""
+        lecteur = _lecteurs_broches.get(self.pin)
+        return lecteur is not None and lecteur() == self.value
+
+
+class _Espace:
+    """Sous-module minimal (alarm.time, alarm.pin)"""
+
+    def __init__(self, **attributs):
+        self.__dict__.update(attributs)
+
+
+time = _Espace(TimeAlarm=TimeAlarm)
+pin = _Espace(PinAlarm=PinAlarm)
+
+
+def light_sleep_until_alarms(*alarms):
+    """
+    Dort jusqu'à la première alarme déclenchée
+
+    Returns:
+        L'alarme qui a réveillé
+    """
+    global wake_alarm
+    alarmes_temps = [a for a in alarms if isinstance(a, TimeAlarm)]
+    alarmes_broche = [a for a in alarms if isinstance(a, PinAlarm)]
+    echeance = min(a.monotonic_time for a in alarmes_temps) if alarmes_temps else None
+
+    while True:
+        for alarme in alarmes_broche:
+            if alarme.declenchee():
+                wake_alarm = alarme
+                return alarme
+
+        maintenant = _time.monotonic()
+        if echeance is not None and maintenant >= echeance:
+            wake_alarm = min(alarmes_temps, key=lambda a: a.monotonic_time)
+            return wake_alarm
+
+        tranche = TRANCHE_SOMMEIL
+        if not alarmes_broche and echeance is not None:
+            tranche = echeance - maintenant
+        elif echeance is not None:
+            tranche = min(tranche, echeance - maintenant)
+        _time.sleep(max(0, tranche))
@@ -5,11 +5,28 @@ Gestion du bouton poussoir
 import time
 from config import Config
 
+try:
+    import keypad
+    HAS_KEYPAD = True
+except ImportError:
+    HAS_KEYPAD = False
+
+MASQUE_TICKS = (1 << 29) - 1  # Horodatage keypad (ms) sur 29 bits
+
 class ButtonManager:
     def __init__(self, hardware):
         self.hardware = hardware
         self.last_press_time = 0
         self.debounce_delay = 0.05  # 50ms pour le debounce
+        
+        # État de la scrutation non bloquante
+        self.debut_appui = None
+        self.appui_long_signale = False
+        
+        # Scrutation en tâche de fond (keypad), sans réveiller la boucle
+        self.touches = None
+        self.evenement = None
+        self.debut_appui_ms = None
     
     def detecter_appui(self):
         """
@@ -41,4 +58,94 @@ class ButtonManager:
                 return "long"
         
         # Appui court détecté
-        return "court"
\ No newline at end of file
+        return "court"
+    
+    def scruter(self, maintenant=None):
+        """
+        Version non bloquante de detecter_appui, à appeler périodiquement
+        L'appui long est signalé dès que la durée est atteinte
+        
+        Returns:
+            str ou None: "court", "long", ou None
+        """
+        if maintenant is None:
+            maintenant = time.monotonic()
+        
+        if self.hardware.get_button_state():
+            if self.debut_appui is None:
+                self.debut_appui = maintenant
+            elif (not self.appui_long_signale and
+                  maintenant - self.debut_appui >= Config.BOUTON_APPUI_LONG):
+                self.appui_long_signale = True
+                return "long"
+            return None
+        
+        if self.debut_appui is None:
+            return None
+        
+        # Relâchement
+        duree = maintenant - self.debut_appui
+        appui_long = self.appui_long_signale
+        self.debut_appui = None
+        self.appui_long_signale = False
+
+        if appui_long or duree < self.debounce_delay:
+            return None
+        return "court"
+    
+    def activer_keypad(self):
+        """
+        Confie la scrutation du bouton au module keypad: les appuis sont
+        horodatés en tâche de fond et lus au prochain réveil de la boucle
+        
+        Returns:
+            bool: False si keypad n'est pas disponible (scrutation classique)
+        """
+        if not HAS_KEYPAD:
+            return False
+        if self.touches is not None:
+            return True  # Déjà actif
+        
+        # La broche doit être libérée pour être scrutée par keypad
+        self.hardware.liberer_bouton()
+        self.touches = keypad.Keys(
+            (self.hardware.broche_bouton(),),
+            value_when_pressed=Config.BOUTON_PULLDOWN,
+            pull=True
+        )
+        self.evenement = keypad.Event()
+        return True
+    
+    def desactiver_keypad(self):
+        """Arrête keypad et rend la broche à la scrutation classique"""
+        if self.touches is None:
+            return
+        self.touches.deinit()
+        self.touches = None
+        self.evenement = None
+        self.debut_appui_ms = None
+        self.hardware.initialize_button()
+    
+    def lire_evenements(self):
+        """
+        Dépile les événements keypad survenus depuis le dernier appel
+        La durée de l'appui vient des horodatages: elle ne dépend pas de
+        l'instant de lecture. Comme detecter_appui, l'appui long est
+        signalé au relâchement.
+        
+        Returns:
+            str ou None: dernier appui terminé ("court", "long"), ou None
+        """
+        type_appui = None
+        evenement = self.evenement
+        while self.touches.events.get_into(evenement):
+            if evenement.pressed:
+                self.debut_appui_ms = evenement.timestamp
+            elif self.debut_appui_ms is not None:
+                duree = ((evenement.timestamp - self.debut_appui_ms) & MASQUE_TICKS) / 1000
+                self.debut_appui_ms = None
+                if duree >= Config.BOUTON_APPUI_LONG:
+                    type_appui = "long"
+                elif duree >= self.debounce_delay:
+                    type_appui = "court"
+        return type_appui
@@ -4,6 +4,8 @@ Avec animation des secondes par déplacement de LED
 """
 
 import time
+DEMARRAGE_NS = time.monotonic_ns()  # Avant les imports (compilés ou .mpy)
+
 from config import Config
 from hardware import Hardware
 from time_utils import TimeManager
@@ -11,6 +13,21 @@ from display import DisplayManager
 from button import ButtonManager
 from state_manager import State, StateManager
 from network import NetworkManager
+from display import ETAPE_TRANSITION
+from energie import PlanificateurEnergie
+
+try:
+    import asyncio
+    from async_runtime import Queue, Runtime, sleep_until
+    HAS_ASYNCIO = True
+except ImportError:
+    HAS_ASYNCIO = False
+
+try:
+    from profiler import Profiler
+    HAS_PROFILER = True
+except ImportError:
+    HAS_PROFILER = False
 
 class BCDClock:
     def __init__(self):
@@ -36,6 +53,15 @@ class BCDClock:
         self.state = StateManager()
         self.network = NetworkManager()
         
+        # Profilage: génération BCD et étapes de fondu, temps et allocations
+        self.profiler = None
+        if HAS_PROFILER and Config.PROFILAGE:
+            self.profiler = Profiler(report_interval=Config.PROFILAGE_RAPPORT,
+                                     memory=Config.PROFILAGE_MEMOIRE,
+                                     strict=Config.PROFILAGE_STRICT)
+            self.profiler.instrument(self.display, "afficher_heure", "horloge_bcd")
+            self.profiler.instrument(self.display, "avancer_transition", "horloge_fondu")
+        
         # Variables d'état
         self.dernier_affichage = None
         self.dernier_sync_ntp = 0
@@ -84,78 +110,392 @@ class BCDClock:
             return False
     
     def executer(self):
-        """Boucle principale de l'application avec animation"""
+        """
+        Boucle principale pilotée par échéances: la boucle dort jusqu'au
+        prochain changement visible (phase d'animation, seconde, étape de
+        transition) ou à la resync NTP, et ne rend l'heure qu'à ces instants
+        Le bouton réveille la boucle (PinAlarm): elle ne le scrute que
+        pendant un appui, pour en mesurer la durée
+        """
+        planificateur = PlanificateurEnergie(self.hardware)
+        self.display.non_bloquant = True
+        
         if Config.DEBUG:
             print("Démarrage de la boucle principale...")
             if Config.ANIMATION_SECONDES:
-                print("Animation des secondes activée: déplacement LED toutes les 0.5s")
+                print(f"Animation des secondes activée: déplacement LED toutes les {Config.DUREE_ANIM_SECONDE}s")
+        
+        prochain_rendu = time.monotonic()
+        self.reinitialiser_reveils()
         
         while True:
             try:
-                # 1. Détecter les appuis sur le bouton
-                type_appui = self.button.detecter_appui()
+                maintenant = time.monotonic()
+                self.reveils += 1
                 
-                if type_appui and Config.DEBUG:
-                    print(f"Appui détecté: {type_appui}")
+                # 1. Bouton: scrutation non bloquante (après un réveil par le bouton)
+                type_appui = self.button.scruter(maintenant)
                 
-                # 2. Gérer les transitions d'état
                 if type_appui:
-                    nouvel_etat, action = self.state.traiter_appui_bouton(type_appui)
-                    
-                    if self.state.transition(nouvel_etat):
-                        if Config.DEBUG:
-                            etat_nom = "AFFICHE" if nouvel_etat == State.AFFICHE else "ETEINT"
-                            print(f"Changement d'état vers: {etat_nom}")
-                        
-                        if nouvel_etat == State.ETEINT:
-                            # Éteindre avec transition
-                            self.display.eteindre(avec_transition=True)
-                        elif nouvel_etat == State.AFFICHE:
-                            # Allumer avec transition
-                            self.display.allumer(self.time_manager, avec_transition=True)
-                            self.dernier_affichage = None
-                    
-                    if action == "resync":
+                    if self.traiter_appui(type_appui) == "resync":
                         if Config.DEBUG:
                             print("Resynchronisation NTP forcée...")
                         self.synchroniser_ntp()
+                    # Allumage (déjà rendu) ou resync: nouvelles échéances
+                    prochain_rendu = self.prochaine_echeance()
                 
-                # 3. Mettre à jour l'affichage selon l'état
-                if self.state.state == State.AFFICHE:
-                    # Vérifier si on doit resynchroniser NTP
+                # 2. Affichage: l'heure à échéance, puis l'étape de transition
+                if self.state.state == State.AFFICHE and not self.display.en_transition:
                     if self.time_manager.besoin_resynchronisation():
                         if Config.DEBUG:
                             print("Resynchronisation périodique NTP...")
-                        self.synchroniser_ntp()
-                    
-                    # Obtenir l'heure actuelle
-                    heures, minutes, secondes, pm = self.time_manager.obtenir_heure_actuelle()
-                    
-                    # Afficher l'heure avec animation
-                    self.display.afficher_heure(self.time_manager, avec_transition=True)
+                        if not self.synchroniser_ntp():
+                            # Réessayer à la prochaine échéance, pas en boucle
+                            self.time_manager.last_ntp_sync = time.monotonic()
                     
-                    # Log chaque changement de minute
-                    if Config.DEBUG and secondes == 0 and self.derniere_seconde != 0:
-                        am_pm = "PM" if pm else "AM"
-                        print(f"Heure affichée: {heures:02d}:{minutes:02d}:{secondes:02d} {am_pm}")
-                    
-                    self.derniere_seconde = secondes
+                    if maintenant >= prochain_rendu:
+                        self.mettre_a_jour_affichage()
+                        self.rendus += 1
+                        prochain_rendu = self.prochaine_echeance()
+                
+                if self.display.en_transition:
+                    self.display.avancer_transition()
+                
+                # 3. Gérer les erreurs réseau
+                self.verifier_reseau()
+                
+                if Config.DEBUG:
+                    self.rapport_reveils_periodique()
+                
+                # 4. Dormir jusqu'à la première échéance ou à l'appui
+                maintenant = time.monotonic()
+                appui_en_cours = self.button.debut_appui is not None
+                if appui_en_cours:
+                    # Mesurer la durée de l'appui
+                    echeance = maintenant + Config.BOUTON_SCRUTATION
+                elif self.display.en_transition:
+                    echeance = maintenant + ETAPE_TRANSITION
+                elif self.state.state == State.AFFICHE:
+                    echeance = min(prochain_rendu,
+                                   self.time_manager.prochaine_synchronisation())
+                else:
+                    echeance = maintenant + Config.SOMMEIL_MAX
+                
+                planificateur.dormir_jusqu_a(echeance, reveil_bouton=not appui_en_cours)
+                
+            except Exception as e:
+                if Config.DEBUG:
+                    print(f"ERREUR dans la boucle principale: {e}")
+                time.sleep(1)  # Pause en cas d'erreur
+    
+    def reinitialiser_reveils(self):
+        """Remet à zéro le compte des réveils et des rendus"""
+        self.reveils = 0
+        self.rendus = 0
+        self.debut_reveils = time.monotonic()
+    
+    def rapport_reveils_periodique(self):
+        """Affiche réveils et rendus par minute toutes les Config.RAPPORT_REVEILS secondes"""
+        if not Config.RAPPORT_REVEILS:
+            return
+        duree = time.monotonic() - self.debut_reveils
+        if duree >= Config.RAPPORT_REVEILS:
+            print(f"Boucle: {self.reveils * 60 / duree:.0f} réveils/min, "
+                  f"{self.rendus * 60 / duree:.0f} rendus/min")
+            self.reinitialiser_reveils()
+    
+    def traiter_appui(self, type_appui):
+        """
+        Applique un appui bouton à la machine d'états
+        
+        Returns:
+            str ou None: action restant à effectuer ("resync")
+        """
+        if Config.DEBUG:
+            print(f"Appui détecté: {type_appui}")
+        
+        nouvel_etat, action = self.state.traiter_appui_bouton(type_appui)
+        
+        if self.state.transition(nouvel_etat):
+            if Config.DEBUG:
+                etat_nom = "AFFICHE" if nouvel_etat == State.AFFICHE else "ETEINT"
+                print(f"Changement d'état vers: {etat_nom}")
+            
+            # Une transition en cours ne doit pas masquer le changement d'état
+            self.display.terminer_transition()
+            
+            if nouvel_etat == State.ETEINT:
+                # Éteindre avec transition
+                self.display.eteindre(avec_transition=True)
+            elif nouvel_etat == State.AFFICHE:
+                # Allumer avec transition
+                self.display.allumer(self.time_manager, avec_transition=True)
+                self.dernier_affichage = None
+        
+        return action
+    
+    def mettre_a_jour_affichage(self):
+        """Affiche l'heure actuelle (état AFFICHE)"""
+        # Obtenir l'heure actuelle
+        heures, minutes, secondes, pm = self.time_manager.obtenir_heure_actuelle()
+        
+        # Afficher l'heure avec animation
+        self.display.afficher_heure(self.time_manager, avec_transition=True)
+        
+        if self.profiler:
+            self.profiler.poll()
+        
+        # Log chaque changement de minute
+        if Config.DEBUG and secondes == 0 and self.derniere_seconde != 0:
+            am_pm = "PM" if pm else "AM"
+            print(f"Heure affichée: {heures:02d}:{minutes:02d}:{secondes:02d} {am_pm}")
+        
+        self.derniere_seconde = secondes
+    
+    def verifier_reseau(self):
+        """Affiche l'erreur en cas de perte de connexion WiFi"""
+        if not self.network.connected and not self.erreur_affichee:
+            self.display.afficher_erreur()
+            self.erreur_affichee = True
+            if Config.DEBUG:
+                print("ERREUR: Perte de connexion WiFi")
+    
+    def prochaine_echeance(self):
+        """
+        Retourne l'instant du prochain changement visible:
+        nouvelle seconde ou changement de phase d'animation
+        """
+        echeance = self.time_manager.prochaine_seconde()
+        phase = self.display.prochaine_phase()
+        if phase is not None and phase < echeance:
+            echeance = phase
+        return echeance
+    
+    # ========================================================================
+    # MODE ÉCONOMIE D'ÉNERGIE
+    # ========================================================================
+    
+    def executer_economie(self):
+        """
+        Boucle principale en sommeil léger: l'horloge dort jusqu'au prochain
+        changement visible (seconde, phase d'animation, étape de transition,
+        resync NTP) et se réveille sur appui bouton
+        """
+        planificateur = PlanificateurEnergie(self.hardware)
+        self.display.non_bloquant = True
+        
+        if Config.DEBUG:
+            print("Démarrage en mode économie d'énergie...")
+        
+        while True:
+            try:
+                # 1. Bouton (scrutation non bloquante)
+                type_appui = self.button.scruter()
+                if type_appui and self.traiter_appui(type_appui) == "resync":
+                    self.synchroniser_ntp()
+                
+                # 2. Affichage
+                if self.display.en_transition:
+                    self.display.avancer_transition()
+                elif self.state.state == State.AFFICHE:
+                    if self.time_manager.besoin_resynchronisation():
+                        if not self.synchroniser_ntp():
+                            # Réessayer à la prochaine échéance, pas en boucle
+                            self.time_manager.last_ntp_sync = time.monotonic()
+                    self.mettre_a_jour_affichage()
+                
+                self.verifier_reseau()
                 
-                # 4. Gérer les erreurs réseau
-                if not self.network.connected and not self.erreur_affichee:
-                    self.display.afficher_erreur()
-                    self.erreur_affichee = True
-                    if Config.DEBUG:
-                        print("ERREUR: Perte de connexion WiFi")
+                if Config.DEBUG:
+                    planificateur.rapport_periodique(self.display.current_buffer)
                 
-                # Pause pour limiter le refresh
-                time.sleep(Config.REFRESH_RATE)
+                # 3. Dormir jusqu'au prochain changement
+                maintenant = time.monotonic()
+                appui_en_cours = self.button.debut_appui is not None
+                if appui_en_cours:
+                    # Mesurer la durée de l'appui
+                    echeance = maintenant + Config.BOUTON_SCRUTATION
+                elif self.display.en_transition:
+                    echeance = maintenant + ETAPE_TRANSITION
+                elif self.state.state == State.AFFICHE:
+                    echeance = min(self.prochaine_echeance(),
+                                   self.time_manager.prochaine_synchronisation())
+                else:
+                    echeance = maintenant + Config.SOMMEIL_MAX
                 
+                planificateur.dormir_jusqu_a(echeance, reveil_bouton=not appui_en_cours)
+            
             except Exception as e:
                 if Config.DEBUG:
                     print(f"ERREUR dans la boucle principale: {e}")
                 time.sleep(1)  # Pause en cas d'erreur
     
+    # ========================================================================
+    # MODE UDP (PIXELS EN TEMPS RÉEL)
+    # ========================================================================
+    
+    def executer_udp(self):
+        """
+        Affiche les pixels reçus en DDP ou E1.31 (udp_stream.py) jusqu'à un
+        appui long, puis rend la matrice à l'horloge
+        La boucle dort dans recv_into: elle se réveille au premier paquet ou
+        pour lire le bouton
+        """
+        # Importés seulement en mode UDP (RAM)
+        from neopixel_matrix_optimized import NeoPixelMatrix
+        from udp_stream import UDPReceiver
+        
+        keypad_actif = self.button.activer_keypad()
+        self.hardware.liberer_matrice()
+        matrice = NeoPixelMatrix(self.hardware.broche_matrice(),
+                                 brightness=Config.MATRICE_LUMINOSITE)
+        recepteur = UDPReceiver(matrice, self.network.obtenir_pool(),
+                                protocol=Config.UDP_PROTOCOLE, port=Config.UDP_PORT,
+                                universe=Config.E131_UNIVERS)
+        attente = Config.REACTIVITE_BOUTON if keypad_actif else Config.REFRESH_RATE
+        
+        if Config.DEBUG:
+            print(f"Mode UDP {Config.UDP_PROTOCOLE}: {self.network.ip_address}:{recepteur.port}")
+        
+        dernier_rapport = time.monotonic()
+        while True:
+            try:
+                recepteur.wait(attente)
+                
+                if keypad_actif:
+                    type_appui = self.button.lire_evenements()
+                else:
+                    type_appui = self.button.scruter()
+                if type_appui == "long":
+                    break
+                
+                if Config.DEBUG and Config.RAPPORT_REVEILS:
+                    maintenant = time.monotonic()
+                    if maintenant - dernier_rapport >= Config.RAPPORT_REVEILS:
+                        recepteur.report()
+                        recepteur.reset_stats()
+                        dernier_rapport = maintenant
+            
+            except Exception as e:
+                if Config.DEBUG:
+                    print(f"ERREUR en mode UDP: {e}")
+                time.sleep(1)  # Pause en cas d'erreur
+        
+        if Config.DEBUG:
+            print("Fin du mode UDP, retour à l'horloge")
+        recepteur.close()
+        self.button.desactiver_keypad()  # Broche rendue au réveil par PinAlarm
+        if matrice.drawing:
+            matrice.end_frame()  # Frame partielle en cours
+        matrice.clear()
+        matrice.pixels.deinit()
+        self.hardware.initialize_neopixel()
+        # Rallumer l'heure en fondu depuis le noir
+        self.display.current_buffer = [(0, 0, 0)] * 64
+        if self.state.state == State.AFFICHE:
+            self.display.allumer(self.time_manager, avec_transition=True)
+    
+    # ========================================================================
+    # RUNTIME ASYNCIO
+    # ========================================================================
+    
+    def tasks(self):
+        """Retourne les tâches de l'horloge pour async_runtime.Runtime"""
+        self.evenements = Queue(maxsize=8)
+        self.reveil_reseau = asyncio.Event()
+        self.reveil_temps = asyncio.Event()
+        self.sync_forcee = False
+        self.display.non_bloquant = True
+        return [
+            self.tache_entrees(),
+            self.tache_temps(),
+            self.tache_rendu(),
+            self.tache_reseau(),
+        ]
+    
+    def stop(self):
+        """Éteint la matrice à l'arrêt du runtime"""
+        self.hardware.cleanup()
+    
+    async def tache_entrees(self):
+        """Scrute le bouton et transmet les appuis à la tâche de rendu"""
+        while True:
+            type_appui = self.button.scruter()
+            if type_appui:
+                self.evenements.put_nowait(type_appui)
+            await asyncio.sleep(Config.BOUTON_SCRUTATION)
+    
+    async def tache_temps(self):
+        """Signale chaque changement visible (seconde, phase d'animation)"""
+        while True:
+            if self.state.state != State.AFFICHE:
+                # Affichage éteint: rien ne change, attendre le changement d'état
+                await self.reveil_temps.wait()
+                self.reveil_temps.clear()
+                continue
+            await sleep_until(self.prochaine_echeance())
+            self.evenements.put_nowait("tic")
+    
+    async def tache_rendu(self):
+        """Traite les événements et rend l'affichage"""
+        while True:
+            if self.display.en_transition:
+                self.display.avancer_transition()
+                echeance = time.monotonic() + ETAPE_TRANSITION
+            else:
+                echeance = time.monotonic() + Config.NTP_SYNC_INTERVAL
+            
+            evenement = await self.evenements.get_until(echeance)
+            try:
+                if evenement in ("court", "long"):
+                    if self.traiter_appui(evenement) == "resync":
+                        self.sync_forcee = True
+                    # Les tâches temps et réseau recalculent leur échéance (état changé)
+                    self.reveil_temps.set()
+                    self.reveil_reseau.set()
+                elif evenement == "tic" and self.state.state == State.AFFICHE:
+                    self.mettre_a_jour_affichage()
+                self.verifier_reseau()
+            except Exception as e:
+                if Config.DEBUG:
+                    print(f"ERREUR dans la tâche de rendu: {e}")
+    
+    async def tache_reseau(self):
+        """Resynchronise NTP à échéance ou sur demande"""
+        while True:
+            if self.state.state == State.AFFICHE:
+                delai = self.time_manager.prochaine_synchronisation() - time.monotonic()
+                if delai > 0:
+                    try:
+                        await asyncio.wait_for(self.reveil_reseau.wait(), delai)
+                    except asyncio.TimeoutError:
+                        pass
+            else:
+                # Pas de resynchronisation périodique quand l'affichage est éteint
+                await self.reveil_reseau.wait()
+            self.reveil_reseau.clear()
+            
+            if self.state.state != State.AFFICHE:
+                continue
+            if not (self.sync_forcee or self.time_manager.besoin_resynchronisation()):
+                continue
+            self.sync_forcee = False
+            
+            if Config.DEBUG:
+                print("Resynchronisation NTP...")
+            # Appel réseau bloquant (adafruit_ntp n'est pas asynchrone)
+            if not self.synchroniser_ntp():
+                # Éviter de réessayer en boucle après un échec
+                self.time_manager.last_ntp_sync = time.monotonic()
+    
+    def executer_async(self):
+        """Boucle principale avec le runtime asyncio"""
+        if Config.DEBUG:
+            print("Démarrage du runtime asyncio...")
+        runtime = Runtime()
+        runtime.add_app(self)
+        runtime.run()
+    
     def synchroniser_ntp(self):
         """Synchronise avec le serveur NTP"""
         ntp_time = self.network.resynchroniser()
@@ -179,14 +519,25 @@ class BCDClock:
 def main():
     """Point d'entrée principal"""
     horloge = BCDClock()
+    if Config.DEBUG:
+        print(f"Modules et matériel prêts en {(time.monotonic_ns() - DEMARRAGE_NS) / 1e6:.0f} ms")
     
     # Initialisation
     if not horloge.initialiser_systeme():
         if Config.DEBUG:
             print("Échec initialisation, démarrage en mode erreur")
     
+    # Mode UDP (sans WiFi: directement l'horloge en erreur)
+    if Config.MODE_UDP and horloge.network.connected:
+        horloge.executer_udp()
+    
     # Boucle principale
-    horloge.executer()
+    if Config.RUNTIME_ASYNC and HAS_ASYNCIO:
+        horloge.executer_async()
+    elif Config.MODE_ECONOMIE:
+        horloge.executer_economie()
+    else:
+        horloge.executer()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
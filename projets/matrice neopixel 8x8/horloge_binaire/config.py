@@ -21,11 +21,33 @@ class Config:
     BOUTON_PIN = 1
     BOUTON_PULLDOWN = True
     BOUTON_APPUI_LONG = 1.5  # secondes
+    BOUTON_SCRUTATION = 0.01  # Scrutation du bouton (asyncio, et pendant un appui)
     
     # Affichage
     FORMAT_12H = True
     AFFICHER_SECONDES = True
-    REFRESH_RATE = 0.05  # 50ms
+    REFRESH_RATE = 0.05  # Mode UDP: scrutation du bouton quand keypad est absent (50ms)
+    REACTIVITE_BOUTON = 0.5  # Mode UDP: attente max entre deux lectures keypad (s)
+    RAPPORT_REVEILS = 60  # Réveils et rendus par minute (secondes, si DEBUG, 0 = jamais)
+    RUNTIME_ASYNC = False  # True: runtime asyncio (async_runtime.py)
+    
+    # Économie d'énergie (sommeil léger entre deux changements visibles)
+    MODE_ECONOMIE = False
+    SOMMEIL_MIN = 0.02         # En dessous, simple time.sleep
+    SOMMEIL_MAX = 60           # Réveil de sécurité quand l'affichage est éteint
+    RAPPORT_ENERGIE = 60       # Rapport d'activité (secondes, si DEBUG)
+    # Estimations pour le rapport (à ajuster au multimètre)
+    COURANT_ACTIF_MA = 45      # Pico W éveillé, WiFi associé
+    COURANT_SOMMEIL_MA = 12    # Pico W en sommeil léger
+    COURANT_LED_REPOS_MA = 0.6 # Par LED WS2812 éteinte
+    COURANT_CANAL_MA = 20      # Par canal à 255 (avant luminosité)
+    
+    # Mode UDP: la matrice affiche les pixels envoyés par le réseau
+    # (xLights, LedFx, udp_sender.py...), appui long: retour à l'horloge
+    MODE_UDP = False
+    UDP_PROTOCOLE = "ddp"      # "ddp" (port 4048) ou "e131" (sACN, port 5568)
+    UDP_PORT = None            # None: port du protocole
+    E131_UNIVERS = 1           # Premier univers E1.31 de la matrice
     
     # Animation des secondes
     ANIMATION_SECONDES = True      # Activer l'animation
@@ -49,4 +71,10 @@ class Config:
     EFFET_TRANSITION = "crossfade"  # "crossfade", "vague", "balayage"
     
     # Debug
-    DEBUG = True
\ No newline at end of file
+    DEBUG = True
+    
+    # Profilage du rendu (profiler.py à copier avec code.py, commande série "prof")
+    PROFILAGE = False
+    PROFILAGE_MEMOIRE = False  # Allocations par frame (gc.mem_alloc)
+    PROFILAGE_STRICT = False   # GC coupé pendant le rendu, allocations signalées
+    PROFILAGE_RAPPORT = 0      # Rapport périodique (secondes, 0 = sur commande)
\ No newline at end of file
@@ -7,12 +7,23 @@ import time
 import math
 from config import Config
 
+ETAPE_TRANSITION = 0.02  # 20ms par étape de transition
+NOIR = (0, 0, 0)
+
 class DisplayManager:
     def __init__(self, hardware):
         self.hardware = hardware
         self.last_display = None
-        self.current_buffer = [(0, 0, 0)] * 64
+        # Réserve de buffers pour generer_buffer_bcd (rendu sans allocation)
+        self._buffers = ([NOIR] * 64, [NOIR] * 64, [NOIR] * 64)
+        self._buffer_ancien = [NOIR] * 64
+        self.current_buffer = self._buffers[0]
         self.en_transition = False
+        self.non_bloquant = False  # True: transitions avancées par la boucle
+        self.transition_ancien = self.current_buffer
+        self.transition_nouveau = self.current_buffer
+        self.transition_etapes = 1
+        self.transition_etape = 0
         
         # Animation des secondes
         self.animation_seconde_active = False
@@ -41,107 +52,91 @@ class DisplayManager:
         Avec animation des secondes par déplacement de LED
         
         animation_phase: 0 = début de seconde, 1 = milieu de seconde
-        """
-        buffer = [(0, 0, 0)] * 64
         
-        # Déterminer les couleurs
-        heure_24h = (timestamp % 86400) // 3600
-        couleur_base = self.choisir_couleur_base(heure_24h)
+        timestamp: conservé pour compatibilité (l'heure 0-23 est déduite
+        de heures et est_pm)
         
-        # Fonctions spécialisées pour chaque type de colonne
-        def ajouter_chiffre_large(chiffre, bits, colonne_debut, couleur):
-            """
-            Ajoute un chiffre BCD sur 2 colonnes (heures, minutes)
-            Chaque bit allume 2x2 LEDs (carré de 4 LEDs)
-            """
-            for bit in range(bits):
-                if (chiffre >> bit) & 1:  # Vérifier si le bit est à 1
-                    # Allumer un carré de 2x2 LEDs pour ce bit
-                    for row in range(bit * 2, bit * 2 + 2):
-                        for col_offset in range(2):
-                            col = colonne_debut + col_offset
-                            idx = self.coords_to_index(col, row)
-                            if idx is not None:
-                                buffer[idx] = couleur
-        
-        def ajouter_chiffre_etroit(chiffre, bits, colonne, couleur):
-            """
-            Ajoute un chiffre BCD sur 1 colonne (secondes)
-            Chaque bit allume 2 LEDs superposées
-            """
-            for bit in range(bits):
-                if (chiffre >> bit) & 1:  # Vérifier si le bit est à 1
-                    # Allumer 2 LEDs superposées pour ce bit
-                    for row in range(bit * 2, bit * 2 + 2):
-                        idx = self.coords_to_index(colonne, row)
-                        if idx is not None:
-                            buffer[idx] = couleur
+        Le buffer est pris dans une réserve de buffers préalloués (ni
+        affiché ni cible d'une transition) : aucune allocation par appel.
+        L'appelant ne doit pas conserver un buffer au-delà de l'appel
+        suivant, sauf s'il devient current_buffer.
+        """
+        buffer = self._buffer_libre()
+        for i in range(64):
+            buffer[i] = NOIR
         
-        def ajouter_chiffre_etroit_anime(chiffre, bits, colonne, couleur, couleur_anim, phase):
-            """
-            Ajoute un chiffre BCD sur 1 colonne (secondes) avec animation
-            phase: 0 = LED du bas, 1 = LED du haut pour l'animation
-            """
-            for bit in range(bits):
-                if (chiffre >> bit) & 1:  # Vérifier si le bit est à 1
-                    # Allumer 2 LEDs superposées pour ce bit
-                    for row in range(bit * 2, bit * 2 + 2):
-                        idx = self.coords_to_index(colonne, row)
-                        if idx is not None:
-                            # Animation: alterner entre couleur normale et couleur animée
-                            if Config.ANIMATION_SECONDES and phase == 0:
-                                # Phase 0: LED du bas en couleur animée
-                                if row == bit * 2:  # LED du bas
-                                    buffer[idx] = couleur_anim
-                                else:  # LED du haut
-                                    buffer[idx] = couleur
-                            elif Config.ANIMATION_SECONDES and phase == 1:
-                                # Phase 1: LED du haut en couleur animée
-                                if row == bit * 2 + 1:  # LED du haut
-                                    buffer[idx] = couleur_anim
-                                else:  # LED du bas
-                                    buffer[idx] = couleur
-                            else:
-                                # Pas d'animation
-                                buffer[idx] = couleur
+        # Déterminer les couleurs (heure 0-23 recalculée sans le timestamp,
+        # dont les opérations allouent des entiers longs)
+        if Config.FORMAT_12H:
+            heure_24h = heures % 12 + (12 if est_pm else 0)
+        else:
+            heure_24h = heures
+        couleur_base = self.choisir_couleur_base(heure_24h)
         
         # 1. Heures (colonnes 0-1, 4 bits) - colonnes larges
-        ajouter_chiffre_large(heures, 4, 0, couleur_base)
+        self._ajouter_chiffre_large(buffer, heures, 4, 0, couleur_base)
         
         # 2. Dizaines de minutes (colonnes 2-3, 3 bits) - colonnes larges
         dizaines_minutes = minutes // 10
-        ajouter_chiffre_large(dizaines_minutes, 3, 2, couleur_base)
+        self._ajouter_chiffre_large(buffer, dizaines_minutes, 3, 2, couleur_base)
         
         # 3. Unités de minutes (colonnes 4-5, 4 bits) - colonnes larges
         unites_minutes = minutes % 10
-        ajouter_chiffre_large(unites_minutes, 4, 4, couleur_base)
+        self._ajouter_chiffre_large(buffer, unites_minutes, 4, 4, couleur_base)
         
         # 4. Secondes (1 colonne chacune) - colonnes étroites
         if Config.AFFICHER_SECONDES:
-            # Dizaines de secondes (colonne 6, 3 bits)
-            dizaines_secondes = secondes // 10
+            # Animation: une LED sur deux en couleur animée (bas en phase 0,
+            # haut en phase 1)
+            phase = animation_phase if Config.ANIMATION_SECONDES else -1
             
-            if Config.ANIMATION_SECONDES:
-                ajouter_chiffre_etroit_anime(dizaines_secondes, 3, 6, 
-                                           Config.COULEUR_SECONDES,
-                                           Config.COULEUR_SECONDES_ANIM,
-                                           animation_phase)
-            else:
-                ajouter_chiffre_etroit(dizaines_secondes, 3, 6, Config.COULEUR_SECONDES)
+            # Dizaines de secondes (colonne 6, 3 bits)
+            self._ajouter_chiffre_etroit(buffer, secondes // 10, 3, 6, phase)
             
             # Unités de secondes (colonne 7, 4 bits)
-            unites_secondes = secondes % 10
-            
-            if Config.ANIMATION_SECONDES:
-                ajouter_chiffre_etroit_anime(unites_secondes, 4, 7,
-                                           Config.COULEUR_SECONDES,
-                                           Config.COULEUR_SECONDES_ANIM,
-                                           animation_phase)
-            else:
-                ajouter_chiffre_etroit(unites_secondes, 4, 7, Config.COULEUR_SECONDES)
+            self._ajouter_chiffre_etroit(buffer, secondes % 10, 4, 7, phase)
         
         return buffer
     
+    def _buffer_libre(self):
+        """Retourne un buffer de la réserve ni affiché ni en transition"""
+        for buffer in self._buffers:
+            if buffer is not self.current_buffer and not (
+                    self.en_transition and buffer is self.transition_nouveau):
+                return buffer
+        return self._buffers[0]
+    
+    def _ajouter_chiffre_large(self, buffer, chiffre, bits, colonne_debut, couleur):
+        """
+        Ajoute un chiffre BCD sur 2 colonnes (heures, minutes)
+        Chaque bit allume 2x2 LEDs (carré de 4 LEDs)
+        """
+        for bit in range(bits):
+            if (chiffre >> bit) & 1:  # Vérifier si le bit est à 1
+                # Allumer un carré de 2x2 LEDs pour ce bit
+                for row in range(bit * 2, bit * 2 + 2):
+                    for col_offset in range(2):
+                        idx = self.coords_to_index(colonne_debut + col_offset, row)
+                        if idx is not None:
+                            buffer[idx] = couleur
+    
+    def _ajouter_chiffre_etroit(self, buffer, chiffre, bits, colonne, phase):
+        """
+        Ajoute un chiffre BCD sur 1 colonne (secondes)
+        Chaque bit allume 2 LEDs superposées
+        phase: 0 = LED du bas animée, 1 = LED du haut animée, -1 = sans animation
+        """
+        for bit in range(bits):
+            if (chiffre >> bit) & 1:  # Vérifier si le bit est à 1
+                # Allumer 2 LEDs superposées pour ce bit
+                for row in range(bit * 2, bit * 2 + 2):
+                    idx = self.coords_to_index(colonne, row)
+                    if idx is not None:
+                        if row == bit * 2 + phase:
+                            buffer[idx] = Config.COULEUR_SECONDES_ANIM
+                        else:
+                            buffer[idx] = Config.COULEUR_SECONDES
+    
     def animation_seconde_update(self):
         """
         Met à jour l'animation des secondes
@@ -203,48 +198,81 @@ class DisplayManager:
         """
         Transition CROSSFADE simultanée
         L'ancien fade out pendant que le nouveau fade IN
+        En mode non bloquant, la transition est seulement démarrée :
+        avancer_transition() doit être appelée toutes les ETAPE_TRANSITION
         """
         if self.en_transition or duree <= 0:
             self.current_buffer = buffer_nouveau
             self._appliquer_buffer()
             return
         
+        self.demarrer_transition(buffer_nouveau, duree)
+        if self.non_bloquant:
+            return
+        
+        while self.avancer_transition():
+            time.sleep(ETAPE_TRANSITION)
+    
+    def demarrer_transition(self, buffer_nouveau, duree):
+        """Prépare une transition crossfade sans l'afficher"""
         self.en_transition = True
-        buffer_ancien = self.current_buffer.copy()
+        # Copie dans un buffer préalloué plutôt que current_buffer.copy()
+        ancien = self._buffer_ancien
+        courant = self.current_buffer
+        for i in range(64):
+            ancien[i] = courant[i]
+        self.transition_ancien = ancien
+        self.transition_nouveau = buffer_nouveau
+        self.transition_etapes = max(1, int(duree / ETAPE_TRANSITION))
+        self.transition_etape = 0
+    
+    def avancer_transition(self):
+        """
+        Affiche l'étape suivante de la transition en cours
+        Retourne True s'il reste des étapes à afficher
+        """
+        if not self.en_transition:
+            return False
         
-        ETAPE = 0.02  # 20ms par étape
-        nb_etapes = max(1, int(duree / ETAPE))
+        # Facteur entier sur 256: aucun flottant ni tuple alloué par LED
+        facteur = self.transition_etape * 256 // self.transition_etapes
+        inverse = 256 - facteur
+        buffer_ancien = self.transition_ancien
+        buffer_nouveau = self.transition_nouveau
+        pixels = self.hardware.pixels
         
-        for etape in range(nb_etapes + 1):
-            facteur = etape / nb_etapes
-            
-            # Pour chaque LED, mélanger ancien et nouveau
-            for i in range(64):
-                r1, g1, b1 = buffer_ancien[i]
-                r2, g2, b2 = buffer_nouveau[i]
-                
-                # Ancien: fade OUT (1 -> 0)
-                r_out = int(r1 * (1 - facteur))
-                g_out = int(g1 * (1 - facteur))
-                b_out = int(b1 * (1 - facteur))
-                
-                # Nouveau: fade IN (0 -> 1)
-                r_in = int(r2 * facteur)
-                g_in = int(g2 * facteur)
-                b_in = int(b2 * facteur)
-                
-                # Combiner les deux
-                self.hardware.pixels[i] = (
-                    min(255, r_out + r_in),
-                    min(255, g_out + g_in),
-                    min(255, b_out + b_in)
-                )
-            
-            self.hardware.pixels.show()
-            time.sleep(ETAPE)
+        # Pour chaque LED, mélanger ancien (fade OUT) et nouveau (fade IN)
+        for i in range(64):
+            r1, g1, b1 = buffer_ancien[i]
+            r2, g2, b2 = buffer_nouveau[i]
+            pixels[i] = (((r1 * inverse + r2 * facteur) >> 8) << 16 |
+                         ((g1 * inverse + g2 * facteur) >> 8) << 8 |
+                         (b1 * inverse + b2 * facteur) >> 8)
         
-        self.current_buffer = buffer_nouveau
-        self.en_transition = False
+        self.hardware.pixels.show()
+        
+        self.transition_etape += 1
+        if self.transition_etape > self.transition_etapes:
+            self.current_buffer = buffer_nouveau
+            self.en_transition = False
+            return False
+        return True
+    
+    def terminer_transition(self):
+        """Termine immédiatement la transition en cours (état final affiché)"""
+        if self.en_transition:
+            self.current_buffer = self.transition_nouveau
+            self.en_transition = False
+            self._appliquer_buffer()
+    
+    def prochaine_phase(self):
+        """
+        Retourne l'instant (time.monotonic()) du prochain changement de
+        phase d'animation, ou None si l'animation est désactivée
+        """
+        if not Config.ANIMATION_SECONDES:
+            return None
+        return self.last_animation_time + Config.DUREE_ANIM_SECONDE
     
     def afficher_heure(self, time_manager, avec_transition=True):
         """
@@ -0,0 +1,112 @@
+"""
+Planificateur d'énergie: sommeil léger jusqu'au prochain changement visible
+Réveil par alarme temporelle (seconde, phase d'animation, NTP) ou par le bouton
+"""
+
+import time
+from config import Config
+
+try:
+    import alarm
+    HAS_ALARM = True
+except ImportError:
+    import alarm_local as alarm
+    HAS_ALARM = False
+
+class PlanificateurEnergie:
+    def __init__(self, hardware):
+        self.hardware = hardware
+        self.reinitialiser_mesures()
+
+    def reinitialiser_mesures(self):
+        """Remet à zéro les statistiques de cycle d'activité"""
+        self.debut_mesure = time.monotonic()
+        self.temps_sommeil = 0.0
+        self.reveils = 0
+        self.reveils_bouton = 0
+        self.dernier_rapport = self.debut_mesure
+
+    def dormir_jusqu_a(self, echeance, reveil_bouton=True):
+        """
+        Dort jusqu'à l'échéance (time.monotonic())
+
+        Args:
+            echeance: Instant du prochain changement à afficher
+            reveil_bouton: Réveil anticipé sur appui bouton (PinAlarm)
+
+        Returns:
+            bool: True si le réveil vient du bouton
+        """
+        debut = time.monotonic()
+        duree = echeance - debut
+        if duree <= 0:
+            return False
+
+        par_bouton = False
+        if duree < Config.SOMMEIL_MIN:
+            # Trop court pour justifier la reconfiguration des broches
+            time.sleep(duree)
+        else:
+            alarmes = [alarm.time.TimeAlarm(monotonic_time=echeance)]
+            if reveil_bouton:
+                # La broche doit être libérée pour devenir une source de réveil
+                self.hardware.liberer_bouton()
+                alarmes.append(alarm.pin.PinAlarm(
+                    self.hardware.broche_bouton(),
+                    value=Config.BOUTON_PULLDOWN,
+                    pull=True
+                ))
+
+            reveil = alarm.light_sleep_until_alarms(*alarmes)
+
+            if reveil_bouton:
+                self.hardware.initialize_button()
+                par_bouton = isinstance(reveil, alarm.pin.PinAlarm)
+
+        self.temps_sommeil += time.monotonic() - debut
+        self.reveils += 1
+        if par_bouton:
+            self.reveils_bouton += 1
+        return par_bouton
+
+    def cycle_activite(self):
+        """Retourne la fraction du temps passée éveillée (0.0 à 1.0)"""
+        total = time.monotonic() - self.debut_mesure
+        if total <= 0:
+            return 1.0
+        return max(0.0, min(1.0, 1 - self.temps_sommeil / total))
+
+    def courant_leds(self, buffer):
+        """
+        Estime le courant des LEDs (mA) pour un buffer affiché
+        Repos de chaque LED + courant par canal proportionnel à la couleur
+        """
+        somme = 0
+        for r, g, b in buffer:
+            somme += r + g + b
+        return (len(buffer) * Config.COURANT_LED_REPOS_MA +
+                somme / 255 * Config.COURANT_CANAL_MA * Config.MATRICE_LUMINOSITE)
+
+    def courant_moyen(self, buffer):
+        """Estime le courant moyen total (mA) depuis le début des mesures"""
+        activite = self.cycle_activite()
+        courant_cpu = (activite * Config.COURANT_ACTIF_MA +
+                       (1 - activite) * Config.COURANT_SOMMEIL_MA)
+        return courant_cpu + self.courant_leds(buffer)
+
+    def rapport(self, buffer):
+        """Affiche le cycle d'activité et le courant moyen estimé"""
+        total = time.monotonic() - self.debut_mesure
+        reveils_minute = self.reveils * 60 / total if total > 0 else 0
+        print(f"Énergie: activité {self.cycle_activite() * 100:.1f}%, "
+              f"{reveils_minute:.0f} réveils/min "
+              f"({self.reveils_bouton} par le bouton), "
+              f"courant moyen estimé {self.courant_moyen(buffer):.1f} mA"
+              f"{'' if HAS_ALARM else ' [alarm simulé]'}")
+
+    def rapport_periodique(self, buffer):
+        """Affiche le rapport toutes les Config.RAPPORT_ENERGIE secondes"""
+        maintenant = time.monotonic()
+        if maintenant - self.dernier_rapport >= Config.RAPPORT_ENERGIE:
+            self.dernier_rapport = maintenant
+            self.rapport(buffer)
@@ -21,7 +21,7 @@ class Hardware:
     def initialize_neopixel(self):
         """Initialise la matrice NeoPixel"""
         self.pixels = neopixel.NeoPixel(
-            getattr(board, f"GP{Config.MATRICE_PIN}"),
+            self.broche_matrice(),
             Config.MATRICE_LEDS,
             brightness=Config.MATRICE_LUMINOSITE,
             auto_write=False,
@@ -30,13 +30,35 @@ class Hardware:
         self.pixels.fill((0, 0, 0))
         self.pixels.show()
     
+    def broche_matrice(self):
+        """Retourne la broche de la matrice"""
+        return getattr(board, f"GP{Config.MATRICE_PIN}")
+    
+    def liberer_matrice(self):
+        """Éteint et libère la broche de la matrice (pour NeoPixelMatrix)"""
+        if self.pixels:
+            self.pixels.fill((0, 0, 0))
+            self.pixels.show()
+            self.pixels.deinit()
+            self.pixels = None
+    
+    def broche_bouton(self):
+        """Retourne la broche du bouton"""
+        return getattr(board, f"GP{Config.BOUTON_PIN}")
+    
     def initialize_button(self):
         """Initialise le bouton poussoir"""
-        self.button = digitalio.DigitalInOut(getattr(board, f"GP{Config.BOUTON_PIN}"))
+        self.button = digitalio.DigitalInOut(self.broche_bouton())
         self.button.direction = digitalio.Direction.INPUT
         if Config.BOUTON_PULLDOWN:
             self.button.pull = digitalio.Pull.DOWN
     
+    def liberer_bouton(self):
+        """Libère la broche du bouton (pour une alarme de réveil)"""
+        if self.button:
+            self.button.deinit()
+            self.button = None
+    
     def get_button_state(self):
         """Retourne l'état actuel du bouton"""
         return self.button.value if self.button else False
@@ -47,6 +47,12 @@ class NetworkManager:
             self.connected = False
             return False
     
+    def obtenir_pool(self):
+        """Retourne le SocketPool du WiFi (créé au premier appel)"""
+        if self.pool is None:
+            self.pool = socketpool.SocketPool(wifi.radio)
+        return self.pool
+    
     def initialiser_ntp(self):
         """Initialise le client NTP"""
         if not self.connected:
@@ -55,9 +61,8 @@ class NetworkManager:
             return False
         
         try:
-            self.pool = socketpool.SocketPool(wifi.radio)
             self.ntp_client = adafruit_ntp.NTP(
-                self.pool,
+                self.obtenir_pool(),
                 server=Config.NTP_SERVER
             )
             
@@ -111,6 +111,17 @@ class TimeManager:
             # Format 24h: est_pm est toujours False
             return heures, minutes, secondes, False
     
+    def prochaine_seconde(self):
+        """
+        Retourne l'instant (time.monotonic()) où la seconde affichée changera
+        """
+        temps_ecoule = time.monotonic() - self.monotonic_reference
+        return self.monotonic_reference + int(temps_ecoule) + 1
+    
+    def prochaine_synchronisation(self):
+        """Retourne l'instant (time.monotonic()) de la prochaine resync NTP"""
+        return self.last_ntp_sync + Config.NTP_SYNC_INTERVAL
+    
     def besoin_resynchronisation(self):
         """Vérifie si une resynchronisation NTP est nécessaire"""
         return time.monotonic() - self.last_ntp_sync >= Config.NTP_SYNC_INTERVAL
\ No newline at end of file
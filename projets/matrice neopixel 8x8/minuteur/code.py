@@ -4,6 +4,7 @@ import digitalio
 import time
 import random
 import sys
+import os
 
 try:
     import toml
@@ -12,7 +13,52 @@ except ImportError:
     print("Avertissement: module toml non trouvé, utilisation des valeurs par défaut")
     HAS_TOML = False
 
+try:
+    from heapq import heappush, heappop
+except ImportError:
+    # Sans module heapq (selon le firmware): tas binaire minimal
+    def heappush(tas, element):
+        tas.append(element)
+        i = len(tas) - 1
+        while i:
+            parent = (i - 1) >> 1
+            if not element < tas[parent]:
+                break
+            tas[i] = tas[parent]
+            i = parent
+        tas[i] = element
+
+    def heappop(tas):
+        dernier = tas.pop()
+        if not tas:
+            return dernier
+        tete = tas[0]
+        n = len(tas)
+        i = 0
+        while True:
+            enfant = 2 * i + 1
+            if enfant >= n:
+                break
+            if enfant + 1 < n and tas[enfant + 1] < tas[enfant]:
+                enfant += 1
+            if not tas[enfant] < dernier:
+                break
+            tas[i] = tas[enfant]
+            i = enfant
+        tas[i] = dernier
+        return tete
+
+try:
+    import asyncio
+    from async_runtime import Queue, Runtime
+    HAS_ASYNCIO = True
+except ImportError:
+    HAS_ASYNCIO = False
+
 # ===== CHARGEMENT CONFIGURATION =====
+FICHIER_TOML = '/config.toml'
+MODULE_FIGE = 'config_minuteur'  # Constantes plates générées par mpy_build.py
+
 CONFIG_DEFAUT = {
     "system": {"nom": "Minuteur BCD", "debug": True},
     "matrice": {"pin": 0, "nombre_leds": 64, "lignes": 8, "colonnes": 8, 
@@ -41,109 +87,170 @@ CONFIG_DEFAUT = {
     "animation": {
         "clignotement_rapide": 0.1,
         "extinction_facteur": 0.95,
-        "etapes_extinction": 20
-    }
+        "etapes_extinction": 20,
+        "cadence_explosion": 30
+    },
+    # Minuteurs nommés en plus du principal ([timer], couleur normale)
+    "minuteurs": {"noms": [], "durees": [], "couleurs": [], "rotation": 3.0},
+    "runtime": {"async": False, "scrutation_bouton": 0.01}
 }
 
-def charger_configuration():
-    """Charge la configuration depuis config.toml ou utilise les valeurs par défaut"""
+def aplatir(defaut, utilisateur, prefixe="", rejets=None):
+    """
+    Fusionne la configuration utilisateur avec les valeurs par défaut en un
+    dictionnaire plat : timer.duree_initiale devient "TIMER_DUREE_INITIALE",
+    une couleur {r, g, b} et une liste deviennent des tuples (une liste
+    vide par défaut accepte toute longueur).
+    Une clé inconnue ou un type différent du défaut lève ValueError, ou,
+    avec une liste rejets, y est signalé et la clé garde sa valeur par
+    défaut (les autres clés sont conservées).
+    """
+    def rejeter(message):
+        if rejets is None:
+            raise ValueError(message)
+        rejets.append(message)
+    
+    for cle in utilisateur:
+        if cle not in defaut:
+            rejeter(f"clé inconnue: {prefixe}{cle.upper()}")
+    resultat = {}
+    for cle, valeur_defaut in defaut.items():
+        nom = prefixe + cle.upper()
+        valeur = utilisateur.get(cle, valeur_defaut)
+        if isinstance(valeur_defaut, dict):
+            if not isinstance(valeur, dict):
+                rejeter(f"section attendue: {nom}")
+                valeur = {}
+            section = aplatir(valeur_defaut, valeur, nom + "_", rejets)
+            if sorted(valeur_defaut) == ["b", "g", "r"]:
+                resultat[nom] = (section[nom + "_R"], section[nom + "_G"], section[nom + "_B"])
+            else:
+                resultat.update(section)
+            continue
+        if isinstance(valeur_defaut, list):
+            if not isinstance(valeur, list):
+                rejeter(f"liste attendue: {nom}")
+                valeur = valeur_defaut
+            elif valeur_defaut and len(valeur) != len(valeur_defaut):
+                rejeter(f"liste de {len(valeur_defaut)} valeurs attendue: {nom}")
+                valeur = valeur_defaut
+            resultat[nom] = tuple(tuple(v) if isinstance(v, list) else v for v in valeur)
+        elif isinstance(valeur_defaut, float) and type(valeur) is int:
+            resultat[nom] = float(valeur)
+        elif type(valeur) is not type(valeur_defaut):
+            rejeter(f"{type(valeur_defaut).__name__} attendu: {nom}")
+            resultat[nom] = valeur_defaut
+        else:
+            resultat[nom] = valeur
+    return resultat
+
+def date_modification(chemin):
+    """Date de modification d'un fichier, None s'il n'existe pas"""
+    try:
+        return os.stat(chemin)[8]
+    except OSError:
+        return None
+
+def charger_config_figee():
+    """Constantes du module figé, None s'il est absent ou plus ancien que config.toml"""
+    for extension in (".mpy", ".py"):
+        date_figee = date_modification(f"/{MODULE_FIGE}{extension}")
+        if date_figee is not None:
+            break
+    else:
+        return None
+    date_toml = date_modification(FICHIER_TOML)
+    if date_toml is not None and date_toml > date_figee:
+        return None  # config.toml modifié depuis la construction
+    module = __import__(MODULE_FIGE)
+    return {nom: getattr(module, nom) for nom in dir(module) if nom.isupper()}
+
+def charger_toml():
+    """Lit et valide config.toml, ou utilise les valeurs par défaut"""
     if not HAS_TOML:
-        return CONFIG_DEFAUT
+        return aplatir(CONFIG_DEFAUT, {}), "défaut"
     
     try:
-        with open('/config.toml', 'r') as f:
-            config = toml.load(f)
-        
-        # Fusionner avec les valeurs par défaut pour les champs manquants
-        config_final = fusionner_configurations(CONFIG_DEFAUT, config)
-        
-        if config_final["system"]["debug"]:
-            print("Configuration chargée avec succès")
-            print(f"Timer: {config_final['timer']['duree_initiale']} secondes")
-        
-        return config_final
-        
+        with open(FICHIER_TOML, 'r') as f:
+            utilisateur = toml.load(f)
     except Exception as e:
         print(f"Erreur chargement config: {e}, utilisation valeurs par défaut")
-        return CONFIG_DEFAUT
-
-def fusionner_configurations(defaut, utilisateur):
-    """Fusionne récursivement deux dictionnaires de configuration"""
-    resultat = defaut.copy()
-    for cle, valeur in utilisateur.items():
-        if cle in resultat and isinstance(resultat[cle], dict) and isinstance(valeur, dict):
-            resultat[cle] = fusionner_configurations(resultat[cle], valeur)
-        else:
-            resultat[cle] = valeur
-    return resultat
+        return aplatir(CONFIG_DEFAUT, {}), "défaut"
+    
+    # Clé par clé: une valeur invalide ne fait pas perdre les autres
+    rejets = []
+    config = aplatir(CONFIG_DEFAUT, utilisateur, "", rejets)
+    for message in rejets:
+        print(f"config.toml, valeur ignorée ({message})")
+    return config, FICHIER_TOML
+
+def charger_configuration():
+    """
+    Charge la configuration (dictionnaire plat, voir aplatir()) : le module
+    figé par mpy_build.py tant que config.toml n'a pas été modifié depuis,
+    sinon config.toml, sinon les valeurs par défaut
+    """
+    debut = time.monotonic_ns()
+    config_finale = charger_config_figee()
+    source = MODULE_FIGE
+    if config_finale is None:
+        config_finale, source = charger_toml()
+    
+    if config_finale["SYSTEM_DEBUG"]:
+        print(f"Configuration chargée ({source}) en {(time.monotonic_ns() - debut) / 1e6:.1f} ms")
+        print(f"Timer: {config_finale['TIMER_DUREE_INITIALE']} secondes")
+    
+    return config_finale
 
 # Charger la configuration
 config = charger_configuration()
 
 # ===== VARIABLES DE CONFIGURATION =====
-DUREE_TIMER = config["timer"]["duree_initiale"]
-DUREE_EXPLOSION = config["timer"]["duree_explosion"]
-APPUI_LONG = config["bouton"]["appui_long_duree"]
-DUREE_FADE_SECONDE = config["transitions"]["seconde"]
-DUREE_FADE_MINUTE = config["transitions"]["minute"]
-DUREE_FADE_HEURE = config["transitions"]["heure"]
-DUREE_FADE_ETAT = config["transitions"]["etat"]
-DUREE_ETAPE = config["transitions"]["etape"]
+DUREE_TIMER = config["TIMER_DUREE_INITIALE"]
+DUREE_EXPLOSION = config["TIMER_DUREE_EXPLOSION"]
+APPUI_LONG = config["BOUTON_APPUI_LONG_DUREE"]
+DUREE_FADE_SECONDE = config["TRANSITIONS_SECONDE"]
+DUREE_FADE_MINUTE = config["TRANSITIONS_MINUTE"]
+DUREE_FADE_HEURE = config["TRANSITIONS_HEURE"]
+DUREE_FADE_ETAT = config["TRANSITIONS_ETAT"]
+DUREE_ETAPE = config["TRANSITIONS_ETAPE"]
 
 # Couleurs configurées
-COULEUR_NORMALE_BASE = (
-    config["couleurs"]["normale"]["r"],
-    config["couleurs"]["normale"]["g"],
-    config["couleurs"]["normale"]["b"]
-)
-COULEUR_PAUSE_BASE = (
-    config["couleurs"]["pause"]["r"],
-    config["couleurs"]["pause"]["g"],
-    config["couleurs"]["pause"]["b"]
-)
-COULEUR_SECONDES = (
-    config["couleurs"]["secondes"]["r"],
-    config["couleurs"]["secondes"]["g"],
-    config["couleurs"]["secondes"]["b"]
-)
+COULEUR_NORMALE_BASE = config["COULEURS_NORMALE"]
+COULEUR_PAUSE_BASE = config["COULEURS_PAUSE"]
+COULEUR_SECONDES = config["COULEURS_SECONDES"]
 COULEURS_EXPLOSION = [
-    (
-        config["couleurs"]["explosion"]["phase1"]["r"],
-        config["couleurs"]["explosion"]["phase1"]["g"],
-        config["couleurs"]["explosion"]["phase1"]["b"]
-    ),
-    (
-        config["couleurs"]["explosion"]["phase2"]["r"],
-        config["couleurs"]["explosion"]["phase2"]["g"],
-        config["couleurs"]["explosion"]["phase2"]["b"]
-    ),
-    (
-        config["couleurs"]["explosion"]["phase3"]["r"],
-        config["couleurs"]["explosion"]["phase3"]["g"],
-        config["couleurs"]["explosion"]["phase3"]["b"]
-    )
+    config["COULEURS_EXPLOSION_PHASE1"],
+    config["COULEURS_EXPLOSION_PHASE2"],
+    config["COULEURS_EXPLOSION_PHASE3"]
 ]
 
 # Configuration BCD
-BCD_CONFIG = config["affichage_bcd"]
+BCD_CONFIG = {
+    "heures": config["AFFICHAGE_BCD_HEURES"],
+    "dizaines_minutes": config["AFFICHAGE_BCD_DIZAINES_MINUTES"],
+    "unites_minutes": config["AFFICHAGE_BCD_UNITES_MINUTES"],
+    "dizaines_secondes": config["AFFICHAGE_BCD_DIZAINES_SECONDES"],
+    "unites_secondes": config["AFFICHAGE_BCD_UNITES_SECONDES"]
+}
 
 # ===== INITIALISATION MATÉRIEL =====
 # Matrice NeoPixel
-pin_matrice = getattr(board, f"GP{config['matrice']['pin']}")
+pin_matrice = getattr(board, f"GP{config['MATRICE_PIN']}")
 pixels = neopixel.NeoPixel(
     pin_matrice,
-    config["matrice"]["nombre_leds"],
-    brightness=config["matrice"]["luminosite"],
-    auto_write=config["matrice"]["auto_write"]
+    config["MATRICE_NOMBRE_LEDS"],
+    brightness=config["MATRICE_LUMINOSITE"],
+    auto_write=config["MATRICE_AUTO_WRITE"]
 )
 
 # Bouton
-pin_bouton = getattr(board, f"GP{config['bouton']['pin']}")
+pin_bouton = getattr(board, f"GP{config['BOUTON_PIN']}")
 touch = digitalio.DigitalInOut(pin_bouton)
 touch.direction = digitalio.Direction.INPUT
 
 # Configuration du pull du bouton
-type_bouton = config["bouton"]["type"]
+type_bouton = config["BOUTON_TYPE"]
 if type_bouton == "pulldown":
     touch.pull = digitalio.Pull.DOWN
 elif type_bouton == "pullup":
@@ -245,20 +352,63 @@ def generer_affichage_bcd(secondes_totales, couleur_base):
     
     return buffer
 
+# Transition en cours: [source, destination, étape, nombre d'étapes]
+transition = None
+# True: les transitions sont avancées par la boucle (runtime asyncio)
+mode_non_bloquant = False
+
+def demarrer_transition(buffer_source, buffer_dest, duree):
+    """Prépare une transition fade sans l'afficher"""
+    global transition
+    terminer_transition()
+    etapes = int(duree / DUREE_ETAPE)
+    if etapes < 1:
+        etapes = 1
+    transition = [buffer_source, buffer_dest, 0, etapes]
+
+def avancer_transition():
+    """
+    Affiche l'étape suivante de la transition en cours
+    Retourne True s'il reste des étapes à afficher
+    """
+    global transition
+    if transition is None:
+        return False
+    
+    buffer_source, buffer_dest, etape, etapes = transition
+    facteur = etape / etapes
+    for i in range(64):
+        couleur = interpoler_couleur(buffer_source[i], buffer_dest[i], facteur)
+        pixels[i] = couleur
+    pixels.show()
+    
+    if etape >= etapes:
+        transition = None
+        return False
+    transition[2] = etape + 1
+    return True
+
+def terminer_transition():
+    """Termine immédiatement la transition en cours (état final affiché)"""
+    global transition
+    if transition is None:
+        return
+    buffer_dest = transition[1]
+    transition = None
+    for i in range(64):
+        pixels[i] = buffer_dest[i]
+    pixels.show()
+
 def transition_fade(buffer_source, buffer_dest, duree):
     """
     Effectue une transition douce (fade) entre deux états d'affichage
+    En mode non bloquant, la transition est seulement démarrée
     """
-    etapes = int(duree / DUREE_ETAPE)
-    if etapes < 1:
-        etapes = 1
+    demarrer_transition(buffer_source, buffer_dest, duree)
+    if mode_non_bloquant:
+        return
     
-    for etape in range(etapes + 1):
-        facteur = etape / etapes
-        for i in range(64):
-            couleur = interpoler_couleur(buffer_source[i], buffer_dest[i], facteur)
-            pixels[i] = couleur
-        pixels.show()
+    while avancer_transition():
         time.sleep(DUREE_ETAPE)
 
 def detecter_type_changement(ancien_temps, nouveau_temps):
@@ -301,54 +451,87 @@ def afficher_bcd(secondes_totales, couleur_base, avec_transition=False, ancien_t
     
     buffer_affichage_actuel = nouveau_buffer
 
-def effet_explosion():
-    """Effet d'explosion de pixels colorés à la fin du timer"""
+# Explosion: trame locale en octets RGB (avant luminosité, jamais relue
+# depuis pixels) et ordre d'apparition, alloués une seule fois
+trame_explosion = bytearray(64 * 3)
+ordre_explosion = bytearray(range(64))
+TOUTES_LEDS = slice(0, 64)
+
+def afficher_trame(trame):
+    """Transmet une trame d'octets RGB en une seule affectation"""
+    pixels[TOUTES_LEDS] = trame
+    pixels.show()
+
+def etapes_explosion():
+    """
+    Effet d'explosion de pixels colorés à la fin du timer
+    Dessine une frame par itération et produit le délai avant la suivante:
+    non bloquant, fermer le générateur (close()) annule l'explosion
+    """
     debut = time.monotonic()
     duree_phase = DUREE_EXPLOSION / 3
+    periode = 1 / config["ANIMATION_CADENCE_EXPLOSION"]
+    trame = trame_explosion
+    ordre = ordre_explosion
+    dernier = len(COULEURS_EXPLOSION) - 1
     
-    # Phase 1: Remplissage progressif aléatoire
-    positions = list(range(64))
-    for i in range(len(positions)-1, 0, -1):
+    # Ordre d'apparition mélangé une fois (Fisher-Yates sur place)
+    for i in range(63, 0, -1):
         j = random.randint(0, i)
-        positions[i], positions[j] = positions[j], positions[i]
+        ordre[i], ordre[j] = ordre[j], ordre[i]
+    for i in range(len(trame)):
+        trame[i] = 0
     
-    delai_phase1 = duree_phase / 64
-    for i in range(64):
-        couleur = COULEURS_EXPLOSION[random.randint(0, len(COULEURS_EXPLOSION)-1)]
-        pixels[positions[i]] = couleur
-        pixels.show()
-        time.sleep(delai_phase1)
+    # Phase 1: apparitions regroupées par frame à cadence fixe (un seul
+    # show() par frame, aucun si rien n'apparaît)
+    frames = int(duree_phase * config["ANIMATION_CADENCE_EXPLOSION"])
+    if frames < 1:
+        frames = 1
+    reveles = 0
+    for frame in range(1, frames + 1):
+        cible = frame * 64 // frames
+        if cible > reveles:
+            while reveles < cible:
+                couleur = COULEURS_EXPLOSION[random.randint(0, dernier)]
+                o = ordre[reveles] * 3
+                trame[o] = couleur[0]
+                trame[o + 1] = couleur[1]
+                trame[o + 2] = couleur[2]
+                reveles += 1
+            afficher_trame(trame)
+        yield periode
     
-    # Phase 2: Clignotements
-    nb_clignotements = int(duree_phase / (config["animation"]["clignotement_rapide"] * 2))
-    for _ in range(nb_clignotements):
-        pixels.fill((0, 0, 0))
-        pixels.show()
-        time.sleep(config["animation"]["clignotement_rapide"])
-        for i in range(64):
-            couleur = COULEURS_EXPLOSION[random.randint(0, len(COULEURS_EXPLOSION)-1)]
-            pixels[i] = couleur
-        pixels.show()
-        time.sleep(config["animation"]["clignotement_rapide"])
+    # Phase 2: clignotements (la trame est renvoyée, pas redessinée)
+    clignotement = config["ANIMATION_CLIGNOTEMENT_RAPIDE"]
+    for _ in range(int(duree_phase / (clignotement * 2))):
+        clear_matrix()
+        yield clignotement
+        afficher_trame(trame)
+        yield clignotement
     
-    # Phase 3: Extinction progressive
-    nb_etapes = config["animation"]["etapes_extinction"]
-    facteur = config["animation"]["extinction_facteur"]
+    # Phase 3: extinction progressive, facteur entier sur 256 par étape
+    nb_etapes = config["ANIMATION_ETAPES_EXTINCTION"]
+    echelle = int(config["ANIMATION_EXTINCTION_FACTEUR"] * 256 + 0.5)
     delai_extinction = duree_phase / nb_etapes
     
     for _ in range(nb_etapes):
-        for i in range(64):
-            r, g, b = pixels[i]
-            pixels[i] = (int(r*facteur), int(g*facteur), int(b*facteur))
-        pixels.show()
-        time.sleep(delai_extinction)
+        for i in range(len(trame)):
+            trame[i] = trame[i] * echelle >> 8
+        afficher_trame(trame)
+        yield delai_extinction
     
     clear_matrix()
     
-    if config["system"]["debug"]:
+    if config["SYSTEM_DEBUG"]:
         duree_totale = time.monotonic() - debut
         print(f"Explosion terminée en {duree_totale:.1f}s")
 
+def annuler_explosion(explosion):
+    """Arrête une explosion en cours (appui long)"""
+    explosion.close()
+    if config["SYSTEM_DEBUG"]:
+        print("Explosion annulée")
+
 def detecter_appui():
     """
     Détecte un appui sur le bouton et retourne:
@@ -386,121 +569,566 @@ def detecter_appui():
     duree = time.monotonic() - debut
     return "long" if duree >= APPUI_LONG else "court"
 
+def bouton_presse():
+    """Retourne True si le bouton est actuellement pressé"""
+    if type_bouton == "pullup":
+        return not touch.value
+    return touch.value
+
+# État de la scrutation non bloquante du bouton
+debut_appui = None
+appui_long_signale = False
+
+def scruter_bouton(maintenant):
+    """
+    Version non bloquante de detecter_appui, à appeler périodiquement
+    L'appui long est signalé dès que la durée est atteinte
+    """
+    global debut_appui, appui_long_signale
+    
+    if bouton_presse():
+        if debut_appui is None:
+            debut_appui = maintenant
+        elif not appui_long_signale and maintenant - debut_appui >= APPUI_LONG:
+            appui_long_signale = True
+            return "long"
+        return None
+    
+    if debut_appui is None:
+        return None
+    
+    # Relâchement
+    etait_long = appui_long_signale
+    debut_appui = None
+    appui_long_signale = False
+    return None if etait_long else "court"
+
+# ===== DÉCOMPTE SANS DÉRIVE =====
+NS_PAR_SECONDE = 1000000000
+
+class Decompte:
+    """
+    Décompte à échéance absolue (time.monotonic_ns())
+    
+    Le temps restant est recalculé depuis l'échéance à chaque lecture: ni
+    la scrutation à 50 ms ni les transitions bloquantes ne s'accumulent.
+    La pause met de côté le temps écoulé, la reprise recalcule l'échéance.
+    Entiers en nanosecondes: pas de perte de précision des floats de
+    CircuitPython sur une longue durée.
+    """
+    
+    def __init__(self, duree):
+        """
+        Args:
+            duree: Durée du décompte en secondes
+        """
+        self.duree_ns = int(duree * NS_PAR_SECONDE)
+        self.reinitialiser()
+    
+    def reinitialiser(self):
+        """Remet la durée complète, décompte arrêté"""
+        self.ecoule_ns = 0        # Temps écoulé mis de côté (pauses)
+        self.echeance_ns = None   # Échéance absolue, None hors décompte
+    
+    def demarrer(self, maintenant_ns):
+        """Démarre ou reprend le décompte"""
+        if self.echeance_ns is None:
+            self.echeance_ns = maintenant_ns + self.duree_ns - self.ecoule_ns
+    
+    def pause(self, maintenant_ns):
+        """Suspend le décompte en mettant de côté le temps écoulé"""
+        if self.echeance_ns is not None:
+            self.ecoule_ns = self.duree_ns - self.restant_ns(maintenant_ns)
+            self.echeance_ns = None
+    
+    def restant_ns(self, maintenant_ns):
+        """Temps restant en nanosecondes (0 à l'échéance)"""
+        if self.echeance_ns is None:
+            return self.duree_ns - self.ecoule_ns
+        restant = self.echeance_ns - maintenant_ns
+        return restant if restant > 0 else 0
+    
+    def secondes(self, maintenant_ns):
+        """Secondes à afficher (arrondi supérieur: 0 seulement à l'échéance)"""
+        return -(-self.restant_ns(maintenant_ns) // NS_PAR_SECONDE)
+    
+    def fin_seconde_ns(self, secondes):
+        """
+        Instant absolu où l'affichage quitte secondes (l'échéance pour 1)
+        Retourne None hors décompte
+        """
+        if self.echeance_ns is None:
+            return None
+        if secondes <= 1:
+            return self.echeance_ns
+        return self.echeance_ns - (secondes - 1) * NS_PAR_SECONDE
+
+def attente_jusqua(echeance_ns):
+    """Délai en secondes jusqu'à une échéance en ns (0 si dépassée)"""
+    attente = echeance_ns - time.monotonic_ns()
+    return attente / NS_PAR_SECONDE if attente > 0 else 0
+
 # ===== PROGRAMME PRINCIPAL =====
 ETAT_ARRET = 0
 ETAT_EN_COURS = 1
 ETAT_PAUSE = 2
 ETAT_TERMINE = 3
 
-etat = ETAT_ARRET
-temps_restant = DUREE_TIMER
+class Minuteur:
+    """Minuteur nommé: décompte, état et couleur propres"""
+    
+    def __init__(self, numero, nom, duree, couleur):
+        """
+        Args:
+            numero: Rang dans la liste des minuteurs (entrées du tas)
+            nom: Nom affiché en debug
+            duree: Durée en secondes
+            couleur: Couleur BCD pendant le décompte
+        """
+        self.numero = numero
+        self.nom = nom
+        self.couleur = couleur
+        self.decompte = Decompte(duree)
+        self.etat = ETAT_ARRET
+        self.version = 0  # Change à chaque planification (entrées du tas périmées)
+
+class Echeancier:
+    """
+    Tas (heapq) des fins de décompte des minuteurs en cours
+    
+    Une entrée porte la version du minuteur à sa planification: une pause
+    ou un reset ne cherche rien dans le tas, l'entrée périmée est ignorée
+    quand elle arrive en tête. O(log n) par événement, quel que soit le
+    nombre de minuteurs.
+    """
+    
+    def __init__(self, minuteurs):
+        self.minuteurs = minuteurs
+        self.tas = []  # (échéance ns, numéro, version)
+    
+    def planifier(self, minuteur):
+        """Planifie la fin d'un minuteur en cours (ou l'annule s'il ne l'est plus)"""
+        minuteur.version += 1
+        echeance = minuteur.decompte.echeance_ns
+        if echeance is not None:
+            heappush(self.tas, (echeance, minuteur.numero, minuteur.version))
+    
+    def prochaine(self):
+        """Prochaine fin de décompte (ns), None si aucun minuteur en cours"""
+        tas = self.tas
+        while tas:
+            echeance, numero, version = tas[0]
+            if self.minuteurs[numero].version == version:
+                return echeance
+            heappop(tas)  # Entrée périmée (pause, reset)
+        return None
+    
+    def retirer_echu(self, maintenant_ns):
+        """Retire et retourne un minuteur arrivé à échéance, ou None"""
+        echeance = self.prochaine()
+        if echeance is None or echeance > maintenant_ns:
+            return None
+        minuteur = self.minuteurs[heappop(self.tas)[1]]
+        minuteur.version += 1
+        return minuteur
+
+def creer_minuteurs():
+    """Minuteur principal ([timer]) suivi des minuteurs nommés ([minuteurs])"""
+    liste = [Minuteur(0, "principal", DUREE_TIMER, COULEUR_NORMALE_BASE)]
+    noms = config["MINUTEURS_NOMS"]
+    durees = config["MINUTEURS_DUREES"]
+    couleurs = config["MINUTEURS_COULEURS"]
+    if not len(noms) == len(durees) == len(couleurs):
+        print("Erreur [minuteurs]: noms, durees et couleurs de même longueur attendus")
+        return liste
+    for nom, duree, couleur in zip(noms, durees, couleurs):
+        liste.append(Minuteur(len(liste), nom, duree, tuple(couleur)))
+    return liste
+
+minuteurs = creer_minuteurs()
+echeancier = Echeancier(minuteurs)
+actifs = []                 # Minuteurs démarrés, dans l'ordre de la rotation
+rang_rotation = 0
+prochaine_rotation = None   # Changement de minuteur affiché (ns)
+ROTATION_NS = int(config["MINUTEURS_ROTATION"] * NS_PAR_SECONDE)
+affiche = minuteurs[0]      # Minuteur affiché, commandé par le bouton
+a_exploser = []             # Terminés pendant l'explosion d'un autre
+temps_restant = DUREE_TIMER  # Secondes affichées
 temps_precedent = None
-dernier_update = 0
 dernier_affichage = -1
 buffer_affichage_actuel = None
 
-if config["system"]["debug"]:
-    print("Minuteur BCD démarré")
-    print(f"Durée configurée: {DUREE_TIMER} secondes")
-    print(f"Bouton sur GP{config['bouton']['pin']} (type: {type_bouton})")
-    print(f"Matrice sur GP{config['matrice']['pin']} ({config['matrice']['lignes']}x{config['matrice']['colonnes']})")
+def couleur_affichage(minuteur):
+    """Couleur BCD d'un minuteur selon son état"""
+    return COULEUR_PAUSE_BASE if minuteur.etat == ETAT_PAUSE else minuteur.couleur
 
-clear_matrix()
+def planifier_rotation(maintenant_ns):
+    """Prochain changement de minuteur affiché, s'il y en a un autre actif"""
+    global prochaine_rotation
+    autres = len(actifs) - (1 if affiche.etat != ETAT_ARRET else 0)
+    prochaine_rotation = maintenant_ns + ROTATION_NS if autres > 0 else None
 
-while True:
-    appui = detecter_appui()
-    temps_actuel = time.monotonic()
-    
-    # Gestion des appuis
-    if appui:
-        if etat == ETAT_ARRET:
-            if appui == "court":
-                etat = ETAT_EN_COURS
-                temps_restant = DUREE_TIMER
-                temps_precedent = None
-                dernier_update = temps_actuel
-                afficher_bcd(temps_restant, COULEUR_NORMALE_BASE, avec_transition=True, ancien_temps=None)
-                temps_precedent = temps_restant
-                dernier_affichage = temps_restant
-                if config["system"]["debug"]:
-                    print("Timer démarré")
-            elif appui == "long":
-                if buffer_affichage_actuel:
-                    buffer_noir = [(0, 0, 0)] * 64
-                    transition_fade(buffer_affichage_actuel, buffer_noir, DUREE_FADE_ETAT)
-                else:
-                    clear_matrix()
-                buffer_affichage_actuel = None
-                temps_precedent = None
-                if config["system"]["debug"]:
-                    print("Affichage éteint")
-        
-        elif etat == ETAT_EN_COURS:
-            if appui == "court":
-                etat = ETAT_PAUSE
-                afficher_bcd(temps_restant, COULEUR_PAUSE_BASE, avec_transition=True, ancien_temps=temps_precedent)
-                temps_precedent = temps_restant
-                dernier_affichage = temps_restant
-                if config["system"]["debug"]:
-                    print(f"Pause - Temps restant: {temps_restant}s")
-        
-        elif etat == ETAT_PAUSE:
-            if appui == "court":
-                etat = ETAT_EN_COURS
-                dernier_update = temps_actuel
-                afficher_bcd(temps_restant, COULEUR_NORMALE_BASE, avec_transition=True, ancien_temps=temps_precedent)
-                temps_precedent = temps_restant
-                dernier_affichage = temps_restant
-                if config["system"]["debug"]:
-                    print("Reprise du timer")
-            elif appui == "long":
+def afficher_minuteur(minuteur, maintenant_ns):
+    """Affiche un minuteur (fondu d'état) et lui donne le bouton"""
+    global affiche, temps_restant, temps_precedent, dernier_affichage
+    affiche = minuteur
+    temps_restant = minuteur.decompte.secondes(maintenant_ns)
+    afficher_bcd(temps_restant, couleur_affichage(minuteur), avec_transition=True, ancien_temps=None)
+    temps_precedent = temps_restant
+    dernier_affichage = temps_restant
+    planifier_rotation(maintenant_ns)
+    if config["SYSTEM_DEBUG"]:
+        print(f"Minuteur affiché: {minuteur.nom}")
+
+def tourner(maintenant_ns):
+    """Passe au minuteur actif suivant (rotation de l'affichage)"""
+    global rang_rotation
+    rang_rotation = (rang_rotation + 1) % len(actifs)
+    if actifs[rang_rotation] is affiche:
+        rang_rotation = (rang_rotation + 1) % len(actifs)
+    afficher_minuteur(actifs[rang_rotation], maintenant_ns)
+
+def desactiver(minuteur):
+    """Retire un minuteur arrêté de la rotation"""
+    global rang_rotation
+    actifs.remove(minuteur)
+    if rang_rotation >= len(actifs):
+        rang_rotation = 0
+
+def traiter_appui(appui, maintenant_ns):
+    """
+    Applique un appui bouton au minuteur affiché (instant en ns)
+    Avec plusieurs minuteurs, un appui long sur un minuteur arrêté ou en
+    cours affiche le suivant
+    """
+    global temps_restant, temps_precedent
+    global dernier_affichage, buffer_affichage_actuel
+    
+    minuteur = affiche
+    decompte = minuteur.decompte
+    etat = minuteur.etat
+    if appui == "long" and len(minuteurs) > 1 and etat in (ETAT_ARRET, ETAT_EN_COURS):
+        afficher_minuteur(minuteurs[(minuteur.numero + 1) % len(minuteurs)], maintenant_ns)
+        return
+    
+    if etat == ETAT_ARRET:
+        if appui == "court":
+            minuteur.etat = ETAT_EN_COURS
+            decompte.reinitialiser()
+            decompte.demarrer(maintenant_ns)
+            echeancier.planifier(minuteur)
+            actifs.append(minuteur)
+            temps_restant = decompte.secondes(maintenant_ns)
+            temps_precedent = None
+            afficher_bcd(temps_restant, minuteur.couleur, avec_transition=True, ancien_temps=None)
+            temps_precedent = temps_restant
+            dernier_affichage = temps_restant
+            planifier_rotation(maintenant_ns)
+            if config["SYSTEM_DEBUG"]:
+                print(f"Timer démarré ({minuteur.nom})")
+        elif appui == "long":
+            if buffer_affichage_actuel:
                 buffer_noir = [(0, 0, 0)] * 64
-                if buffer_affichage_actuel:
-                    transition_fade(buffer_affichage_actuel, buffer_noir, duree=DUREE_FADE_ETAT/2)
-                etat = ETAT_ARRET
-                temps_restant = DUREE_TIMER
-                temps_precedent = None
+                transition_fade(buffer_affichage_actuel, buffer_noir, DUREE_FADE_ETAT)
+            else:
+                clear_matrix()
+            buffer_affichage_actuel = None
+            temps_precedent = None
+            if config["SYSTEM_DEBUG"]:
+                print("Affichage éteint")
+    
+    elif etat == ETAT_EN_COURS:
+        if appui == "court":
+            minuteur.etat = ETAT_PAUSE
+            decompte.pause(maintenant_ns)
+            echeancier.planifier(minuteur)
+            afficher_bcd(temps_restant, COULEUR_PAUSE_BASE, avec_transition=True, ancien_temps=temps_precedent)
+            temps_precedent = temps_restant
+            dernier_affichage = temps_restant
+            if config["SYSTEM_DEBUG"]:
+                print(f"Pause - Temps restant: {temps_restant}s ({minuteur.nom})")
+    
+    elif etat == ETAT_PAUSE:
+        if appui == "court":
+            minuteur.etat = ETAT_EN_COURS
+            decompte.demarrer(maintenant_ns)
+            echeancier.planifier(minuteur)
+            afficher_bcd(temps_restant, minuteur.couleur, avec_transition=True, ancien_temps=temps_precedent)
+            temps_precedent = temps_restant
+            dernier_affichage = temps_restant
+            if config["SYSTEM_DEBUG"]:
+                print(f"Reprise du timer ({minuteur.nom})")
+        elif appui == "long":
+            buffer_noir = [(0, 0, 0)] * 64
+            if buffer_affichage_actuel:
+                transition_fade(buffer_affichage_actuel, buffer_noir, duree=DUREE_FADE_ETAT/2)
+            minuteur.etat = ETAT_ARRET
+            decompte.reinitialiser()
+            desactiver(minuteur)
+            temps_restant = decompte.secondes(maintenant_ns)
+            temps_precedent = None
+            if not mode_non_bloquant:
                 time.sleep(0.1)
-                afficher_bcd(temps_restant, COULEUR_NORMALE_BASE, avec_transition=True, ancien_temps=None)
+            afficher_bcd(temps_restant, minuteur.couleur, avec_transition=True, ancien_temps=None)
+            temps_precedent = temps_restant
+            dernier_affichage = temps_restant
+            planifier_rotation(maintenant_ns)
+            if config["SYSTEM_DEBUG"]:
+                print(f"Reset du timer ({minuteur.nom})")
+    
+    elif etat == ETAT_TERMINE:
+        if appui == "long":
+            buffer_noir = [(0, 0, 0)] * 64
+            if buffer_affichage_actuel:
+                transition_fade(buffer_affichage_actuel, buffer_noir, DUREE_FADE_ETAT)
+            else:
+                clear_matrix()
+            minuteur.etat = ETAT_ARRET
+            decompte.reinitialiser()
+            desactiver(minuteur)
+            temps_restant = decompte.secondes(maintenant_ns)
+            buffer_affichage_actuel = None
+            temps_precedent = None
+            dernier_affichage = -1
+            planifier_rotation(maintenant_ns)
+            if config["SYSTEM_DEBUG"]:
+                print(f"Extinction - Timer réinitialisé ({minuteur.nom})")
+
+def mettre_a_jour_decompte(maintenant_ns, affichage=True):
+    """
+    Traite les fins de décompte dues (tas), puis la rotation et la seconde
+    du minuteur affiché (affichage=False pendant l'explosion): le rendu ne
+    dépend pas du nombre de minuteurs en cours
+    Retourne True si un minuteur vient de se terminer (lancer l'explosion)
+    """
+    global affiche, temps_restant, temps_precedent, prochaine_rotation
+    global dernier_affichage, buffer_affichage_actuel
+    
+    termine = False
+    minuteur = echeancier.retirer_echu(maintenant_ns)
+    while minuteur is not None:
+        minuteur.etat = ETAT_TERMINE
+        if config["SYSTEM_DEBUG"]:
+            retard = (maintenant_ns - minuteur.decompte.echeance_ns) / 1e6
+            print(f"Timer terminé! ({retard:.1f} ms après l'échéance, {minuteur.nom})")
+        if affichage and not termine:
+            # L'explosion est pour lui: il garde l'affichage
+            affiche = minuteur
+            temps_restant = 0
+            buffer_affichage_actuel = None
+            temps_precedent = None
+            prochaine_rotation = None
+            termine = True
+        else:
+            a_exploser.append(minuteur)
+        minuteur = echeancier.retirer_echu(maintenant_ns)
+    if termine or not affichage:
+        return termine
+    
+    if prochaine_rotation is not None and maintenant_ns >= prochaine_rotation:
+        tourner(maintenant_ns)
+    elif affiche.etat == ETAT_EN_COURS:
+        secondes = affiche.decompte.secondes(maintenant_ns)
+        if secondes != temps_restant:
+            ancien_temps = temps_restant
+            temps_restant = secondes
+            if temps_restant != dernier_affichage:
+                afficher_bcd(temps_restant, affiche.couleur, avec_transition=True, ancien_temps=ancien_temps)
                 temps_precedent = temps_restant
                 dernier_affichage = temps_restant
-                if config["system"]["debug"]:
-                    print("Reset du timer")
+    return False
+
+def explosion_suivante(maintenant_ns):
+    """
+    Fin d'une explosion: donne l'affichage au prochain minuteur terminé
+    pendant celle-ci (True: relancer l'explosion), sinon reprend la rotation
+    """
+    global affiche
+    while a_exploser:
+        minuteur = a_exploser.pop(0)
+        if minuteur.etat == ETAT_TERMINE:
+            affiche = minuteur
+            return True
+    planifier_rotation(maintenant_ns)
+    return False
+
+def prochain_reveil_ns():
+    """
+    Échéance la plus proche: fin d'un minuteur (tête du tas), seconde du
+    minuteur affiché ou rotation. None si rien n'est planifié
+    """
+    reveil = echeancier.prochaine()
+    if affiche.etat == ETAT_EN_COURS:
+        # Depuis la seconde affichée: déjà passée si le rendu est en retard
+        seconde = affiche.decompte.fin_seconde_ns(temps_restant)
+        if reveil is None or seconde < reveil:
+            reveil = seconde
+    if prochaine_rotation is not None and (reveil is None or prochaine_rotation < reveil):
+        reveil = prochaine_rotation
+    return reveil
+
+def boucle_principale():
+    """
+    Boucle principale: scrutation du bouton à cadence fixe, minuteurs
+    réveillés seulement à l'échéance la plus proche (prochain_reveil_ns())
+    Pendant l'explosion, le bouton est scruté sans bloquer: un appui long
+    l'annule
+    """
+    explosion = None
+    prochaine_etape = 0
+    while True:
+        if explosion is None and debut_appui is None:
+            appui = detecter_appui()
+        else:
+            # Non bloquant jusqu'au relâchement de l'appui qui a annulé
+            appui = scruter_bouton(time.monotonic())
+        maintenant = time.monotonic_ns()
         
-        elif etat == ETAT_TERMINE:
-            if appui == "long":
-                buffer_noir = [(0, 0, 0)] * 64
-                if buffer_affichage_actuel:
-                    transition_fade(buffer_affichage_actuel, buffer_noir, DUREE_FADE_ETAT)
-                else:
-                    clear_matrix()
-                etat = ETAT_ARRET
-                temps_restant = DUREE_TIMER
-                buffer_affichage_actuel = None
-                temps_precedent = None
-                dernier_affichage = -1
-                if config["system"]["debug"]:
-                    print("Extinction - Timer réinitialisé")
-    
-    # Mise à jour du décompte
-    if etat == ETAT_EN_COURS:
-        if temps_actuel - dernier_update >= 1.0:
-            ancien_temps = temps_restant
-            temps_restant -= 1
-            dernier_update = temps_actuel
-            
-            if temps_restant <= 0:
-                temps_restant = 0
-                etat = ETAT_TERMINE
-                buffer_affichage_actuel = None
-                temps_precedent = None
-                if config["system"]["debug"]:
-                    print("Timer terminé!")
-                effet_explosion()
+        # Gestion des appuis
+        if appui:
+            if appui == "long" and explosion is not None:
+                annuler_explosion(explosion)
+                explosion = None
+            traiter_appui(appui, maintenant)
+        
+        # Minuteurs: seulement si une échéance est atteinte
+        reveil = prochain_reveil_ns()
+        if reveil is not None and maintenant >= reveil:
+            if mettre_a_jour_decompte(maintenant, explosion is None):
+                explosion = etapes_explosion()
+                prochaine_etape = maintenant
+        
+        # Frame suivante de l'explosion
+        if explosion is not None and maintenant >= prochaine_etape:
+            try:
+                prochaine_etape = maintenant + int(next(explosion) * NS_PAR_SECONDE)
+            except StopIteration:
+                explosion = None
+                if explosion_suivante(maintenant):
+                    explosion = etapes_explosion()
+        
+        # Prochaine scrutation, ou échéance (ou frame) si elle arrive avant
+        attente = config["TIMER_RAFRAICHISSEMENT"]
+        reveil = prochain_reveil_ns()
+        if reveil is not None:
+            delai = attente_jusqua(reveil)
+            if delai < attente:
+                attente = delai
+        if explosion is not None:
+            frame = attente_jusqua(prochaine_etape)
+            if frame < attente:
+                attente = frame
+        time.sleep(attente)
+
+# ===== RUNTIME ASYNCIO =====
+
+class MinuteurApp:
+    """
+    Minuteur pour le runtime asyncio (async_runtime.Runtime)
+    
+    Tâche entrées: scrute le bouton
+    Tâche temps: réveille le rendu à l'échéance la plus proche (fin d'un
+    minuteur, seconde affichée, rotation)
+    Tâche rendu: machine d'états, transitions et explosion
+    """
+    
+    def tasks(self):
+        """Retourne les coroutines de l'application"""
+        global mode_non_bloquant
+        mode_non_bloquant = True
+        self.evenements = Queue(maxsize=8)
+        self.reveil_temps = asyncio.Event()
+        return [self.tache_entrees(), self.tache_temps(), self.tache_rendu()]
+    
+    def stop(self):
+        """Éteint la matrice à l'arrêt du runtime"""
+        clear_matrix()
+    
+    async def tache_entrees(self):
+        """Scrute le bouton et transmet les appuis au rendu"""
+        while True:
+            appui = scruter_bouton(time.monotonic())
+            if appui:
+                self.evenements.put_nowait(appui)
+            await asyncio.sleep(config["RUNTIME_SCRUTATION_BOUTON"])
+    
+    async def tache_temps(self):
+        """
+        Dort jusqu'à l'échéance la plus proche des minuteurs, recalculée
+        dès que le rendu change le planning (appui, fin d'explosion)
+        """
+        while True:
+            reveil = prochain_reveil_ns()
+            if reveil is None:
+                await self.reveil_temps.wait()
             else:
-                if temps_restant != dernier_affichage:
-                    afficher_bcd(temps_restant, COULEUR_NORMALE_BASE, avec_transition=True, ancien_temps=ancien_temps)
-                    temps_precedent = temps_restant
-                    dernier_affichage = temps_restant
+                try:
+                    await asyncio.wait_for(self.reveil_temps.wait(), attente_jusqua(reveil))
+                except asyncio.TimeoutError:
+                    self.evenements.put_nowait("tic")
+                    # Attendre que le rendu ait consommé l'échéance
+                    await self.reveil_temps.wait()
+            self.reveil_temps.clear()
     
-    time.sleep(config["timer"]["rafraichissement"])
+    async def tache_rendu(self):
+        """
+        Traite les événements, avance les transitions et l'explosion
+        (un appui long pendant l'explosion l'annule)
+        """
+        explosion = None
+        prochaine_etape = 0.0
+        while True:
+            if explosion is not None:
+                if time.monotonic() >= prochaine_etape:
+                    try:
+                        prochaine_etape = time.monotonic() + next(explosion)
+                    except StopIteration:
+                        explosion = None
+                        if explosion_suivante(time.monotonic_ns()):
+                            explosion = etapes_explosion()
+                            prochaine_etape = time.monotonic()
+                            continue
+                        self.reveil_temps.set()
+                echeance = prochaine_etape if explosion is not None else time.monotonic() + DUREE_TIMER
+            elif avancer_transition():
+                echeance = time.monotonic() + DUREE_ETAPE
+            else:
+                echeance = time.monotonic() + DUREE_TIMER
+            
+            evenement = await self.evenements.get_until(echeance)
+            if evenement is None:
+                continue
+            
+            maintenant = time.monotonic_ns()
+            if evenement == "long" and explosion is not None:
+                annuler_explosion(explosion)
+                explosion = None
+            if evenement == "tic":
+                termine = mettre_a_jour_decompte(maintenant, explosion is None)
+            else:
+                traiter_appui(evenement, maintenant)
+                termine = False
+            self.reveil_temps.set()
+            
+            if termine:
+                terminer_transition()
+                explosion = etapes_explosion()
+                prochaine_etape = time.monotonic()
+
+if config["SYSTEM_DEBUG"]:
+    print("Minuteur BCD démarré")
+    print(f"Durée configurée: {DUREE_TIMER} secondes")
+    if len(minuteurs) > 1:
+        print(f"Minuteurs: {', '.join(m.nom for m in minuteurs)}")
+    print(f"Bouton sur GP{config['BOUTON_PIN']} (type: {type_bouton})")
+    print(f"Matrice sur GP{config['MATRICE_PIN']} ({config['MATRICE_LIGNES']}x{config['MATRICE_COLONNES']})")
+
+clear_matrix()
+
+if __name__ == "__main__":
+    if config["RUNTIME_ASYNC"] and HAS_ASYNCIO:
+        runtime = Runtime()
+        runtime.add_app(MinuteurApp())
+        runtime.run()
+    else:
+        boucle_principale()
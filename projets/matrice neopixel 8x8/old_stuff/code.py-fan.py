@@ -1,7 +1,7 @@
 import board
 import neopixel
 import time
-import math
+from fixed_trig import isin, iatan2, isqrt, radians, ONE
 
 # Configuration de la matrice
 LED_WIDTH = 8
@@ -11,18 +11,23 @@ NUM_PIXELS = LED_WIDTH * LED_HEIGHT
 # Création de l'objet neopixel
 pixels = neopixel.NeoPixel(board.GP0, NUM_PIXELS, auto_write=False)
 
+# Trigonométrie en virgule fixe (fixed_trig.py à copier sur la carte) :
+# coordonnées doublées pour centrer sans float, distances en 1/32 de pixel
+DISTANCE_SCALE = 32
+MAX_DISTANCE = isqrt(2 * (LED_WIDTH * DISTANCE_SCALE) ** 2)  # Demi-diagonale x2
+
 def fan_blade(x, y, t):
     # Calcul de l'angle par rapport au centre de la matrice
-    dx = x - (LED_WIDTH - 1) / 2.0
-    dy = y - (LED_HEIGHT - 1) / 2.0
-    angle = math.atan2(dy, dx)
+    dx = 2 * x - (LED_WIDTH - 1)
+    dy = 2 * y - (LED_HEIGHT - 1)
+    angle = iatan2(dy, dx)
     # Calcul de la distance par rapport au centre
-    dist = math.sqrt(dx * dx + dy * dy)
-    # Calcul de la luminosité en fonction de l'angle, du temps et de la distance
-    brightness = math.sin(4.0 * (angle - t)) * (1.0 - dist / (math.sqrt(2) * LED_WIDTH / 2.0))
+    dist = isqrt((dx * dx + dy * dy) * DISTANCE_SCALE * DISTANCE_SCALE)
+    # Calcul de la luminosité en fonction de l'angle, du temps et de la distance (Q15)
+    brightness = isin(4 * (angle - radians(t))) * (ONE - dist * ONE // MAX_DISTANCE) >> 15
     if brightness > 0:  # Si la luminosité est positive, allumer la LED
         r = 0  # Pas de composante rouge
-        g = int(brightness * 255)  # Composante verte
+        g = brightness * 255 >> 15  # Composante verte
         b = 0  # Pas de composante bleue
     else:  # Sinon, éteindre la LED
         r = 0
@@ -0,0 +1,286 @@
+"""
+Émetteur de frames pour serial_stream.py (sur l'ordinateur)
+Rend un effet de effects/ ou une fonction de motif sur une
+NeoPixelMatrix simulée et envoie chaque frame au Pico par USB CDC, ou
+mesure le débit du protocole à travers un pseudo-terminal (pty)
+
+Sur le Pico : boot.py active usb_cdc.data, code.py lance
+FrameReceiver(matrix).run() (voir serial_stream.py). Le port de données
+est le second port série de la carte (/dev/ttyACM1, COM4...).
+
+UTILISATION:
+    python serial_sender.py /dev/ttyACM1 effects/effect5_fire.py:Effect5_Fire --fps 60
+    python serial_sender.py /dev/ttyACM1 "projets/matrice neopixel 8x8/old_stuff/code.py-fan.py:fan_blade"
+    python serial_sender.py --banc                    # débit sur pty, 8x8
+    python serial_sender.py --banc --disposition 2x2 --frames 1000
+
+Options:
+    --fps N          Fréquence d'envoi (défaut: 60)
+    --duree S        Durée d'envoi (défaut: illimitée)
+    --graine N       Graine de random (défaut: 0)
+    --disposition D  Disposition des panneaux ("8x8", "2x2"...)
+    --cles N         Image complète toutes les N frames
+    --banc           Mesure du débit sur pty (pas de carte)
+    --frames N       Frames envoyées par scénario du banc (défaut: 2000)
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+
+import serial_stream
+from npxa_compiler import _add_paths, load_target
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+FPS = 60
+GRAINE = 0
+DISPOSITION = "8x8"
+FRAMES_BANC = 2000
+DEBIT_USB = 1_000_000  # Octets/s utiles estimés en USB Full Speed (CDC)
+CHANGEMENTS_DELTA = 4  # LEDs modifiées par frame dans le scénario delta
+TIMEOUT_BANC = 60      # Attente maximale de la réception (secondes)
+
+
+def _matrix(layout):
+    """NeoPixelMatrix hors écran (modules simulés, horloge inchangée)."""
+    _add_paths()
+    from neopixel_matrix_optimized import NeoPixelMatrix
+    return NeoPixelMatrix(None, layout=layout)
+
+
+# ============================================================================
+# ENVOI EN DIRECT
+# ============================================================================
+
+def render_frames(target, fps=FPS, seed=GRAINE, layout=DISPOSITION):
+    """
+    Rend la cible frame par frame sur une matrice simulée.
+
+    Le frame buffer de la matrice est déjà en octets RGB dans l'ordre de
+    la bande: il part tel quel, sans table de correspondance.
+
+    Args:
+        target: Cible "fichier:nom" (voir npxa_compiler.py)
+
+    Yields:
+        Frame buffer après chaque frame (même bytearray, réécrit)
+    """
+    matrix = _matrix(layout)
+    obj, kind = load_target(target)
+    random.seed(seed)
+    effect = obj(matrix) if kind == "effet" else None
+    number = 0
+    while True:
+        t = number / fps
+        if effect is not None:
+            effect.update(1 / fps, t)
+        elif kind == "motif_t":
+            matrix.draw_pattern(lambda x, y: obj(x, y, t))
+            matrix.show()
+        else:
+            matrix.draw_pattern(obj)
+            matrix.show()
+        yield matrix.frame_buffer()
+        number += 1
+
+
+def paced(frames, fps=FPS, duration=None):
+    """
+    Cadence un flux de frames sur des échéances absolues (sans dérive).
+
+    Args:
+        duration: Durée en secondes (None = illimitée)
+    """
+    period = 1_000_000_000 // int(fps)
+    deadline = time.monotonic_ns()
+    for number, frame in enumerate(frames):
+        if duration is not None and number >= duration * fps:
+            return
+        yield frame
+        deadline += period
+        delay = deadline - time.monotonic_ns()
+        if delay > 0:
+            time.sleep(delay / 1e9)
+        else:
+            deadline -= delay
+
+
+def stream(port, target, fps=FPS, duration=None, seed=GRAINE, layout=DISPOSITION,
+           keyframe_interval=serial_stream.KEYFRAME_INTERVAL):
+    """
+    Rend la cible en temps réel et envoie chaque frame.
+
+    Args:
+        port: Port série de données du Pico
+        target: Cible "fichier:nom" (voir npxa_compiler.py)
+        duration: Durée d'envoi en secondes (None = jusqu'à Ctrl+C)
+
+    Returns:
+        FrameSender (statistiques)
+    """
+    import serial  # pyserial
+    sender = None
+    start = time.monotonic_ns()
+    with serial.Serial(port, 115200, timeout=1) as link:
+        try:
+            for frame in paced(render_frames(target, fps, seed, layout), fps, duration):
+                if sender is None:
+                    sender = serial_stream.FrameSender(link, len(frame) // 3,
+                                                       keyframe_interval=keyframe_interval)
+                sender.send(frame)
+        except KeyboardInterrupt:
+            pass
+    elapsed = (time.monotonic_ns() - start) / 1e9
+    if sender is not None:
+        print(f"{sender.frames} frames en {elapsed:.1f} s ({sender.frames / elapsed:.1f} FPS), "
+              f"{sender.keyframes} images complètes, {sender.bytes / elapsed / 1000:.1f} Ko/s")
+    return sender
+
+
+# ============================================================================
+# BANC DE DÉBIT (PTY)
+# ============================================================================
+
+def _frames_full(count, size, rng):
+    """Frames aléatoires: chaque LED change, envoyées en images complètes."""
+    return [rng.randbytes(size) for _ in range(count)]
+
+
+def _frames_delta(count, size, rng):
+    """Frames où CHANGEMENTS_DELTA LEDs changent à chaque fois."""
+    frame = bytearray(size)
+    frames = []
+    for _ in range(count):
+        for _ in range(CHANGEMENTS_DELTA):
+            o = 3 * rng.randrange(size // 3)
+            frame[o] = rng.getrandbits(8)
+            frame[o + 1] = rng.getrandbits(8)
+            frame[o + 2] = rng.getrandbits(8)
+        frames.append(bytes(frame))
+    return frames
+
+
+def bench_pty(frames, layout=DISPOSITION, keyframe_interval=serial_stream.KEYFRAME_INTERVAL):
+    """
+    Envoie les frames à un FrameReceiver à travers un pty et mesure le
+    débit soutenu (émission et réception en parallèle).
+
+    Returns:
+        dict: frames, affichées, erreurs, secondes, fps, octets, exact
+    """
+    import tty
+    matrix = _matrix(layout)
+    master, slave = os.openpty()
+    tty.setraw(master)
+    tty.setraw(slave)
+    source = os.fdopen(slave, "rb", buffering=0)
+    output = os.fdopen(master, "wb", buffering=0)
+    receiver = serial_stream.FrameReceiver(matrix, source)
+    sender = serial_stream.FrameSender(output, matrix.num_pixels,
+                                       keyframe_interval=keyframe_interval)
+
+    def receive():
+        try:
+            while True:
+                receiver.receive()
+        except (OSError, ValueError):
+            pass  # pty fermé à la fin du banc
+
+    thread = threading.Thread(target=receive, daemon=True)
+    start = time.perf_counter()
+    thread.start()
+    for frame in frames:
+        sender.send(frame)
+    # Fin: toutes les frames envoyées sont affichées (ou ignorées)
+    limit = time.perf_counter() + TIMEOUT_BANC
+    while (receiver.frames + receiver.dropped < sender.frames and
+           time.perf_counter() < limit):
+        time.sleep(0.0005)
+    elapsed = time.perf_counter() - start
+    output.close()
+    source.close()
+    thread.join()
+    return {
+        "frames": sender.frames,
+        "images_cles": sender.keyframes,
+        "affichees": receiver.frames,
+        "erreurs": receiver.errors,
+        "secondes": elapsed,
+        "fps": receiver.frames / elapsed if elapsed else 0,
+        "octets": sender.bytes,
+        "exact": bytes(matrix.frame_buffer()) == bytes(frames[-1]),
+    }
+
+
+def print_bench(name, result):
+    """Affiche une ligne de résultats du banc."""
+    packet = result["octets"] / result["frames"]
+    print(f"{name:16s} {result['affichees']:5d}/{result['frames']:<5d} "
+          f"{result['fps']:8.0f} FPS  {packet:7.0f} o/frame  "
+          f"{result['octets'] / result['secondes'] / 1e6:6.2f} Mo/s  "
+          f"USB FS ~{DEBIT_USB / packet:6.0f} FPS  "
+          f"erreurs {result['erreurs']}  {'exact' if result['exact'] else 'DIFFÉRENT'}")
+
+
+def bench(frame_count=FRAMES_BANC, layout=DISPOSITION):
+    """Lance les scénarios images complètes et delta."""
+    _add_paths()
+    from neopixel_matrix_optimized import tile_map
+    tiles = tile_map(layout)
+    num_pixels = tiles.width * tiles.height
+    size = 3 * num_pixels
+    rng = random.Random(GRAINE)
+    print(f"Banc pty: {layout} ({num_pixels} LEDs), {frame_count} frames par scénario")
+    results = {}
+    for name, make in (("images complètes", _frames_full), ("delta", _frames_delta)):
+        results[name] = bench_pty(make(frame_count, size, rng), layout)
+        print_bench(name, results[name])
+    return results
+
+
+def main(argv):
+    """Point d'entrée en ligne de commande."""
+    options = {}
+    positional = []
+    run_bench = False
+    frame_count = FRAMES_BANC
+    args = iter(argv)
+    for arg in args:
+        if arg == "--fps":
+            options["fps"] = float(next(args))
+        elif arg == "--duree":
+            options["duration"] = float(next(args))
+        elif arg == "--graine":
+            options["seed"] = int(next(args))
+        elif arg == "--disposition":
+            options["layout"] = next(args)
+        elif arg == "--cles":
+            options["keyframe_interval"] = int(next(args))
+        elif arg == "--banc":
+            run_bench = True
+        elif arg == "--frames":
+            frame_count = int(next(args))
+        elif arg.startswith("-"):
+            print(__doc__)
+            return 2
+        else:
+            positional.append(arg)
+
+    if run_bench:
+        bench(frame_count, options.get("layout", DISPOSITION))
+        return 0
+    if len(positional) != 2:
+        print(__doc__)
+        return 2
+    stream(positional[0], positional[1], **options)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,439 @@
+"""
+Flux de frames sur liaison série (USB CDC) pour NeoPixelMatrix
+L'ordinateur calcule les images et la carte les affiche : images
+complètes ou delta (plages de LEDs modifiées), à la manière d'Adalight
+
+FORMAT D'UN PAQUET (petit-boutiste):
+    En-tête (8 octets)
+        3s  synchro "NPX"
+        B   type: "K" image complète, "D" delta
+        B   numéro de séquence (0-255, un par frame envoyée)
+        H   longueur des données (octets)
+        B   contrôle de l'en-tête: XOR de type, séquence et longueur, ^ 0x55
+    Données
+        K: 3 octets R, G, B par LED, dans l'ordre de la bande
+        D: plages, chacune: H première LED, H nombre n, puis 3n octets RGB
+    CRC-32 (I) des données
+
+Les données arrivent directement dans le frame buffer de la matrice par
+readinto() : une image complète en un appel, une delta en un appel par
+plage, sans boucle Python par pixel. Le CRC est calculé par
+binascii.crc32 sur le tampon. Une delta ne s'applique que sur la frame
+de séquence précédente : après un paquet perdu ou corrompu, le récepteur
+attend la prochaine image complète (l'émetteur en envoie régulièrement).
+
+UTILISATION:
+    # boot.py (port série de données en plus de la console)
+    import usb_cdc
+    usb_cdc.enable(console=True, data=True)
+
+    # code.py (Pico)
+    receiver = FrameReceiver(matrix)   # usb_cdc.data par défaut
+    receiver.run()
+
+    # Ordinateur (pyserial), voir serial_sender.py
+    sender = FrameSender(serial.Serial("/dev/ttyACM1"), matrix.num_pixels)
+    sender.send(frame)  # octets RGB ou couleurs, ordre de la bande
+"""
+
+import struct
+
+try:
+    from binascii import crc32
+except ImportError:
+    crc32 = None
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+SYNC = b"NPX"
+HEADER_FORMAT = "<3sBBHB"
+HEADER_SIZE = 8
+HEADER_CHECK = 0x55      # Comme Adalight: somme de contrôle jamais nulle
+CRC_SIZE = 4
+
+KEYFRAME = 0x4B  # "K"
+DELTA = 0x44     # "D"
+SPAN_SIZE = 4    # En-tête de plage: première LED (H), nombre de LEDs (H)
+
+MAX_GAP = 1               # LEDs inchangées absorbées dans une plage (3 octets < 4)
+KEYFRAME_INTERVAL = 30    # Image complète toutes les N frames (reprise après erreur)
+TIMEOUT = 0.5             # Délai de lecture d'un paquet commencé (secondes)
+
+
+if crc32 is None:
+    # binascii sans crc32: version Python (lente, à n'utiliser qu'en dépannage)
+    _CRC_TABLE = []
+    for _n in range(256):
+        _c = _n
+        for _ in range(8):
+            _c = (_c >> 1) ^ 0xEDB88320 if _c & 1 else _c >> 1
+        _CRC_TABLE.append(_c)
+
+    def crc32(data, value=0):
+        """CRC-32 (même résultat que binascii.crc32)."""
+        table = _CRC_TABLE
+        value ^= 0xFFFFFFFF
+        for byte in data:
+            value = table[(value ^ byte) & 0xFF] ^ (value >> 8)
+        return value ^ 0xFFFFFFFF
+
+
+def header_check(kind, sequence, length):
+    """Octet de contrôle de l'en-tête."""
+    return kind ^ sequence ^ (length & 0xFF) ^ (length >> 8) ^ HEADER_CHECK
+
+
+def pack_header(kind, sequence, length):
+    """Retourne l'en-tête d'un paquet."""
+    return struct.pack(HEADER_FORMAT, SYNC, kind, sequence, length,
+                       header_check(kind, sequence, length))
+
+
+# ============================================================================
+# ÉMISSION
+# ============================================================================
+
+class FrameSender:
+    """
+    Encode et envoie des frames: image complète ou delta, la plus courte.
+
+    Fonctionne avec tout objet muni de write() (pyserial, pty, fichier).
+    Les frames sont des octets RGB dans l'ordre de la bande, ou dans
+    l'ordre logique si table (index dans la bande de chaque pixel logique,
+    NeoPixelMatrix.index_table) est donnée.
+    """
+
+    def __init__(self, port, num_pixels, table=None,
+                 keyframe_interval=KEYFRAME_INTERVAL, max_gap=MAX_GAP):
+        """
+        Args:
+            port: Sortie (méthode write())
+            num_pixels: Nombre de LEDs de la matrice
+            table: Ordre logique -> index dans la bande (None: ordre de la bande)
+            keyframe_interval: Image complète toutes les N frames au plus
+            max_gap: LEDs inchangées absorbées dans une plage delta
+        """
+        self.port = port
+        self.num_pixels = num_pixels
+        self.size = 3 * num_pixels
+        self.table = table
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.max_gap = max_gap
+        self.previous = None
+        self.current = bytearray(self.size)
+        self.sequence = 0
+        self.since_keyframe = 0
+        self.frames = 0
+        self.keyframes = 0
+        self.bytes = 0
+
+    def _to_strip(self, frame):
+        """Copie frame (octets ou couleurs) dans self.current, ordre de la bande."""
+        out = self.current
+        table = self.table
+        if isinstance(frame, (bytes, bytearray, memoryview)):
+            if len(frame) != self.size:
+                raise ValueError(f"Frame de {len(frame)} octets, {self.size} attendus")
+            if table is None:
+                out[:] = frame
+                return
+            for i in range(self.num_pixels):
+                o = 3 * table[i]
+                out[o:o + 3] = frame[3 * i:3 * i + 3]
+            return
+        if len(frame) != self.num_pixels:
+            raise ValueError(f"Frame de {len(frame)} pixels, {self.num_pixels} attendus")
+        for i, color in enumerate(frame):
+            o = 3 * (table[i] if table is not None else i)
+            if isinstance(color, int):
+                out[o] = (color >> 16) & 0xFF
+                out[o + 1] = (color >> 8) & 0xFF
+                out[o + 2] = color & 0xFF
+            else:
+                out[o] = color[0]
+                out[o + 1] = color[1]
+                out[o + 2] = color[2]
+
+    def encode_delta(self, previous, current):
+        """
+        Plages de LEDs modifiées entre deux frames (ordre de la bande).
+
+        Returns:
+            Données d'une frame delta (vides si rien n'a changé)
+        """
+        out = bytearray()
+        n = self.num_pixels
+        i = 0
+        while i < n:
+            o = 3 * i
+            if current[o:o + 3] == previous[o:o + 3]:
+                i += 1
+                continue
+            # Étendre la plage tant que les trous restent courts
+            start = i
+            end = i + 1
+            gap = 0
+            j = end
+            while j < n:
+                o = 3 * j
+                if current[o:o + 3] != previous[o:o + 3]:
+                    end = j + 1
+                    gap = 0
+                else:
+                    gap += 1
+                    if gap > self.max_gap:
+                        break
+                j += 1
+            out += struct.pack("<HH", start, end - start)
+            out += current[3 * start:3 * end]
+            i = end
+        return out
+
+    def send(self, frame, keyframe=False):
+        """
+        Envoie une frame (rien si elle est identique à la précédente).
+
+        Args:
+            frame: Octets RGB (3 par LED) ou couleurs (tuples, 0xRRGGBB)
+            keyframe: Forcer une image complète
+
+        Returns:
+            Octets écrits
+        """
+        self._to_strip(frame)
+        current = self.current
+        kind = KEYFRAME
+        data = current
+        if (not keyframe and self.previous is not None and
+                self.since_keyframe + 1 < self.keyframe_interval):
+            delta = self.encode_delta(self.previous, current)
+            if not delta:
+                return 0
+            if len(delta) < len(current):
+                kind = DELTA
+                data = delta
+
+        self.sequence = (self.sequence + 1) & 0xFF
+        packet = (pack_header(kind, self.sequence, len(data)) + data +
+                  struct.pack("<I", crc32(data) & 0xFFFFFFFF))
+        self._write(packet)
+
+        if kind == KEYFRAME:
+            self.keyframes += 1
+            self.since_keyframe = 0
+        else:
+            self.since_keyframe += 1
+        if self.previous is None:
+            self.previous = bytearray(self.size)
+        self.previous[:] = current
+        self.frames += 1
+        self.bytes += len(packet)
+        return len(packet)
+
+    def _write(self, packet):
+        """Écrit tout le paquet (les descripteurs bruts peuvent écrire en partie)."""
+        view = memoryview(packet)
+        while view:
+            count = self.port.write(view)
+            if count is None:
+                count = len(view)
+            view = view[count:]
+
+
+# ============================================================================
+# RÉCEPTION (PICO)
+# ============================================================================
+
+class FrameReceiver:
+    """
+    Reçoit les paquets et les affiche par begin_frame() / end_frame().
+
+    Statistiques: frames (affichées), errors (en-têtes ou CRC invalides),
+    dropped (delta ignorées en attendant une image complète).
+    """
+
+    def __init__(self, matrix, port=None, timeout=TIMEOUT):
+        """
+        Args:
+            matrix: NeoPixelMatrix (double tampon)
+            port: Entrée avec readinto() (défaut: usb_cdc.data)
+            timeout: Délai de lecture d'un paquet commencé (ports série)
+        """
+        if port is None:
+            import usb_cdc
+            port = usb_cdc.data
+            if port is None:
+                raise RuntimeError("Port usb_cdc.data désactivé (voir boot.py)")
+        if hasattr(port, "timeout"):
+            port.timeout = timeout
+        self.matrix = matrix
+        self.port = port
+        self.size = 3 * matrix.num_pixels
+        self.header = bytearray(HEADER_SIZE)
+        self.header_view = memoryview(self.header)
+        self.span = bytearray(SPAN_SIZE)
+        self.span_view = memoryview(self.span)
+        self.crc = bytearray(CRC_SIZE)
+        self.crc_view = memoryview(self.crc)
+        self.sequence = None  # Dernière frame affichée (None: attendre une image complète)
+        self.frames = 0
+        self.errors = 0
+        self.dropped = 0
+
+    def _read(self, view):
+        """
+        Remplit view depuis le port.
+
+        Returns:
+            False si le port n'a plus rien envoyé (délai dépassé, fin)
+        """
+        read = 0
+        total = len(view)
+        while read < total:
+            count = self.port.readinto(view[read:] if read else view)
+            if not count:
+                return False
+            read += count
+        return True
+
+    def _sync(self):
+        """
+        Lit un en-tête valide, en glissant octet par octet sur les données
+        qui ne commencent pas par la synchro.
+
+        Returns:
+            False si le port n'a rien envoyé
+        """
+        header = self.header
+        view = self.header_view
+        if not self._read(view):
+            return False
+        lost = False
+        while True:
+            if (header[0] == SYNC[0] and header[1] == SYNC[1] and header[2] == SYNC[2] and
+                    header[7] == header_check(header[3], header[4],
+                                              header[5] | (header[6] << 8))):
+                return True
+            if not lost:
+                self.errors += 1  # Une erreur par perte de synchro
+                lost = True
+            # Reprendre au prochain début de synchro possible
+            start = 1
+            while start < HEADER_SIZE and header[start] != SYNC[0]:
+                start += 1
+            kept = HEADER_SIZE - start
+            for k in range(kept):
+                header[k] = header[start + k]
+            if not self._read(view[kept:]):
+                return False
+
+    def _skip(self, count):
+        """Consomme count octets (dans le frame buffer, réécrit avant affichage)."""
+        view = self.matrix.frame_view()
+        while count > 0:
+            chunk = min(count, self.size)
+            if not self._read(view[:chunk]):
+                return False
+            count -= chunk
+        return True
+
+    def _discard(self):
+        """
+        Abandonne la frame en cours: rien n'est affiché, et la prochaine
+        frame acceptée est une image complète (le frame buffer est à
+        redessiner entièrement).
+        """
+        self.matrix.cancel_frame()
+        self.sequence = None
+
+    def _check_crc(self, value):
+        """Lit le CRC du paquet et le compare à value."""
+        if not self._read(self.crc_view):
+            return False
+        crc = self.crc
+        expected = crc[0] | (crc[1] << 8) | (crc[2] << 16) | (crc[3] << 24)
+        return expected == value & 0xFFFFFFFF
+
+    def receive(self):
+        """
+        Lit un paquet et l'affiche s'il est valide.
+
+        Returns:
+            True si une frame a été affichée
+        """
+        if not self._sync():
+            return False
+        header = self.header
+        kind = header[3]
+        sequence = header[4]
+        length = header[5] | (header[6] << 8)
+        matrix = self.matrix
+
+        if kind == KEYFRAME and length == self.size:
+            matrix.begin_frame()
+            view = matrix.frame_view()
+            if not self._read(view) or not self._check_crc(crc32(view)):
+                self.errors += 1
+                self._discard()
+                return False
+
+        elif kind == DELTA and self.sequence is not None and \
+                sequence == (self.sequence + 1) & 0xFF:
+            matrix.begin_frame(copy_previous=True)
+            view = matrix.frame_view()
+            span = self.span
+            crc = 0
+            remaining = length
+            while remaining >= SPAN_SIZE:
+                if not self._read(self.span_view):
+                    break
+                crc = crc32(span, crc)
+                start = 3 * (span[0] | (span[1] << 8))
+                end = start + 3 * (span[2] | (span[3] << 8))
+                remaining -= SPAN_SIZE + end - start
+                if end > self.size or remaining < 0:
+                    break
+                target = view[start:end]
+                if not self._read(target):
+                    break
+                crc = crc32(target, crc)
+            if remaining or not self._check_crc(crc):
+                self.errors += 1
+                self._discard()
+                return False
+
+        else:
+            # Delta sans la frame de référence, ou type / taille inconnus
+            if kind == DELTA:
+                self.dropped += 1
+            else:
+                self.errors += 1
+            self._skip(length + CRC_SIZE)
+            self._discard()
+            return False
+
+        matrix.end_frame()
+        self.sequence = sequence
+        self.frames += 1
+        return True
+
+    def poll(self):
+        """
+        Affiche les paquets déjà arrivés, sans attendre (boucle principale).
+
+        Returns:
+            Nombre de frames affichées
+        """
+        shown = 0
+        while self.port.in_waiting >= HEADER_SIZE:
+            if self.receive():
+                shown += 1
+        return shown
+
+    def run(self):
+        """Reçoit et affiche les frames indéfiniment (bloquant)."""
+        while True:
+            self.receive()
@@ -0,0 +1,50 @@
+"""
+Simulateur hôte pour le code CircuitPython du projet
+Remplace board, neopixel, digitalio, touchio, wifi, socketpool,
+adafruit_ntp et alarm par des équivalents CPython
+
+Les programmes tournent sans modification:
+    python -m simulateur main_final.py --duree 10
+    python -m simulateur "projets/matrice neopixel 8x8/minuteur/code.py" --virtuel
+    python -m simulateur main_final.py --entrees appuis.txt --enregistrer frames.json
+
+Depuis Python:
+    import simulateur
+    simulateur.installer()
+    import board, neopixel   # modules simulés
+"""
+
+import os
+import sys
+
+DOSSIER_MODULES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "modules")
+DOSSIER_PROJET = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def installer(virtuel=False, entrees=None, enregistreur=None, duree=None):
+    """
+    Rend les modules simulés importables et prépare la simulation
+
+    Args:
+        virtuel: True pour une horloge virtuelle (sleep instantané)
+        entrees: ScriptEntrees à utiliser (défaut: aucun événement)
+        enregistreur: EnregistreurFrames à utiliser (défaut: nouveau)
+        duree: Durée simulée avant KeyboardInterrupt (None = illimitée)
+
+    Returns:
+        L'état de la simulation (simulateur.etat.etat)
+    """
+    for dossier in (DOSSIER_PROJET, DOSSIER_MODULES):
+        if dossier not in sys.path:
+            sys.path.insert(0, dossier)
+
+    from simulateur.etat import etat
+    etat.demarrer(virtuel=virtuel, entrees=entrees,
+                  enregistreur=enregistreur, duree=duree)
+    return etat
+
+
+def desinstaller():
+    """Restaure le module time d'origine"""
+    from simulateur.etat import etat
+    etat.arreter()
@@ -0,0 +1,88 @@
+"""
+Lance un programme CircuitPython du projet sur l'ordinateur
+
+Usage:
+    python -m simulateur SCRIPT [--duree S] [--virtuel] [--entrees FICHIER]
+                                [--enregistrer FICHIER] [--sans-transmission]
+
+Options:
+    --duree S            Arrête le programme après S secondes (simulées)
+    --virtuel            Horloge virtuelle: time.sleep est instantané
+    --entrees FICHIER    Script d'entrées (appuis bouton, toucher)
+    --enregistrer F      Sauvegarde les frames en JSON
+    --sans-transmission  show() ne consomme pas le temps de transmission
+"""
+
+import os
+import runpy
+import sys
+
+import simulateur
+from simulateur.entrees import ScriptEntrees
+from simulateur.enregistreur import EnregistreurFrames
+
+
+def afficher_resume(resume):
+    """Affiche le résumé de l'enregistreur"""
+    print("=" * 40)
+    print("Simulation terminée")
+    print(f"  show(): {resume['shows']}")
+    if resume["shows"] >= 2:
+        print(f"  Durée: {resume['duree']:.2f} s")
+        print(f"  FPS: {resume['fps']:.1f}")
+        print(f"  Intervalle max: {resume['intervalle_max'] * 1000:.1f} ms")
+        print(f"  Transmission moyenne: {resume['transmission_moyenne'] * 1000:.2f} ms")
+        print(f"  Occupation du fil: {resume['occupation_fil'] * 100:.1f}%")
+
+
+def main(argv):
+    script = None
+    duree = None
+    virtuel = False
+    entrees = None
+    sortie = None
+    transmission = True
+    args = iter(argv)
+    for arg in args:
+        if arg == "--duree":
+            duree = float(next(args))
+        elif arg == "--virtuel":
+            virtuel = True
+        elif arg == "--entrees":
+            entrees = ScriptEntrees.charger(next(args))
+        elif arg == "--enregistrer":
+            sortie = next(args)
+        elif arg == "--sans-transmission":
+            transmission = False
+        else:
+            script = arg
+
+    if script is None:
+        print(__doc__)
+        return 1
+
+    script = os.path.abspath(script)
+    enregistreur = EnregistreurFrames(garder_frames=sortie is not None,
+                                      modeler_transmission=transmission)
+    etat = simulateur.installer(virtuel=virtuel, entrees=entrees,
+                                enregistreur=enregistreur, duree=duree)
+    # Comme sur la carte: les modules voisins de code.py sont importables
+    sys.path.insert(0, os.path.dirname(script))
+    sys.argv = [script]
+
+    try:
+        runpy.run_path(script, run_name="__main__")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        simulateur.desinstaller()
+
+    afficher_resume(etat.enregistreur.resume())
+    if sortie:
+        etat.enregistreur.sauver(sortie)
+        print(f"Frames sauvegardées: {sortie}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
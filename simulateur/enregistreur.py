@@ -0,0 +1,94 @@
+"""
+Enregistreur de frames: horodate chaque show() et modélise la durée de
+transmission WS2812 (environ 30 µs par pixel + 80 µs de reset)
+"""
+
+import json
+
+TEMPS_PAR_PIXEL = 30e-6   # 24 bits à 800 kHz
+TEMPS_RESET = 80e-6       # Niveau bas de fin de trame
+
+
+def duree_transmission(nb_pixels):
+    """Retourne la durée de transmission d'une trame (secondes)"""
+    return nb_pixels * TEMPS_PAR_PIXEL + TEMPS_RESET
+
+
+class EnregistreurFrames:
+    """
+    Collecte les frames envoyées aux LEDs simulées
+
+    Attributes:
+        frames: Liste de tuples (t, bande, durée de transmission, octets RGB)
+        modeler_transmission: True pour que show() dure le temps de transmission
+    """
+
+    def __init__(self, garder_frames=True, modeler_transmission=True):
+        """
+        Args:
+            garder_frames: Conserve le contenu des frames (sinon seulement
+                les horodatages)
+            modeler_transmission: show() bloque pendant la durée de transmission
+        """
+        self.garder_frames = garder_frames
+        self.modeler_transmission = modeler_transmission
+        self.frames = []
+        self.temps_transmission = 0.0
+
+    def enregistrer(self, t, bande, octets_rgb, nb_pixels):
+        """
+        Enregistre une frame
+
+        Args:
+            t: Instant du show() (secondes depuis le début)
+            bande: Identifiant de la bande (nom de la broche)
+            octets_rgb: Couleurs affichées (RGB, luminosité appliquée), ou
+                None si les frames ne sont pas conservées
+            nb_pixels: Nombre de pixels transmis
+
+        Returns:
+            Durée de transmission modélisée (secondes)
+        """
+        duree = duree_transmission(nb_pixels)
+        contenu = bytes(octets_rgb) if self.garder_frames and octets_rgb is not None else None
+        self.frames.append((t, bande, duree, contenu))
+        self.temps_transmission += duree
+        return duree
+
+    def vider(self):
+        """Efface les frames enregistrées"""
+        self.frames = []
+        self.temps_transmission = 0.0
+
+    def resume(self):
+        """
+        Retourne un dictionnaire de statistiques:
+        nombre de show(), durée couverte, FPS, temps de transmission
+        """
+        nb = len(self.frames)
+        if nb < 2:
+            return {"shows": nb, "duree": 0.0, "fps": 0.0,
+                    "transmission_totale": self.temps_transmission}
+        duree = self.frames[-1][0] - self.frames[0][0]
+        intervalles = [b[0] - a[0] for a, b in zip(self.frames, self.frames[1:])]
+        return {
+            "shows": nb,
+            "duree": duree,
+            "fps": (nb - 1) / duree if duree > 0 else 0.0,
+            "intervalle_max": max(intervalles),
+            "transmission_moyenne": self.temps_transmission / nb,
+            "transmission_totale": self.temps_transmission,
+            "occupation_fil": self.temps_transmission / duree if duree > 0 else 0.0,
+        }
+
+    def sauver(self, chemin):
+        """Sauvegarde les frames en JSON (couleurs en hexadécimal)"""
+        with open(chemin, "w") as f:
+            json.dump({
+                "resume": self.resume(),
+                "frames": [
+                    {"t": t, "bande": bande, "transmission": duree,
+                     "rgb": contenu.hex() if contenu is not None else None}
+                    for t, bande, duree, contenu in self.frames
+                ],
+            }, f)
@@ -0,0 +1,82 @@
+"""
+Script d'entrées programmable (boutons, capteurs tactiles)
+
+Les événements sont datés en secondes depuis le début de la simulation.
+Une broche "active" correspond à un bouton appuyé (niveau bas avec un
+pull-up, haut sinon) ou à un capteur tactile touché.
+
+Format texte (une ligne par événement, # pour les commentaires):
+    # t    action  broche  paramètre
+    2.0    appui   GP1     0.2     # appui de 0.2 s
+    5.0    appui   GP1     2.0     # appui long
+    8.0    actif   GP2     1       # niveau maintenu
+    9.0    actif   GP2     0
+"""
+
+
+class ScriptEntrees:
+    """Évolution temporelle de l'état des broches d'entrée"""
+
+    def __init__(self):
+        self.evenements = {}  # nom de broche -> [(t, actif)] triés
+
+    def definir(self, t, broche, actif):
+        """
+        Fixe l'état d'une broche à partir de l'instant t
+
+        Args:
+            t: Instant (secondes depuis le début de la simulation)
+            broche: Broche (board.GPx) ou son nom ("GP1")
+            actif: True si appuyé / touché
+        """
+        liste = self.evenements.setdefault(str(broche), [])
+        liste.append((t, bool(actif)))
+        liste.sort(key=lambda e: e[0])
+        return self
+
+    def appui(self, t, broche, duree=0.2):
+        """Programme un appui de durée donnée"""
+        self.definir(t, broche, True)
+        self.definir(t + duree, broche, False)
+        return self
+
+    def actif(self, broche, t):
+        """
+        Retourne l'état d'une broche à l'instant t
+
+        Returns:
+            True/False, ou None si aucun événement n'est encore survenu
+        """
+        etat = None
+        for instant, actif in self.evenements.get(str(broche), ()):
+            if instant > t:
+                break
+            etat = actif
+        return etat
+
+    def prochain_changement(self, broche, t):
+        """Retourne l'instant du prochain événement après t, ou None"""
+        for instant, _ in self.evenements.get(str(broche), ()):
+            if instant > t:
+                return instant
+        return None
+
+    @classmethod
+    def charger(cls, chemin):
+        """Charge un script au format texte"""
+        script = cls()
+        with open(chemin) as f:
+            for ligne in f:
+                ligne = ligne.split("#", 1)[0].strip()
+                if not ligne:
+                    continue
+                champs = ligne.split()
+                t, action, broche = float(champs[0]), champs[1], champs[2]
+                parametre = champs[3] if len(champs) > 3 else None
+                if action == "appui":
+                    script.appui(t, broche, float(parametre) if parametre else 0.2)
+                elif action == "actif":
+                    script.definir(t, broche, parametre in ("1", "true", "True"))
+                else:
+                    raise ValueError(f"Action inconnue: {action}")
+        return script
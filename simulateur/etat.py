@@ -0,0 +1,42 @@
+"""
+État partagé de la simulation (horloge, entrées, enregistreur)
+"""
+
+from simulateur.horloge import Horloge
+from simulateur.entrees import ScriptEntrees
+from simulateur.enregistreur import EnregistreurFrames
+
+
+class EtatSimulation:
+    """Regroupe les objets partagés par les modules simulés"""
+
+    def __init__(self):
+        self.horloge = Horloge()
+        self.entrees = ScriptEntrees()
+        self.enregistreur = EnregistreurFrames()
+        self.fin = None
+
+    def demarrer(self, virtuel=False, entrees=None, enregistreur=None, duree=None):
+        """Installe l'horloge et réinitialise la simulation"""
+        self.horloge.arreter()
+        self.horloge = Horloge(virtuelle=virtuel, verifier=self.verifier_fin)
+        self.horloge.installer()
+        self.entrees = entrees if entrees is not None else ScriptEntrees()
+        self.enregistreur = enregistreur if enregistreur is not None else EnregistreurFrames()
+        self.fin = None if duree is None else duree
+
+    def arreter(self):
+        """Restaure le module time"""
+        self.horloge.arreter()
+
+    def temps(self):
+        """Temps écoulé depuis le début de la simulation (secondes)"""
+        return self.horloge.ecoule()
+
+    def verifier_fin(self):
+        """Interrompt le programme simulé une fois la durée atteinte"""
+        if self.fin is not None and self.horloge.ecoule() >= self.fin:
+            raise KeyboardInterrupt
+
+
+etat = EtatSimulation()
@@ -0,0 +1,84 @@
+"""
+Horloge de la simulation: temps réel ou virtuel
+"""
+
+import time
+
+_monotonic = time.monotonic
+_monotonic_ns = time.monotonic_ns
+_sleep = time.sleep
+_time = time.time
+
+
+class Horloge:
+    """
+    Remplace time.monotonic, time.monotonic_ns, time.sleep et time.time
+
+    En mode virtuel, sleep() avance le temps instantanément: une heure de
+    minuteur se simule en quelques secondes. Le calcul Python ne coûte
+    alors rien en temps simulé (seules les attentes et la transmission
+    des LEDs avancent l'horloge). Le mode virtuel ne convient pas aux
+    programmes asyncio, dont la boucle attend en temps réel.
+    """
+
+    def __init__(self, virtuelle=False, verifier=None):
+        """
+        Args:
+            virtuelle: True pour un temps virtuel
+            verifier: Fonction appelée après chaque attente (fin de simulation)
+        """
+        self.virtuelle = virtuelle
+        self.verifier = verifier
+        self.debut = _monotonic()
+        self.debut_epoch = _time()
+        self.t = self.debut
+        self.installee = False
+
+    def monotonic(self):
+        """time.monotonic() simulé"""
+        return self.t if self.virtuelle else _monotonic()
+
+    def monotonic_ns(self):
+        """time.monotonic_ns() simulé"""
+        if self.virtuelle:
+            return int(self.t * 1_000_000_000)
+        return _monotonic_ns()
+
+    def time(self):
+        """time.time() simulé (epoch)"""
+        return self.debut_epoch + (self.monotonic() - self.debut)
+
+    def ecoule(self):
+        """Temps écoulé depuis le début de la simulation"""
+        return self.monotonic() - self.debut
+
+    def avancer(self, duree):
+        """Laisse passer une durée (attente ou transmission)"""
+        if duree > 0:
+            if self.virtuelle:
+                self.t += duree
+            else:
+                _sleep(duree)
+        if self.verifier:
+            self.verifier()
+
+    def sleep(self, duree):
+        """time.sleep() simulé"""
+        self.avancer(duree)
+
+    def installer(self):
+        """Remplace les fonctions du module time"""
+        time.monotonic = self.monotonic
+        time.monotonic_ns = self.monotonic_ns
+        time.sleep = self.sleep
+        time.time = self.time
+        self.installee = True
+
+    def arreter(self):
+        """Restaure les fonctions d'origine du module time"""
+        if self.installee:
+            time.monotonic = _monotonic
+            time.monotonic_ns = _monotonic_ns
+            time.sleep = _sleep
+            time.time = _time
+            self.installee = False
@@ -0,0 +1,40 @@
+"""
+Module adafruit_neopxl8 simulé: jusqu'à 8 bandes sur des broches
+consécutives, transmises en parallèle (PIO du RP2040)
+
+La trame est enregistrée une fois pour toutes les bandes, avec la durée de
+transmission d'une seule bande.
+"""
+
+from adafruit_pixelbuf import PixelBuf
+from simulateur.etat import etat
+
+
+class NeoPxl8(PixelBuf):
+    """Bandes parallèles simulées (num_strands bandes de n // num_strands LEDs)"""
+
+    def __init__(self, data0, n, *, num_strands=8, bpp=3, brightness=1.0,
+                 auto_write=True, pixel_order=None):
+        if not 1 <= num_strands <= 8:
+            raise ValueError("num_strands doit être compris entre 1 et 8")
+        if n % num_strands:
+            raise ValueError("n doit être un multiple de num_strands")
+        self.pin = data0
+        self.num_strands = num_strands
+        self.strand_length = n // num_strands
+        self.shows = 0
+        super().__init__(n, byteorder=pixel_order or "GRB", brightness=brightness,
+                         auto_write=auto_write)
+
+    def _transmit(self, buffer):
+        self.shows += 1
+        enregistreur = etat.enregistreur
+        octets = self.octets_affiches() if enregistreur.garder_frames else None
+        duree = enregistreur.enregistrer(etat.temps(), f"{self.pin}x{self.num_strands}",
+                                         octets, self.strand_length)
+        etat.horloge.avancer(duree if enregistreur.modeler_transmission else 0)
+
+    def deinit(self):
+        """Libère les broches"""
+        self.fill((0, 0, 0))
+        self.show()
@@ -0,0 +1,28 @@
+"""
+Module adafruit_ntp simulé: l'heure vient de l'horloge de la simulation
+(pas de requête réseau, pour des mesures reproductibles)
+"""
+
+import time
+from simulateur.etat import etat
+
+
+class NTP:
+    """Client NTP simulé"""
+
+    def __init__(self, socketpool, *, server="0.adafruit.pool.ntp.org", port=123,
+                 tz_offset=0, socket_timeout=10, cache_seconds=0):
+        self.socketpool = socketpool
+        self.server = server
+        self.tz_offset = tz_offset
+        self.requetes = 0
+
+    @property
+    def datetime(self):
+        """Heure courante (time.struct_time, UTC + tz_offset)"""
+        self.requetes += 1
+        return time.gmtime(int(etat.horloge.time() + self.tz_offset * 3600))
+
+    @property
+    def utc_ns(self):
+        return int(etat.horloge.time() * 1_000_000_000)
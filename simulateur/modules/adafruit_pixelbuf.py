@@ -0,0 +1,98 @@
+"""
+Module adafruit_pixelbuf simulé: tampon de pixels avec luminosité,
+transmis par la méthode _transmit() des sous-classes
+"""
+
+
+class PixelBuf:
+    """Tampon de pixels (couleurs avant luminosité, octets dans byteorder)"""
+
+    def __init__(self, n, *, byteorder="BGR", brightness=1.0, auto_write=False,
+                 header=None, trailer=None):
+        self.n = n
+        self.byteorder = byteorder
+        self.bpp = len(byteorder)
+        self.auto_write = auto_write
+        self._brightness = min(max(brightness, 0.0), 1.0)
+        self._couleurs = [(0, 0, 0)] * n
+        self._tampon = bytearray(n * self.bpp)
+        self._ordre = [byteorder.index(c) for c in "RGB"]
+
+    def __len__(self):
+        return self.n
+
+    @property
+    def brightness(self):
+        return self._brightness
+
+    @brightness.setter
+    def brightness(self, valeur):
+        self._brightness = min(max(valeur, 0.0), 1.0)
+        if self.auto_write:
+            self.show()
+
+    def _convertir(self, valeur):
+        if isinstance(valeur, int):
+            return ((valeur >> 16) & 0xFF, (valeur >> 8) & 0xFF, valeur & 0xFF)
+        r, g, b = valeur[0], valeur[1], valeur[2]
+        return (int(r), int(g), int(b))
+
+    def __setitem__(self, index, valeur):
+        if isinstance(index, slice):
+            indices = range(*index.indices(self.n))
+            if len(valeur) != len(indices):
+                # Séquence plate (r, g, b, r, g, b...), comme _pixelbuf de CircuitPython
+                if len(valeur) != len(indices) * self.bpp:
+                    raise ValueError(f"{len(valeur)} valeurs pour {len(indices)} pixels")
+                valeur = [valeur[k:k + self.bpp] for k in range(0, len(valeur), self.bpp)]
+            for i, v in zip(indices, valeur):
+                self._couleurs[i] = self._convertir(v)
+        else:
+            if index < 0:
+                index += self.n
+            if not 0 <= index < self.n:
+                raise IndexError("Index de pixel hors limites")
+            self._couleurs[index] = self._convertir(valeur)
+        if self.auto_write:
+            self.show()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._couleurs[i] for i in range(*index.indices(self.n))]
+        if index < 0:
+            index += self.n
+        return self._couleurs[index]
+
+    def fill(self, couleur):
+        """Remplit tout le tampon"""
+        self._couleurs = [self._convertir(couleur)] * self.n
+        if self.auto_write:
+            self.show()
+
+    def octets_affiches(self):
+        """Retourne les couleurs affichées (RGB, luminosité appliquée)"""
+        b = self._brightness
+        octets = bytearray(self.n * 3)
+        i = 0
+        for r, g, bl in self._couleurs:
+            octets[i] = int(r * b)
+            octets[i + 1] = int(g * b)
+            octets[i + 2] = int(bl * b)
+            i += 3
+        return octets
+
+    def show(self):
+        """Prépare les octets (ordre byteorder) et appelle _transmit()"""
+        b = self._brightness
+        tampon = self._tampon
+        ir, ig, ib = self._ordre
+        base = 0
+        for r, g, bl in self._couleurs:
+            tampon[base + ir] = int(r * b)
+            tampon[base + ig] = int(g * b)
+            tampon[base + ib] = int(bl * b)
+            base += self.bpp
+        self._transmit(tampon)
+
+    def _transmit(self, buffer):
+        raise NotImplementedError("Sous-classe sans _transmit()")
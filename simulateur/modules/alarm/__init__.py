@@ -0,0 +1,55 @@
+"""
+Module alarm simulé: light_sleep_until_alarms avance l'horloge de la
+simulation jusqu'à l'échéance ou au prochain changement d'une broche
+du script d'entrées
+"""
+
+from simulateur.etat import etat
+from alarm import time, pin
+
+wake_alarm = None
+
+TRANCHE_SOMMEIL = 0.005  # Scrutation des broches en temps réel
+
+
+def light_sleep_until_alarms(*alarms):
+    """
+    Dort jusqu'à la première alarme déclenchée
+
+    Returns:
+        L'alarme qui a réveillé
+    """
+    global wake_alarm
+    alarmes_temps = [a for a in alarms if isinstance(a, time.TimeAlarm)]
+    alarmes_broche = [a for a in alarms if isinstance(a, pin.PinAlarm)]
+    horloge = etat.horloge
+    echeance = min(a.monotonic_time for a in alarmes_temps) if alarmes_temps else None
+
+    while True:
+        for alarme in alarmes_broche:
+            if alarme.declenchee():
+                wake_alarm = alarme
+                return alarme
+
+        maintenant = horloge.monotonic()
+        if echeance is not None and maintenant >= echeance:
+            wake_alarm = min(alarmes_temps, key=lambda a: a.monotonic_time)
+            return wake_alarm
+
+        if horloge.virtuelle:
+            # Saut direct au prochain événement (échéance ou broche)
+            cible = echeance
+            ecoule = etat.temps()
+            for alarme in alarmes_broche:
+                changement = etat.entrees.prochain_changement(alarme.pin, ecoule)
+                if changement is not None:
+                    changement += maintenant - ecoule
+                    cible = changement if cible is None else min(cible, changement)
+            if cible is None:
+                raise RuntimeError("Sommeil sans alarme possible")
+            horloge.avancer(cible - maintenant)
+        else:
+            tranche = TRANCHE_SOMMEIL
+            if echeance is not None:
+                tranche = min(tranche, echeance - maintenant)
+            horloge.avancer(tranche)
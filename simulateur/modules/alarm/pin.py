@@ -0,0 +1,25 @@
+"""
+alarm.pin simulé: le niveau suit le script d'entrées
+"""
+
+from simulateur.etat import etat
+
+
+class PinAlarm:
+    """Alarme sur le niveau d'une broche"""
+
+    def __init__(self, pin, value, edge=False, pull=False):
+        self.pin = pin
+        self.value = value
+        self.edge = edge
+        self.pull = pull
+
+    def niveau(self):
+        """Niveau de la broche (le pull tire à l'opposé de value)"""
+        repos = not self.value if self.pull else False
+        actif = etat.entrees.actif(self.pin, etat.temps())
+        return (not repos) if actif else repos
+
+    def declenchee(self):
+        """True si la broche est au niveau attendu"""
+        return self.niveau() == self.value
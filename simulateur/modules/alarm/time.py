@@ -0,0 +1,15 @@
+"""
+alarm.time simulé
+"""
+
+from simulateur.etat import etat
+
+
+class TimeAlarm:
+    """Alarme à une échéance time.monotonic()"""
+
+    def __init__(self, *, monotonic_time=None, epoch_time=None):
+        horloge = etat.horloge
+        if monotonic_time is None:
+            monotonic_time = horloge.monotonic() + (epoch_time - horloge.time())
+        self.monotonic_time = monotonic_time
@@ -0,0 +1,24 @@
+"""
+Module board simulé (Raspberry Pi Pico / Pico W)
+"""
+
+
+class Pin:
+    """Broche identifiée par son nom"""
+
+    def __init__(self, nom):
+        self.nom = nom
+
+    def __repr__(self):
+        return f"board.{self.nom}"
+
+    def __str__(self):
+        return self.nom
+
+
+for _numero in range(29):
+    globals()[f"GP{_numero}"] = Pin(f"GP{_numero}")
+
+LED = Pin("LED")
+A0, A1, A2 = GP26, GP27, GP28
+SDA, SCL = GP4, GP5
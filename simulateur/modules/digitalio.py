@@ -0,0 +1,68 @@
+"""
+Module digitalio simulé: les entrées suivent le script d'entrées
+"""
+
+from simulateur.etat import etat
+
+
+class Direction:
+    INPUT = "INPUT"
+    OUTPUT = "OUTPUT"
+
+
+class Pull:
+    UP = "UP"
+    DOWN = "DOWN"
+
+
+class DriveMode:
+    PUSH_PULL = "PUSH_PULL"
+    OPEN_DRAIN = "OPEN_DRAIN"
+
+
+class DigitalInOut:
+    """Broche numérique simulée"""
+
+    def __init__(self, pin):
+        self.pin = pin
+        self.direction = Direction.INPUT
+        self.pull = None
+        self.drive_mode = DriveMode.PUSH_PULL
+        self._sortie = False
+        self._libre = False
+
+    def switch_to_input(self, pull=None):
+        self.direction = Direction.INPUT
+        self.pull = pull
+
+    def switch_to_output(self, value=False, drive_mode=DriveMode.PUSH_PULL):
+        self.direction = Direction.OUTPUT
+        self.drive_mode = drive_mode
+        self._sortie = value
+
+    @property
+    def value(self):
+        if self._libre:
+            raise ValueError("Broche libérée (deinit)")
+        if self.direction == Direction.OUTPUT:
+            return self._sortie
+        etat.verifier_fin()
+        actif = etat.entrees.actif(self.pin, etat.temps())
+        repos = self.pull == Pull.UP
+        if actif is None or not actif:
+            return repos
+        # Bouton appuyé: tire la broche à l'opposé du pull
+        return not repos
+
+    @value.setter
+    def value(self, valeur):
+        self._sortie = bool(valeur)
+
+    def deinit(self):
+        self._libre = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.deinit()
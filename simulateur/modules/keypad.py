@@ -0,0 +1,123 @@
+"""
+Module keypad simulé: les événements suivent le script d'entrées
+
+Les changements d'état des broches survenus depuis la dernière lecture
+sont mis en file au moment de la lecture, datés à l'instant du script
+(timestamp en millisecondes sur 29 bits, comme supervisor.ticks_ms).
+"""
+
+from simulateur.etat import etat
+
+MASQUE_TICKS = (1 << 29) - 1
+
+
+class Event:
+    """Appui ou relâchement d'une touche"""
+
+    def __init__(self, key_number=0, pressed=True):
+        self.key_number = key_number
+        self.pressed = pressed
+        self.timestamp = 0
+
+    @property
+    def released(self):
+        return not self.pressed
+
+    def __eq__(self, autre):
+        return (isinstance(autre, Event) and
+                self.key_number == autre.key_number and
+                self.pressed == autre.pressed)
+
+    def __repr__(self):
+        etat_touche = "pressed" if self.pressed else "released"
+        return f"<Event: key_number {self.key_number} {etat_touche}>"
+
+
+class EventQueue:
+    """File d'événements alimentée par le script d'entrées"""
+
+    def __init__(self, touches, max_events):
+        self._touches = touches
+        self._max = max_events
+        self._file = []
+        self.overflowed = False
+
+    def _scruter(self):
+        """Met en file les changements survenus depuis la dernière lecture"""
+        etat.verifier_fin()
+        maintenant = etat.temps()
+        nouveaux = []
+        for numero, pin in enumerate(self._touches.pins):
+            appuye = self._touches.etats[numero]
+            for instant, actif in etat.entrees.evenements.get(str(pin), ()):
+                if instant <= self._touches.derniere_lecture:
+                    continue
+                if instant > maintenant:
+                    break
+                if actif != appuye:
+                    appuye = actif
+                    nouveaux.append((instant, numero, actif))
+            self._touches.etats[numero] = appuye
+        self._touches.derniere_lecture = maintenant
+
+        nouveaux.sort(key=lambda e: e[0])
+        for instant, numero, actif in nouveaux:
+            if len(self._file) >= self._max:
+                self.overflowed = True
+                break
+            self._file.append((int(instant * 1000) & MASQUE_TICKS, numero, actif))
+
+    def get(self):
+        """Retourne le plus ancien événement, ou None"""
+        evenement = Event()
+        return evenement if self.get_into(evenement) else None
+
+    def get_into(self, event):
+        """Copie le plus ancien événement dans event, False si file vide"""
+        if not self._file:
+            self._scruter()
+        if not self._file:
+            return False
+        event.timestamp, event.key_number, event.pressed = self._file.pop(0)
+        return True
+
+    def clear(self):
+        self._scruter()
+        self._file = []
+        self.overflowed = False
+
+    def __len__(self):
+        self._scruter()
+        return len(self._file)
+
+    def __bool__(self):
+        return len(self) > 0
+
+
+class Keys:
+    """Touches sur broches individuelles, scrutées en tâche de fond"""
+
+    def __init__(self, pins, *, value_when_pressed, pull=True,
+                 interval=0.02, max_events=64):
+        self.pins = tuple(pins)
+        self.key_count = len(self.pins)
+        self.value_when_pressed = value_when_pressed
+        self.pull = pull
+        self.interval = interval
+        self.derniere_lecture = etat.temps()
+        self.etats = [bool(etat.entrees.actif(pin, self.derniere_lecture))
+                      for pin in self.pins]
+        self.events = EventQueue(self, max_events)
+
+    def reset(self):
+        """Oublie l'état des touches (les appuis en cours seront signalés)"""
+        self.etats = [False] * self.key_count
+
+    def deinit(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.deinit()
@@ -0,0 +1,122 @@
+"""
+Module neopixel simulé (compatible adafruit_pixelbuf)
+Chaque show() est horodaté par l'enregistreur de la simulation
+"""
+
+from simulateur.etat import etat
+
+RGB = "RGB"
+GRB = "GRB"
+RGBW = "RGBW"
+GRBW = "GRBW"
+
+
+def _regrouper(valeur, nombre, bpp):
+    """
+    Accepte une séquence plate (r, g, b, r, g, b...) pour une tranche,
+    comme _pixelbuf de CircuitPython
+    """
+    if len(valeur) == nombre:
+        return valeur
+    if len(valeur) != nombre * bpp:
+        raise ValueError(f"{len(valeur)} valeurs pour {nombre} pixels")
+    return [tuple(valeur[k:k + bpp]) for k in range(0, len(valeur), bpp)]
+
+
+class NeoPixel:
+    """Bande de LEDs WS2812 simulée"""
+
+    def __init__(self, pin, n, *, bpp=3, brightness=1.0, auto_write=True,
+                 pixel_order=None):
+        self.pin = pin
+        self.n = n
+        self.bpp = len(pixel_order) if pixel_order else bpp
+        self.byteorder = pixel_order or (GRB if self.bpp == 3 else GRBW)
+        self.auto_write = auto_write
+        self._brightness = min(max(brightness, 0.0), 1.0)
+        # Couleurs avant luminosité, comme le pre_brightness_buffer de pixelbuf
+        self._couleurs = [(0, 0, 0)] * n
+        self.shows = 0
+
+    def __len__(self):
+        return self.n
+
+    @property
+    def brightness(self):
+        return self._brightness
+
+    @brightness.setter
+    def brightness(self, valeur):
+        self._brightness = min(max(valeur, 0.0), 1.0)
+        if self.auto_write:
+            self.show()
+
+    def _convertir(self, valeur):
+        if isinstance(valeur, int):
+            return ((valeur >> 16) & 0xFF, (valeur >> 8) & 0xFF, valeur & 0xFF)
+        if len(valeur) == 4:
+            r, g, b, w = valeur
+            return (min(255, r + w), min(255, g + w), min(255, b + w))
+        r, g, b = valeur
+        return (int(r), int(g), int(b))
+
+    def __setitem__(self, index, valeur):
+        if isinstance(index, slice):
+            indices = range(*index.indices(self.n))
+            valeur = _regrouper(valeur, len(indices), self.bpp)
+            for i, v in zip(indices, valeur):
+                self._couleurs[i] = self._convertir(v)
+        else:
+            if index < 0:
+                index += self.n
+            if not 0 <= index < self.n:
+                raise IndexError("Index de pixel hors limites")
+            self._couleurs[index] = self._convertir(valeur)
+        if self.auto_write:
+            self.show()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._couleurs[i] for i in range(*index.indices(self.n))]
+        if index < 0:
+            index += self.n
+        return self._couleurs[index]
+
+    def fill(self, couleur):
+        """Remplit toute la bande"""
+        c = self._convertir(couleur)
+        self._couleurs = [c] * self.n
+        if self.auto_write:
+            self.show()
+
+    def octets_affiches(self):
+        """Retourne les couleurs affichées (RGB, luminosité appliquée)"""
+        b = self._brightness
+        octets = bytearray(self.n * 3)
+        i = 0
+        for r, g, bl in self._couleurs:
+            octets[i] = int(r * b)
+            octets[i + 1] = int(g * b)
+            octets[i + 2] = int(bl * b)
+            i += 3
+        return octets
+
+    def show(self):
+        """Transmet la trame (horodatée, durée de transmission modélisée)"""
+        self.shows += 1
+        enregistreur = etat.enregistreur
+        # Sans conservation des frames, pas de copie (mesures d'allocation)
+        octets = self.octets_affiches() if enregistreur.garder_frames else None
+        duree = enregistreur.enregistrer(etat.temps(), str(self.pin), octets, self.n)
+        etat.horloge.avancer(duree if enregistreur.modeler_transmission else 0)
+
+    def deinit(self):
+        """Libère la broche"""
+        self.fill((0, 0, 0))
+        self.show()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.deinit()
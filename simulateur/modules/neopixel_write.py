@@ -0,0 +1,28 @@
+"""
+Module neopixel_write simulé: transmet un buffer d'octets déjà ordonné
+(GRB par défaut) sur une broche DigitalInOut
+"""
+
+from simulateur.etat import etat
+
+
+def neopixel_write(digitalinout, buf, ordre="GRB"):
+    """
+    Transmet buf (3 octets par pixel, ordre GRB) et l'enregistre en RGB
+
+    Args:
+        digitalinout: Broche de sortie (digitalio.DigitalInOut)
+        buf: Octets à transmettre
+        ordre: Ordre des octets dans buf (extension du simulateur)
+    """
+    nb_pixels = len(buf) // 3
+    ir, ig, ib = ordre.index("R"), ordre.index("G"), ordre.index("B")
+    rgb = bytearray(nb_pixels * 3)
+    for i in range(nb_pixels):
+        base = i * 3
+        rgb[base] = buf[base + ir]
+        rgb[base + 1] = buf[base + ig]
+        rgb[base + 2] = buf[base + ib]
+    enregistreur = etat.enregistreur
+    duree = enregistreur.enregistrer(etat.temps(), str(digitalinout.pin), rgb, nb_pixels)
+    etat.horloge.avancer(duree if enregistreur.modeler_transmission else 0)
@@ -0,0 +1,33 @@
+"""
+Module socketpool simulé: sockets réels de l'hôte
+"""
+
+import socket as _socket
+
+
+class SocketPool:
+    """Fabrique de sockets (API CircuitPython)"""
+
+    AF_INET = _socket.AF_INET
+    SOCK_STREAM = _socket.SOCK_STREAM
+    SOCK_DGRAM = _socket.SOCK_DGRAM
+    SOL_SOCKET = _socket.SOL_SOCKET
+    SO_REUSEADDR = _socket.SO_REUSEADDR
+    IPPROTO_TCP = _socket.IPPROTO_TCP
+    IPPROTO_UDP = _socket.IPPROTO_UDP
+    EAGAIN = 11
+    ETIMEDOUT = 116
+
+    gaierror = _socket.gaierror
+    timeout = _socket.timeout
+
+    def __init__(self, radio):
+        self.radio = radio
+
+    def socket(self, family=_socket.AF_INET, type=_socket.SOCK_STREAM, proto=0):
+        """Crée un socket hôte (recv_into, recvfrom_into, settimeout disponibles)"""
+        return _socket.socket(family, type, proto)
+
+    def getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0):
+        """Résolution DNS par l'hôte"""
+        return _socket.getaddrinfo(host, port, family, type, proto, flags)
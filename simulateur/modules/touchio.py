@@ -0,0 +1,43 @@
+"""
+Module touchio simulé: raw_value = base + dérive + bruit (+ écart si touché)
+"""
+
+import random
+from simulateur.etat import etat
+
+BASE = 450           # Valeur brute au repos
+DERIVE = 2.0         # Dérive de la base (unités par seconde)
+BRUIT = 6            # Écart type du bruit
+ECART_TOUCHER = 180  # Écart ajouté par un doigt
+
+_aleatoire = random.Random(0)
+
+
+class TouchIn:
+    """Capteur tactile capacitif simulé"""
+
+    def __init__(self, pin):
+        self.pin = pin
+        self.threshold = self.raw_value + 100
+
+    @property
+    def raw_value(self):
+        etat.verifier_fin()
+        t = etat.temps()
+        valeur = BASE + DERIVE * t + _aleatoire.gauss(0, BRUIT)
+        if etat.entrees.actif(self.pin, t):
+            valeur += ECART_TOUCHER
+        return max(0, int(valeur))
+
+    @property
+    def value(self):
+        return self.raw_value > self.threshold
+
+    def deinit(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.deinit()
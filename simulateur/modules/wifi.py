@@ -0,0 +1,38 @@
+"""
+Module wifi simulé: la connexion réussit toujours (réseau de l'hôte)
+"""
+
+import ipaddress
+
+
+class _InfoPointAcces:
+    ssid = ""
+    rssi = -50
+    channel = 6
+
+
+class Radio:
+    """Interface radio simulée"""
+
+    def __init__(self):
+        self.enabled = True
+        self.hostname = "picow-simule"
+        self.ipv4_address = None
+        self.ap_info = None
+        self.connexions = 0
+
+    def connect(self, ssid, password="", *, channel=0, bssid=None, timeout=None):
+        """Simule une connexion (aucune attente)"""
+        if not self.enabled:
+            raise ConnectionError("Radio désactivée")
+        self.connexions += 1
+        self.ipv4_address = ipaddress.IPv4Address("127.0.0.1")
+        self.ap_info = _InfoPointAcces()
+        self.ap_info.ssid = ssid
+
+    @property
+    def connected(self):
+        return self.ipv4_address is not None
+
+
+radio = Radio()
@@ -0,0 +1,521 @@
+"""
+Sorties multiples pour les grandes matrices
+Le framebuffer est réparti sur N broches, chacune pilotant une tranche
+contiguë de la bande (un panneau par broche avec les TileMap)
+
+Une bande WS2812 transmet ~30 µs par LED : 1024 LEDs sur une broche
+plafonnent à ~32 FPS. Avec N sorties :
+    - "pio"        : bandes transmises en parallèle par le PIO du RP2040
+                     (adafruit_neopxl8, broches consécutives), durée / N
+    - "sequentiel" : tranches transmises l'une après l'autre avec
+                     neopixel_write (toutes broches, pas de gain de débit
+                     mais des lignes de données courtes)
+    - "neopixel"   : une seule broche (comportement d'origine)
+
+Toutes les sorties exposent l'interface d'adafruit_pixelbuf (pixels[i],
+fill, brightness, show, deinit) : NeoPixelMatrix et les effets ne changent
+pas. Sur l'ordinateur, le simulateur fournit adafruit_neopxl8 et
+neopixel_write (durées de transmission modélisées).
+
+show() en arrière-plan (background=True, une broche) : show() copie la
+trame dans l'un des deux tampons de transmission et rend la main pendant
+que le PIO (rp2pio.background_write) ou, sur l'ordinateur, un thread
+l'envoie. Le rendu de la frame N+1 recouvre la transmission de la frame N ;
+OverlapMeter mesure la part de chaque période recouverte.
+
+UTILISATION:
+    matrix = NeoPixelMatrix((board.GP2, board.GP3, board.GP4, board.GP5),
+                            layout="2x2_16x16")
+
+    matrix = NeoPixelMatrix(board.GP0, background=True)
+    ...
+    matrix.pixels.overlap.report()
+
+    # Tableaux de rafraîchissement (1, 2, 4 et 8 sorties) et de recouvrement
+    python -m simulateur strip_output.py    # sur l'ordinateur (horloge réelle)
+    (copier en code.py sur le Pico)
+"""
+
+import time
+
+import board
+import digitalio
+import neopixel
+from neopixel_write import neopixel_write
+
+try:
+    import adafruit_pixelbuf
+    HAS_PIXELBUF = True
+except ImportError:
+    HAS_PIXELBUF = False
+
+try:
+    import adafruit_neopxl8
+    HAS_NEOPXL8 = True
+except ImportError:
+    HAS_NEOPXL8 = False
+
+try:
+    import rp2pio
+    from array import array
+    HAS_RP2PIO = True
+except ImportError:
+    HAS_RP2PIO = False
+
+try:
+    import threading
+    HAS_THREADING = True
+except ImportError:
+    HAS_THREADING = False
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# Broches consécutives (exigées par le PIO), GP0/GP1 restent libres
+OUTPUT_PINS = (board.GP2, board.GP3, board.GP4, board.GP5,
+               board.GP6, board.GP7, board.GP8, board.GP9)
+WIRE_US_PER_PIXEL = 30
+WIRE_RESET_US = 80
+TABLE_PIXELS = 1024
+TABLE_OUTPUTS = (1, 2, 4, 8)
+TABLE_FRAMES = 30
+OVERLAP_RENDER_MS = (0, 5, 10, 20, 30)  # Coûts de rendu simulés (tableau de recouvrement)
+PIO_FREQUENCY = 12_800_000  # 16 cycles par bit à 800 kHz
+PIO_RESET_MARGIN_US = 300   # Vidage de la FIFO + niveau bas de fin de trame
+
+
+# ============================================================================
+# SORTIE SÉQUENTIELLE
+# ============================================================================
+
+if HAS_PIXELBUF:
+    class StripGroup(adafruit_pixelbuf.PixelBuf):
+        """
+        Framebuffer unique transmis tranche par tranche sur plusieurs broches.
+
+        Attributes:
+            strand_length (int): LEDs par broche
+        """
+
+        def __init__(self, pins, n, *, brightness=1.0, auto_write=False,
+                     pixel_order="GRB"):
+            """
+            Args:
+                pins: Broches de sortie (une tranche de n // len(pins) LEDs chacune)
+                n: Nombre total de LEDs
+                brightness: Luminosité de 0.0 à 1.0
+                auto_write: show() après chaque écriture
+                pixel_order: Ordre des octets des LEDs
+            """
+            if n % len(pins):
+                raise ValueError(f"{n} LEDs non divisibles en {len(pins)} sorties")
+            self.strand_length = n // len(pins)
+            self.outputs = []
+            for pin in pins:
+                output = digitalio.DigitalInOut(pin)
+                output.direction = digitalio.Direction.OUTPUT
+                self.outputs.append(output)
+            self._source = None
+            self._views = []
+            super().__init__(n, brightness=brightness, byteorder=pixel_order,
+                             auto_write=auto_write)
+
+        def _transmit(self, buffer):
+            if buffer is not self._source:
+                # Vues calculées une fois: pas de tranche allouée par frame
+                size = len(buffer) // len(self.outputs)
+                view = memoryview(buffer)
+                self._views = [view[k * size:(k + 1) * size] for k in range(len(self.outputs))]
+                self._source = buffer
+            outputs = self.outputs
+            views = self._views
+            for k in range(len(outputs)):
+                neopixel_write(outputs[k], views[k])
+
+        def deinit(self):
+            """Éteint les LEDs et libère les broches."""
+            self.fill((0, 0, 0))
+            self.show()
+            for output in self.outputs:
+                output.deinit()
+
+
+# ============================================================================
+# TRANSMISSION EN ARRIÈRE-PLAN
+# ============================================================================
+
+class PioTransmitter:
+    """
+    Envoie une trame WS2812 par DMA (rp2pio.StateMachine.background_write).
+
+    Même programme que neopixel_write sur RP2040, mais start() rend la
+    main dès que le DMA est lancé.
+    """
+
+    # out x 1 side 0 [6] / jmp !x 3 side 1 [3] / jmp 0 side 1 [4] / nop side 0 [4]
+    PROGRAM = (0x6621, 0x1323, 0x1400, 0xA442)
+
+    def __init__(self, pin, n):
+        """
+        Args:
+            pin: Broche de données
+            n: Nombre de LEDs (durée de transmission estimée)
+        """
+        self.sm = rp2pio.StateMachine(
+            array("H", self.PROGRAM), frequency=PIO_FREQUENCY,
+            first_sideset_pin=pin, sideset_pin_count=1,
+            auto_pull=True, pull_threshold=8, out_shift_right=False)
+        self.duration_ns = (n * WIRE_US_PER_PIXEL + WIRE_RESET_US) * 1000
+        self._started = False
+
+    def start(self, buffer):
+        """Lance la transmission de buffer (non bloquant)."""
+        self.sm.background_write(buffer)
+        self._started = True
+
+    def wait(self):
+        """Attend la fin de la trame en cours (niveau bas de fin compris)."""
+        if not self._started:
+            return
+        while self.sm.writing:
+            pass
+        end = time.monotonic_ns() + PIO_RESET_MARGIN_US * 1000
+        while time.monotonic_ns() < end:
+            pass
+        self._started = False
+
+    def deinit(self):
+        self.wait()
+        self.sm.deinit()
+
+
+class ThreadTransmitter:
+    """
+    Remplaçant sur l'ordinateur : un thread appelle neopixel_write
+    (bloquant) pendant que le programme continue. Nécessite l'horloge
+    réelle du simulateur (pas --virtuel).
+    """
+
+    def __init__(self, pin, n):
+        self.output = digitalio.DigitalInOut(pin)
+        self.output.direction = digitalio.Direction.OUTPUT
+        self.duration_ns = 0
+        self._buffer = None
+        self._error = None
+        self._stop = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._buffer is None and not self._stop:
+                    self._condition.wait()
+                if self._stop:
+                    return
+                buffer = self._buffer
+            start = time.monotonic_ns()
+            try:
+                neopixel_write(self.output, buffer)
+            except BaseException as e:  # Fin de simulation (KeyboardInterrupt)
+                self._error = e
+            self.duration_ns = time.monotonic_ns() - start
+            with self._condition:
+                self._buffer = None
+                self._condition.notify_all()
+
+    def start(self, buffer):
+        """Confie buffer au thread (non bloquant)."""
+        with self._condition:
+            self._buffer = buffer
+            self._condition.notify_all()
+
+    def wait(self):
+        """Attend la fin de la trame en cours."""
+        with self._condition:
+            while self._buffer is not None:
+                self._condition.wait()
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def deinit(self):
+        self.wait()
+        with self._condition:
+            self._stop = True
+            self._condition.notify_all()
+        self._thread.join()
+        self.output.deinit()
+
+
+class OverlapMeter:
+    """
+    Mesure le recouvrement entre rendu et transmission.
+
+    Pour chaque show(): période depuis le show() précédent, attente de la
+    trame précédente, et part de sa transmission effectuée pendant le
+    rendu (durée de transmission - attente).
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Remet les compteurs à zéro."""
+        self.frames = 0
+        self.period_ns = 0
+        self.wait_ns = 0
+        self.overlap_ns = 0
+        self.transmit_ns = 0
+        self._last = 0
+
+    def record(self, now, waited, transmitted):
+        """
+        Args:
+            now: Instant du show() (ns)
+            waited: Attente de la trame précédente (ns)
+            transmitted: Durée de transmission de la trame précédente (ns)
+        """
+        if self._last:
+            period = now + waited - self._last
+            self.frames += 1
+            self.period_ns += period
+            self.wait_ns += waited
+            self.transmit_ns += transmitted
+            self.overlap_ns += min(period, max(0, transmitted - waited))
+        self._last = now + waited
+
+    def overlap_ratio(self):
+        """Part de la période recouverte par la transmission (0 à 1)."""
+        return self.overlap_ns / self.period_ns if self.period_ns else 0.0
+
+    def report(self):
+        """Affiche période, attente et recouvrement moyens."""
+        if not self.frames:
+            print("Recouvrement: aucune mesure")
+            return
+        n = self.frames
+        print(f"Recouvrement: {n} frames, période {self.period_ns / n / 1e6:.2f} ms, "
+              f"transmission {self.transmit_ns / n / 1e6:.2f} ms, "
+              f"attente {self.wait_ns / n / 1e6:.2f} ms, "
+              f"recouvert {self.overlap_ratio() * 100:.0f}% de la période")
+
+
+if HAS_PIXELBUF:
+    class BackgroundPixels(adafruit_pixelbuf.PixelBuf):
+        """
+        Bande dont show() rend la main pendant la transmission.
+
+        Deux tampons de transmission alternent : show() copie la trame
+        dans le tampon libre, attend la fin de la trame précédente,
+        lance l'envoi puis échange les tampons.
+
+        Attributes:
+            overlap (OverlapMeter): Mesures de recouvrement
+        """
+
+        def __init__(self, pin, n, *, brightness=1.0, pixel_order="GRB",
+                     transmitter=None):
+            """
+            Args:
+                pin: Broche de données
+                n: Nombre de LEDs
+                brightness: Luminosité de 0.0 à 1.0
+                pixel_order: Ordre des octets des LEDs
+                transmitter: PioTransmitter / ThreadTransmitter (défaut: selon
+                    la plateforme)
+            """
+            super().__init__(n, brightness=brightness, byteorder=pixel_order,
+                             auto_write=False)
+            if transmitter is None:
+                transmitter = (PioTransmitter if HAS_RP2PIO else ThreadTransmitter)(pin, n)
+            self.transmitter = transmitter
+            size = n * len(pixel_order)
+            self._buffers = (bytearray(size), bytearray(size))
+            self._index = 0
+            self.overlap = OverlapMeter()
+
+        def _transmit(self, buffer):
+            back = self._buffers[self._index]
+            back[:] = buffer  # Copie mémoire: le dessin peut reprendre aussitôt
+            start = time.monotonic_ns()
+            self.transmitter.wait()
+            waited = time.monotonic_ns() - start
+            transmitted = self.transmitter.duration_ns
+            self.transmitter.start(back)
+            self._index ^= 1
+            self.overlap.record(start, waited, transmitted)
+
+        def deinit(self):
+            """Éteint les LEDs et arrête la transmission."""
+            self.fill((0, 0, 0))
+            self.show()
+            self.transmitter.deinit()
+
+
+# ============================================================================
+# CHOIX DE LA SORTIE
+# ============================================================================
+
+def backends():
+    """
+    Returns:
+        Sorties disponibles sur cette plateforme
+    """
+    names = ["neopixel"]
+    if HAS_PIXELBUF:
+        names.append("sequentiel")
+    if HAS_NEOPXL8:
+        names.append("pio")
+    return names
+
+
+def select_backend(outputs, parallel=None):
+    """
+    Args:
+        outputs: Nombre de broches
+        parallel: True = PIO exigé, False = séquentiel, None = le plus rapide
+
+    Returns:
+        Nom de la sortie ("neopixel", "pio" ou "sequentiel")
+    """
+    if outputs == 1:
+        return "neopixel"
+    if parallel is not False and HAS_NEOPXL8 and outputs <= 8:
+        return "pio"
+    if parallel:
+        raise RuntimeError("Sortie parallèle indisponible (adafruit_neopxl8, 8 broches max)")
+    if not HAS_PIXELBUF:
+        raise RuntimeError("adafruit_pixelbuf requis pour plusieurs sorties")
+    return "sequentiel"
+
+
+def create_pixels(pins, n, brightness=1.0, parallel=None, backend=None, background=False):
+    """
+    Crée l'objet pixels d'une matrice sur une ou plusieurs broches.
+
+    Args:
+        pins: Broche ou séquence de broches (consécutives pour le PIO)
+        n: Nombre total de LEDs
+        brightness: Luminosité de 0.0 à 1.0
+        parallel: Voir select_backend()
+        backend: Force une sortie ("neopixel", "sequentiel", "pio")
+        background: show() en arrière-plan (une broche; la sortie "pio"
+            l'est déjà)
+
+    Returns:
+        Objet compatible adafruit_pixelbuf (auto_write=False)
+    """
+    if not isinstance(pins, (list, tuple)):
+        pins = (pins,)
+    backend = backend or select_backend(len(pins), parallel)
+    if backend == "neopixel":
+        if len(pins) != 1:
+            raise ValueError("La sortie neopixel n'utilise qu'une broche")
+        if background:
+            if not HAS_PIXELBUF:
+                raise RuntimeError("adafruit_pixelbuf requis pour show() en arrière-plan")
+            return BackgroundPixels(pins[0], n, brightness=brightness)
+        return neopixel.NeoPixel(pins[0], n, auto_write=False, brightness=brightness)
+    if background and backend == "sequentiel":
+        raise ValueError("show() en arrière-plan: une broche ou la sortie pio")
+    if backend == "pio":
+        if n % len(pins):
+            raise ValueError(f"{n} LEDs non divisibles en {len(pins)} sorties")
+        return adafruit_neopxl8.NeoPxl8(pins[0], n, num_strands=len(pins),
+                                        auto_write=False, brightness=brightness)
+    return StripGroup(pins, n, brightness=brightness)
+
+
+def frame_time_us(n, outputs, backend):
+    """Durée théorique de transmission d'une trame (µs)."""
+    if backend == "pio":
+        return n // outputs * WIRE_US_PER_PIXEL + WIRE_RESET_US
+    if backend == "sequentiel":
+        return n * WIRE_US_PER_PIXEL + outputs * WIRE_RESET_US
+    return n * WIRE_US_PER_PIXEL + WIRE_RESET_US
+
+
+# ============================================================================
+# TABLEAU DE RAFRAÎCHISSEMENT
+# ============================================================================
+
+def measure_refresh(pixels, frames=TABLE_FRAMES):
+    """
+    Mesure la fréquence maximale de show() (framebuffer déjà rempli).
+
+    Returns:
+        Images par seconde
+    """
+    pixels.fill((16, 8, 4))
+    pixels.show()
+    start = time.monotonic_ns()
+    for _ in range(frames):
+        pixels.show()
+    elapsed = time.monotonic_ns() - start
+    return frames * 1e9 / elapsed if elapsed else 0.0
+
+
+def refresh_table(n=TABLE_PIXELS, counts=TABLE_OUTPUTS, frames=TABLE_FRAMES,
+                  pins=OUTPUT_PINS):
+    """
+    Mesure et affiche le FPS maximal pour 1, 2, 4 et 8 sorties.
+
+    Returns:
+        Liste de tuples (sorties, sortie, FPS mesuré, FPS théorique)
+    """
+    rows = []
+    for outputs in counts:
+        names = ["neopixel"] if outputs == 1 else [
+            name for name in ("sequentiel", "pio") if name in backends()]
+        for name in names:
+            pixels = create_pixels(pins[:outputs], n, brightness=0.1, backend=name)
+            try:
+                fps = measure_refresh(pixels, frames)
+            finally:
+                pixels.deinit()
+            rows.append((outputs, name, fps, 1e6 / frame_time_us(n, outputs, name)))
+
+    print(f"Rafraîchissement de {n} LEDs ({frames} show() par mesure)")
+    print(f"{'sorties':>8s} {'mode':12s} {'FPS mesuré':>11s} {'théorique':>10s}")
+    for outputs, name, fps, theory in rows:
+        print(f"{outputs:8d} {name:12s} {fps:11.1f} {theory:10.1f}")
+    return rows
+
+
+def overlap_table(n=256, render_ms=OVERLAP_RENDER_MS, frames=TABLE_FRAMES,
+                  pin=OUTPUT_PINS[0]):
+    """
+    Compare show() bloquant et en arrière-plan pour plusieurs coûts de
+    rendu (simulés par time.sleep) et affiche le recouvrement mesuré.
+    """
+    print(f"show() bloquant / en arrière-plan, {n} LEDs "
+          f"(transmission {frame_time_us(n, 1, 'neopixel') / 1000:.1f} ms)")
+    print(f"{'rendu ms':>9s} {'FPS bloquant':>13s} {'FPS fond':>9s} {'recouvert':>10s}")
+    for render in render_ms:
+        results = []
+        for background in (False, True):
+            pixels = create_pixels(pin, n, brightness=0.1, background=background)
+            pixels.fill((16, 8, 4))
+            try:
+                pixels.show()
+                start = time.monotonic_ns()
+                for _ in range(frames):
+                    if render:
+                        time.sleep(render / 1000)
+                    pixels.show()
+                elapsed = time.monotonic_ns() - start
+                results.append(frames * 1e9 / elapsed)
+                ratio = pixels.overlap.overlap_ratio() if background else 0
+            finally:
+                pixels.deinit()
+        print(f"{render:9d} {results[0]:13.1f} {results[1]:9.1f} {ratio * 100:9.0f}%")
+
+
+if __name__ == "__main__":
+    refresh_table()
+    if HAS_PIXELBUF and (HAS_RP2PIO or HAS_THREADING):
+        overlap_table()
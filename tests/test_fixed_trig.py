@@ -0,0 +1,52 @@
+"""
+Trigonométrie en virgule fixe (fixed_trig.py): erreur de isin/icos et
+iatan2 par rapport à math, isqrt exacte
+
+    python -m pytest tests/
+"""
+
+import math
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fixed_trig import HALF, ONE, QUARTER, TURN, iatan2, icos, isin, isqrt, radians
+
+STEP = 2 * math.pi / TURN  # Radians par unité d'angle
+
+
+def test_isin_icos_error_bound():
+    for angle in range(-TURN, 2 * TURN, 5):
+        assert abs(isin(angle) / ONE - math.sin(angle * STEP)) < 0.0015  # 0.37 niveau de LED sur 255
+        assert abs(icos(angle) / ONE - math.cos(angle * STEP)) < 0.0015
+    assert isin(0) == 0 and isin(QUARTER) == ONE and isin(-QUARTER) == -ONE
+    assert isin(HALF) == 0 and icos(HALF) == -ONE
+
+
+def test_iatan2_error_bound():
+    for y in range(-64, 65):
+        for x in range(-64, 65):
+            if x or y:
+                exact = math.atan2(y, x) / STEP % TURN
+                assert abs((iatan2(y, x) - exact + HALF) % TURN - HALF) < 6  # 0.033°
+    assert iatan2(0, 0) == 0
+    assert iatan2(0, -5) == HALF
+    assert iatan2(-1, 0) == 3 * QUARTER
+    assert iatan2(3000, 3000) == iatan2(1, 1) == TURN // 8  # Seul le rapport compte
+
+
+def test_isqrt_exact():
+    for n in list(range(20000)) + [2 ** 30 - 1, 2 ** 30, 10 ** 12 + 7]:
+        root = isqrt(n)
+        assert root * root <= n < (root + 1) * (root + 1)
+    assert isqrt(2 ** 40) == 2 ** 20
+    with pytest.raises(ValueError):
+        isqrt(-1)
+
+
+def test_radians():
+    assert radians(math.pi) == HALF
+    assert radians(-math.pi / 2) == -QUARTER
@@ -0,0 +1,95 @@
+"""
+Horloge BCD pilotée par échéances: prochaine_seconde(), prochaine_phase()
+et réveil du sommeil par le bouton (PinAlarm)
+
+    python -m pytest tests/
+"""
+
+import importlib.util
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+HORLOGE = os.path.join(RACINE, "projets", "matrice neopixel 8x8", "horloge_binaire")
+sys.path.insert(0, HORLOGE)
+
+import simulateur
+from simulateur.enregistreur import EnregistreurFrames
+from simulateur.entrees import ScriptEntrees
+
+simulateur.installer(virtuel=True, enregistreur=EnregistreurFrames(
+    garder_frames=False, modeler_transmission=False))
+
+from config import Config
+from display import DisplayManager
+from energie import PlanificateurEnergie
+from hardware import Hardware
+from time_utils import TimeManager
+
+# code.py masquerait le module code de la bibliothèque standard
+_spec = importlib.util.spec_from_file_location("horloge_code", os.path.join(HORLOGE, "code.py"))
+horloge_code = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(horloge_code)
+
+
+def _time_manager():
+    manager = TimeManager()
+    manager.synchroniser_ntp(time.localtime(0))
+    return manager
+
+
+def test_prochaine_seconde():
+    manager = _time_manager()
+    reference = manager.monotonic_reference
+    assert manager.prochaine_seconde() == reference + 1
+    time.sleep(0.3)
+    assert manager.prochaine_seconde() == reference + 1
+    time.sleep(0.7)  # Pile sur la seconde: on vise la suivante
+    assert manager.prochaine_seconde() == reference + 2
+    time.sleep(2.5)
+    assert manager.prochaine_seconde() == reference + 4
+
+
+def test_prochaine_phase(monkeypatch):
+    display = DisplayManager(None)
+    display.animation_seconde_update()
+    assert display.prochaine_phase() == display.last_animation_time + Config.DUREE_ANIM_SECONDE
+    time.sleep(Config.DUREE_ANIM_SECONDE)
+    assert display.animation_seconde_update()
+    assert display.prochaine_phase() == time.monotonic() + Config.DUREE_ANIM_SECONDE
+    monkeypatch.setattr(Config, "ANIMATION_SECONDES", False)
+    assert display.prochaine_phase() is None
+
+
+def test_prochaine_echeance_plus_proche(monkeypatch):
+    horloge = SimpleNamespace(time_manager=_time_manager(), display=DisplayManager(None))
+    seconde = horloge.time_manager.prochaine_seconde()
+    time.sleep(0.2)
+    horloge.display.animation_seconde_update()  # Phase suivante à +0.7 s
+    assert horloge_code.BCDClock.prochaine_echeance(horloge) == horloge.display.prochaine_phase()
+    time.sleep(0.6)  # Phase suivante à 1.3 s, après la seconde
+    horloge.display.animation_seconde_update()
+    assert horloge_code.BCDClock.prochaine_echeance(horloge) == seconde
+    monkeypatch.setattr(Config, "ANIMATION_SECONDES", False)
+    assert horloge_code.BCDClock.prochaine_echeance(horloge) == seconde
+
+
+def test_bouton_reveille_le_sommeil():
+    etat = simulateur.etat.etat
+    entrees, etat.entrees = etat.entrees, ScriptEntrees()
+    try:
+        planificateur = PlanificateurEnergie(Hardware())
+        debut = time.monotonic()
+        etat.entrees.appui(etat.temps() + 0.3, f"GP{Config.BOUTON_PIN}", 0.2)
+        assert planificateur.dormir_jusqu_a(debut + 5)
+        assert time.monotonic() - debut < 0.35  # Sans attendre l'échéance
+        assert planificateur.reveils_bouton == 1
+        # Pendant un appui, réveil à l'échéance seulement
+        debut = time.monotonic()
+        assert not planificateur.dormir_jusqu_a(debut + 1, reveil_bouton=False)
+        assert time.monotonic() - debut >= 1
+    finally:
+        etat.entrees = entrees
@@ -0,0 +1,161 @@
+"""
+Minuteur BCD (minuteur/code.py): décompte à échéance absolue (Decompte),
+tas des échéances (Echeancier) et rotation des minuteurs nommés
+
+    python -m pytest tests/
+"""
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RACINE)
+
+import simulateur
+from simulateur.enregistreur import EnregistreurFrames
+
+simulateur.installer(virtuel=True, enregistreur=EnregistreurFrames(
+    garder_frames=False, modeler_transmission=False))
+
+# code.py masquerait le module code de la bibliothèque standard
+_spec = importlib.util.spec_from_file_location(
+    "minuteur_code", os.path.join(RACINE, "projets", "matrice neopixel 8x8", "minuteur", "code.py"))
+minuteur = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(minuteur)
+
+S = minuteur.NS_PAR_SECONDE
+T0 = 1_000 * S  # Instant de départ arbitraire (ns)
+
+
+@pytest.fixture
+def trois_minuteurs(monkeypatch):
+    """Principal et deux minuteurs nommés, état global du programme neuf"""
+    liste = [minuteur.Minuteur(0, "principal", 60, (0, 0, 100)),
+             minuteur.Minuteur(1, "thé", 180, (0, 80, 0)),
+             minuteur.Minuteur(2, "pâtes", 540, (80, 40, 0))]
+    for nom, valeur in (("minuteurs", liste), ("echeancier", minuteur.Echeancier(liste)),
+                        ("actifs", []), ("affiche", liste[0]), ("rang_rotation", 0),
+                        ("prochaine_rotation", None), ("a_exploser", []),
+                        ("temps_restant", 60), ("temps_precedent", None),
+                        ("dernier_affichage", -1), ("buffer_affichage_actuel", None)):
+        monkeypatch.setattr(minuteur, nom, valeur)
+    monkeypatch.setitem(minuteur.config, "SYSTEM_DEBUG", False)
+    return liste
+
+
+def _demarrer(m, maintenant_ns, echeancier):
+    m.etat = minuteur.ETAT_EN_COURS
+    m.decompte.demarrer(maintenant_ns)
+    echeancier.planifier(m)
+
+
+def test_decompte_secondes_arrondi_superieur():
+    decompte = minuteur.Decompte(10)
+    assert decompte.secondes(T0) == 10
+    decompte.demarrer(T0)
+    assert decompte.echeance_ns == T0 + 10 * S
+    assert decompte.secondes(T0 + 1) == 10
+    assert decompte.secondes(T0 + S) == 9
+    assert decompte.secondes(T0 + 10 * S - 1) == 1
+    assert decompte.secondes(T0 + 10 * S) == 0
+    assert decompte.restant_ns(T0 + 60 * S) == 0
+
+
+def test_decompte_pause_reprise():
+    decompte = minuteur.Decompte(10)
+    decompte.demarrer(T0)
+    decompte.pause(T0 + 3 * S + S // 4)
+    assert decompte.echeance_ns is None
+    assert decompte.restant_ns(T0 + 50 * S) == 6 * S + 3 * S // 4  # Figé en pause
+    decompte.pause(T0 + 60 * S)  # Sans effet
+    decompte.demarrer(T0 + 100 * S)
+    assert decompte.echeance_ns == T0 + 106 * S + 3 * S // 4
+    decompte.demarrer(T0 + 101 * S)  # Déjà en cours: échéance inchangée
+    assert decompte.echeance_ns == T0 + 106 * S + 3 * S // 4
+    # Deuxième pause: les temps écoulés s'additionnent
+    decompte.pause(T0 + 102 * S)
+    decompte.demarrer(T0 + 200 * S)
+    assert decompte.restant_ns(T0 + 200 * S) == 4 * S + 3 * S // 4
+    assert decompte.secondes(T0 + 200 * S) == 5
+    decompte.reinitialiser()
+    assert decompte.restant_ns(T0) == 10 * S
+
+
+def test_decompte_fin_seconde():
+    decompte = minuteur.Decompte(5)
+    assert decompte.fin_seconde_ns(5) is None
+    decompte.demarrer(T0)
+    assert decompte.fin_seconde_ns(5) == T0 + S
+    assert decompte.fin_seconde_ns(2) == T0 + 4 * S
+    assert decompte.fin_seconde_ns(1) == T0 + 5 * S
+    assert decompte.fin_seconde_ns(0) == T0 + 5 * S
+    # La seconde affichée change exactement à fin_seconde_ns
+    for secondes in range(5, 0, -1):
+        fin = decompte.fin_seconde_ns(secondes)
+        assert decompte.secondes(fin - 1) == secondes
+        assert decompte.secondes(fin) == secondes - 1
+
+
+def test_echeancier_ordre_des_fins(trois_minuteurs):
+    principal, the, pates = trois_minuteurs
+    echeancier = minuteur.echeancier
+    assert echeancier.prochaine() is None
+    for m in (pates, principal, the):
+        _demarrer(m, T0, echeancier)
+    assert echeancier.prochaine() == T0 + 60 * S
+    assert echeancier.retirer_echu(T0 + 60 * S - 1) is None
+    assert echeancier.retirer_echu(T0 + 600 * S) is principal
+    assert echeancier.retirer_echu(T0 + 600 * S) is the
+    assert echeancier.retirer_echu(T0 + 600 * S) is pates
+    assert echeancier.retirer_echu(T0 + 600 * S) is None
+    assert echeancier.tas == []
+
+
+def test_echeancier_ignore_entrees_perimees(trois_minuteurs):
+    principal, the, _ = trois_minuteurs
+    echeancier = minuteur.echeancier
+    _demarrer(principal, T0, echeancier)
+    _demarrer(the, T0, echeancier)
+    # Pause: l'entrée reste dans le tas, mais sa version est périmée
+    principal.decompte.pause(T0 + 20 * S)
+    echeancier.planifier(principal)
+    assert len(echeancier.tas) == 2
+    assert echeancier.prochaine() == T0 + 180 * S
+    assert len(echeancier.tas) == 1
+    # Reprise: nouvelle échéance, avant celle du thé
+    principal.decompte.demarrer(T0 + 100 * S)
+    echeancier.planifier(principal)
+    assert echeancier.prochaine() == T0 + 140 * S
+    # Reset du thé: son entrée est ignorée à l'échéance
+    the.decompte.reinitialiser()
+    echeancier.planifier(the)
+    assert echeancier.retirer_echu(T0 + 200 * S) is principal
+    assert echeancier.retirer_echu(T0 + 200 * S) is None
+    assert echeancier.prochaine() is None
+
+
+def test_rotation_minuteurs_nommes(trois_minuteurs):
+    principal, the, pates = trois_minuteurs
+    # Court: démarrer; long: minuteur suivant
+    for appui in ("court", "long", "court", "long", "court"):
+        minuteur.traiter_appui(appui, T0)
+    assert minuteur.actifs == [principal, the, pates]
+    assert minuteur.affiche is pates
+    assert minuteur.prochaine_rotation == T0 + minuteur.ROTATION_NS
+    assert minuteur.prochain_reveil_ns() == pates.decompte.fin_seconde_ns(minuteur.temps_restant)
+    vus = []
+    for _ in range(4):
+        instant = minuteur.prochaine_rotation
+        assert not minuteur.mettre_a_jour_decompte(instant)
+        vus.append(minuteur.affiche)
+    assert vus == [the, pates, principal, the]
+    assert minuteur.temps_restant == the.decompte.secondes(instant)
+    # Fin du principal pendant la rotation: il prend l'affichage
+    fin = principal.decompte.echeance_ns
+    assert minuteur.mettre_a_jour_decompte(fin)
+    assert minuteur.affiche is principal and principal.etat == minuteur.ETAT_TERMINE
+    assert minuteur.prochaine_rotation is None
+    assert minuteur.echeancier.prochaine() == the.decompte.echeance_ns
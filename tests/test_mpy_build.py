@@ -0,0 +1,105 @@
+"""
+Configuration figée du minuteur (mpy_build.py): aplatir() avec rejets,
+check_constraints() et freeze_config()
+
+    python -m pytest tests/
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mpy_build
+
+DEFAUT, aplatir = mpy_build.minuteur_definitions()
+
+
+def _config(**valeurs):
+    config = aplatir(DEFAUT, {})
+    config.update(valeurs)
+    return config
+
+
+def _freeze(tmp_path, toml):
+    path = tmp_path / "config.toml"
+    path.write_text(toml, encoding="utf-8")
+    return mpy_build.freeze_config(str(path))
+
+
+def test_aplatir_rejets_keep_defaults():
+    rejets = []
+    config = aplatir(DEFAUT, {
+        "timer": {"duree_initiale": "1h", "duree_explosion": 20, "inconnue": 1},
+        "couleurs": {"pause": {"r": 1, "g": 2, "b": 3}},
+        "animation": 3,
+        "affichage_bcd": {"heures": [0, 1]},
+    }, "", rejets)
+    assert sorted(rejets) == sorted([
+        "clé inconnue: TIMER_INCONNUE",
+        "int attendu: TIMER_DUREE_INITIALE",
+        "section attendue: ANIMATION",
+        "liste de 4 valeurs attendue: AFFICHAGE_BCD_HEURES",
+    ])
+    assert config["TIMER_DUREE_INITIALE"] == 3600
+    assert config["TIMER_DUREE_EXPLOSION"] == 20
+    assert config["COULEURS_PAUSE"] == (1, 2, 3)
+    assert config["ANIMATION_ETAPES_EXTINCTION"] == 20
+    assert config["AFFICHAGE_BCD_HEURES"] == (0, 1, 0, 7)
+
+
+def test_aplatir_without_rejets_raises():
+    with pytest.raises(ValueError, match="clé inconnue: SYSTEM_NOM_COURT"):
+        aplatir(DEFAUT, {"system": {"nom_court": "x"}})
+    # Un entier est accepté pour un flottant
+    assert aplatir(DEFAUT, {"matrice": {"luminosite": 1}})["MATRICE_LUMINOSITE"] == 1.0
+
+
+def test_check_constraints():
+    assert mpy_build.check_constraints(_config()) == []
+    errors = mpy_build.check_constraints(_config(
+        BOUTON_TYPE="pullupp", MATRICE_LUMINOSITE=1.5, TIMER_RAFRAICHISSEMENT=0.0,
+        COULEURS_NORMALE=(0, 0, 300)))
+    assert len(errors) == 4
+    assert errors[0].startswith("BOUTON_TYPE")
+
+
+def test_check_constraints_minuteurs_lengths():
+    config = _config(MINUTEURS_NOMS=("thé", "pâtes"), MINUTEURS_DUREES=(180,),
+                     MINUTEURS_COULEURS=((0, 80, 0), (80, 40, 0)))
+    assert mpy_build.check_constraints(config) == [
+        "MINUTEURS_: noms, durees et couleurs de même longueur attendus"]
+    config.update(MINUTEURS_DUREES=(180, -1), MINUTEURS_COULEURS=((0, 80, 0), (80, 40)))
+    assert mpy_build.check_constraints(config) == [
+        "MINUTEURS_DUREES: durées positives attendues",
+        "MINUTEURS_COULEURS: [r, g, b] de 0 à 255 attendus"]
+
+
+def test_freeze_config_reports_every_error(tmp_path):
+    with pytest.raises(ValueError) as erreur:
+        _freeze(tmp_path, """
+[timer]
+duree_initiale = "une heure"
+[bouton]
+couleur = 3
+[minuteurs]
+noms = ["thé", "pâtes"]
+durees = [180]
+couleurs = [[0, 80, 0], [80, 40, 0]]
+""")
+    assert str(erreur.value).splitlines() == [
+        "clé inconnue: BOUTON_COULEUR",
+        "int attendu: TIMER_DUREE_INITIALE",
+        "MINUTEURS_: noms, durees et couleurs de même longueur attendus",
+    ]
+
+
+def test_freeze_config_project_toml():
+    config = mpy_build.freeze_config(os.path.join(mpy_build.MINUTEUR, "config.toml"))
+    assert config["SYSTEM_NOM"] == "Minuteur BCD 8x8"
+    assert config["COULEURS_EXPLOSION_PHASE2"] == (50, 0, 0)
+    namespace = {}
+    exec(mpy_build.frozen_source(config, "config.toml"), namespace)
+    assert all(namespace[name] == value for name, value in config.items())
@@ -0,0 +1,103 @@
+"""
+Double tampon de NeoPixelMatrix: begin_frame() / end_frame(), show()
+pendant une trame, trame précédente conservée (copy_previous, keep),
+fade() et cancel_frame()
+
+    python -m pytest tests/
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import simulateur
+from simulateur.enregistreur import EnregistreurFrames
+
+simulateur.installer(virtuel=True, enregistreur=EnregistreurFrames(
+    garder_frames=False, modeler_transmission=False))
+
+from neopixel_matrix_optimized import NeoPixelMatrix
+
+
+RED = (255, 0, 0)
+BLUE = (0, 0, 255)
+
+
+def _sent(matrix):
+    """Octets RGB reçus par la matrice hors écran (PixelBuffer)."""
+    return bytes(matrix.pixels.buf)
+
+
+def test_show_is_noop_inside_frame():
+    matrix = NeoPixelMatrix(None)
+    matrix.fill(BLUE)
+    matrix.show()
+    shows = matrix.pixels.shows
+    matrix.begin_frame()
+    matrix.fill(RED)
+    matrix.show()
+    matrix.clear()  # show() interne ignoré lui aussi
+    matrix.set_pixel(1, 2, RED)
+    assert matrix.pixels.shows == shows
+    assert _sent(matrix) == bytes(BLUE) * matrix.num_pixels
+    matrix.end_frame()
+    assert matrix.pixels.shows == shows + 1
+    assert not matrix.drawing
+    assert matrix.pixels[matrix.get_index(1, 2)] == RED
+    assert matrix.pixels[matrix.get_index(0, 0)] == (0, 0, 0)
+
+
+def test_end_frame_keeps_sent_frame():
+    matrix = NeoPixelMatrix(None)
+    for keep in (False, True):
+        matrix.begin_frame()
+        matrix.fill(BLUE)
+        matrix.set_pixel(3, 4, RED)
+        matrix.end_frame(keep=keep)
+        assert bytes(matrix.frame_buffer()) == _sent(matrix)
+        assert matrix.get_pixel(3, 4) == RED
+
+
+def test_copy_previous_starts_from_displayed_frame():
+    matrix = NeoPixelMatrix(None, layout="2x2")
+    matrix.begin_frame()
+    matrix.fill(BLUE)
+    matrix.end_frame()
+    for x in range(3):
+        matrix.begin_frame(copy_previous=True)
+        matrix.set_pixel(x, 0, RED)
+        matrix.end_frame()
+    assert [matrix.pixels[matrix.get_index(x, 0)] for x in range(4)] == [RED, RED, RED, BLUE]
+    assert matrix.pixels[matrix.get_index(15, 15)] == BLUE
+
+
+def test_fade_trails():
+    matrix = NeoPixelMatrix(None)
+    matrix.begin_frame()
+    matrix.fill((200, 100, 50))
+    matrix.end_frame()
+    matrix.begin_frame(copy_previous=True)
+    matrix.fade(128)
+    matrix.set_pixel(0, 0, RED)
+    matrix.end_frame()
+    assert matrix.pixels[matrix.get_index(0, 0)] == RED
+    assert matrix.pixels[matrix.get_index(7, 7)] == (100, 50, 25)
+    matrix.fade(256)
+    assert matrix.get_pixel(7, 7) == (100, 50, 25)
+    matrix.fade(0)
+    assert bytes(matrix.frame_buffer()) == bytes(3 * matrix.num_pixels)
+
+
+def test_cancel_frame_sends_nothing():
+    matrix = NeoPixelMatrix(None)
+    matrix.fill(BLUE)
+    matrix.show()
+    shows = matrix.pixels.shows
+    matrix.begin_frame()
+    matrix.frame_view()[0:3] = bytes(RED)
+    matrix.cancel_frame()
+    assert not matrix.drawing
+    assert matrix.pixels.shows == shows
+    assert _sent(matrix) == bytes(BLUE) * matrix.num_pixels
+
@@ -0,0 +1,74 @@
+"""
+Aller-retour .npxa: encodage puis lecture par AnimationPlayer sur une
+NeoPixelMatrix simulée
+
+    python -m pytest tests/
+"""
+
+import io
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import simulateur
+from simulateur.enregistreur import EnregistreurFrames
+
+simulateur.installer(virtuel=True, enregistreur=EnregistreurFrames(
+    garder_frames=False, modeler_transmission=False))
+
+import board
+import npxa
+from neopixel_matrix_optimized import NeoPixelMatrix
+
+
+def _frames(count, size, colors, rng):
+    """Frames aléatoires: une image de départ puis quelques pixels changés."""
+    frame = [rng.choice(colors) for _ in range(size)]
+    frames = [list(frame)]
+    for _ in range(count - 1):
+        for _ in range(size // 8):
+            frame[rng.randrange(size)] = rng.choice(colors)
+        frames.append(list(frame))
+    return frames
+
+
+def _play(matrix, frames, keyframe_interval=npxa.KEYFRAME_INTERVAL):
+    """Encode les frames, les joue et retourne les couleurs affichées."""
+    encoder = npxa.Encoder(matrix.width, matrix.height, fps=20,
+                           keyframe_interval=keyframe_interval)
+    for frame in frames:
+        encoder.add_frame(frame)
+    data, _ = encoder.encode()
+    player = npxa.AnimationPlayer(matrix, io.BytesIO(data), loop=False)
+    table = matrix.index_table
+    shown = []
+    for _ in player.frames():
+        shown.append([tuple(matrix.pixels[table[i]][:3]) for i in range(matrix.num_pixels)])
+    return shown
+
+
+def test_palette_round_trip():
+    rng = random.Random(0)
+    matrix = NeoPixelMatrix(board.GP0, brightness=1.0)
+    colors = [(rng.randrange(256), rng.randrange(256), rng.randrange(256)) for _ in range(6)]
+    frames = _frames(5, matrix.num_pixels, colors, rng)
+    assert _play(matrix, frames, keyframe_interval=3) == frames
+
+
+def test_rgb_round_trip_chained_panels():
+    rng = random.Random(1)
+    matrix = NeoPixelMatrix(board.GP0, brightness=1.0, layout="2x2")
+    colors = [(rng.randrange(256), rng.randrange(256), rng.randrange(256)) for _ in range(400)]
+    frames = _frames(5, matrix.num_pixels, colors, rng)
+    assert _play(matrix, frames) == frames
+
+
+def test_delta_keeps_unchanged_pixels():
+    matrix = NeoPixelMatrix(board.GP0, brightness=1.0)
+    red, blue = (255, 0, 0), (0, 0, 255)
+    first = [red] * matrix.num_pixels
+    second = list(first)
+    second[10] = blue
+    assert _play(matrix, [first, second, second]) == [first, second, second]
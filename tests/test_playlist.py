@@ -0,0 +1,94 @@
+"""
+Transitions de la playlist (playlist.py): mélange dans le frame buffer
+de la matrice de sortie, durée de transition nulle
+
+    python -m pytest tests/
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import simulateur
+from simulateur.enregistreur import EnregistreurFrames
+
+simulateur.installer(virtuel=True, enregistreur=EnregistreurFrames(
+    garder_frames=False, modeler_transmission=False))
+
+import playlist
+from effects import EffectRegistry
+from neopixel_matrix_optimized import NeoPixelMatrix
+
+ITEMS = (("effect2_rainbow", 1), ("effect5_fire", 1))
+SECOND = 1_000_000_000
+
+
+def _player(transition=playlist.CROSSFADE, transition_time=0.5, layout="8x8"):
+    registry = EffectRegistry()
+    matrix = NeoPixelMatrix(None, layout=layout)
+    player = playlist.PlaylistPlayer(matrix, registry, playlist.Playlist(registry, ITEMS),
+                                     transition=transition, transition_time=transition_time)
+    return player, matrix
+
+
+def _tracks(player, outgoing, incoming):
+    """Deux effets factices: les matrices hors écran remplies des couleurs."""
+    a, b = player.buffers
+    a.fill(outgoing)
+    b.fill(incoming)
+    player.current = playlist.Track(None, a, 0, 0)
+    player.incoming = playlist.Track(None, b, 1, 0)
+
+
+def test_crossfade_writes_output_frame_buffer():
+    player, matrix = _player()
+    _tracks(player, (200, 0, 40), (0, 100, 240))
+    matrix.begin_frame()
+    player.crossfade(64)
+    matrix.end_frame()
+    assert matrix.pixels[matrix.get_index(3, 3)] == (150, 25, 90)
+    assert matrix.pixels.shows == 1
+
+
+def test_wipe_columns():
+    player, matrix = _player(playlist.WIPE, layout="2x2")
+    _tracks(player, (255, 0, 0), (0, 0, 255))
+    matrix.begin_frame()
+    player.wipe(128)
+    matrix.end_frame()
+    assert matrix.get_pixel(7, 15) == (0, 0, 255)
+    assert matrix.get_pixel(8, 0) == (255, 0, 0)
+
+
+def test_zero_transition_time_cuts():
+    player, matrix = _player(transition_time=0)
+    assert player.transition == playlist.CUT
+    start = time.monotonic_ns()  # Horloge virtuelle: immobile sans sleep()
+    player.render_frame(start)
+    first = player.current.name
+    player.render_frame(start + 2 * SECOND)  # Fin du premier élément
+    assert player.incoming is None
+    assert player.current.name != first
+    assert matrix.pixels.shows >= 2
+    player.stop()
+
+
+def test_transition_sends_through_matrix():
+    player, matrix = _player(transition_time=0.5)
+    start = time.monotonic_ns()
+    player.render_frame(start)
+    for step in range(10):
+        player.render_frame(start + SECOND + step * SECOND // 10)
+    assert player.incoming is None
+    assert player.transition_frames >= 5
+    assert bytes(matrix.frame_buffer()) == bytes(player.current.matrix.frame_buffer())
+    player.stop()
+
+
+def test_negative_transition_time():
+    with pytest.raises(ValueError):
+        _player(transition_time=-1)
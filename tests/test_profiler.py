@@ -0,0 +1,53 @@
+"""
+Profileur (profiler.py): show() enveloppé seulement pendant les mesures
+
+    python -m pytest tests/
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import simulateur
+from simulateur.enregistreur import EnregistreurFrames
+
+simulateur.installer(virtuel=True, enregistreur=EnregistreurFrames(
+    garder_frames=False, modeler_transmission=False))
+
+from neopixel_matrix_optimized import NeoPixelMatrix
+from profiler import Profiler
+
+
+def test_disabled_profiler_leaves_show_alone():
+    matrix = NeoPixelMatrix(None)
+    profiler = Profiler(enabled=False)
+    profiler.instrument_show(matrix)
+    assert not profiler.active
+    assert "show" not in vars(matrix) and "end_frame" not in vars(matrix)
+
+
+def test_prof_on_off_wraps_and_restores_show():
+    matrix = NeoPixelMatrix(None)
+    profiler = Profiler(enabled=False)
+    profiler.instrument_show(matrix)
+    profiler.select("effet")
+    assert profiler.execute("prof on")
+    assert profiler.active
+    matrix.show()
+    matrix.begin_frame()
+    matrix.end_frame()
+    assert profiler.sections["effet"].show.count == 2
+    assert matrix.pixels.shows == 2
+
+    profiler.execute("prof off")
+    assert not profiler.active
+    matrix.show()
+    assert profiler.sections["effet"].show.count == 2
+    assert matrix.pixels.shows == 3
+    assert vars(matrix)["show"].__name__ == "show"  # Méthode d'origine
+
+    profiler.execute("prof on")
+    profiler.execute("prof on")  # Une seule enveloppe
+    matrix.show()
+    assert profiler.sections["effet"].show.count == 3
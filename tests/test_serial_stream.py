@@ -0,0 +1,128 @@
+"""
+Protocole série (serial_stream.py): en-têtes et resynchronisation, CRC,
+aller-retour des frames delta, débit à travers un pty
+
+    python -m pytest tests/
+"""
+
+import io
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import simulateur
+from simulateur.enregistreur import EnregistreurFrames
+
+simulateur.installer(virtuel=True, enregistreur=EnregistreurFrames(
+    garder_frames=False, modeler_transmission=False))
+
+import serial_sender
+import serial_stream
+from neopixel_matrix_optimized import NeoPixelMatrix
+
+
+def _packets(frames, num_pixels, **options):
+    """Encode les frames et retourne le flux d'octets et l'émetteur."""
+    output = io.BytesIO()
+    sender = serial_stream.FrameSender(output, num_pixels, **options)
+    for frame in frames:
+        sender.send(frame)
+    return output.getvalue(), sender
+
+
+def _receiver(data, layout="8x8"):
+    matrix = NeoPixelMatrix(None, layout=layout)
+    return serial_stream.FrameReceiver(matrix, io.BytesIO(data)), matrix
+
+
+def _receive_all(receiver):
+    """Lit le flux jusqu'au bout; retourne le nombre de frames affichées."""
+    shown = 0
+    while receiver.port.tell() < len(receiver.port.getbuffer()):
+        if receiver.receive():
+            shown += 1
+    return shown
+
+
+def test_header_check():
+    header = serial_stream.pack_header(serial_stream.DELTA, 7, 300)
+    assert len(header) == serial_stream.HEADER_SIZE
+    assert header[:3] == serial_stream.SYNC
+    assert header[7] == serial_stream.header_check(serial_stream.DELTA, 7, 300)
+    assert header[7] != serial_stream.header_check(serial_stream.DELTA, 8, 300)
+
+
+def test_resync_after_garbage():
+    frame = bytes(range(192))
+    data, _ = _packets([frame], 64)
+    receiver, matrix = _receiver(b"NP\x00garbage" + data)
+    assert _receive_all(receiver) == 1
+    assert receiver.errors == 1  # Une erreur par perte de synchro
+    assert bytes(matrix.frame_buffer()) == frame
+    assert matrix.pixels.shows == 1
+
+
+def test_crc_rejects_corrupted_data():
+    rng = random.Random(0)
+    first = bytes(rng.getrandbits(8) for _ in range(192))
+    second = bytearray(first)
+    second[30] ^= 0xFF
+    third = bytearray(second)
+    third[60] ^= 0xFF
+    data, sender = _packets([first, second, third, first], 64, keyframe_interval=3)
+    assert sender.keyframes == 2
+    # Octet de la première image complète corrompu
+    corrupted = bytearray(data)
+    corrupted[serial_stream.HEADER_SIZE + 10] ^= 0x01
+    receiver, matrix = _receiver(bytes(corrupted))
+    assert _receive_all(receiver) == 1
+    assert receiver.errors == 1
+    assert receiver.dropped == 2  # Delta sans référence, jusqu'à l'image complète
+    assert bytes(matrix.frame_buffer()) == first
+    assert matrix.pixels.shows == 1
+
+
+def test_delta_round_trip():
+    rng = random.Random(1)
+    matrix = NeoPixelMatrix(None, layout="2x2")
+    size = 3 * matrix.num_pixels
+    frame = bytearray(rng.getrandbits(8) for _ in range(size))
+    frames = []
+    for _ in range(40):
+        for _ in range(5):
+            o = 3 * rng.randrange(matrix.num_pixels)
+            frame[o:o + 3] = bytes(rng.getrandbits(8) for _ in range(3))
+        frames.append(bytes(frame))
+    output = io.BytesIO()
+    sender = serial_stream.FrameSender(output, matrix.num_pixels, keyframe_interval=16)
+    receiver = serial_stream.FrameReceiver(matrix, io.BytesIO())
+    for frame in frames:
+        start = output.tell()
+        sender.send(frame)
+        receiver.port = io.BytesIO(output.getvalue()[start:])
+        assert receiver.receive()
+        assert bytes(matrix.frame_buffer()) == frame
+    assert sender.keyframes == 3
+    assert sender.bytes < len(frames) * size // 4
+    assert receiver.errors == receiver.dropped == 0
+
+
+def test_logical_order_table():
+    matrix = NeoPixelMatrix(None, layout="2x2")
+    colors = [(i, 255 - i, i // 2) for i in range(matrix.num_pixels)]
+    data, _ = _packets([colors], matrix.num_pixels, table=matrix.index_table)
+    receiver, received = _receiver(data, layout="2x2")
+    assert receiver.receive()
+    assert received.get_pixel(1, 0) == colors[1]
+    assert received.get_pixel(0, 1) == colors[received.width]
+
+
+def test_pty_throughput():
+    rng = random.Random(2)
+    result = serial_sender.bench_pty(serial_sender._frames_delta(200, 192, rng))
+    assert result["affichees"] == result["frames"] == 200
+    assert result["erreurs"] == 0
+    assert result["exact"]
+    assert result["fps"] > 200
@@ -0,0 +1,36 @@
+"""
+Filtre tactile adaptatif (touch_filter.py) rejoué sur la trace synthétique
+de touch_traces.py: dérive, bruit, parasites et appuis
+
+    python -m pytest tests/
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from touch_filter import ThresholdFilter, TouchFilter
+from touch_traces import replay, synthetic_trace
+
+
+def test_adaptive_filter_on_synthetic_trace():
+    result = replay(synthetic_trace(), TouchFilter())
+    assert result["touches"] == 45
+    assert result["missed"] == 0
+    assert result["false_positives"] == 0
+    assert max(result["latencies"]) <= 20  # Deux confirmations à 100 Hz
+
+
+def test_fixed_threshold_misses_drift():
+    result = replay(synthetic_trace(), ThresholdFilter(500))
+    assert result["missed"] > 0 and result["false_positives"] > 0
+
+
+def test_baseline_follows_drops():
+    fast, slow = TouchFilter(), TouchFilter(alpha_base_down=1 / 64)
+    for raw in [500] * 8 + [400] * 20:
+        fast.update(raw)
+        slow.update(raw)
+    assert fast.baseline < 410 < slow.baseline
+    assert not fast.touched and not slow.touched
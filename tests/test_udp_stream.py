@@ -0,0 +1,153 @@
+"""
+Réception DDP et E1.31 (udp_stream.py) sur la boucle locale: frames
+périmées, paquets hors séquence, univers et décalages
+
+    python -m pytest tests/
+"""
+
+import os
+import socket
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import simulateur
+from simulateur.enregistreur import EnregistreurFrames
+
+simulateur.installer(virtuel=True, enregistreur=EnregistreurFrames(
+    garder_frames=False, modeler_transmission=False))
+
+import socketpool
+import udp_stream
+from neopixel_matrix_optimized import NeoPixelMatrix
+
+
+class _Capture:
+    """Socket d'émission qui garde les paquets (envoyés ensuite dans l'ordre voulu)."""
+
+    def __init__(self):
+        self.packets = []
+
+    def sendto(self, packet, address):
+        self.packets.append(packet)
+
+
+def _receiver(protocol, layout="2x2_16x16", universe=1):
+    matrix = NeoPixelMatrix(None, layout=layout)
+    receiver = udp_stream.UDPReceiver(matrix, socketpool.SocketPool(None), protocol,
+                                      port=0, universe=universe, host="127.0.0.1")
+    return receiver, matrix
+
+
+def _sender(receiver, protocol, universe=1):
+    return udp_stream.UDPSender(_Capture(), ("127.0.0.1", 1), receiver.matrix.num_pixels,
+                                protocol, universe=universe)
+
+
+def _deliver(receiver, packets):
+    """Envoie les paquets au récepteur puis les traite (un seul poll)."""
+    address = receiver.socket.getsockname()
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        for packet in packets:
+            sock.sendto(packet, address)
+    return receiver.wait(1.0)
+
+
+def _frame(size, seed):
+    return bytes((seed + 7 * i) & 0xFF for i in range(size))
+
+
+def test_stale_window():
+    assert udp_stream._stale(3, 3, 16, udp_stream.DDP_WINDOW)     # Doublon
+    assert udp_stream._stale(15, 1, 16, udp_stream.DDP_WINDOW)    # Avant 1 (bouclage)
+    assert not udp_stream._stale(1, 15, 16, udp_stream.DDP_WINDOW)
+    assert not udp_stream._stale(8, 1, 16, udp_stream.DDP_WINDOW)  # Reprise de l'émetteur
+    assert udp_stream._stale(250, 5, 256, udp_stream.E131_WINDOW)
+    assert not udp_stream._stale(5, 250, 256, udp_stream.E131_WINDOW)
+
+
+def test_ddp_frame_over_several_packets():
+    receiver, matrix = _receiver("ddp")
+    sender = _sender(receiver, "ddp")
+    frame = _frame(receiver.size, 1)
+    assert sender.send(frame) == 3  # 3072 octets, 1440 par paquet
+    try:
+        assert _deliver(receiver, sender.socket.packets) == 1
+    finally:
+        receiver.close()
+    assert bytes(matrix.frame_buffer()) == frame
+    assert receiver.packets == 3 and receiver.errors == 0
+
+
+def test_ddp_drops_stale_frame():
+    receiver, matrix = _receiver("ddp")
+    sender = _sender(receiver, "ddp")
+    first, second = _frame(receiver.size, 1), _frame(receiver.size, 2)
+    sender.send(first)
+    sender.send(second)
+    try:
+        assert _deliver(receiver, sender.socket.packets) == 1
+    finally:
+        receiver.close()
+    assert receiver.stale == 1
+    assert matrix.pixels.shows == 1
+    assert bytes(matrix.frame_buffer()) == second
+
+
+def test_ddp_drops_out_of_order_packets():
+    receiver, matrix = _receiver("ddp", layout="8x8")
+    sender = _sender(receiver, "ddp")
+    first, second = _frame(receiver.size, 1), _frame(receiver.size, 2)
+    sender.send(first)
+    sender.send(second)
+    packets = sender.socket.packets
+    query = bytes([udp_stream.DDP_VERSION | udp_stream.DDP_QUERY]) + bytes(9)
+    try:
+        # Plus récente d'abord, puis l'ancienne et un doublon
+        assert _deliver(receiver, [packets[1], packets[0], packets[1], query]) == 1
+    finally:
+        receiver.close()
+    assert receiver.out_of_order == 2
+    assert receiver.errors == 1
+    assert bytes(matrix.frame_buffer()) == second
+
+
+def test_e131_universe_mapping():
+    receiver, matrix = _receiver("e131", universe=5)
+    assert receiver.universes == 7  # 3072 octets, 510 par univers
+    sender = _sender(receiver, "e131", universe=5)
+    first, second = _frame(receiver.size, 1), _frame(receiver.size, 2)
+    sender.send(first)
+    sender.send(second)
+    packets = sender.socket.packets
+    other = udp_stream.UDPSender(_Capture(), ("127.0.0.1", 1), 170, "e131", universe=4)
+    other.send(bytes(510))
+    try:
+        assert _deliver(receiver, packets[:7]) == 1
+        assert bytes(matrix.frame_buffer()) == first
+        # Univers 7 (LEDs 340 à 509) puis le dernier, qui termine la frame
+        assert _deliver(receiver, other.socket.packets + [packets[9], packets[13]]) == 1
+    finally:
+        receiver.close()
+    expected = bytearray(first)
+    expected[2 * 510:3 * 510] = second[2 * 510:3 * 510]
+    expected[6 * 510:] = second[6 * 510:]
+    assert bytes(matrix.frame_buffer()) == bytes(expected)
+    assert receiver.errors == 0
+
+
+def test_e131_sequence_per_universe():
+    receiver, matrix = _receiver("e131")
+    sender = _sender(receiver, "e131")
+    first, second = _frame(receiver.size, 1), _frame(receiver.size, 2)
+    sender.send(first)
+    sender.send(second)
+    packets = sender.socket.packets
+    try:
+        assert _deliver(receiver, packets[7:]) == 1
+        # Anciennes séquences de chaque univers: toutes ignorées
+        assert _deliver(receiver, packets[:7]) == 0
+    finally:
+        receiver.close()
+    assert receiver.out_of_order == 7
+    assert bytes(matrix.frame_buffer()) == second
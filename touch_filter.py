@@ -0,0 +1,184 @@
+"""
+Filtre adaptatif pour capteur tactile capacitif (touchio)
+Suivi de la ligne de base en arrière-plan et détection avec hystérésis
+"""
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+ALPHA_BASE = 1 / 64        # Vitesse de suivi de la ligne de base (dérive lente)
+ALPHA_BASE_BAISSE = 1 / 8  # Suivi plus rapide quand la valeur passe sous la base
+ALPHA_BRUIT = 1 / 32       # Vitesse de suivi de l'estimation du bruit
+FACTEUR_APPUI = 8.0        # Seuil d'appui = FACTEUR_APPUI x bruit
+FACTEUR_RELACHE = 0.5      # Seuil de relâche = FACTEUR_RELACHE x seuil d'appui
+DELTA_MIN = 40             # Écart minimal (en unités raw_value) pour un appui
+ECHANTILLONS_INIT = 8      # Échantillons de démarrage (ligne de base initiale)
+CONFIRMATIONS = 2          # Échantillons consécutifs requis pour valider un appui
+APPUI_MAX = 2000           # Au-delà (en échantillons), l'appui est considéré bloqué
+
+
+# ============================================================================
+# CLASSE PRINCIPALE
+# ============================================================================
+
+class TouchFilter:
+    """
+    Filtre adaptatif pour les valeurs brutes d'un capteur tactile.
+
+    La ligne de base suit la dérive (humidité, température) par moyenne
+    mobile exponentielle, uniquement lorsque le capteur n'est pas touché.
+    Le bruit est estimé par la moyenne mobile de l'écart absolu à la base.
+    Un appui est détecté avec hystérésis relativement à cette base.
+
+    Attributes:
+        baseline (float): Ligne de base courante
+        noise (float): Estimation du bruit (écart absolu moyen)
+        delta (float): Écart du dernier échantillon à la ligne de base
+        touched (bool): État courant (touché ou non)
+        samples (int): Nombre d'échantillons traités
+    """
+
+    def __init__(self, alpha_base=ALPHA_BASE, alpha_base_down=ALPHA_BASE_BAISSE,
+                 alpha_noise=ALPHA_BRUIT, press_factor=FACTEUR_APPUI,
+                 release_factor=FACTEUR_RELACHE, min_delta=DELTA_MIN,
+                 warmup=ECHANTILLONS_INIT,
+                 confirmations=CONFIRMATIONS, max_press=APPUI_MAX):
+        """
+        Initialise le filtre.
+
+        Args:
+            alpha_base: Coefficient de la moyenne mobile de la ligne de base
+            alpha_base_down: Coefficient utilisé quand la valeur passe sous
+                la base (suivi plus rapide)
+            alpha_noise: Coefficient de la moyenne mobile du bruit
+            press_factor: Multiple du bruit au-delà duquel un appui est détecté
+            release_factor: Fraction du seuil d'appui en dessous de laquelle
+                l'appui est relâché (hystérésis)
+            min_delta: Écart minimal pour un appui, quel que soit le bruit
+            warmup: Nombre d'échantillons pour établir la base initiale
+            confirmations: Échantillons consécutifs requis pour un appui
+            max_press: Durée maximale d'un appui (en échantillons) avant
+                recalibration automatique
+        """
+        self.alpha_base = alpha_base
+        self.alpha_base_down = alpha_base_down
+        self.alpha_noise = alpha_noise
+        self.press_factor = press_factor
+        self.release_factor = release_factor
+        self.min_delta = min_delta
+        self.warmup = warmup
+        self.confirmations = confirmations
+        self.max_press = max_press
+        self.reset()
+
+    def reset(self):
+        """Réinitialise la ligne de base (recalibration non bloquante)."""
+        self.baseline = 0.0
+        self.noise = 0.0
+        self.delta = 0.0
+        self.touched = False
+        self.samples = 0
+        self._above = 0
+        self._press_samples = 0
+
+    @property
+    def ready(self):
+        """True une fois la ligne de base initiale établie."""
+        return self.samples >= self.warmup
+
+    def press_threshold(self):
+        """Retourne l'écart à la base requis pour détecter un appui."""
+        return max(self.min_delta, self.press_factor * self.noise)
+
+    def release_threshold(self):
+        """Retourne l'écart à la base en dessous duquel l'appui est relâché."""
+        return self.release_factor * self.press_threshold()
+
+    def update(self, raw):
+        """
+        Traite un échantillon brut.
+
+        Args:
+            raw: Valeur brute du capteur (touchio.TouchIn.raw_value)
+
+        Returns:
+            True si un nouvel appui vient d'être détecté, False sinon
+        """
+        self.samples += 1
+
+        # Phase de démarrage : moyenne simple des premiers échantillons
+        if self.samples <= self.warmup:
+            self.baseline += (raw - self.baseline) / self.samples
+            self.delta = raw - self.baseline
+            if self.samples > 1:
+                self.noise += (abs(self.delta) - self.noise) / (self.samples - 1)
+            return False
+
+        delta = raw - self.baseline
+        self.delta = delta
+
+        if self.touched:
+            self._press_samples += 1
+            if delta < self.release_threshold():
+                self.touched = False
+                self._above = 0
+            elif self._press_samples >= self.max_press:
+                # Appui anormalement long : la base a dérivé, on la recale
+                self.baseline = float(raw)
+                self.touched = False
+                self._above = 0
+            return False
+
+        if delta > self.press_threshold():
+            self._above += 1
+            if self._above >= self.confirmations:
+                self.touched = True
+                self._press_samples = 0
+                return True
+            return False
+
+        # Pas de toucher : suivi de la dérive et du bruit
+        self._above = 0
+        if delta < 0:
+            self.baseline += delta * self.alpha_base_down
+        else:
+            self.baseline += delta * self.alpha_base
+        self.noise += (abs(delta) - self.noise) * self.alpha_noise
+        return False
+
+
+# ============================================================================
+# DÉTECTION À SEUIL FIXE (RÉFÉRENCE)
+# ============================================================================
+
+class ThresholdFilter:
+    """
+    Détection à seuil fixe, équivalente à touchio.TouchIn.value.
+
+    Sert de référence pour comparer les traces enregistrées.
+    """
+
+    def __init__(self, threshold):
+        """
+        Args:
+            threshold: Seuil absolu sur raw_value
+        """
+        self.threshold = threshold
+        self.touched = False
+
+    def reset(self):
+        """Réinitialise l'état."""
+        self.touched = False
+
+    def update(self, raw):
+        """
+        Traite un échantillon brut.
+
+        Returns:
+            True si un nouvel appui vient d'être détecté, False sinon
+        """
+        was_touched = self.touched
+        self.touched = raw > self.threshold
+        return self.touched and not was_touched
@@ -0,0 +1,215 @@
+"""
+Enregistrement et rejeu de traces du capteur tactile
+Compare le filtre adaptatif (touch_filter) au seuil fixe (TOUCH_THRESHOLD)
+
+UTILISATION:
+Sur le Pico (enregistrement) :
+1. Copier ce fichier en code.py avec touch_filter.py
+2. Ouvrir la console série et copier les lignes "t_ms,raw,contact"
+   dans un fichier trace.csv (contact = 1 pendant que le bouton de
+   référence GP2 est appuyé, facultatif)
+
+Sur l'ordinateur (comparaison) :
+    python touch_traces.py trace.csv --seuil 500
+    python touch_traces.py --synthetique
+"""
+
+import sys
+from touch_filter import TouchFilter, ThresholdFilter
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+SAMPLE_RATE = 100         # Hz
+RECORD_DURATION = 60      # secondes
+TOUCH_PIN_NAME = "GP1"
+REFERENCE_PIN_NAME = "GP2"  # Bouton de référence (vérité terrain), facultatif
+
+
+# ============================================================================
+# ENREGISTREMENT (SUR LE PICO)
+# ============================================================================
+
+def record(duration=RECORD_DURATION, sample_rate=SAMPLE_RATE):
+    """Affiche une trace t_ms,raw,contact sur la console série."""
+    import board
+    import digitalio
+    import time
+    import touchio
+
+    touch = touchio.TouchIn(getattr(board, TOUCH_PIN_NAME))
+    reference = digitalio.DigitalInOut(getattr(board, REFERENCE_PIN_NAME))
+    reference.direction = digitalio.Direction.INPUT
+    reference.pull = digitalio.Pull.UP
+
+    period_ns = 1_000_000_000 // sample_rate
+    start = time.monotonic_ns()
+    next_sample = start
+    end = start + int(duration * 1_000_000_000)
+
+    print("t_ms,raw,contact")
+    while next_sample < end:
+        while time.monotonic_ns() < next_sample:
+            pass
+        t_ms = (next_sample - start) // 1_000_000
+        contact = 0 if reference.value else 1
+        print(f"{t_ms},{touch.raw_value},{contact}")
+        next_sample += period_ns
+    print("# fin de trace")
+
+
+# ============================================================================
+# TRACES (SUR L'ORDINATEUR)
+# ============================================================================
+
+def load_trace(path):
+    """
+    Charge une trace CSV.
+
+    Returns:
+        Liste de tuples (t_ms, raw, contact) ; contact vaut None si absent
+    """
+    trace = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#") or line.startswith("t_ms"):
+                continue
+            fields = line.split(",")
+            contact = int(fields[2]) if len(fields) > 2 else None
+            trace.append((int(fields[0]), int(fields[1]), contact))
+    return trace
+
+
+def synthetic_trace(duration=120, sample_rate=SAMPLE_RATE, seed=1):
+    """
+    Génère une trace réaliste : dérive lente (humidité, température),
+    bruit, parasites isolés et appuis de durée variable.
+
+    Returns:
+        Liste de tuples (t_ms, raw, contact)
+    """
+    import random
+    rng = random.Random(seed)
+    trace = []
+    n = int(duration * sample_rate)
+    touch_until = -1
+    for i in range(n):
+        t = i / sample_rate
+        # Dérive : la base monte de 450 à ~900 en deux minutes
+        base = 450 + 450 * t / duration
+        raw = base + rng.gauss(0, 6)
+        if rng.random() < 0.002:
+            raw += rng.choice((-1, 1)) * 60  # Parasite isolé
+        if i > touch_until and rng.random() < 0.004:
+            touch_until = i + int(rng.uniform(0.15, 0.8) * sample_rate)
+        contact = 1 if i <= touch_until else 0
+        if contact:
+            raw += 180
+        trace.append((i * 1000 // sample_rate, int(raw), contact))
+    return trace
+
+
+def replay(trace, detector):
+    """
+    Rejoue une trace dans un détecteur.
+
+    Returns:
+        Dictionnaire: appuis détectés, latences (ms), faux positifs, manqués
+    """
+    detector.reset()
+    detections = []
+    onsets = []
+    previous_contact = 0
+    for t_ms, raw, contact in trace:
+        if contact and not previous_contact:
+            onsets.append(t_ms)
+        previous_contact = contact or 0
+        if detector.update(raw):
+            detections.append(t_ms)
+
+    result = {"detections": len(detections)}
+    if trace and trace[0][2] is None:
+        return result
+
+    latencies = []
+    false_positives = 0
+    matched = set()
+    for t in detections:
+        # Associer la détection au dernier début de contact précédent
+        candidates = [o for o in onsets if o <= t and o not in matched]
+        if candidates and t - candidates[-1] <= 1000:
+            matched.add(candidates[-1])
+            latencies.append(t - candidates[-1])
+        else:
+            false_positives += 1
+    result["touches"] = len(onsets)
+    result["latencies"] = latencies
+    result["false_positives"] = false_positives
+    result["missed"] = len(onsets) - len(matched)
+    return result
+
+
+def sample_rate_of(trace):
+    """Retourne la fréquence d'échantillonnage mesurée (Hz)."""
+    if len(trace) < 2:
+        return 0
+    return (len(trace) - 1) * 1000 / (trace[-1][0] - trace[0][0])
+
+
+def report(name, result):
+    """Affiche le résultat d'un rejeu."""
+    print(f"{name}:")
+    print(f"  Détections: {result['detections']}")
+    if "touches" not in result:
+        return
+    latencies = result["latencies"]
+    if latencies:
+        mean = sum(latencies) / len(latencies)
+        print(f"  Latence: moyenne {mean:.1f} ms, max {max(latencies)} ms")
+    print(f"  Appuis réels: {result['touches']}")
+    print(f"  Manqués: {result['missed']}")
+    print(f"  Faux positifs: {result['false_positives']}")
+
+
+def compare(trace, threshold):
+    """Compare le filtre adaptatif et le seuil fixe sur une trace."""
+    print(f"Échantillons: {len(trace)}")
+    print(f"Fréquence d'échantillonnage: {sample_rate_of(trace):.1f} Hz")
+    print("=" * 40)
+    report("Filtre adaptatif", replay(trace, TouchFilter()))
+    report(f"Seuil fixe ({threshold})", replay(trace, ThresholdFilter(threshold)))
+
+
+def main(argv):
+    """Point d'entrée sur l'ordinateur."""
+    threshold = 500
+    synthetic = False
+    paths = []
+    args = iter(argv)
+    for arg in args:
+        if arg == "--seuil":
+            threshold = int(next(args))
+        elif arg == "--synthetique":
+            synthetic = True
+        else:
+            paths.append(arg)
+
+    if synthetic:
+        trace = synthetic_trace()
+    elif paths:
+        trace = load_trace(paths[0])
+    else:
+        print(__doc__)
+        return
+
+    compare(trace, threshold)
+
+
+if __name__ == "__main__":
+    if sys.implementation.name == "circuitpython":
+        record()
+    else:
+        main(sys.argv[1:])
@@ -0,0 +1,295 @@
+"""
+Émetteur de pixels UDP pour udp_stream.py (sur l'ordinateur)
+Rend un effet de effects/ ou une fonction de motif (comme
+serial_sender.py) et envoie chaque frame en DDP ou E1.31 (sACN) au
+Pico W, ou mesure la réception sur la boucle locale (127.0.0.1)
+
+Sur le Pico W : horloge_binaire avec MODE_UDP = True dans config.py,
+ou UDPReceiver(matrix, pool).wait() dans sa propre boucle.
+
+Le banc fait tourner UDPReceiver sur le simulateur en temps réel (show()
+dure le temps de transmission WS2812) et un émetteur dans un second fil
+d'exécution. Chaque frame porte son numéro dans ses 4 premiers octets:
+à la fin de chaque show(), la frame affichée est identifiée et la
+latence paquet -> LEDs mesurée depuis son envoi.
+    cadencé     FPS fixe, latence (médiane, p99, max)
+    saturation  envoi plus rapide que show(), FPS soutenu et frames périmées
+    désordre    cadencé, des paquets voisins échangés (hors séquence)
+
+UTILISATION:
+    python udp_sender.py 192.168.1.42 effects/effect5_fire.py:Effect5_Fire --fps 60
+    python udp_sender.py 192.168.1.42 effects/effect5_fire.py:Effect5_Fire --protocole e131
+    python udp_sender.py --banc                    # DDP et E1.31, 8x8
+    python udp_sender.py --banc --disposition 2x2_16x16 --frames 300
+
+Options:
+    --protocole P    "ddp" (défaut) ou "e131"
+    --port N         Port UDP (défaut: port du protocole)
+    --univers N      Premier univers E1.31 (défaut: 1)
+    --fps N          Fréquence d'envoi (défaut: 60)
+    --duree S        Durée d'envoi (défaut: illimitée)
+    --graine N       Graine de random (défaut: 0)
+    --disposition D  Disposition des panneaux ("8x8", "2x2_16x16"...)
+    --banc           Mesure sur la boucle locale (pas de carte)
+    --frames N       Frames envoyées par scénario du banc (défaut: 600)
+"""
+
+import random
+import socket
+import struct
+import sys
+import threading
+import time
+
+import udp_stream
+from npxa_compiler import _add_paths
+from serial_sender import FPS, GRAINE, DISPOSITION, paced, render_frames
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+FRAMES_BANC = 600
+FPS_SATURATION = 1000  # Au-delà de ce que show() peut suivre
+TAUX_DESORDRE = 0.05  # Part des paquets échangés avec le suivant
+TIMEOUT_BANC = 5      # Silence de l'émetteur avant la fin d'un scénario (secondes)
+
+
+# ============================================================================
+# ENVOI EN DIRECT
+# ============================================================================
+
+def stream(host, target, protocol="ddp", port=0, universe=1, fps=FPS, duration=None,
+           seed=GRAINE, layout=DISPOSITION):
+    """
+    Rend la cible en temps réel et envoie chaque frame en UDP.
+
+    Args:
+        host: Adresse IP du Pico W
+        target: Cible "fichier:nom" (voir npxa_compiler.py)
+        duration: Durée d'envoi en secondes (None = jusqu'à Ctrl+C)
+
+    Returns:
+        UDPSender (statistiques)
+    """
+    sender = None
+    start = time.monotonic_ns()
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        try:
+            for frame in paced(render_frames(target, fps, seed, layout), fps, duration):
+                if sender is None:
+                    sender = udp_stream.UDPSender(sock, (host, port), len(frame) // 3,
+                                                  protocol=protocol, universe=universe)
+                sender.send(frame)
+        except KeyboardInterrupt:
+            pass
+    elapsed = (time.monotonic_ns() - start) / 1e9
+    if sender is not None:
+        print(f"{sender.frames} frames en {elapsed:.1f} s ({sender.frames / elapsed:.1f} FPS), "
+              f"{sender.packets} paquets {protocol} vers {sender.address[0]}:{sender.address[1]}")
+    return sender
+
+
+# ============================================================================
+# BANC SUR LA BOUCLE LOCALE
+# ============================================================================
+
+class _Reorder:
+    """Socket d'émission qui retient parfois un paquet après le suivant."""
+
+    def __init__(self, sock, rng, rate):
+        self.socket = sock
+        self.rng = rng
+        self.rate = rate
+        self.held = None
+
+    def sendto(self, packet, address):
+        if self.held is not None:
+            self.socket.sendto(packet, address)
+            self.socket.sendto(self.held, address)
+            self.held = None
+        elif self.rng.random() < self.rate:
+            self.held = packet
+        else:
+            self.socket.sendto(packet, address)
+
+    def flush(self, address):
+        """Envoie le paquet retenu (fin du scénario)."""
+        if self.held is not None:
+            self.socket.sendto(self.held, address)
+            self.held = None
+
+
+def _frames(count, size, rng):
+    """Frames aléatoires numérotées (4 premiers octets, gros-boutiste)."""
+    frames = []
+    for number in range(count):
+        frame = bytearray(rng.randbytes(size))
+        struct.pack_into(">I", frame, 0, number)
+        frames.append(frame)
+    return frames
+
+
+def _percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0
+
+
+def bench_loopback(protocol, frames, layout=DISPOSITION, fps=FPS, reorder=0.0, seed=GRAINE):
+    """
+    Envoie les frames à un UDPReceiver sur 127.0.0.1 et mesure latence
+    et débit.
+
+    Args:
+        fps: Fréquence d'envoi
+        reorder: Part des paquets retenus après le suivant
+
+    Returns:
+        dict: frames, affichées, périmées, hors_sequence, perdus, secondes,
+            fps, latences (ns, triées), exact
+    """
+    import board
+    import socketpool
+    import wifi
+    from neopixel_matrix_optimized import NeoPixelMatrix
+    matrix = NeoPixelMatrix(board.GP0, layout=layout, brightness=1.0)
+    receiver = udp_stream.UDPReceiver(matrix, socketpool.SocketPool(wifi.radio),
+                                      protocol=protocol, port=0, host="127.0.0.1")
+    address = receiver.socket.getsockname()
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    output = _Reorder(sock, random.Random(seed), reorder) if reorder else sock
+    sender = udp_stream.UDPSender(output, address, matrix.num_pixels, protocol=protocol)
+    sent_ns = [0] * len(frames)
+    done = threading.Event()
+
+    def send():
+        for number, frame in enumerate(paced(frames, fps)):
+            sent_ns[number] = time.monotonic_ns()
+            sender.send(frame)
+        if reorder:
+            output.flush(sender.address)
+        done.set()
+
+    latencies = []
+    thread = threading.Thread(target=send, daemon=True)
+    start = time.perf_counter()
+    thread.start()
+    while True:
+        # Envoi terminé: les paquets sont déjà dans la file du socket
+        finished = done.is_set()
+        if finished:
+            shown = receiver.poll()
+        else:
+            shown = receiver.wait(0.05)
+        if shown:
+            # Frame affichée: show() terminé, transmission comprise
+            number = struct.unpack_from(">I", matrix.frame_buffer(), 0)[0]
+            if number < len(frames):
+                latencies.append(time.monotonic_ns() - sent_ns[number])
+        elif finished or time.perf_counter() - start > TIMEOUT_BANC + len(frames) / fps:
+            break
+    elapsed = time.perf_counter() - start
+    thread.join()
+    receiver.close()
+    sock.close()
+    latencies.sort()
+    return {
+        "frames": sender.frames,
+        "affichees": receiver.frames,
+        "perimees": receiver.stale,
+        "hors_sequence": receiver.out_of_order,
+        "perdus": sender.packets - receiver.packets,
+        "secondes": elapsed,
+        "fps": receiver.frames / elapsed if elapsed else 0,
+        "latences": latencies,
+        "exact": bytes(matrix.frame_buffer()) == bytes(frames[-1]),
+    }
+
+
+def print_bench(name, result):
+    """Affiche une ligne de résultats du banc."""
+    latencies = result["latences"]
+    print(f"{name:22s} {result['affichees']:5d}/{result['frames']:<5d} {result['fps']:6.0f} FPS  "
+          f"latence {_percentile(latencies, 0.5) / 1e6:6.2f} / "
+          f"{_percentile(latencies, 0.99) / 1e6:6.2f} / "
+          f"{(latencies[-1] if latencies else 0) / 1e6:6.2f} ms  "
+          f"périmées {result['perimees']:4d}  hors séquence {result['hors_sequence']:3d}  "
+          f"perdus {result['perdus']:3d}  {'exact' if result['exact'] else 'DIFFÉRENT'}")
+
+
+def bench(frame_count=FRAMES_BANC, layout=DISPOSITION, fps=FPS, protocols=udp_stream.PROTOCOLS):
+    """Lance les scénarios cadencé, saturation et désordre pour chaque protocole."""
+    _add_paths()
+    import simulateur
+    from simulateur.enregistreur import EnregistreurFrames
+    from neopixel_matrix_optimized import tile_map
+    # Temps réel, show() dure la transmission WS2812 (800 kHz)
+    simulateur.installer(enregistreur=EnregistreurFrames(
+        garder_frames=False, modeler_transmission=True))
+    try:
+        tiles = tile_map(layout)
+        num_pixels = tiles.width * tiles.height
+        frames = _frames(frame_count, 3 * num_pixels, random.Random(GRAINE))
+        print(f"Banc UDP 127.0.0.1: {layout} ({num_pixels} LEDs), {frame_count} frames "
+              f"par scénario, latence médiane / p99 / max (envoi -> fin de show)")
+        results = {}
+        for protocol in protocols:
+            for name, options in (("cadencé", {"fps": fps}),
+                                  ("saturation", {"fps": FPS_SATURATION}),
+                                  ("désordre", {"fps": fps, "reorder": TAUX_DESORDRE})):
+                key = f"{protocol} {name}"
+                results[key] = bench_loopback(protocol, frames, layout, **options)
+                print_bench(key, results[key])
+        return results
+    finally:
+        simulateur.desinstaller()
+
+
+def main(argv):
+    """Point d'entrée en ligne de commande."""
+    options = {}
+    positional = []
+    run_bench = False
+    frame_count = FRAMES_BANC
+    args = iter(argv)
+    for arg in args:
+        if arg == "--protocole":
+            options["protocol"] = next(args)
+            if options["protocol"] not in udp_stream.PROTOCOLS:
+                print(__doc__)
+                return 2
+        elif arg == "--port":
+            options["port"] = int(next(args))
+        elif arg == "--univers":
+            options["universe"] = int(next(args))
+        elif arg == "--fps":
+            options["fps"] = float(next(args))
+        elif arg == "--duree":
+            options["duration"] = float(next(args))
+        elif arg == "--graine":
+            options["seed"] = int(next(args))
+        elif arg == "--disposition":
+            options["layout"] = next(args)
+        elif arg == "--banc":
+            run_bench = True
+        elif arg == "--frames":
+            frame_count = int(next(args))
+        elif arg.startswith("-"):
+            print(__doc__)
+            return 2
+        else:
+            positional.append(arg)
+
+    if run_bench:
+        protocols = (options["protocol"],) if "protocol" in options else udp_stream.PROTOCOLS
+        bench(frame_count, options.get("layout", DISPOSITION), options.get("fps", FPS), protocols)
+        return 0
+    if len(positional) != 2:
+        print(__doc__)
+        return 2
+    stream(positional[0], positional[1], **options)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,379 @@
+"""
+Réception de pixels en temps réel par UDP (DDP ou E1.31 / sACN) pour
+NeoPixelMatrix, sur le Pico W
+Les logiciels d'éclairage (xLights, Jinx!, LedFx, QLC+...) et
+udp_sender.py envoient les couleurs, la matrice les affiche
+
+FORMATS (gros-boutiste):
+    DDP, port 4048, en-tête de 10 octets (14 avec horodatage)
+        B   drapeaux: version 01 (0x40), horodatage (0x10), PUSH (0x01)
+        B   numéro de séquence (bits 0-3, 1-15, 0 = non utilisé)
+        B   type de données (0x0B: RGB 8 bits)
+        B   destination (1: affichage, 255: tous)
+        I   position dans la bande (octets)
+        H   longueur des données (octets)
+        Les données d'une frame peuvent être réparties sur plusieurs
+        paquets; le paquet PUSH termine la frame.
+
+    E1.31, port 5568, en-tête de 126 octets puis les canaux DMX
+        Univers N: LEDs (N - universe) x 170 et suivantes (510 canaux,
+        R, G, B). La frame est terminée par le dernier univers de la
+        matrice. Séquence propre à chaque univers.
+
+Les paquets sont lus par recv_into() dans un tampon préalloué, et les
+données copiées dans le frame buffer de la matrice par une seule
+affectation de memoryview: aucune allocation de tampon ni boucle Python
+par pixel. La file du socket est vidée avant d'afficher: une frame déjà
+remplacée par une plus récente n'est pas transmise aux LEDs (périmée).
+Les paquets en double ou plus anciens que le dernier reçu sont ignorés.
+
+UTILISATION:
+    pool = socketpool.SocketPool(wifi.radio)
+    receiver = UDPReceiver(matrix, pool, protocol="ddp")
+    while True:
+        receiver.wait(1.0)   # ou receiver.poll() dans une boucle existante
+
+    # Ordinateur: voir udp_sender.py
+"""
+
+import struct
+import time
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+PACKET_SIZE = 1472        # Charge utile UDP maximale (MTU 1500)
+
+DDP_PORT = 4048
+DDP_HEADER_SIZE = 10
+DDP_TIMECODE_SIZE = 4
+DDP_VERSION = 0x40
+DDP_VERSION_MASK = 0xC0
+DDP_TIMECODE = 0x10
+DDP_QUERY = 0x02
+DDP_PUSH = 0x01
+DDP_TYPE_RGB = 0x0B
+DDP_ID_DISPLAY = 1
+DDP_ID_ALL = 255
+DDP_MAX_DATA = 1440       # 480 LEDs par paquet
+DDP_WINDOW = 4            # Paquets plus anciens que 4 numéros: reprise de l'émetteur
+
+E131_PORT = 5568
+E131_HEADER_SIZE = 126
+E131_ID = b"ASC-E1.17\x00\x00\x00"
+E131_ROOT_VECTOR = 0x00000004
+E131_FRAMING_VECTOR = 0x00000002
+E131_DMP_VECTOR = 0x02
+E131_PREVIEW = 0x40
+E131_TERMINATED = 0x20
+E131_CHANNELS = 510       # 170 LEDs RGB par univers
+E131_WINDOW = 20          # Fenêtre de rejet de la norme (-20 < écart <= 0)
+E131_PRIORITY = 100
+
+PROTOCOLS = ("ddp", "e131")
+
+
+def _stale(sequence, last, modulo, window):
+    """True si sequence est un doublon ou précède last (fenêtre de rejet)."""
+    difference = (sequence - last) % modulo
+    return difference == 0 or difference > modulo - window
+
+
+# ============================================================================
+# ÉMISSION
+# ============================================================================
+
+class UDPSender:
+    """
+    Envoie des frames (octets RGB dans l'ordre de la bande) en DDP ou E1.31.
+
+    Fonctionne avec tout socket UDP muni de sendto() (socket de
+    l'ordinateur ou socketpool du Pico W).
+    """
+
+    def __init__(self, sock, address, num_pixels, protocol="ddp", universe=1,
+                 source_name="neopixel-matrix"):
+        """
+        Args:
+            sock: Socket UDP
+            address: Tuple (hôte, port), port 0 = port du protocole
+            num_pixels: Nombre de LEDs de la matrice
+            protocol: "ddp" ou "e131"
+            universe: Premier univers E1.31
+            source_name: Nom de la source E1.31
+        """
+        if protocol not in PROTOCOLS:
+            raise ValueError(f"Protocole inconnu: {protocol}")
+        host, port = address
+        self.socket = sock
+        self.address = (host, port or (DDP_PORT if protocol == "ddp" else E131_PORT))
+        self.size = 3 * num_pixels
+        self.protocol = protocol
+        self.universe = universe
+        self.universes = (self.size + E131_CHANNELS - 1) // E131_CHANNELS
+        self.sequence = 0
+        self.sequences = bytearray(self.universes)
+        self.packets = 0
+        self.frames = 0
+        if protocol == "e131":
+            name = source_name.encode()[:63]
+            self._e131_source = name + bytes(64 - len(name))
+
+    def send(self, frame):
+        """
+        Envoie une frame complète.
+
+        Returns:
+            Nombre de paquets envoyés
+        """
+        if len(frame) != self.size:
+            raise ValueError(f"Frame de {len(frame)} octets, {self.size} attendus")
+        view = memoryview(frame)
+        count = 0
+        if self.protocol == "ddp":
+            for offset in range(0, self.size, DDP_MAX_DATA):
+                end = min(offset + DDP_MAX_DATA, self.size)
+                self._send(self.ddp_header(offset, end - offset, end == self.size) +
+                           bytes(view[offset:end]))
+                count += 1
+        else:
+            for index in range(self.universes):
+                offset = index * E131_CHANNELS
+                end = min(offset + E131_CHANNELS, self.size)
+                self._send(self.e131_header(index, end - offset) + bytes(view[offset:end]))
+                count += 1
+        self.frames += 1
+        return count
+
+    def _send(self, packet):
+        self.socket.sendto(packet, self.address)
+        self.packets += 1
+
+    def ddp_header(self, offset, length, push):
+        """En-tête DDP (séquence 1-15 par paquet)."""
+        self.sequence = self.sequence % 15 + 1
+        flags = DDP_VERSION | (DDP_PUSH if push else 0)
+        return struct.pack(">BBBBIH", flags, self.sequence, DDP_TYPE_RGB,
+                           DDP_ID_DISPLAY, offset, length)
+
+    def e131_header(self, index, length):
+        """En-tête E1.31 de l'univers universe + index (séquence par univers)."""
+        sequence = (self.sequences[index] + 1) & 0xFF
+        self.sequences[index] = sequence
+        slots = length + 1  # Code de départ inclus
+        return (struct.pack(">HH12sHI16s", 0x0010, 0, E131_ID,
+                            0x7000 | (109 + slots), E131_ROOT_VECTOR, bytes(16)) +
+                struct.pack(">HI", 0x7000 | (87 + slots), E131_FRAMING_VECTOR) +
+                self._e131_source +
+                struct.pack(">BHBBH", E131_PRIORITY, 0, sequence, 0, self.universe + index) +
+                struct.pack(">HBBHHHB", 0x7000 | (10 + slots), E131_DMP_VECTOR, 0xA1,
+                            0, 1, slots, 0))
+
+
+# ============================================================================
+# RÉCEPTION (PICO W)
+# ============================================================================
+
+class UDPReceiver:
+    """
+    Reçoit les paquets DDP ou E1.31 et les affiche par begin_frame() /
+    end_frame().
+
+    Statistiques: frames (affichées), stale (frames complètes remplacées
+    avant affichage), out_of_order (paquets en double ou en retard),
+    errors (paquets invalides), latence réception -> fin de show()
+    (latency_total_ns / frames, latency_max_ns).
+    """
+
+    def __init__(self, matrix, pool, protocol="ddp", port=None, universe=1,
+                 host="0.0.0.0"):
+        """
+        Args:
+            matrix: NeoPixelMatrix (double tampon)
+            pool: socketpool.SocketPool
+            protocol: "ddp" ou "e131"
+            port: Port UDP (défaut: port du protocole)
+            universe: Premier univers E1.31 de la matrice
+            host: Adresse d'écoute
+        """
+        if protocol not in PROTOCOLS:
+            raise ValueError(f"Protocole inconnu: {protocol}")
+        self.matrix = matrix
+        self.protocol = protocol
+        self.size = 3 * matrix.num_pixels
+        self.universe = universe
+        self.universes = (self.size + E131_CHANNELS - 1) // E131_CHANNELS
+        if port is None:
+            port = DDP_PORT if protocol == "ddp" else E131_PORT
+        self.port = port
+        self.socket = pool.socket(pool.AF_INET, pool.SOCK_DGRAM)
+        self.socket.bind((host, port))
+        self.socket.setblocking(False)
+        self.packet = bytearray(PACKET_SIZE)
+        self.view = memoryview(self.packet)
+        self.sequence = 0                          # DDP (0: aucun reçu)
+        self.sequences = bytearray(self.universes)  # E1.31, par univers
+        self.seen = bytearray(self.universes)
+        self.pending = False     # Frame complète pas encore affichée
+        self.received_ns = 0     # Réception du paquet qui l'a complétée
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Remet à zéro les statistiques."""
+        self.packets = 0
+        self.frames = 0
+        self.stale = 0
+        self.out_of_order = 0
+        self.errors = 0
+        self.latency_total_ns = 0
+        self.latency_max_ns = 0
+
+    def close(self):
+        """Ferme le socket."""
+        self.socket.close()
+
+    # ------------------------------------------------------------------------
+    # Paquets
+    # ------------------------------------------------------------------------
+
+    def _handle(self, count):
+        """Décode un paquet de count octets reçu dans self.packet."""
+        self.packets += 1
+        if self.protocol == "ddp":
+            self._handle_ddp(count)
+        else:
+            self._handle_e131(count)
+
+    def _handle_ddp(self, count):
+        packet = self.packet
+        flags = packet[0]
+        if (count < DDP_HEADER_SIZE or flags & DDP_VERSION_MASK != DDP_VERSION or
+                flags & DDP_QUERY or packet[3] not in (DDP_ID_DISPLAY, DDP_ID_ALL)):
+            self.errors += 1
+            return
+        sequence = packet[1] & 0x0F
+        if sequence:
+            if self.sequence and _stale(sequence, self.sequence, 16, DDP_WINDOW):
+                self.out_of_order += 1
+                return
+            self.sequence = sequence
+        start = DDP_HEADER_SIZE + (DDP_TIMECODE_SIZE if flags & DDP_TIMECODE else 0)
+        offset = (packet[4] << 24) | (packet[5] << 16) | (packet[6] << 8) | packet[7]
+        length = (packet[8] << 8) | packet[9]
+        if start + length > count:
+            self.errors += 1
+            return
+        self._write(offset, start, length, flags & DDP_PUSH)
+
+    def _handle_e131(self, count):
+        packet = self.packet
+        if (count < E131_HEADER_SIZE or packet[4] != E131_ID[0] or packet[5] != E131_ID[1] or
+                packet[21] != E131_ROOT_VECTOR or packet[43] != E131_FRAMING_VECTOR or
+                packet[117] != E131_DMP_VECTOR or packet[125] != 0):
+            self.errors += 1  # Autre paquet (synchro, découverte) ou code de départ non nul
+            return
+        options = packet[112]
+        index = ((packet[113] << 8) | packet[114]) - self.universe
+        if options & E131_PREVIEW or not 0 <= index < self.universes:
+            return
+        if options & E131_TERMINATED:
+            self.seen[index] = 0  # Nouvelle séquence acceptée à la reprise
+            return
+        sequence = packet[111]
+        if self.seen[index] and _stale(sequence, self.sequences[index], 256, E131_WINDOW):
+            self.out_of_order += 1
+            return
+        self.sequences[index] = sequence
+        self.seen[index] = 1
+        slots = ((packet[123] << 8) | packet[124]) - 1
+        length = min(slots, E131_CHANNELS, count - E131_HEADER_SIZE)
+        self._write(index * E131_CHANNELS, E131_HEADER_SIZE, length,
+                    index == self.universes - 1)
+
+    def _write(self, offset, start, length, push):
+        """
+        Copie les données du paquet dans le frame buffer.
+
+        Une frame en attente recouverte par la suivante dans la même
+        lecture de la file est périmée: elle n'est jamais transmise, et la
+        suivante n'est affichée qu'une fois son paquet PUSH reçu (pas de
+        mélange de deux frames sur les LEDs).
+        """
+        if offset >= self.size or length <= 0:
+            return
+        end = min(offset + length, self.size)
+        complete = push and offset == 0 and end == self.size
+        matrix = self.matrix
+        if self.pending:
+            self.stale += 1
+            self.pending = False
+        if not matrix.drawing:
+            # Frame partielle: les LEDs non reçues gardent la frame affichée
+            matrix.begin_frame(copy_previous=not complete)
+        matrix.frame_view()[offset:end] = self.view[start:start + end - offset]
+        if push:
+            self.pending = True
+            self.received_ns = time.monotonic_ns()
+
+    def _show(self):
+        """Transmet la frame en attente aux LEDs."""
+        self.matrix.end_frame()
+        self.pending = False
+        self.frames += 1
+        latency = time.monotonic_ns() - self.received_ns
+        self.latency_total_ns += latency
+        if latency > self.latency_max_ns:
+            self.latency_max_ns = latency
+
+    # ------------------------------------------------------------------------
+    # Boucle
+    # ------------------------------------------------------------------------
+
+    def poll(self):
+        """
+        Lit tous les paquets en attente puis affiche la dernière frame
+        complète, sans attendre.
+
+        Returns:
+            Nombre de frames affichées
+        """
+        frames = self.frames
+        sock = self.socket
+        packet = self.packet
+        while True:
+            try:
+                count = sock.recv_into(packet)
+            except OSError:
+                break  # EAGAIN: file vide
+            self._handle(count)
+        if self.pending:
+            self._show()
+        return self.frames - frames
+
+    def wait(self, timeout=None):
+        """
+        Attend le premier paquet (au plus timeout secondes), puis comme poll().
+
+        Returns:
+            Nombre de frames affichées
+        """
+        sock = self.socket
+        sock.settimeout(timeout)
+        try:
+            count = sock.recv_into(self.packet)
+        except OSError:
+            return 0  # Délai dépassé
+        finally:
+            sock.setblocking(False)
+        self._handle(count)
+        return self.poll()
+
+    def report(self):
+        """Affiche les statistiques de réception."""
+        mean = self.latency_total_ns / self.frames / 1e6 if self.frames else 0
+        print(f"UDP {self.protocol}: {self.packets} paquets, {self.frames} frames, "
+              f"{self.stale} périmées, {self.out_of_order} hors séquence, "
+              f"{self.errors} invalides, réception -> LEDs {mean:.2f} ms "
+              f"(max {self.latency_max_ns / 1e6:.2f} ms)")